@@ -147,6 +147,58 @@ if DEBUG:
         'django_browser_reload.middleware.BrowserReloadMiddleware',
     ]
 
+# Opt-in query budgets: count, time and fingerprint the SQL of every
+# request and Celery task, see hasta_la_vista_money.system.services.
+QUERY_BUDGET_ENABLED = config('QUERY_BUDGET_ENABLED', default=False, cast=bool)
+QUERY_BUDGET_RAISE = config(
+    'QUERY_BUDGET_RAISE',
+    default=IS_TESTING,
+    cast=bool,
+)
+# Limits of views by URL name and of tasks by task name; keys are the
+# fields of QueryBudget. Anything not listed gets QUERY_BUDGET_DEFAULT.
+QUERY_BUDGETS: dict[str, dict[str, int]] = {}
+QUERY_BUDGET_DEFAULT = {'max_queries': 100, 'max_duplicates': 10}
+
+if QUERY_BUDGET_ENABLED:
+    MIDDLEWARE.insert(
+        1,
+        'hasta_la_vista_money.system.middleware.QueryBudgetMiddleware',
+    )
+
+# Server-Timing headers and per-request timings in the request log; the
+# header tells clients how long service calls took, so it is off in
+# production by default.
+SERVER_TIMING_ENABLED = config(
+    'SERVER_TIMING_ENABLED',
+    default=DEBUG,
+    cast=bool,
+)
+if SERVER_TIMING_ENABLED:
+    MIDDLEWARE.append(
+        'hasta_la_vista_money.system.middleware.ServerTimingMiddleware',
+    )
+
+# Export the spans of service calls through OpenTelemetry (the
+# ``telemetry`` extra): to an OTLP collector when an endpoint is set,
+# to the console otherwise.
+OTEL_SPANS_ENABLED = config('OTEL_SPANS_ENABLED', default=False, cast=bool)
+OTEL_SERVICE_NAME = config('OTEL_SERVICE_NAME', default='hasta-la-vista-money')
+OTEL_EXPORTER_OTLP_ENDPOINT = config('OTEL_EXPORTER_OTLP_ENDPOINT', default='')
+
+# Prometheus metrics at /metrics, for METRICS_TOKEN bearers and
+# superusers. Set PROMETHEUS_MULTIPROC_DIR in the environment of every
+# web and worker process to merge the metrics of all processes.
+METRICS_ENABLED = config('METRICS_ENABLED', default=False, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+# Port the main Celery worker process serves its metrics on; 0 is off.
+METRICS_WORKER_PORT = config('METRICS_WORKER_PORT', default=0, cast=int)
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(
+        0,
+        'hasta_la_vista_money.system.middleware.MetricsMiddleware',
+    )
+
 ROOT_URLCONF = 'config.urls'
 WSGI_APPLICATION = 'config.wsgi.application'
 ASGI_APPLICATION = 'config.asgi.application'
@@ -242,6 +294,26 @@ else:
             'REDIS_LOCATION is required when DEBUG=False',
         )
 
+# In-process tier of hasta_la_vista_money.services.two_tier_cache. Tests
+# disable it so that clearing the cache between tests resets everything.
+TWO_TIER_CACHE_LOCAL_TIMEOUT = 0 if IS_TESTING else 60
+TWO_TIER_CACHE_MAX_ENTRIES = 2048
+
+# Thread pool computing dashboard widgets concurrently. Tests run them
+# inline so that they see data of the test transaction.
+DASHBOARD_WIDGET_WORKERS = 0 if IS_TESTING else 4
+# Pools retired behind timed-out widgets that may still be draining.
+# Past this, a slow widget keeps its pool instead of starting a new one.
+DASHBOARD_WIDGET_MAX_RETIRED_POOLS = 4
+
+# Threads refreshing soft-expired cached payloads in the background.
+# Tests refresh inline, after the stale payload is picked.
+CACHE_REFRESH_WORKERS = 0 if IS_TESTING else 2
+
+# Seconds a request waits for another one computing the same cached
+# payload before it computes a copy of its own.
+CACHE_LOCK_WAIT = 10
+
 # Session backend configuration
 if not DEBUG:
     SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
@@ -731,3 +803,21 @@ CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_TASK_DEFAULT_QUEUE = 'hlvm_tasks'
 CELERY_TASK_DEFAULT_EXCHANGE = 'hlvm_tasks'
 CELERY_TASK_DEFAULT_ROUTING_KEY = 'hlvm_tasks'
+
+# Background statistics cache warm-up; tests run without a broker.
+STATISTICS_PREWARM_ENABLED = not IS_TESTING
+
+# Hand audit entries of committed transactions to a Celery task instead
+# of writing them in the request.
+AUDIT_LOG_QUEUE = config('AUDIT_LOG_QUEUE', default=False, cast=bool)
+
+# Audit log months older than this are exported to AUDIT_LOG_ARCHIVE_DIR
+# as compressed NDJSON and removed; 0 keeps the whole history.
+AUDIT_LOG_RETENTION_MONTHS = config(
+    'AUDIT_LOG_RETENTION_MONTHS',
+    default=0,
+    cast=int,
+)
+AUDIT_LOG_ARCHIVE_DIR = Path(
+    config('AUDIT_LOG_ARCHIVE_DIR', default='') or BASE_DIR / 'archive',
+)
@@ -1,6 +1,7 @@
 from collections.abc import Callable
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.http import HttpRequest, HttpResponse
 from structlog.contextvars import get_contextvars
 
@@ -11,17 +12,34 @@ if TYPE_CHECKING:
 
 
 class CoreMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(
         self,
-        get_response: Callable[[HttpRequest], HttpResponse],
+        get_response: Callable[[HttpRequest], Any],
     ) -> None:
         self.get_response = get_response
         self.container = ApplicationContainer()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(self._attach_container(request))
+        return self._add_request_id(response)
 
-    def __call__(self, request: HttpRequest) -> HttpResponse:
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = await self.get_response(self._attach_container(request))
+        return self._add_request_id(response)
+
+    def _attach_container(self, request: HttpRequest) -> HttpRequest:
         request_with_container = cast('RequestWithContainer', request)
         request_with_container.container = self.container
-        response = self.get_response(request_with_container)
+        return request_with_container
+
+    def _add_request_id(self, response: HttpResponse) -> HttpResponse:
         context = get_contextvars()
         request_id = context.get('request_id') or context.get('correlation_id')
         if request_id is not None:
@@ -18,6 +18,7 @@ from hasta_la_vista_money.finance_account.views import (
 )
 from hasta_la_vista_money.system.views import (
     HealthCheckView,
+    MetricsView,
     OfflineView,
     ReadinessCheckView,
     ServiceWorkerPrecacheView,
@@ -80,6 +81,7 @@ def debug_static_serve(request: HttpRequest, path: str) -> FileResponse:
 urlpatterns = [
     path('healthz/', HealthCheckView.as_view(), name='healthz'),
     path('readyz/', ReadinessCheckView.as_view(), name='readyz'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
     path('sw.js', ServiceWorkerView.as_view(), name='service_worker'),
     path(
         'sw-precache.json',
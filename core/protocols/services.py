@@ -5,13 +5,15 @@ from typing import TYPE_CHECKING, Protocol, runtime_checkable
 from hasta_la_vista_money import constants
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
     from datetime import date, datetime
     from decimal import Decimal
 
-    from django.db.models import QuerySet
+    from django.db.models import Q, QuerySet
 
     from hasta_la_vista_money.finance_account.models import (
         Account,
+        CreditCardCycle,
         TransferMoneyLog,
     )
     from hasta_la_vista_money.finance_account.services import (
@@ -20,6 +22,8 @@ if TYPE_CHECKING:
     )
     from hasta_la_vista_money.finance_account.services.types import (
         BalanceReconcileCommand,
+        CreditPeriod,
+        CreditPeriodTotals,
     )
     from hasta_la_vista_money.users.models import User
 
@@ -89,6 +93,57 @@ class AccountServiceProtocol(Protocol):
         """
         ...
 
+    def get_credit_cards_period_totals(
+        self,
+        periods_by_account: Mapping[int, Sequence[CreditPeriod]],
+        *,
+        transaction_filter: Q | None = None,
+        receipt_filter: Q | None = None,
+    ) -> dict[int, list[CreditPeriodTotals]]:
+        """Calculate credit card totals for N cards and M periods at once.
+
+        Args:
+            periods_by_account: Periods to calculate, keyed by account id.
+            transaction_filter: Optional extra filter for transactions.
+            receipt_filter: Optional extra filter for receipts.
+
+        Returns:
+            Totals keyed by account id, in the order of the given periods.
+        """
+        ...
+
+    def calculate_grace_periods_info(
+        self,
+        accounts: Iterable[Account],
+        purchase_month: date | datetime,
+    ) -> dict[int, GracePeriodInfoDict]:
+        """Calculate grace period information for several credit cards.
+
+        Args:
+            accounts: Accounts to calculate grace periods for.
+            purchase_month: Month to calculate grace period for.
+
+        Returns:
+            Dictionary with grace period information keyed by account id.
+        """
+        ...
+
+    def get_credit_card_cycles(
+        self,
+        accounts: Iterable[Account],
+        months: Iterable[date | datetime],
+    ) -> dict[int, list[CreditCardCycle]]:
+        """Get statement cycles of several credit cards and months.
+
+        Args:
+            accounts: Accounts to read cycles for.
+            months: Purchase months to read.
+
+        Returns:
+            Cycles keyed by account id, ordered by purchase month.
+        """
+        ...
+
     def calculate_raiffeisenbank_payment_schedule(
         self,
         account: Account,
@@ -0,0 +1,53 @@
+"""Base API views shared by the apps."""
+
+from inspect import isawaitable
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """APIView whose handlers may be coroutines.
+
+    Django serves the view asynchronously once its handlers are async.
+    Authentication, permission and throttle checks are those of
+    ``APIView``; they query the database and the cache synchronously,
+    so they run in a worker thread before the handler is awaited.
+    """
+
+    async def dispatch(  # type: ignore[override]
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            method = (request.method or '').lower()
+            handler = (
+                getattr(self, method, self.http_method_not_allowed)
+                if method in self.http_method_names
+                else self.http_method_not_allowed
+            )
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request,
+            response,
+            *args,
+            **kwargs,
+        )
+        return self.response
@@ -22,6 +22,7 @@ from hasta_la_vista_money.budget.repositories import (
     BudgetRepository,
     PlanningRepository,
 )
+from hasta_la_vista_money.core.spans import timed
 from hasta_la_vista_money.transactions.models import Category, TransactionType
 from hasta_la_vista_money.transactions.repositories import TransactionRepository
 from hasta_la_vista_money.users.models import User
@@ -145,36 +146,6 @@ def _month_range(months: list[date]) -> tuple[datetime, datetime]:
     return start_date, end_date
 
 
-def _get_category_ids_by_root(
-    categories: list[Category],
-) -> dict[int, set[int]]:
-    category_ids_by_root = {
-        category.pk: {category.pk} for category in categories
-    }
-    if not categories:
-        return category_ids_by_root
-
-    children = Category.objects.filter(
-        parent_category__in=categories,
-    ).values_list(
-        'parent_category_id',
-        'id',
-    )
-    for parent_id, child_id in children:
-        category_ids_by_root[parent_id].add(child_id)
-    return category_ids_by_root
-
-
-def _get_root_id_by_category_id(
-    category_ids_by_root: dict[int, set[int]],
-) -> dict[int, int]:
-    root_id_by_category_id = {}
-    for root_id, category_ids in category_ids_by_root.items():
-        for category_id in category_ids:
-            root_id_by_category_id[category_id] = root_id
-    return root_id_by_category_id
-
-
 def _scope_users(user: User, users: Iterable[User] | None = None) -> list[User]:
     return list(users) if users is not None else [user]
 
@@ -251,15 +222,7 @@ class BudgetService:
         type_value: str,
         users: Iterable[User] | None = None,
     ) -> dict[int, dict[date, Decimal]]:
-        if not months:
-            return {}
-
-        category_ids_by_root = _get_category_ids_by_root(categories)
-        root_id_by_category_id = _get_root_id_by_category_id(
-            category_ids_by_root,
-        )
-        category_ids = list(root_id_by_category_id)
-        if not category_ids:
+        if not months or not categories:
             return {}
 
         start_date, end_date = _month_range(months)
@@ -268,12 +231,12 @@ class BudgetService:
             self.transaction_repository.filter(
                 user__in=scope_users,
                 type=type_value,
-                category_id__in=category_ids,
+                category__ancestor_links__ancestor__in=categories,
                 date__gte=start_date,
                 date__lte=end_date,
             )
             .annotate(month=TruncMonth('date'))
-            .values('category_id', 'month')
+            .values('category__ancestor_links__ancestor_id', 'month')
             .annotate(total=Sum('amount'))
         )
 
@@ -287,11 +250,12 @@ class BudgetService:
                 else row['month']
             )
             month_start = month_date.replace(day=1)
-            root_id = root_id_by_category_id[row['category_id']]
+            root_id = row['category__ancestor_links__ancestor_id']
             total = Decimal(str(row['total'])) if row['total'] else Decimal(0)
             fact_map[root_id][month_start] += total
         return fact_map
 
+    @timed()
     def aggregate_budget_limit_overview(
         self,
         user: User,
@@ -413,6 +377,7 @@ class BudgetService:
             )
         return plan_map
 
+    @timed()
     def aggregate_budget_data(
         self,
         user: User,
@@ -520,6 +485,7 @@ class BudgetService:
             'total_plan_income': total_plan_income,
         }
 
+    @timed()
     def aggregate_expense_table(
         self,
         user: User,
@@ -566,6 +532,7 @@ class BudgetService:
             'total_plan_expense': total_plan_expense,
         }
 
+    @timed()
     def aggregate_income_table(
         self,
         user: User,
@@ -612,6 +579,7 @@ class BudgetService:
             'total_plan_income': total_plan_income,
         }
 
+    @timed()
     def aggregate_expense_api(
         self,
         user: User,
@@ -650,6 +618,7 @@ class BudgetService:
         )
         return {'months': [m.isoformat() for m in months], 'data': data}
 
+    @timed()
     def aggregate_income_api(
         self,
         user: User,
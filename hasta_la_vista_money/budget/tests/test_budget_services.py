@@ -3,6 +3,7 @@ from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 
@@ -27,6 +28,7 @@ class BudgetServicesTestCase(TestCase):
     """Cover the budget aggregation service end-to-end."""
 
     def setUp(self) -> None:
+        cache.clear()
         self.user = User.objects.create_user(
             username='budget_user',
             password='pass',  # nosec B106: test-only password
@@ -192,6 +194,42 @@ class BudgetServicesTestCase(TestCase):
 
         self.assertEqual(data['expense_data'][0]['fact'][0], 125)
 
+    def test_aggregate_expense_table_includes_nested_categories(self) -> None:
+        grandchild = Category.objects.create(
+            user=self.user,
+            name='Apples',
+            type=TransactionType.EXPENSE,
+            parent_category=self.child_expense_category,
+        )
+        for category, amount in (
+            (self.expense_category, '10.00'),
+            (self.child_expense_category, '20.00'),
+            (grandchild, '30.00'),
+        ):
+            Transaction.objects.create(
+                user=self.user,
+                account=self.account,
+                category=category,
+                type=TransactionType.EXPENSE,
+                amount=Decimal(amount),
+                date=datetime(
+                    2026,
+                    1,
+                    10,
+                    12,
+                    0,
+                    tzinfo=timezone.get_current_timezone(),
+                ),
+            )
+
+        data = self.budget_service.aggregate_expense_table(
+            user=self.user,
+            months=self.months,
+            expense_categories=self.expense_categories,
+        )
+
+        self.assertEqual(data['expense_data'][0]['fact'][0], 60)
+
     def test_aggregate_expense_table_preserves_decimal_amounts(self) -> None:
         Transaction.objects.create(
             user=self.user,
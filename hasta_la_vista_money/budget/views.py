@@ -7,6 +7,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Sum
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.generic import ListView, View
 from drf_spectacular.openapi import AutoSchema
 from drf_spectacular.utils import OpenApiResponse, extend_schema
@@ -30,6 +31,9 @@ from hasta_la_vista_money.services.generate_dates import generate_date_list
 from hasta_la_vista_money.transactions.models import Category
 from hasta_la_vista_money.transactions.repositories import TransactionRepository
 from hasta_la_vista_money.users.models import FamilyGroupMembership, User
+from hasta_la_vista_money.users.services.conditional_get import (
+    conditional_on_user_data,
+)
 from hasta_la_vista_money.users.services.groups import get_family_groups
 
 if TYPE_CHECKING:
@@ -245,6 +249,7 @@ class BudgetView(
         return context
 
 
+@method_decorator(conditional_on_user_data(htmx_only=True), name='get')
 class ExpenseTableView(
     LoginRequiredMixin,
     BudgetContextMixin,
@@ -290,6 +295,7 @@ class ExpenseTableView(
         return context
 
 
+@method_decorator(conditional_on_user_data(htmx_only=True), name='get')
 class IncomeTableView(
     LoginRequiredMixin,
     BudgetContextMixin,
@@ -392,6 +398,7 @@ class PlanningExpenseDict(TypedDict):
         ),
     },
 )
+@method_decorator(conditional_on_user_data(), name='get')
 class ExpenseBudgetAPIView(APIView):
     schema = AutoSchema()
     authentication_classes = (CookieJWTAuthentication,)
@@ -457,6 +464,7 @@ class ExpenseBudgetAPIView(APIView):
         ),
     },
 )
+@method_decorator(conditional_on_user_data(), name='get')
 class IncomeBudgetAPIView(APIView):
     schema = AutoSchema()
     authentication_classes = (CookieJWTAuthentication,)
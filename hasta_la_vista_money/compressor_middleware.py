@@ -3,11 +3,12 @@ in HTML responses."""
 
 import html
 import re
-from collections.abc import Callable
 from typing import Any
 
+from django.utils.deprecation import MiddlewareMixin
 
-class CompressorNonceMiddleware:
+
+class CompressorNonceMiddleware(MiddlewareMixin):
     """Add CSP nonce to `<link>` and `<script>` tags that reference
     static assets.
 
@@ -29,26 +30,6 @@ class CompressorNonceMiddleware:
     )
     _HAS_NONCE_RE = re.compile(r'\bnonce\s*=', re.IGNORECASE)
 
-    def __init__(self, get_response: Callable[..., Any]) -> None:
-        """Initialize middleware.
-
-        Args:
-            get_response: The next middleware or view callable.
-        """
-        self.get_response = get_response
-
-    def __call__(self, request: Any) -> Any:
-        """Process request/response chain.
-
-        Args:
-            request: Django HttpRequest.
-
-        Returns:
-            Django HttpResponse.
-        """
-        response = self.get_response(request)
-        return self.process_response(request, response)
-
     def _validate_nonce(self, nonce: Any) -> bool:
         """Validate nonce characters and length.
 
@@ -237,6 +237,7 @@ THIRTY_TWO: Final = 32
 FORTY: Final = 40
 FIFTY: Final = 50
 SIXTY: Final = 60
+SIXTY_FOUR: Final = 64
 SEVENTY: Final = 70
 EIGHTY: Final = 80
 NINTY: Final = 90
@@ -333,6 +334,9 @@ TRANSFER_LOG_LIMIT: Final = 20
 DASHBOARD_CACHE_TIMEOUT: Final = 300
 DASHBOARD_COMPARISON_CACHE_TIMEOUT: Final = 120
 REPORTS_CACHE_TIMEOUT: Final = 300
+REPORT_SNAPSHOT_CHUNK_SIZE: Final = 200
+AUDIT_LOG_PARTITIONS_AHEAD: Final = 2
+AUDIT_LOG_ARCHIVE_CHUNK_SIZE: Final = 2000
 
 # ============================================================================
 # Statistics Constants
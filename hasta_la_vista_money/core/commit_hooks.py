@@ -0,0 +1,72 @@
+"""On-commit callbacks registered once per transaction.
+
+Writers touching many rows in one transaction often need a single piece
+of work once it commits: a cache flush, a bulk insert, a recalculation.
+``CommitHook`` registers its callback with ``transaction.on_commit`` the
+first time it is scheduled and skips later calls while that registration
+is still pending.
+
+Only a weak reference to the registered callback is kept. Django drops
+the callbacks of a rolled back savepoint or transaction, which frees
+them, so a dead reference tells that the hook has to be registered
+again. The check relies on public API only and costs no query.
+"""
+
+import threading
+import weakref
+from collections.abc import Callable
+from functools import partial
+
+from django.db import transaction
+
+
+class CommitHook:
+    """Callback run once after the current transaction commits.
+
+    Outside of a transaction ``schedule`` runs the callback right away,
+    as ``transaction.on_commit`` does. Pending registrations are tracked
+    per thread, like Django's connections.
+    """
+
+    def __init__(self, func: Callable[[], None]) -> None:
+        """Initialize CommitHook.
+
+        Args:
+            func: Work to run once the transaction commits.
+        """
+        self._func = func
+        self._local = threading.local()
+
+    @property
+    def pending(self) -> bool:
+        """Whether the callback is registered and has not run yet."""
+        ref: weakref.ref[partial[None]] | None = getattr(
+            self._local,
+            'callback',
+            None,
+        )
+        return ref is not None and ref() is not None
+
+    def schedule(self) -> None:
+        """Register the callback unless it is already pending."""
+        if self.pending:
+            return
+        token = object()
+        callback = partial(self._run, token)
+        self._local.token = token
+        self._local.callback = weakref.ref(callback)
+        transaction.on_commit(callback)
+
+    def discard(self) -> None:
+        """Forget the pending registration; its callback does nothing.
+
+        The next ``schedule`` registers the callback again.
+        """
+        self._local.token = None
+        self._local.callback = None
+
+    def _run(self, token: object) -> None:
+        if getattr(self._local, 'token', None) is not token:
+            return
+        self.discard()
+        self._func()
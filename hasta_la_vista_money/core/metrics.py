@@ -0,0 +1,142 @@
+"""Prometheus metrics of web and Celery worker processes.
+
+Metrics are kept per process. With ``PROMETHEUS_MULTIPROC_DIR`` set in
+the environment before the processes start, every Granian worker and
+Celery child writes them to files in that directory and ``render``
+merges the files of all processes. Empty the directory whenever the
+service starts.
+
+Cache hit ratios are derived in queries, for example::
+
+    sum by (metric) (rate(hlvm_cache_lookups_total{outcome=~"hit|stale"}[5m]))
+      / sum by (metric) (rate(hlvm_cache_lookups_total[5m]))
+"""
+
+import os
+from typing import Final
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROC_DIR_ENV: Final = 'PROMETHEUS_MULTIPROC_DIR'
+
+LATENCY_BUCKETS: Final = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+TASK_BUCKETS: Final = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+QUERY_BUCKETS: Final = (0, 1, 5, 10, 25, 50, 100, 250, 500)
+ROWS_PER_SECOND_BUCKETS: Final = (1, 10, 50, 100, 500, 1000, 5000, 10000)
+
+REQUEST_LATENCY = Histogram(
+    'hlvm_http_request_duration_seconds',
+    'Time to respond to a request, by URL name.',
+    ['route', 'method', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    'hlvm_http_request_queries',
+    'SQL statements run by a request, by URL name.',
+    ['route'],
+    buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    'hlvm_http_request_db_seconds',
+    'Time a request spent in the database, by URL name.',
+    ['route'],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    'hlvm_cache_lookups',
+    'Lookups of cached payloads by outcome.',
+    ['metric', 'outcome'],
+)
+CACHE_TIER_LOOKUPS = Counter(
+    'hlvm_cache_tier_lookups',
+    'Lookups of the two-tier cache by tier and result.',
+    ['tier', 'result'],
+)
+SPAN_DURATION = Histogram(
+    'hlvm_span_duration_seconds',
+    'Duration of timed service calls and pipeline stages.',
+    ['span'],
+    buckets=LATENCY_BUCKETS,
+)
+TASK_DURATION = Histogram(
+    'hlvm_celery_task_duration_seconds',
+    'Run time of Celery tasks by final state.',
+    ['task', 'state'],
+    buckets=TASK_BUCKETS,
+)
+TASK_QUEUE_WAIT = Histogram(
+    'hlvm_celery_task_queue_wait_seconds',
+    'Time from publishing a Celery task to a worker starting it.',
+    ['task'],
+    buckets=TASK_BUCKETS,
+)
+TASK_RETRIES = Counter(
+    'hlvm_celery_task_retries',
+    'Retries requested by Celery tasks.',
+    ['task'],
+)
+STATEMENT_ROWS = Counter(
+    'hlvm_bank_statement_rows',
+    'Bank statement rows handled, by stage.',
+    ['stage'],
+)
+STATEMENT_ROWS_PER_SECOND = Histogram(
+    'hlvm_bank_statement_rows_per_second',
+    'Throughput of a bank statement stage for one upload.',
+    ['stage'],
+    buckets=ROWS_PER_SECOND_BUCKETS,
+)
+
+
+def observe_span(name: str, duration: float) -> None:
+    """Record a finished span; a listener for ``add_span_listener``."""
+    SPAN_DURATION.labels(span=name).observe(duration)
+
+
+def observe_statement_rows(stage: str, rows: int, duration: float) -> None:
+    """Record the rows of a bank statement stage and its throughput.
+
+    Args:
+        stage: ``parse`` or ``import``.
+        rows: Rows the stage went through.
+        duration: Seconds the stage took.
+    """
+    STATEMENT_ROWS.labels(stage=stage).inc(rows)
+    if rows and duration > 0:
+        STATEMENT_ROWS_PER_SECOND.labels(stage=stage).observe(
+            rows / duration,
+        )
+
+
+def registry() -> CollectorRegistry:
+    """Return the registry holding the metrics of all processes."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        merged = CollectorRegistry()
+        multiprocess.MultiProcessCollector(merged)  # type: ignore[no-untyped-call]
+        return merged
+    return REGISTRY
+
+
+def render() -> tuple[bytes, str]:
+    """Return the metrics in the text format and its content type."""
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
@@ -107,14 +107,12 @@ class EntityListViewMixin:
 
     def get_flattened_categories(
         self,
-        categories: list[dict[str, Any]] | QuerySet[Any],
         category_type: str,
         depth: int = 3,
     ) -> list[dict[str, Any]]:
         """Get flattened category tree with caching.
 
         Args:
-            categories: List or QuerySet of categories.
             category_type: Type of categories ('expense' or 'income').
             depth: Depth of category tree.
 
@@ -122,15 +120,9 @@ class EntityListViewMixin:
             list: List of categories as a tree.
         """
         user = self.get_current_user()
-        categories_list = (
-            [dict(cat) for cat in categories]
-            if hasattr(categories, 'values')
-            else categories
-        )
         return get_cached_category_tree(
             user_id=user.pk,
             category_type=category_type,
-            categories=categories_list,
             depth=depth,
         )
 
@@ -1,8 +1,13 @@
+import base64
+import binascii
+import json
 from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any
 
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.paginator import Page, Paginator
-from django.db.models import QuerySet
+from django.db.models import Field, Model, Q, QuerySet
 from django.http import HttpRequest
 
 
@@ -16,3 +21,136 @@ def paginator_custom_view(
     paginator = Paginator(queryset, paginate_by)
     num_page = request.GET.get(page_name)
     return paginator.get_page(num_page)
+
+
+@dataclass(frozen=True)
+class KeysetPage[T: Model]:
+    """Page of a queryset paginated by the values of its ordering.
+
+    ``next_cursor`` and ``previous_cursor`` are opaque tokens for the
+    ``after`` and ``before`` arguments of ``keyset_page``; ``None`` when
+    there is no page in that direction.
+    """
+
+    object_list: list[T]
+    next_cursor: str | None
+    previous_cursor: str | None
+
+
+def _encode_cursor(obj: Model, fields: Sequence[str]) -> str:
+    values = [getattr(obj, field) for field in fields]
+    # ``str`` keeps microseconds of datetimes, which the JSON encoder of
+    # Django would round to milliseconds.
+    payload = json.dumps(values, default=str).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _decode_cursor(
+    model: type[Model],
+    fields: Sequence[str],
+    cursor: str,
+) -> list[Any] | None:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+    opts = model._meta  # noqa: SLF001
+    parsed = []
+    try:
+        for field, value in zip(fields, values, strict=True):
+            model_field = opts.pk if field == 'pk' else opts.get_field(field)
+            if not isinstance(model_field, Field):
+                return None
+            parsed.append(model_field.to_python(value))
+    except (FieldDoesNotExist, ValidationError):
+        return None
+    return parsed
+
+
+def _beyond(
+    ordering: Sequence[str],
+    values: Sequence[Any],
+    *,
+    forward: bool,
+) -> Q:
+    """Rows after the cursor in ``ordering``, or before it backwards."""
+    condition = Q()
+    for index, name in enumerate(ordering):
+        field = name.removeprefix('-')
+        lookup = 'lt' if name.startswith('-') == forward else 'gt'
+        term = Q(**{f'{field}__{lookup}': values[index]})
+        for previous, value in zip(
+            ordering[:index],
+            values[:index],
+            strict=True,
+        ):
+            term &= Q(**{previous.removeprefix('-'): value})
+        condition |= term
+    return condition
+
+
+def keyset_page[T: Model](
+    queryset: QuerySet[T],
+    ordering: Sequence[str],
+    page_size: int,
+    *,
+    after: str | None = None,
+    before: str | None = None,
+) -> KeysetPage[T]:
+    """Return a page of a queryset without counting or skipping rows.
+
+    The page starts right after the ``after`` cursor, or ends right
+    before the ``before`` cursor; without a valid cursor the first page
+    is returned. The ordering must identify rows uniquely, so end it
+    with the primary key, and its fields must not be nullable.
+
+    Args:
+        queryset: Rows to paginate.
+        ordering: Fields of the order, ``-`` marking a descending one.
+        page_size: Maximum number of rows on a page.
+        after: Cursor of the last row of the previous page.
+        before: Cursor of the first row of the next page.
+    """
+    fields = [name.removeprefix('-') for name in ordering]
+    model = queryset.model
+    after_values = _decode_cursor(model, fields, after) if after else None
+    before_values = _decode_cursor(model, fields, before) if before else None
+
+    if before_values is not None and after_values is None:
+        reverse = [
+            name.removeprefix('-') if name.startswith('-') else f'-{name}'
+            for name in ordering
+        ]
+        rows = list(
+            queryset.filter(
+                _beyond(ordering, before_values, forward=False),
+            ).order_by(*reverse)[: page_size + 1],
+        )
+        has_previous = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=_encode_cursor(rows[-1], fields) if rows else None,
+            previous_cursor=(
+                _encode_cursor(rows[0], fields) if has_previous else None
+            ),
+        )
+
+    if after_values is not None:
+        queryset = queryset.filter(
+            _beyond(ordering, after_values, forward=True),
+        )
+    rows = list(queryset.order_by(*ordering)[: page_size + 1])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=_encode_cursor(rows[-1], fields) if has_next else None,
+        previous_cursor=(
+            _encode_cursor(rows[0], fields)
+            if after_values is not None and rows
+            else None
+        ),
+    )
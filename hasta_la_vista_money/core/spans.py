@@ -0,0 +1,188 @@
+"""Timing spans of service hot paths.
+
+``span`` measures a block and ``timed`` a whole function. Inside
+``collect_spans`` the durations are summed per span name, which is how
+``ServerTimingMiddleware`` reports them for a request. With
+``OTEL_SPANS_ENABLED`` and the ``telemetry`` extra installed, every span
+is exported through OpenTelemetry as well, and listeners added with
+``add_span_listener`` see every finished span. Without any of them a
+span costs a context variable lookup. Reads and writes of the shared
+cache are timed as the ``cache`` span.
+"""
+
+import functools
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+import structlog
+
+CACHE_SPAN: Final = 'cache'
+
+logger = structlog.get_logger(__name__)
+
+_collector: ContextVar['SpanTimings | None'] = ContextVar(
+    'span_collector',
+    default=None,
+)
+_tracer: Any = None
+_listeners: list[Callable[[str, float], None]] = []
+
+
+@dataclass
+class SpanTiming:
+    """Time spent in the spans of one name."""
+
+    count: int = 0
+    duration: float = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        """Total duration in milliseconds."""
+        return self.duration * 1000
+
+
+@dataclass
+class SpanTimings:
+    """Spans finished while collecting, by name in order of appearance."""
+
+    spans: dict[str, SpanTiming] = field(default_factory=dict)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        repr=False,
+        compare=False,
+    )
+
+    def add(self, name: str, duration: float) -> None:
+        """Count a finished span; safe to call from several threads."""
+        with self._lock:
+            timing = self.spans.setdefault(name, SpanTiming())
+            timing.count += 1
+            timing.duration += duration
+
+    def as_fields(self) -> dict[str, float]:
+        """Return milliseconds per span name, for structured logs."""
+        return {
+            name: round(timing.duration_ms, 1)
+            for name, timing in self.spans.items()
+        }
+
+
+@contextmanager
+def collect_spans() -> Iterator[SpanTimings]:
+    """Sum the durations of spans finished inside the block.
+
+    Nested collections are independent: spans count towards the
+    innermost one only.
+    """
+    timings = SpanTimings()
+    token = _collector.set(timings)
+    try:
+        yield timings
+    finally:
+        _collector.reset(token)
+
+
+def add_span_listener(listener: Callable[[str, float], None]) -> None:
+    """Call ``listener`` with the name and seconds of every finished span."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    """Time the block as the span ``name``.
+
+    Args:
+        name: Span name, a dotted ``Service.method`` style token.
+        attributes: Extra fields of the exported OpenTelemetry span.
+    """
+    timings = _collector.get()
+    if timings is None and _tracer is None and not _listeners:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        if _tracer is None:
+            yield
+        else:
+            with _tracer.start_as_current_span(name, attributes=attributes):
+                yield
+    finally:
+        duration = time.perf_counter() - started
+        if timings is not None:
+            timings.add(name, duration)
+        for listener in _listeners:
+            listener(name, duration)
+
+
+def timed[**P, R](
+    name: str | None = None,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Run every call of the decorated function in a span.
+
+    Args:
+        name: Span name; the qualified name of the function by default.
+    """
+
+    def decorate(func: Callable[P, R]) -> Callable[P, R]:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def configure_tracing(service_name: str, endpoint: str = '') -> bool:
+    """Export spans through OpenTelemetry.
+
+    Spans go to an OTLP collector at ``endpoint``, or are printed to the
+    console without one. Returns whether tracing was set up, which needs
+    the packages of the ``telemetry`` extra.
+    """
+    global _tracer  # noqa: PLW0603
+
+    try:
+        from opentelemetry import trace  # noqa: PLC0415
+        from opentelemetry.sdk.resources import Resource  # noqa: PLC0415
+        from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+        from opentelemetry.sdk.trace.export import (  # noqa: PLC0415
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+        )
+    except ImportError:
+        logger.warning(
+            'OpenTelemetry is not installed, spans are not exported',
+        )
+        return False
+
+    exporter: Any
+    if endpoint:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (  # noqa: PLC0415
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning('OTLP exporter is not installed')
+            return False
+        exporter = OTLPSpanExporter(endpoint=endpoint)
+    else:
+        exporter = ConsoleSpanExporter()
+
+    provider = TracerProvider(
+        resource=Resource.create({'service.name': service_name}),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(__name__)
+    return True
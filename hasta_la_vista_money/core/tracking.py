@@ -0,0 +1,91 @@
+"""Tracking of the field values a model instance was loaded with."""
+
+from collections.abc import Collection, Iterable
+from typing import Any, Self
+
+from django.db import models
+
+
+class LoadedValuesMixin(models.Model):
+    """Remember the database values of concrete fields.
+
+    Values are captured when the instance is loaded from the database,
+    refreshed from it or saved, so the state stored in the database can
+    be compared with the instance without another query.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(
+        cls,
+        db: str | None,
+        field_names: Collection[str],
+        values: Collection[Any],
+        **kwargs: Any,
+    ) -> Self:
+        # Keyword options of newer Django versions, such as fetch_mode,
+        # are passed through unchanged.
+        instance = super().from_db(db, field_names, values, **kwargs)
+        instance.remember_loaded_values(field_names)
+        return instance
+
+    def refresh_from_db(
+        self,
+        using: str | None = None,
+        fields: Iterable[str] | None = None,
+        from_queryset: models.QuerySet[Any] | None = None,
+    ) -> None:
+        fields = list(fields) if fields is not None else None
+        super().refresh_from_db(
+            using=using,
+            fields=fields,
+            from_queryset=from_queryset,
+        )
+        self.remember_loaded_values(fields)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+        self.remember_loaded_values(kwargs.get('update_fields'))
+
+    def remember_loaded_values(
+        self,
+        fields: Iterable[str] | None = None,
+    ) -> None:
+        """Record current values as the ones stored in the database.
+
+        Args:
+            fields: Names or attnames of the fields to record; all loaded
+                concrete fields when omitted.
+        """
+        loaded: dict[str, Any] = self.__dict__.setdefault('_loaded_values', {})
+        names = set(fields) if fields is not None else None
+        for field in self._meta.concrete_fields:
+            if names is not None and not names & {field.name, field.attname}:
+                continue
+            if field.attname in self.__dict__:
+                loaded[field.attname] = self.__dict__[field.attname]
+
+    def loaded_values(self) -> dict[str, Any] | None:
+        """Return the stored values of all concrete fields.
+
+        ``None`` means the instance was not loaded from the database or
+        some of its fields were never loaded.
+        """
+        loaded: dict[str, Any] | None = getattr(self, '_loaded_values', None)
+        if loaded is None or any(
+            field.attname not in loaded for field in self._meta.concrete_fields
+        ):
+            return None
+        return loaded
+
+    def loaded_field_values(self, *attnames: str) -> tuple[Any, ...] | None:
+        """Return the stored values of some fields, in the given order.
+
+        ``None`` means some of the fields were never loaded.
+        """
+        loaded: dict[str, Any] = getattr(self, '_loaded_values', {})
+        if any(attname not in loaded for attname in attnames):
+            return None
+        return tuple(loaded[attname] for attname in attnames)
@@ -10,6 +10,7 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from hasta_la_vista_money import constants
+from hasta_la_vista_money.core.spans import timed
 from hasta_la_vista_money.deposits.commands import (
     AddFloatingRatePeriodCommand,
     CapitalizeInterestCommand,
@@ -63,8 +64,9 @@ from hasta_la_vista_money.finance_account.services.balance_service import (
     BalanceService,
 )
 from hasta_la_vista_money.users.models import User
-from hasta_la_vista_money.users.services.cache import (
-    invalidate_user_detailed_statistics_cache,
+from hasta_la_vista_money.users.services.cache import DOMAIN_DEPOSITS
+from hasta_la_vista_money.users.services.cache_invalidation import (
+    schedule_statistics_change,
 )
 
 
@@ -728,6 +730,7 @@ class DepositService:
     def get_user_deposits(self, user: User) -> QuerySet[Deposit]:
         return self.deposit_repository.get_by_user(user)
 
+    @timed()
     def get_user_deposit_overview(self, user: User) -> DepositOverview:
         deposits = tuple(self.get_user_deposits(user))
         active_deposits = tuple(
@@ -1006,9 +1009,7 @@ class DepositService:
             reversal_reason=reason,
         )
         self.deposit_repository.reopen_term(term.pk)
-        transaction.on_commit(
-            lambda: invalidate_user_detailed_statistics_cache(command.user.pk),
-        )
+        schedule_statistics_change(command.user.pk, DOMAIN_DEPOSITS)
         return principal_reversal
 
     def _reverse_interest_event(
@@ -1058,9 +1059,7 @@ class DepositService:
             reversal_of=event,
             reversal_reason=reason,
         )
-        transaction.on_commit(
-            lambda: invalidate_user_detailed_statistics_cache(command.user.pk),
-        )
+        schedule_statistics_change(command.user.pk, DOMAIN_DEPOSITS)
         return reversal
 
     @staticmethod
@@ -1392,9 +1391,7 @@ class DepositService:
         )
         if forecast is not None:
             self.deposit_repository.confirm_forecast(forecast.pk)
-        transaction.on_commit(
-            lambda: invalidate_user_detailed_statistics_cache(command.user.pk),
-        )
+        schedule_statistics_change(command.user.pk, DOMAIN_DEPOSITS)
         self._create_audit(
             deposit=deposit,
             event_type=DepositAuditEvent.Type.CONFIRMATION,
@@ -1415,6 +1412,7 @@ class DepositService:
                 )
         return event
 
+    @timed()
     def forecast_early_closure(
         self,
         command: ForecastEarlyClosureCommand,
@@ -1570,9 +1568,7 @@ class DepositService:
         self.deposit_repository.delete_unconfirmed_forecasts(term.pk)
         self.deposit_repository.close_term(term.pk, command.value_on)
         self.account_repository.archive(deposit.account.pk)
-        transaction.on_commit(
-            lambda: invalidate_user_detailed_statistics_cache(command.user.pk),
-        )
+        schedule_statistics_change(command.user.pk, DOMAIN_DEPOSITS)
         self._create_audit(
             deposit=deposit,
             event_type=DepositAuditEvent.Type.CLOSURE,
@@ -1716,9 +1712,7 @@ class DepositService:
         self.deposit_repository.delete_unconfirmed_forecasts(term.pk)
         self.deposit_repository.close_term(term.pk, command.value_on)
         self.account_repository.archive(deposit.account.pk)
-        transaction.on_commit(
-            lambda: invalidate_user_detailed_statistics_cache(command.user.pk),
-        )
+        schedule_statistics_change(command.user.pk, DOMAIN_DEPOSITS)
         self._create_audit(
             deposit=deposit,
             event_type=DepositAuditEvent.Type.CLOSURE,
@@ -2067,6 +2061,7 @@ class DepositService:
                 _('Снятие нарушает неснижаемый остаток вклада.'),
             )
 
+    @timed()
     @transaction.atomic
     def recalculate_forecast(
         self,
@@ -2307,6 +2302,7 @@ class DepositService:
             description=description,
         )
 
+    @timed()
     def reconcile_deposit(
         self,
         deposit_id: int,
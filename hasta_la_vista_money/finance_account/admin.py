@@ -5,6 +5,7 @@ from django.contrib import admin
 from hasta_la_vista_money.finance_account.models import (
     Account,
     Bank,
+    CreditCardCycle,
     TransferMoneyLog,
 )
 
@@ -43,3 +44,18 @@ class TransferMoneyLogAdmin(admin.ModelAdmin[TransferMoneyLog]):
     list_select_related = ('user', 'from_account', 'to_account')
     search_fields = ('user__username',)
     date_hierarchy = 'exchange_date'
+
+
+@admin.register(CreditCardCycle)
+class CreditCardCycleAdmin(admin.ModelAdmin[CreditCardCycle]):
+    list_display = (
+        'account',
+        'purchase_start',
+        'grace_end',
+        'debt',
+        'payments',
+        'remaining_debt',
+    )
+    list_select_related = ('account',)
+    search_fields = ('account__name_account',)
+    date_hierarchy = 'purchase_start'
@@ -16,3 +16,6 @@ class AccountConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hasta_la_vista_money.finance_account'
+
+    def ready(self) -> None:
+        import hasta_la_vista_money.finance_account.signals  # noqa: F401
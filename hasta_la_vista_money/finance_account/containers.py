@@ -13,6 +13,7 @@ from hasta_la_vista_money.finance_account.services import (
     AccountService,
     BalanceTrendService,
     BankService,
+    CreditCardCycleService,
     TransferService,
 )
 
@@ -37,6 +38,12 @@ class FinanceAccountContainer(containers.DeclarativeContainer):
             receipt_repository=receipts.receipt_repository,
         )
     )
+    credit_card_cycle_service = providers.Factory(
+        CreditCardCycleService,
+        credit_calculation_service=(
+            account_service.provided.credit_calculation_service
+        ),
+    )
     transfer_service = providers.Factory(
         TransferService,
         transfer_money_log_repository=transfer_money_log_repository,
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.7 on 2026-10-18 22:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance_account', '0024_add_external_id_and_audit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreditCardCycle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, null=True, verbose_name='Дата и время создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True, verbose_name='Дата и время обновления')),
+                ('purchase_start', models.DateTimeField(verbose_name='Начало периода покупок')),
+                ('purchase_end', models.DateTimeField(verbose_name='Конец периода покупок')),
+                ('grace_end', models.DateTimeField(verbose_name='Конец льготного периода')),
+                ('payments_end', models.DateTimeField(verbose_name='Конец периода погашения')),
+                ('purchases', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Покупки')),
+                ('refunds', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Возвраты')),
+                ('repayments', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Погашения в периоде покупок')),
+                ('payments', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Погашения до конца льготного периода')),
+                ('debt', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Долг за период')),
+                ('remaining_debt', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Остаток долга')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credit_cycles', to='finance_account.account', verbose_name='Счёт')),
+            ],
+            options={
+                'verbose_name': 'Расчётный период кредитной карты',
+                'verbose_name_plural': 'Расчётные периоды кредитных карт',
+                'ordering': ['account', 'purchase_start'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['account', 'grace_end'], name='finance_acc_account_075388_idx'), models.Index(fields=['account', 'payments_end'], name='finance_acc_account_ad8afe_idx')],
+                'constraints': [models.UniqueConstraint(fields=('account', 'purchase_start'), name='unique_credit_cycle_per_month')],
+            },
+        ),
+    ]
@@ -5,10 +5,12 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.functional import Promise
 from django.utils.translation import gettext_lazy as _
 
 from hasta_la_vista_money import constants
+from hasta_la_vista_money.core.tracking import LoadedValuesMixin
 from hasta_la_vista_money.finance_account.currencies import (
     currency_choices,
     get_default_currency,
@@ -180,7 +182,7 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
-class Account(TimeStampedModel):
+class Account(LoadedValuesMixin, TimeStampedModel):
     """
     Represents a user's financial account, which can be a credit/debit
     account, card, or cash.
@@ -340,7 +342,7 @@ class TransferMoneyLogManager(models.Manager['TransferMoneyLog']):
         return self.get_queryset().by_date_range(start, end)
 
 
-class TransferMoneyLog(TimeStampedModel):
+class TransferMoneyLog(LoadedValuesMixin, TimeStampedModel):
     """
     Stores logs of money transfers between accounts, including user,
     source, destination, amount, and notes.
@@ -403,3 +405,85 @@ class TransferMoneyLog(TimeStampedModel):
                 to_account=self.to_account,
             ),
         )
+
+
+class CreditCardCycle(TimeStampedModel):
+    """
+    Materialized statement cycle of a credit card for one purchase month.
+    Stores purchase and repayment totals, grace period end and remaining
+    debt, recalculated when operations of the card change.
+    """
+
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        related_name='credit_cycles',
+        verbose_name=_('Счёт'),
+    )
+    purchase_start = models.DateTimeField(
+        verbose_name=_('Начало периода покупок'),
+    )
+    purchase_end = models.DateTimeField(
+        verbose_name=_('Конец периода покупок'),
+    )
+    grace_end = models.DateTimeField(
+        verbose_name=_('Конец льготного периода'),
+    )
+    payments_end = models.DateTimeField(
+        verbose_name=_('Конец периода погашения'),
+    )
+    purchases = models.DecimalField(
+        max_digits=constants.TWENTY,
+        decimal_places=constants.TWO,
+        default=0,
+        verbose_name=_('Покупки'),
+    )
+    refunds = models.DecimalField(
+        max_digits=constants.TWENTY,
+        decimal_places=constants.TWO,
+        default=0,
+        verbose_name=_('Возвраты'),
+    )
+    repayments = models.DecimalField(
+        max_digits=constants.TWENTY,
+        decimal_places=constants.TWO,
+        default=0,
+        verbose_name=_('Погашения в периоде покупок'),
+    )
+    payments = models.DecimalField(
+        max_digits=constants.TWENTY,
+        decimal_places=constants.TWO,
+        default=0,
+        verbose_name=_('Погашения до конца льготного периода'),
+    )
+    debt = models.DecimalField(
+        max_digits=constants.TWENTY,
+        decimal_places=constants.TWO,
+        default=0,
+        verbose_name=_('Долг за период'),
+    )
+    remaining_debt = models.DecimalField(
+        max_digits=constants.TWENTY,
+        decimal_places=constants.TWO,
+        default=0,
+        verbose_name=_('Остаток долга'),
+    )
+
+    class Meta(TimeStampedModel.Meta):
+        verbose_name = _('Расчётный период кредитной карты')
+        verbose_name_plural = _('Расчётные периоды кредитных карт')
+        ordering: ClassVar[list[str]] = ['account', 'purchase_start']
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=['account', 'purchase_start'],
+                name='unique_credit_cycle_per_month',
+            ),
+        ]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=['account', 'grace_end']),
+            models.Index(fields=['account', 'payments_end']),
+        ]
+
+    def __str__(self) -> str:
+        purchase_start = timezone.localtime(self.purchase_start)
+        return f'{self.account}: {purchase_start:%m.%Y}'
@@ -31,6 +31,9 @@ from hasta_la_vista_money.finance_account.services.bank_service import (
 from hasta_la_vista_money.finance_account.services.credit_calculation_service import (  # noqa: E501
     CreditCalculationService,
 )
+from hasta_la_vista_money.finance_account.services.credit_cycle_service import (
+    CreditCardCycleService,
+)
 from hasta_la_vista_money.finance_account.services.protocols import (
     BalanceServiceProtocol,
     BankCalculatorProtocol,
@@ -41,6 +44,8 @@ from hasta_la_vista_money.finance_account.services.transfer_service import (
 )
 from hasta_la_vista_money.finance_account.services.types import (
     BalanceReconcileCommand,
+    CreditPeriod,
+    CreditPeriodTotals,
     GracePeriodInfoDict,
     PaymentScheduleItemDict,
     PaymentScheduleStatementDict,
@@ -61,6 +66,9 @@ __all__ = [
     'BankService',
     'CreditCalculationService',
     'CreditCalculationServiceProtocol',
+    'CreditCardCycleService',
+    'CreditPeriod',
+    'CreditPeriodTotals',
     'DefaultBankCalculator',
     'GracePeriodInfoDict',
     'PaymentScheduleItemDict',
@@ -1,15 +1,16 @@
 """Service for account management operations."""
 
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from django.contrib.auth.models import Group
-from django.db.models import QuerySet, Sum
+from django.db.models import Q, QuerySet, Sum
 
 from hasta_la_vista_money import constants
 from hasta_la_vista_money.finance_account.models import (
     Account,
+    CreditCardCycle,
     TransferMoneyLog,
 )
 from hasta_la_vista_money.finance_account.services.balance_service import (
@@ -18,13 +19,20 @@ from hasta_la_vista_money.finance_account.services.balance_service import (
 from hasta_la_vista_money.finance_account.services.credit_calculation_service import (  # noqa: E501
     CreditCalculationService,
 )
+from hasta_la_vista_money.finance_account.services.credit_cycle_service import (
+    CreditCardCycleService,
+)
 from hasta_la_vista_money.finance_account.services.types import (
     BalanceReconcileCommand,
+    CreditPeriod,
+    CreditPeriodTotals,
     GracePeriodInfoDict,
     RaiffeisenbankScheduleDict,
 )
 from hasta_la_vista_money.users.models import FamilyGroupMembership, User
 from hasta_la_vista_money.users.services.groups import (
+    get_family_member_ids,
+    get_family_roles,
     user_has_group_access,
 )
 
@@ -71,6 +79,9 @@ class AccountService:
             transaction_repository=transaction_repository,
             receipt_repository=receipt_repository,
         )
+        self.credit_cycle_service = CreditCardCycleService(
+            self.credit_calculation_service,
+        )
 
     def get_user_accounts(self, user: User) -> list[Account]:
         """Get all accounts for a specific user.
@@ -121,36 +132,24 @@ class AccountService:
         if not group_id or group_id == 'my':
             return [user]
 
+        owner = FamilyGroupMembership.Role.OWNER
         if group_id == 'family':
-            group_ids = FamilyGroupMembership.objects.filter(
-                user=user,
-                role=FamilyGroupMembership.Role.OWNER,
-            ).values_list('group_id', flat=True)
-            users = User.objects.filter(
-                family_memberships__group_id__in=group_ids,
-            ).distinct()
-            return list(users) or [user]
+            member_ids = {
+                member_id
+                for owned_group_id, role in get_family_roles(user).items()
+                if role == owner
+                for member_id in get_family_member_ids(owned_group_id)
+            }
+            return list(User.objects.filter(pk__in=member_ids)) or [user]
 
         if not user_has_group_access(user, group_id):
             return []
 
-        try:
-            group = Group.objects.get(pk=group_id)
-        except Group.DoesNotExist:
-            return []
-        else:
-            is_owner = FamilyGroupMembership.objects.filter(
-                group=group,
-                user=user,
-                role=FamilyGroupMembership.Role.OWNER,
-            ).exists()
-            if not is_owner:
-                return [user]
-            return list(
-                User.objects.filter(
-                    family_memberships__group=group,
-                ).distinct(),
-            )
+        if get_family_roles(user).get(int(group_id)) != owner:
+            return [user]
+        return list(
+            User.objects.filter(pk__in=get_family_member_ids(int(group_id))),
+        )
 
     def get_accounts_for_user_or_group(
         self,
@@ -289,6 +288,30 @@ class AccountService:
             end_date,
         )
 
+    def get_credit_cards_period_totals(
+        self,
+        periods_by_account: Mapping[int, Sequence[CreditPeriod]],
+        *,
+        transaction_filter: Q | None = None,
+        receipt_filter: Q | None = None,
+    ) -> dict[int, list[CreditPeriodTotals]]:
+        """Calculate credit card totals for N cards and M periods at once.
+
+        Args:
+            periods_by_account: Periods to calculate, keyed by account id.
+            transaction_filter: Optional extra filter for transactions.
+            receipt_filter: Optional extra filter for receipts.
+
+        Returns:
+            Totals keyed by account id, in the order of the given periods.
+        """
+        service = self.credit_calculation_service
+        return service.get_credit_cards_period_totals(
+            periods_by_account,
+            transaction_filter=transaction_filter,
+            receipt_filter=receipt_filter,
+        )
+
     def calculate_grace_period_info(
         self,
         account: Account,
@@ -304,9 +327,47 @@ class AccountService:
             Dictionary with grace period information. Empty dict if account
             is not a credit card.
         """
-        return self.credit_calculation_service.calculate_grace_period_info(
-            account,
+        return self.credit_cycle_service.grace_periods_info(
+            [account],
             purchase_month,
+        ).get(account.pk, {})
+
+    def calculate_grace_periods_info(
+        self,
+        accounts: Iterable[Account],
+        purchase_month: date | datetime,
+    ) -> dict[int, GracePeriodInfoDict]:
+        """Calculate grace period information for several credit cards.
+
+        Args:
+            accounts: Accounts to calculate grace periods for.
+            purchase_month: Month to calculate grace period for.
+
+        Returns:
+            Dictionary with grace period information keyed by account id.
+        """
+        return self.credit_cycle_service.grace_periods_info(
+            accounts,
+            purchase_month,
+        )
+
+    def get_credit_card_cycles(
+        self,
+        accounts: Iterable[Account],
+        months: Iterable[date | datetime],
+    ) -> dict[int, list[CreditCardCycle]]:
+        """Get statement cycles of several credit cards and months.
+
+        Args:
+            accounts: Accounts to read cycles for.
+            months: Purchase months to read.
+
+        Returns:
+            Cycles keyed by account id, ordered by purchase month.
+        """
+        return self.credit_cycle_service.get_credit_card_cycles(
+            accounts,
+            months,
         )
 
     def calculate_raiffeisenbank_payment_schedule(
@@ -1,12 +1,22 @@
 """Service for credit card calculation operations."""
 
 from calendar import monthrange
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import date, datetime, time
 from decimal import Decimal
-from typing import TYPE_CHECKING, cast
+from functools import reduce
+from operator import or_
+from typing import TYPE_CHECKING, Any, Final, cast
 
 from dateutil.relativedelta import relativedelta
-from django.db.models import DecimalField, Q, Sum
+from django.db.models import (
+    DecimalField,
+    ExpressionWrapper,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+)
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
@@ -15,23 +25,30 @@ from hasta_la_vista_money.constants import (
     RECEIPT_OPERATION_PURCHASE,
     RECEIPT_OPERATION_RETURN,
 )
+from hasta_la_vista_money.core.spans import timed
 from hasta_la_vista_money.finance_account.bank_constants import (
     BANK_RAIFFEISENBANK,
     SUPPORTED_BANKS,
 )
 from hasta_la_vista_money.finance_account.models import (
     Account,
+    CreditCardCycle,
     TransferMoneyLog,
 )
 from hasta_la_vista_money.finance_account.services.bank_calculators import (
     create_bank_calculator,
 )
 from hasta_la_vista_money.finance_account.services.types import (
+    CreditPeriod,
+    CreditPeriodTotals,
     GracePeriodInfoDict,
     PaymentScheduleStatementDict,
     RaiffeisenbankScheduleDict,
 )
-from hasta_la_vista_money.transactions.models import TransactionType
+from hasta_la_vista_money.transactions.models import (
+    Transaction,
+    TransactionType,
+)
 
 if TYPE_CHECKING:
     from hasta_la_vista_money.receipts.repositories import ReceiptRepository
@@ -40,6 +57,68 @@ if TYPE_CHECKING:
     )
 
 
+_TOTALS_FIELDS: Final = ('purchases', 'refunds', 'repayments', 'payments')
+_ZERO_COLUMN: Final = ExpressionWrapper(
+    Value(constants.ZERO),
+    output_field=DecimalField(),
+)
+
+
+def credit_cycle_start(value: date | datetime) -> datetime:
+    """Return the aware start of the local month of a date or datetime.
+
+    Statement cycles of credit cards are keyed by this moment.
+    """
+    if isinstance(value, datetime):
+        value = (
+            timezone.localdate(value)
+            if timezone.is_aware(value)
+            else value.date()
+        )
+    return timezone.make_aware(datetime.combine(value.replace(day=1), time.min))
+
+
+def _conditional_sum(field: str, condition: Q) -> Coalesce:
+    """Build SUM(field) FILTER (condition) defaulting to zero."""
+    return Coalesce(
+        Sum(field, filter=condition),
+        0,
+        output_field=DecimalField(),
+    )
+
+
+def _period_windows(
+    periods_by_account: Mapping[int, Sequence[CreditPeriod]],
+    index: int,
+) -> dict[CreditPeriod, list[int]]:
+    """Group accounts sharing the same period at the given index."""
+    windows: dict[CreditPeriod, list[int]] = {}
+    for account_id, periods in periods_by_account.items():
+        if index < len(periods):
+            windows.setdefault(periods[index], []).append(account_id)
+    return windows
+
+
+def _windows_lookup(
+    windows: Mapping[CreditPeriod, Sequence[int]],
+    field: str,
+    *,
+    account_field: str = 'account_id',
+    payments: bool = False,
+) -> Q:
+    """Build OR of (account in group AND date in window) conditions."""
+    conditions = []
+    for period, account_ids in windows.items():
+        end = (period.payments_end or period.end) if payments else period.end
+        condition = Q(**{f'{account_field}__in': account_ids})
+        if period.start is not None:
+            condition &= Q(**{f'{field}__gte': period.start})
+        if end is not None:
+            condition &= Q(**{f'{field}__lte': end})
+        conditions.append(condition)
+    return reduce(or_, conditions)
+
+
 class CreditCalculationService:
     """Service for credit card debt and grace period calculations.
 
@@ -71,7 +150,7 @@ class CreditCalculationService:
 
         Calculates the debt by summing expenses and receipts (purchases)
         and subtracting income and returns for the specified period.
-        Optimized to use single aggregation query where possible.
+        Uses a single batched aggregation query.
 
         Args:
             account: Account instance. Must be credit card or credit type.
@@ -84,88 +163,9 @@ class CreditCalculationService:
         if account.type_account not in constants.CREDIT_ACCOUNT_TYPES:
             return None
 
-        start_date_dt: datetime | None = None
-        end_date_dt: datetime | None = None
-
-        if start_date and end_date:
-            if isinstance(start_date, datetime):
-                start_date_dt = start_date
-            elif isinstance(start_date, date):
-                start_date_dt = timezone.make_aware(
-                    datetime.combine(start_date, time.min),
-                )
-            if isinstance(end_date, datetime):
-                end_date_dt = end_date
-            elif isinstance(end_date, date):
-                end_date_dt = timezone.make_aware(
-                    datetime.combine(end_date, time.max),
-                )
-
-        expenses_queryset = self.transaction_repository.filter(
-            account=account,
-            type=TransactionType.EXPENSE,
-        )
-        income_queryset = self.transaction_repository.filter(
-            account=account,
-            type=TransactionType.INCOME,
-        )
-        receipts_queryset = self.receipt_repository.filter(account=account)
-
-        if start_date_dt and end_date_dt:
-            expenses_queryset = expenses_queryset.filter(
-                date__range=(start_date_dt, end_date_dt),
-            )
-            income_queryset = income_queryset.filter(
-                date__range=(start_date_dt, end_date_dt),
-            )
-            receipts_queryset = receipts_queryset.filter(
-                receipt_date__range=(start_date_dt, end_date_dt),
-            )
-
-        total_expense = (
-            expenses_queryset.aggregate(total=Sum('amount'))['total'] or 0
-        )
-        total_income = (
-            income_queryset.aggregate(total=Sum('amount'))['total'] or 0
-        )
-
-        receipt_aggregation = receipts_queryset.aggregate(
-            total_expense=Coalesce(
-                Sum(
-                    'total_sum',
-                    filter=Q(operation_type=RECEIPT_OPERATION_PURCHASE),
-                ),
-                0,
-                output_field=DecimalField(),
-            ),
-            total_return=Coalesce(
-                Sum(
-                    'total_sum',
-                    filter=Q(operation_type=RECEIPT_OPERATION_RETURN),
-                ),
-                0,
-                output_field=DecimalField(),
-            ),
-        )
-        total_receipt_expense = receipt_aggregation['total_expense'] or 0
-        total_receipt_return = receipt_aggregation['total_return'] or 0
-
-        transfer_payments_queryset = TransferMoneyLog.objects.filter(
-            to_account=account,
-        )
-        if start_date_dt and end_date_dt:
-            transfer_payments_queryset = transfer_payments_queryset.filter(
-                exchange_date__range=(start_date_dt, end_date_dt),
-            )
-        total_transfer_payments = (
-            transfer_payments_queryset.aggregate(total=Sum('amount'))['total']
-            or 0
-        )
-
-        result = (total_expense + total_receipt_expense) - (
-            total_income + total_receipt_return + total_transfer_payments
-        )
-        return max(Decimal(str(result)), Decimal(str(constants.ZERO)))
+        period = self._credit_period(start_date, end_date)
+        totals = self.get_credit_cards_period_totals({account.pk: [period]})
+        return totals[account.pk][0].debt
 
     def get_credit_card_payments(
         self,
@@ -187,62 +187,201 @@ class CreditCalculationService:
         Returns:
             Total payments amount as Decimal.
         """
-        start_date_dt: datetime | None = None
-        end_date_dt: datetime | None = None
-
-        if start_date and end_date:
-            if isinstance(start_date, datetime):
-                start_date_dt = start_date
-            elif isinstance(start_date, date):
-                start_date_dt = timezone.make_aware(
-                    datetime.combine(start_date, time.min),
-                )
-            if isinstance(end_date, datetime):
-                end_date_dt = end_date
-            elif isinstance(end_date, date):
-                end_date_dt = timezone.make_aware(
-                    datetime.combine(end_date, time.max),
-                )
+        period = self._credit_period(start_date, end_date)
+        totals = self.get_credit_cards_period_totals({account.pk: [period]})
+        return totals[account.pk][0].payments
 
-        income_queryset = self.transaction_repository.filter(
-            account=account,
-            type=TransactionType.INCOME,
-        )
-        receipts_queryset = self.receipt_repository.filter(account=account)
-        transfer_queryset = TransferMoneyLog.objects.filter(to_account=account)
+    @timed()
+    def get_credit_cards_period_totals(
+        self,
+        periods_by_account: Mapping[int, Sequence[CreditPeriod]],
+        *,
+        transaction_filter: Q | None = None,
+        receipt_filter: Q | None = None,
+    ) -> dict[int, list[CreditPeriodTotals]]:
+        """Calculate credit card totals for N cards and M periods at once.
+
+        Transactions, receipts and incoming transfers are aggregated with
+        conditional sums (one column per period) and combined with
+        UNION ALL, so the whole batch costs a single query.
+
+        Args:
+            periods_by_account: Periods to calculate, keyed by account id.
+            transaction_filter: Optional extra filter for transactions.
+            receipt_filter: Optional extra filter for receipts.
 
-        if start_date_dt and end_date_dt:
-            income_queryset = income_queryset.filter(
-                date__range=(start_date_dt, end_date_dt),
+        Returns:
+            Totals keyed by account id, in the order of the given periods.
+        """
+        zero = Decimal(str(constants.ZERO))
+        sums: dict[int, list[list[Decimal]]] = {
+            account_id: [[zero] * len(_TOTALS_FIELDS) for _ in periods]
+            for account_id, periods in periods_by_account.items()
+        }
+        width = max(map(len, periods_by_account.values()), default=0)
+        if width:
+            rows = self._credit_totals_queryset(
+                periods_by_account,
+                width,
+                transaction_filter=transaction_filter,
+                receipt_filter=receipt_filter,
             )
-            receipts_queryset = receipts_queryset.filter(
-                receipt_date__range=(start_date_dt, end_date_dt),
+            for row in rows:
+                account_sums = sums[row['account_id']]
+                for index, period_sums in enumerate(account_sums):
+                    for pos, field in enumerate(_TOTALS_FIELDS):
+                        value = row[f'{field}_{index}']
+                        period_sums[pos] += Decimal(str(value or 0))
+
+        return {
+            account_id: [
+                CreditPeriodTotals(
+                    **dict(zip(_TOTALS_FIELDS, period_sums, strict=True)),
+                )
+                for period_sums in account_sums
+            ]
+            for account_id, account_sums in sums.items()
+        }
+
+    def _credit_period(
+        self,
+        start_date: date | datetime | None,
+        end_date: date | datetime | None,
+    ) -> CreditPeriod:
+        """Build CreditPeriod from optional date bounds.
+
+        The period is bounded only when both dates are given.
+
+        Args:
+            start_date: Optional start date for the period.
+            end_date: Optional end date for the period.
+
+        Returns:
+            CreditPeriod with timezone-aware bounds or an unbounded one.
+        """
+        if not (start_date and end_date):
+            return CreditPeriod()
+        if not isinstance(start_date, datetime):
+            start_date = timezone.make_aware(
+                datetime.combine(start_date, time.min),
             )
-            transfer_queryset = transfer_queryset.filter(
-                exchange_date__range=(start_date_dt, end_date_dt),
+        if not isinstance(end_date, datetime):
+            end_date = timezone.make_aware(
+                datetime.combine(end_date, time.max),
             )
+        return CreditPeriod(start=start_date, end=end_date)
 
-        total_income = (
-            income_queryset.aggregate(total=Sum('amount'))['total'] or 0
-        )
-        total_return = (
-            receipts_queryset.aggregate(
-                total=Coalesce(
-                    Sum(
-                        'total_sum',
-                        filter=Q(operation_type=RECEIPT_OPERATION_RETURN),
+    def _credit_totals_queryset(
+        self,
+        periods_by_account: Mapping[int, Sequence[CreditPeriod]],
+        width: int,
+        *,
+        transaction_filter: Q | None,
+        receipt_filter: Q | None,
+    ) -> 'QuerySet[Transaction, Any]':
+        """Build UNION ALL of per-source conditional aggregates.
+
+        Args:
+            periods_by_account: Periods to calculate, keyed by account id.
+            width: Maximum number of periods per account.
+            transaction_filter: Optional extra filter for transactions.
+            receipt_filter: Optional extra filter for receipts.
+
+        Returns:
+            Values queryset with ``account_id`` and one column per total
+            and period index.
+        """
+        account_ids = list(periods_by_account)
+        transactions = self.transaction_repository.filter(
+            account_id__in=account_ids,
+            type__in=(TransactionType.EXPENSE, TransactionType.INCOME),
+        )
+        receipts = self.receipt_repository.filter(account_id__in=account_ids)
+        transfers = TransferMoneyLog.objects.filter(
+            to_account_id__in=account_ids,
+        )
+        if transaction_filter is not None:
+            transactions = transactions.filter(transaction_filter)
+        if receipt_filter is not None:
+            receipts = receipts.filter(receipt_filter)
+
+        expense = Q(type=TransactionType.EXPENSE)
+        income = Q(type=TransactionType.INCOME)
+        purchase = Q(operation_type=RECEIPT_OPERATION_PURCHASE)
+        refund = Q(operation_type=RECEIPT_OPERATION_RETURN)
+
+        transaction_columns: dict[str, Any] = {}
+        receipt_columns: dict[str, Any] = {}
+        transfer_columns: dict[str, Any] = {}
+        for index in range(width):
+            windows = _period_windows(periods_by_account, index)
+            transaction_columns |= {
+                f'purchases_{index}': _conditional_sum(
+                    'amount',
+                    expense & _windows_lookup(windows, 'date'),
+                ),
+                f'refunds_{index}': _ZERO_COLUMN,
+                f'repayments_{index}': _conditional_sum(
+                    'amount',
+                    income & _windows_lookup(windows, 'date'),
+                ),
+                f'payments_{index}': _conditional_sum(
+                    'amount',
+                    income & _windows_lookup(windows, 'date', payments=True),
+                ),
+            }
+            receipt_columns |= {
+                f'purchases_{index}': _conditional_sum(
+                    'total_sum',
+                    purchase & _windows_lookup(windows, 'receipt_date'),
+                ),
+                f'refunds_{index}': _conditional_sum(
+                    'total_sum',
+                    refund & _windows_lookup(windows, 'receipt_date'),
+                ),
+                f'repayments_{index}': _ZERO_COLUMN,
+                f'payments_{index}': _conditional_sum(
+                    'total_sum',
+                    refund
+                    & _windows_lookup(windows, 'receipt_date', payments=True),
+                ),
+            }
+            transfer_columns |= {
+                f'purchases_{index}': _ZERO_COLUMN,
+                f'refunds_{index}': _ZERO_COLUMN,
+                f'repayments_{index}': _conditional_sum(
+                    'amount',
+                    _windows_lookup(
+                        windows,
+                        'exchange_date',
+                        account_field='to_account_id',
                     ),
-                    0,
-                    output_field=DecimalField(),
                 ),
-            )['total']
-            or 0
-        )
-        total_transfers = (
-            transfer_queryset.aggregate(total=Sum('amount'))['total'] or 0
-        )
+                f'payments_{index}': _conditional_sum(
+                    'amount',
+                    _windows_lookup(
+                        windows,
+                        'exchange_date',
+                        account_field='to_account_id',
+                        payments=True,
+                    ),
+                ),
+            }
 
-        return Decimal(str(total_income + total_return + total_transfers))
+        return (
+            transactions.order_by()
+            .values('account_id')
+            .annotate(**transaction_columns)
+            .union(
+                receipts.order_by()
+                .values('account_id')
+                .annotate(**receipt_columns),
+                transfers.order_by()
+                .values('to_account_id')
+                .annotate(**transfer_columns),
+                all=True,
+            )
+        )
 
     def _find_first_purchase_in_month(
         self,
@@ -354,48 +493,6 @@ class CreditCalculationService:
             purchase_end,
         )
 
-    def _calculate_debt_info(
-        self,
-        account: Account,
-        purchase_start: datetime,
-        purchase_end: datetime,
-        payments_start: datetime,
-        payments_end: datetime,
-    ) -> tuple[Decimal, Decimal, Decimal]:
-        """Calculate debt information for the period.
-
-        Args:
-            account: Account to calculate debt for.
-            purchase_start: Start of purchase period.
-            purchase_end: End of purchase period.
-            payments_start: Start of payments period (unused, kept for compat).
-            payments_end: End of grace period.
-
-        Returns:
-            Tuple of (purchase_period_debt, payments_made, final_debt).
-        """
-        purchase_period_debt = self.get_credit_card_debt(
-            account,
-            purchase_start,
-            purchase_end,
-        ) or Decimal(str(constants.ZERO))
-
-        if account.bank.code in SUPPORTED_BANKS:
-            payments_made = self.get_credit_card_payments(
-                account,
-                purchase_start,
-                payments_end,
-            )
-        else:
-            payments_made = Decimal(str(constants.ZERO))
-
-        final_debt = max(
-            purchase_period_debt - payments_made,
-            Decimal(str(constants.ZERO)),
-        )
-
-        return purchase_period_debt, payments_made, final_debt
-
     def _ensure_timezone_aware(self, dt: datetime) -> datetime:
         """Ensure datetime is timezone aware.
 
@@ -424,47 +521,143 @@ class CreditCalculationService:
             Dictionary with grace period information. Empty dict if account
             is not a credit card.
         """
-        if account.type_account not in constants.CREDIT_ACCOUNT_TYPES:
-            return {}
-
-        purchase_start, purchase_end = self._calculate_purchase_period(
+        return self.calculate_grace_periods_info(
+            [account],
             purchase_month,
-        )
+        ).get(account.pk, {})
 
-        grace_end, payments_start, payments_end = (
-            self._calculate_grace_period_by_bank(
-                account,
-                purchase_start,
-                purchase_end,
-            )
+    @timed()
+    def calculate_grace_periods_info(
+        self,
+        accounts: Iterable[Account],
+        purchase_month: date | datetime,
+    ) -> dict[int, GracePeriodInfoDict]:
+        """Calculate grace period information for several credit cards.
+
+        Debts and payments of all cards are fetched with one batched query.
+
+        Args:
+            accounts: Accounts to calculate grace periods for. Non-credit
+                accounts are skipped.
+            purchase_month: Month to calculate grace period for.
+
+        Returns:
+            Dictionary with grace period information keyed by account id.
+        """
+        cycles = self.build_credit_cycles(
+            {account: [purchase_month] for account in accounts},
         )
+        return {
+            cycle.account_id: self.grace_period_info_from_cycle(cycle)
+            for cycle in cycles
+        }
 
-        purchase_period_debt, payment_period_debt, total_debt = (
-            self._calculate_debt_info(
-                account,
-                purchase_start,
-                purchase_end,
-                payments_start,
-                payments_end,
+    @timed()
+    def build_credit_cycles(
+        self,
+        months_by_account: Mapping[Account, Iterable[date | datetime]],
+    ) -> list[CreditCardCycle]:
+        """Calculate statement cycles of credit cards without saving them.
+
+        Grace periods come from the bank calculators; purchases, refunds
+        and repayments of all cycles are fetched with one batched query.
+        Every operation on a card counts, whoever made it, so purchases
+        of family members on a shared card are part of its debt.
+
+        Args:
+            months_by_account: Purchase months to calculate, keyed by
+                account. Non-credit accounts are skipped.
+
+        Returns:
+            Unsaved CreditCardCycle instances ordered by account and month.
+        """
+        cycles: list[CreditCardCycle] = []
+        periods: dict[int, list[CreditPeriod]] = {}
+        for account, months in months_by_account.items():
+            if account.type_account not in constants.CREDIT_ACCOUNT_TYPES:
+                continue
+            account_periods = periods.setdefault(account.pk, [])
+            for month in sorted(
+                {credit_cycle_start(month) for month in months}
+            ):
+                purchase_start, purchase_end = self._calculate_purchase_period(
+                    month,
+                )
+                grace_end, _payments_start, payments_end = (
+                    self._calculate_grace_period_by_bank(
+                        account,
+                        purchase_start,
+                        purchase_end,
+                    )
+                )
+                cycles.append(
+                    CreditCardCycle(
+                        account=account,
+                        purchase_start=purchase_start,
+                        purchase_end=purchase_end,
+                        grace_end=self._ensure_timezone_aware(grace_end),
+                        payments_end=payments_end,
+                    ),
+                )
+                account_periods.append(
+                    CreditPeriod(
+                        start=purchase_start,
+                        end=purchase_end,
+                        payments_end=payments_end,
+                    ),
+                )
+
+        if not periods:
+            return cycles
+        batched = self.get_credit_cards_period_totals(periods)
+        totals = {
+            account_id: iter(account_totals)
+            for account_id, account_totals in batched.items()
+        }
+        zero = Decimal(str(constants.ZERO))
+        for cycle in cycles:
+            cycle_totals = next(totals[cycle.account_id])
+            cycle.purchases = cycle_totals.purchases
+            cycle.refunds = cycle_totals.refunds
+            cycle.repayments = cycle_totals.repayments
+            cycle.payments = (
+                cycle_totals.payments
+                if cycle.account.bank.code in SUPPORTED_BANKS
+                else zero
             )
-        )
+            cycle.debt = cycle_totals.debt
+            cycle.remaining_debt = max(cycle.debt - cycle.payments, zero)
+        return cycles
+
+    def grace_period_info_from_cycle(
+        self,
+        cycle: CreditCardCycle,
+    ) -> GracePeriodInfoDict:
+        """Build grace period information from a statement cycle.
 
-        grace_end = self._ensure_timezone_aware(grace_end)
+        Args:
+            cycle: Calculated or stored credit card cycle.
 
+        Returns:
+            Dictionary with grace period information.
+        """
+        purchase_start = timezone.localtime(cycle.purchase_start)
+        grace_end = timezone.localtime(cycle.grace_end)
+        now = timezone.now()
         return {
             'purchase_month': purchase_start.strftime('%m.%Y'),
             'purchase_start': purchase_start,
-            'purchase_end': purchase_end,
+            'purchase_end': timezone.localtime(cycle.purchase_end),
             'grace_end': grace_end,
-            'debt_for_month': purchase_period_debt,
-            'payments_for_period': payment_period_debt,
-            'final_debt': total_debt,
+            'debt_for_month': cycle.debt,
+            'payments_for_period': cycle.payments,
+            'final_debt': cycle.remaining_debt,
             'is_overdue': (
-                timezone.now() > grace_end and total_debt > constants.ZERO
+                now > grace_end and cycle.remaining_debt > constants.ZERO
             ),
             'days_until_due': (
-                (grace_end.date() - timezone.now().date()).days
-                if timezone.now() <= grace_end
+                (grace_end.date() - now.date()).days
+                if now <= grace_end
                 else constants.ZERO
             ),
         }
@@ -618,6 +811,7 @@ class CreditCalculationService:
             datetime.combine(grace_end.date(), time.max),
         )
 
+    @timed()
     def calculate_raiffeisenbank_payment_schedule(
         self,
         account: Account,
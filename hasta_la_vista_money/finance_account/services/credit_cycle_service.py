@@ -0,0 +1,278 @@
+"""Service for persisted credit card statement cycles."""
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, time
+from typing import Final
+
+import structlog
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.finance_account.models import (
+    Account,
+    CreditCardCycle,
+)
+from hasta_la_vista_money.finance_account.services.credit_calculation_service import (  # noqa: E501
+    CreditCalculationService,
+    credit_cycle_start,
+)
+from hasta_la_vista_money.finance_account.services.types import (
+    GracePeriodInfoDict,
+)
+
+logger = structlog.get_logger(__name__)
+
+_CYCLE_FIELDS: Final = (
+    'purchase_end',
+    'grace_end',
+    'payments_end',
+    'purchases',
+    'refunds',
+    'repayments',
+    'payments',
+    'debt',
+    'remaining_debt',
+    'updated_at',
+)
+
+
+def _queue_cycle_storage(
+    months_by_account: Mapping[Account, Iterable[datetime]],
+) -> None:
+    """Queue storing of cycles calculated on read, once committed."""
+    from hasta_la_vista_money.finance_account.tasks import (  # noqa: PLC0415
+        store_credit_card_cycles,
+    )
+
+    pairs = [
+        [account.pk, month.isoformat()]
+        for account, months in months_by_account.items()
+        for month in months
+    ]
+
+    def queue() -> None:
+        try:
+            store_credit_card_cycles.apply_async(args=[pairs], retry=False)
+        except OperationalError:
+            # Reads stay correct; the cycles are calculated again.
+            logger.warning('Credit card cycles not queued', cycles=len(pairs))
+
+    transaction.on_commit(queue)
+
+
+def _aware_moment(value: date | datetime) -> datetime:
+    """Convert a date or naive datetime to an aware datetime."""
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+class CreditCardCycleService:
+    """Service for statement cycles of credit cards.
+
+    Cycles store per-month purchases, refunds, repayments, due date and
+    remaining debt, so readers get them with a single indexed query.
+    They are refreshed incrementally when card operations change. Months
+    that were never calculated are calculated on read and stored by a
+    background task, so reads never write.
+    """
+
+    def __init__(
+        self,
+        credit_calculation_service: CreditCalculationService,
+    ) -> None:
+        """Initialize CreditCardCycleService.
+
+        Args:
+            credit_calculation_service: Service calculating cycle totals.
+        """
+        self.credit_calculation_service = credit_calculation_service
+
+    def refresh_cycles(
+        self,
+        months_by_account: Mapping[Account, Iterable[date | datetime]],
+    ) -> list[CreditCardCycle]:
+        """Recalculate and store cycles of the given months.
+
+        Args:
+            months_by_account: Purchase months to refresh, keyed by
+                account. Non-credit accounts are skipped.
+
+        Returns:
+            Stored CreditCardCycle instances.
+        """
+        cycles = self.credit_calculation_service.build_credit_cycles(
+            months_by_account,
+        )
+        if not cycles:
+            return []
+        return CreditCardCycle.objects.bulk_create(
+            cycles,
+            update_conflicts=True,
+            unique_fields=['account', 'purchase_start'],
+            update_fields=list(_CYCLE_FIELDS),
+        )
+
+    def refresh_for_operations(
+        self,
+        operations: Iterable[tuple[int | None, date | datetime | None]],
+    ) -> list[CreditCardCycle]:
+        """Refresh cycles affected by changed card operations.
+
+        An operation affects the cycle of its own month as a purchase and
+        every stored cycle whose repayment window contains it.
+
+        Args:
+            operations: Pairs of (account id, operation moment). Pairs
+                with missing values are ignored.
+
+        Returns:
+            Stored CreditCardCycle instances.
+        """
+        moments: dict[int, set[datetime]] = defaultdict(set)
+        for account_id, moment in operations:
+            if account_id is not None and moment is not None:
+                moments[account_id].add(_aware_moment(moment))
+        if not moments:
+            return []
+
+        accounts = {
+            account.pk: account
+            for account in Account.objects.filter(
+                pk__in=moments,
+                type_account__in=constants.CREDIT_ACCOUNT_TYPES,
+            ).select_related('bank')
+        }
+        if not accounts:
+            return []
+
+        months: dict[Account, set[datetime]] = defaultdict(set)
+        repayment_lookup = Q()
+        for account_id, account_moments in moments.items():
+            account = accounts.get(account_id)
+            if account is None:
+                continue
+            by_month: dict[datetime, list[datetime]] = defaultdict(list)
+            for moment in account_moments:
+                by_month[credit_cycle_start(moment)].append(moment)
+            months[account].update(by_month)
+            # One window per month keeps the lookup small for bulk
+            # imports; cycles overlapping it are refreshed as well.
+            for month_moments in by_month.values():
+                repayment_lookup |= Q(
+                    account_id=account_id,
+                    purchase_start__lte=max(month_moments),
+                    payments_end__gte=min(month_moments),
+                )
+        for account_id, purchase_start in CreditCardCycle.objects.filter(
+            repayment_lookup,
+        ).values_list('account_id', 'purchase_start'):
+            months[accounts[account_id]].add(purchase_start)
+
+        return self.refresh_cycles(months)
+
+    def refresh_account(self, account: Account) -> list[CreditCardCycle]:
+        """Refresh every stored cycle of an account.
+
+        Cycles of accounts that are no longer credit ones are removed.
+
+        Args:
+            account: Account whose settings changed.
+
+        Returns:
+            Stored CreditCardCycle instances.
+        """
+        if account.type_account not in constants.CREDIT_ACCOUNT_TYPES:
+            CreditCardCycle.objects.filter(account=account).delete()
+            return []
+        months = list(
+            CreditCardCycle.objects.filter(account=account).values_list(
+                'purchase_start',
+                flat=True,
+            ),
+        )
+        return self.refresh_cycles({account: months})
+
+    def get_credit_card_cycles(
+        self,
+        accounts: Iterable[Account],
+        months: Iterable[date | datetime],
+    ) -> dict[int, list[CreditCardCycle]]:
+        """Get stored cycles of several cards and months.
+
+        Missing cycles are calculated without storing them, and a
+        background task is queued to store them.
+
+        Args:
+            accounts: Accounts to read cycles for. Non-credit accounts
+                are skipped.
+            months: Purchase months to read.
+
+        Returns:
+            Cycles keyed by account id, ordered by purchase month.
+        """
+        cards = [
+            account
+            for account in accounts
+            if account.type_account in constants.CREDIT_ACCOUNT_TYPES
+        ]
+        starts = sorted({credit_cycle_start(month) for month in months})
+        if not cards or not starts:
+            return {}
+
+        stored = {
+            (cycle.account_id, cycle.purchase_start): cycle
+            for cycle in CreditCardCycle.objects.filter(
+                account__in=cards,
+                purchase_start__in=starts,
+            )
+        }
+        missing: dict[Account, list[datetime]] = {}
+        for card in cards:
+            card_missing = [
+                start for start in starts if (card.pk, start) not in stored
+            ]
+            if card_missing:
+                missing[card] = card_missing
+        if missing:
+            for cycle in self.credit_calculation_service.build_credit_cycles(
+                missing,
+            ):
+                stored[cycle.account_id, cycle.purchase_start] = cycle
+            _queue_cycle_storage(missing)
+
+        result: dict[int, list[CreditCardCycle]] = {}
+        for card in cards:
+            result[card.pk] = [stored[card.pk, start] for start in starts]
+            for cycle in result[card.pk]:
+                cycle.account = card
+        return result
+
+    def grace_periods_info(
+        self,
+        accounts: Iterable[Account],
+        purchase_month: date | datetime,
+    ) -> dict[int, GracePeriodInfoDict]:
+        """Get grace period information of several cards from cycles.
+
+        Args:
+            accounts: Accounts to read grace periods for.
+            purchase_month: Month to read grace period for.
+
+        Returns:
+            Dictionary with grace period information keyed by account id.
+        """
+        service = self.credit_calculation_service
+        return {
+            account_id: service.grace_period_info_from_cycle(cycles[0])
+            for account_id, cycles in self.get_credit_card_cycles(
+                accounts,
+                [purchase_month],
+            ).items()
+        }
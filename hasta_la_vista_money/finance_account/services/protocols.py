@@ -1,12 +1,20 @@
 """Protocols for finance account services."""
 
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Protocol, runtime_checkable
 
-from hasta_la_vista_money.finance_account.models import Account
+from django.db.models import Q
+
+from hasta_la_vista_money.finance_account.models import (
+    Account,
+    CreditCardCycle,
+)
 from hasta_la_vista_money.finance_account.services.types import (
     BalanceReconcileCommand,
+    CreditPeriod,
+    CreditPeriodTotals,
     GracePeriodInfoDict,
     RaiffeisenbankScheduleDict,
 )
@@ -81,6 +89,70 @@ class CreditCalculationServiceProtocol(Protocol):
         """
         ...
 
+    def get_credit_cards_period_totals(
+        self,
+        periods_by_account: Mapping[int, Sequence[CreditPeriod]],
+        *,
+        transaction_filter: Q | None = None,
+        receipt_filter: Q | None = None,
+    ) -> dict[int, list[CreditPeriodTotals]]:
+        """Calculate credit card totals for N cards and M periods at once.
+
+        Args:
+            periods_by_account: Periods to calculate, keyed by account id.
+            transaction_filter: Optional extra filter for transactions.
+            receipt_filter: Optional extra filter for receipts.
+
+        Returns:
+            Totals keyed by account id, in the order of the given periods.
+        """
+        ...
+
+    def calculate_grace_periods_info(
+        self,
+        accounts: Iterable[Account],
+        purchase_month: date | datetime,
+    ) -> dict[int, GracePeriodInfoDict]:
+        """Calculate grace period information for several credit cards.
+
+        Args:
+            accounts: Accounts to calculate grace periods for.
+            purchase_month: Month to calculate grace period for.
+
+        Returns:
+            Dictionary with grace period information keyed by account id.
+        """
+        ...
+
+    def build_credit_cycles(
+        self,
+        months_by_account: Mapping[Account, Iterable[date | datetime]],
+    ) -> list[CreditCardCycle]:
+        """Calculate statement cycles of credit cards without saving them.
+
+        Args:
+            months_by_account: Purchase months to calculate, keyed by
+                account.
+
+        Returns:
+            Unsaved CreditCardCycle instances.
+        """
+        ...
+
+    def grace_period_info_from_cycle(
+        self,
+        cycle: CreditCardCycle,
+    ) -> GracePeriodInfoDict:
+        """Build grace period information from a statement cycle.
+
+        Args:
+            cycle: Calculated or stored credit card cycle.
+
+        Returns:
+            Dictionary with grace period information.
+        """
+        ...
+
     def calculate_raiffeisenbank_payment_schedule(
         self,
         account: Account,
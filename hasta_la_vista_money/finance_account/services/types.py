@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from decimal import Decimal
 from typing import TYPE_CHECKING, TypedDict
 
 if TYPE_CHECKING:
     from datetime import datetime
-    from decimal import Decimal
 
     from hasta_la_vista_money.finance_account.models import Account
 
@@ -20,6 +20,48 @@ class BalanceReconcileCommand:
     new_total_sum: Decimal
 
 
+@dataclass(frozen=True, kw_only=True)
+class CreditPeriod:
+    """Window of credit card operations used by batched debt calculations.
+
+    Attributes:
+        start: Start of purchase window. None means unbounded.
+        end: End of purchase window. None means unbounded.
+        payments_end: End of repayment window that starts at ``start``.
+            Defaults to ``end``.
+    """
+
+    start: datetime | None = None
+    end: datetime | None = None
+    payments_end: datetime | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class CreditPeriodTotals:
+    """Credit card totals for a single CreditPeriod.
+
+    Attributes:
+        purchases: Expenses and purchase receipts in the purchase window.
+        refunds: Return receipts in the purchase window.
+        repayments: Incomes and incoming transfers in the purchase window.
+        payments: Incomes, return receipts and incoming transfers
+            in the repayment window.
+    """
+
+    purchases: Decimal
+    refunds: Decimal
+    repayments: Decimal
+    payments: Decimal
+
+    @property
+    def debt(self) -> Decimal:
+        """Debt accumulated in the purchase window, never negative."""
+        return max(
+            self.purchases - self.refunds - self.repayments,
+            Decimal(0),
+        )
+
+
 class GracePeriodInfoDict(TypedDict, total=False):
     """Information about credit card grace period.
 
@@ -0,0 +1,233 @@
+"""Signals keeping credit card statement cycles up to date.
+
+Cycles of a card are refreshed after commit whenever its transactions,
+receipts or incoming transfers are saved or deleted, and whenever
+the card settings that define grace periods change. Operations changed
+within one transaction are collected and refreshed together once it
+commits. Bulk importers committing row by row can wrap the whole import
+in ``deferred_credit_cycle_refresh`` to get one refresh for the run.
+"""
+
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Final, cast
+
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from config.containers import ApplicationContainer
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.core.commit_hooks import CommitHook
+from hasta_la_vista_money.core.tracking import LoadedValuesMixin
+from hasta_la_vista_money.finance_account.models import (
+    Account,
+    TransferMoneyLog,
+)
+from hasta_la_vista_money.finance_account.services import (
+    CreditCardCycleService,
+)
+from hasta_la_vista_money.receipts.models import Receipt
+from hasta_la_vista_money.transactions.models import Transaction
+
+CARD_OPERATION_FIELDS: Final[dict[type[models.Model], tuple[str, str]]] = {
+    Transaction: ('account_id', 'date'),
+    Receipt: ('account_id', 'receipt_date'),
+    TransferMoneyLog: ('to_account_id', 'exchange_date'),
+}
+CYCLE_ACCOUNT_FIELDS: Final = frozenset(
+    {'bank', 'type_account', 'grace_period_days', 'payment_due_date'},
+)
+_CYCLE_ACCOUNT_ATTNAMES: Final = (
+    'bank_id',
+    'type_account',
+    'grace_period_days',
+    'payment_due_date',
+)
+_ORIGINAL_OPERATION_ATTR = '_credit_cycle_original_operation'
+_CYCLE_SETTINGS_CHANGED_ATTR = '_credit_cycle_settings_changed'
+
+Operation = tuple[int | None, datetime | None]
+
+_state = threading.local()
+
+
+def _cycle_service() -> CreditCardCycleService:
+    return cast(
+        'CreditCardCycleService',
+        ApplicationContainer().finance_account.credit_card_cycle_service(),
+    )
+
+
+def _pending_operations() -> set[Operation]:
+    pending: set[Operation] | None = getattr(_state, 'pending', None)
+    if pending is None:
+        pending = set()
+        _state.pending = pending
+    return pending
+
+
+def _refresh_pending_cycles() -> None:
+    # Operations of rolled back work may still be collected; refreshing
+    # their cycles again is harmless.
+    pending = _pending_operations()
+    if not pending:
+        return
+    _state.pending = set()
+    _cycle_service().refresh_for_operations(pending)
+
+
+_refresh_hook = CommitHook(_refresh_pending_cycles)
+
+
+def _refresh_on_commit(operations: Iterable[Operation]) -> None:
+    _pending_operations().update(operations)
+    if not getattr(_state, 'deferred', 0):
+        _refresh_hook.schedule()
+
+
+@contextmanager
+def deferred_credit_cycle_refresh() -> Iterator[None]:
+    """Collect cycle refreshes and run them once when the block exits.
+
+    Meant for bulk writers that commit many small transactions, such as
+    bank statement imports. Nested blocks refresh with the outermost one.
+    """
+    _state.deferred = getattr(_state, 'deferred', 0) + 1
+    try:
+        yield
+    finally:
+        _state.deferred -= 1
+        if not _state.deferred and _pending_operations():
+            _refresh_hook.schedule()
+
+
+def _operation(instance: models.Model) -> Operation:
+    account_field, date_field = CARD_OPERATION_FIELDS[type(instance)]
+    return getattr(instance, account_field), getattr(instance, date_field)
+
+
+def _account_is_not_credit(instance: models.Model, account_field: str) -> bool:
+    """Whether the cached account of an operation is known to be no card.
+
+    Accounts that are not cached on the instance are not looked up.
+    """
+    field = instance._meta.get_field(account_field.removesuffix('_id'))
+    if not field.is_cached(instance):  # type: ignore[union-attr]
+        return False
+    account = cast(
+        'Account | None',
+        field.get_cached_value(instance),  # type: ignore[union-attr]
+    )
+    return (
+        account is None
+        or account.type_account not in constants.CREDIT_ACCOUNT_TYPES
+    )
+
+
+@receiver(pre_save, sender=Transaction)
+@receiver(pre_save, sender=Receipt)
+@receiver(pre_save, sender=TransferMoneyLog)
+def store_original_operation(
+    sender: type[models.Model],
+    instance: models.Model,
+    **kwargs: Any,
+) -> None:
+    if kwargs.get('raw') or instance.pk is None:
+        return
+    account_field, date_field = CARD_OPERATION_FIELDS[sender]
+    original: Operation | None = None
+    if isinstance(instance, LoadedValuesMixin):
+        original = instance.loaded_field_values(account_field, date_field)
+    if original is None:
+        # Only instances built without loading them are read back, and
+        # only while they were on a credit account.
+        original = (
+            sender._default_manager.filter(
+                pk=instance.pk,
+                **{
+                    f'{account_field.removesuffix("_id")}__type_account__in': (
+                        constants.CREDIT_ACCOUNT_TYPES
+                    ),
+                },
+            )
+            .values_list(account_field, date_field)
+            .first()
+        )
+    setattr(instance, _ORIGINAL_OPERATION_ATTR, original)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Receipt)
+@receiver(post_save, sender=TransferMoneyLog)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Receipt)
+@receiver(post_delete, sender=TransferMoneyLog)
+def refresh_cycles_on_operation_change(
+    sender: type[models.Model],
+    instance: models.Model,
+    **kwargs: Any,
+) -> None:
+    del sender
+    if kwargs.get('raw'):
+        return
+    operations = [_operation(instance)]
+    original = getattr(instance, _ORIGINAL_OPERATION_ATTR, None)
+    if original is not None and original != operations[0]:
+        operations.append(original)
+    account_field, _date_field = CARD_OPERATION_FIELDS[type(instance)]
+    if _account_is_not_credit(instance, account_field) and all(
+        account_id == operations[0][0] for account_id, _moment in operations
+    ):
+        return
+    _refresh_on_commit(operations)
+
+
+@receiver(pre_save, sender=Account)
+def store_cycle_settings_change(
+    sender: type[models.Model],
+    instance: Account,
+    **kwargs: Any,
+) -> None:
+    del sender
+    if kwargs.get('raw') or instance.pk is None:
+        return
+    loaded = instance.loaded_field_values(*_CYCLE_ACCOUNT_ATTNAMES)
+    # Instances built without loading them are assumed to have changed.
+    changed = loaded is None or loaded != tuple(
+        getattr(instance, attname) for attname in _CYCLE_ACCOUNT_ATTNAMES
+    )
+    setattr(instance, _CYCLE_SETTINGS_CHANGED_ATTR, changed)
+
+
+@receiver(post_save, sender=Account)
+def refresh_cycles_on_account_change(
+    sender: type[models.Model],
+    instance: Account,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    del sender
+    if created or kwargs.get('raw'):
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and not (
+        CYCLE_ACCOUNT_FIELDS & set(update_fields)
+    ):
+        return
+    if not getattr(instance, _CYCLE_SETTINGS_CHANGED_ATTR, True):
+        return
+    account_id = instance.pk
+    transaction.on_commit(
+        lambda: _refresh_account(account_id),
+    )
+
+
+def _refresh_account(account_id: int) -> None:
+    account = (
+        Account.objects.filter(pk=account_id).select_related('bank').first()
+    )
+    if account is not None:
+        _cycle_service().refresh_account(account)
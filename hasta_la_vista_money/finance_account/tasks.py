@@ -0,0 +1,34 @@
+"""Celery tasks of the finance account app."""
+
+from collections import defaultdict
+from datetime import datetime
+
+from celery import shared_task
+
+from config.containers import ApplicationContainer
+from hasta_la_vista_money.finance_account.models import Account
+
+
+@shared_task(  # type: ignore[untyped-decorator]
+    name='finance_account.store_credit_card_cycles',
+    ignore_result=True,
+)
+def store_credit_card_cycles(cycles: list[tuple[int, str]]) -> int:
+    """Store credit card cycles that were calculated on read.
+
+    Args:
+        cycles: Pairs of (account id, ISO purchase month start).
+
+    Returns:
+        Number of stored cycles.
+    """
+    months: dict[int, list[datetime]] = defaultdict(list)
+    for account_id, month in cycles:
+        months[account_id].append(datetime.fromisoformat(month))
+    accounts = Account.objects.filter(pk__in=months).select_related('bank')
+    service = ApplicationContainer().finance_account.credit_card_cycle_service()
+    return len(
+        service.refresh_cycles(
+            {account: months[account.pk] for account in accounts},
+        ),
+    )
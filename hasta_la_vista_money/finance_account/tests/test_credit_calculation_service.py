@@ -0,0 +1,231 @@
+"""Tests for batched credit card totals."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, cast
+
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+from config.containers import ApplicationContainer
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.finance_account.bank_constants import BANK_SBERBANK
+from hasta_la_vista_money.finance_account.factories import AccountFactory
+from hasta_la_vista_money.finance_account.models import Bank, TransferMoneyLog
+from hasta_la_vista_money.finance_account.services.types import (
+    CreditPeriod,
+    CreditPeriodTotals,
+)
+from hasta_la_vista_money.receipts.models import Receipt
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    Transaction,
+    TransactionType,
+)
+from hasta_la_vista_money.users.factories import UserFactory
+
+if TYPE_CHECKING:
+    from hasta_la_vista_money.finance_account.models import Account
+    from hasta_la_vista_money.users.models import User
+
+
+def _aware(year: int, month: int, day: int) -> datetime:
+    return datetime(
+        year,
+        month,
+        day,
+        12,
+        0,
+        tzinfo=timezone.get_current_timezone(),
+    )
+
+
+class TestCreditCardsPeriodTotals(TestCase):
+    """Test cases for CreditCalculationService batched totals."""
+
+    def setUp(self) -> None:
+        self.user = cast('User', UserFactory())
+        self.bank = Bank.objects.get(code=BANK_SBERBANK)
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Покупки',
+            type=TransactionType.EXPENSE,
+        )
+        self.cards = [
+            cast(
+                'Account',
+                AccountFactory(
+                    user=self.user,
+                    bank=self.bank,
+                    type_account=constants.ACCOUNT_TYPE_CREDIT_CARD,
+                    limit_credit=Decimal('100000.00'),
+                ),
+            )
+            for _ in range(3)
+        ]
+        self.debit = cast(
+            'Account',
+            AccountFactory(user=self.user, bank=self.bank),
+        )
+        self.periods = [
+            CreditPeriod(
+                start=_aware(2025, month, 1),
+                end=_aware(2025, month, 28),
+            )
+            for month in (1, 2, 3, 4)
+        ]
+        container = ApplicationContainer()
+        self.account_service = container.finance_account.account_service()
+        self.service = self.account_service.credit_calculation_service
+
+        for factor, card in enumerate(self.cards, start=1):
+            for month in (1, 2, 3):
+                self._operations(card, month, Decimal(factor))
+
+    def _operations(self, card: 'Account', month: int, factor: Decimal) -> None:
+        Transaction.objects.create(
+            user=self.user,
+            account=card,
+            category=self.category,
+            type=TransactionType.EXPENSE,
+            amount=Decimal('1000.00') * factor,
+            date=_aware(2025, month, 5),
+        )
+        Transaction.objects.create(
+            user=self.user,
+            account=card,
+            category=self.category,
+            type=TransactionType.INCOME,
+            amount=Decimal('100.00') * factor,
+            date=_aware(2025, month, 10),
+        )
+        Receipt.objects.create(
+            user=self.user,
+            account=card,
+            receipt_date=_aware(2025, month, 7),
+            operation_type=constants.RECEIPT_OPERATION_PURCHASE,
+            total_sum=Decimal('300.00') * factor,
+        )
+        Receipt.objects.create(
+            user=self.user,
+            account=card,
+            receipt_date=_aware(2025, month, 8),
+            operation_type=constants.RECEIPT_OPERATION_RETURN,
+            total_sum=Decimal('50.00') * factor,
+        )
+        TransferMoneyLog.objects.create(
+            user=self.user,
+            from_account=self.debit,
+            to_account=card,
+            amount=Decimal('200.00') * factor,
+            exchange_date=_aware(2025, month, 20),
+        )
+
+    def test_totals_match_single_card_calculations(self) -> None:
+        totals = self.service.get_credit_cards_period_totals(
+            {card.pk: self.periods for card in self.cards},
+        )
+
+        for card in self.cards:
+            self.assertEqual(len(totals[card.pk]), len(self.periods))
+            for period, period_totals in zip(
+                self.periods,
+                totals[card.pk],
+                strict=True,
+            ):
+                self.assertEqual(
+                    period_totals.debt,
+                    self.service.get_credit_card_debt(
+                        card,
+                        period.start,
+                        period.end,
+                    ),
+                )
+                self.assertEqual(
+                    period_totals.payments,
+                    self.service.get_credit_card_payments(
+                        card,
+                        period.start,
+                        period.end,
+                    ),
+                )
+
+    def test_totals_split_by_source(self) -> None:
+        totals = self.service.get_credit_cards_period_totals(
+            {self.cards[1].pk: self.periods},
+        )
+
+        self.assertEqual(
+            totals[self.cards[1].pk][0],
+            CreditPeriodTotals(
+                purchases=Decimal('2600.00'),
+                refunds=Decimal('100.00'),
+                repayments=Decimal('600.00'),
+                payments=Decimal('700.00'),
+            ),
+        )
+        self.assertEqual(totals[self.cards[1].pk][0].debt, Decimal('1900.00'))
+        self.assertEqual(
+            totals[self.cards[1].pk][3],
+            CreditPeriodTotals(
+                purchases=Decimal(0),
+                refunds=Decimal(0),
+                repayments=Decimal(0),
+                payments=Decimal(0),
+            ),
+        )
+
+    def test_payments_window_extends_purchase_window(self) -> None:
+        period = CreditPeriod(
+            start=_aware(2025, 1, 1),
+            end=_aware(2025, 1, 31),
+            payments_end=_aware(2025, 3, 31),
+        )
+
+        totals = self.service.get_credit_cards_period_totals(
+            {self.cards[0].pk: [period]},
+        )[self.cards[0].pk][0]
+
+        self.assertEqual(totals.purchases, Decimal('1300.00'))
+        self.assertEqual(totals.payments, Decimal('1050.00'))
+
+    def test_unbounded_period_and_extra_filters(self) -> None:
+        totals = self.service.get_credit_cards_period_totals(
+            {self.cards[0].pk: [CreditPeriod()]},
+            transaction_filter=~Q(type=TransactionType.EXPENSE),
+            receipt_filter=Q(pk__in=[]),
+        )[self.cards[0].pk][0]
+
+        self.assertEqual(totals.purchases, Decimal(0))
+        self.assertEqual(totals.refunds, Decimal(0))
+        self.assertEqual(totals.repayments, Decimal('900.00'))
+
+    def test_batch_costs_single_query(self) -> None:
+        with self.assertNumQueries(1):
+            self.service.get_credit_cards_period_totals(
+                {card.pk: self.periods for card in self.cards},
+            )
+
+    def test_empty_batch_skips_query(self) -> None:
+        with self.assertNumQueries(0):
+            totals = self.service.get_credit_cards_period_totals({})
+        self.assertEqual(totals, {})
+
+    def test_grace_periods_info_matches_single_card(self) -> None:
+        purchase_month = _aware(2025, 2, 1)
+
+        infos = self.account_service.calculate_grace_periods_info(
+            [*self.cards, self.debit],
+            purchase_month,
+        )
+
+        self.assertNotIn(self.debit.pk, infos)
+        for card in self.cards:
+            self.assertEqual(
+                infos[card.pk],
+                self.account_service.calculate_grace_period_info(
+                    card,
+                    purchase_month,
+                ),
+            )
@@ -0,0 +1,347 @@
+"""Tests for persisted credit card statement cycles."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, cast
+from unittest.mock import patch
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from config.containers import ApplicationContainer
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.finance_account.bank_constants import (
+    BANK_DEFAULT,
+    BANK_SBERBANK,
+)
+from hasta_la_vista_money.finance_account.factories import AccountFactory
+from hasta_la_vista_money.finance_account.models import (
+    Bank,
+    CreditCardCycle,
+    TransferMoneyLog,
+)
+from hasta_la_vista_money.finance_account.services import (
+    CreditCardCycleService,
+)
+from hasta_la_vista_money.finance_account.signals import (
+    deferred_credit_cycle_refresh,
+)
+from hasta_la_vista_money.finance_account.tasks import (
+    store_credit_card_cycles,
+)
+from hasta_la_vista_money.receipts.models import Receipt
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    Transaction,
+    TransactionType,
+)
+from hasta_la_vista_money.users.factories import UserFactory
+
+if TYPE_CHECKING:
+    from hasta_la_vista_money.finance_account.models import Account
+    from hasta_la_vista_money.users.models import User
+
+STORE_CYCLES = (
+    'hasta_la_vista_money.finance_account.tasks.'
+    'store_credit_card_cycles.apply_async'
+)
+
+
+def _aware(year: int, month: int, day: int) -> datetime:
+    return datetime(
+        year,
+        month,
+        day,
+        12,
+        0,
+        tzinfo=timezone.get_current_timezone(),
+    )
+
+
+class TestCreditCardCycles(TestCase):
+    """Test cases for CreditCardCycle refresh and reads."""
+
+    def setUp(self) -> None:
+        self.user = cast('User', UserFactory())
+        self.card = cast(
+            'Account',
+            AccountFactory(
+                user=self.user,
+                bank=Bank.objects.get(code=BANK_SBERBANK),
+                type_account=constants.ACCOUNT_TYPE_CREDIT_CARD,
+                limit_credit=Decimal('100000.00'),
+            ),
+        )
+        self.debit = cast(
+            'Account',
+            AccountFactory(user=self.user),
+        )
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Покупки',
+            type=TransactionType.EXPENSE,
+        )
+        self.account_service = (
+            ApplicationContainer().finance_account.account_service()
+        )
+
+    def _expense(self, amount: str, moment: datetime) -> Transaction:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Transaction.objects.create(
+                user=self.user,
+                account=self.card,
+                category=self.category,
+                type=TransactionType.EXPENSE,
+                amount=Decimal(amount),
+                date=moment,
+            )
+
+    def _cycle(self, year: int, month: int) -> CreditCardCycle:
+        return CreditCardCycle.objects.get(
+            account=self.card,
+            purchase_start=_aware(year, month, 1).replace(hour=0),
+        )
+
+    def test_cycle_created_on_expense(self) -> None:
+        self._expense('1000.00', _aware(2025, 1, 10))
+
+        cycle = self._cycle(2025, 1)
+        self.assertEqual(cycle.purchases, Decimal('1000.00'))
+        self.assertEqual(cycle.debt, Decimal('1000.00'))
+        self.assertEqual(cycle.remaining_debt, Decimal('1000.00'))
+        self.assertEqual(
+            timezone.localtime(cycle.grace_end).date(),
+            datetime(2025, 4, 30).date(),  # noqa: DTZ001
+        )
+
+    def test_repayment_updates_previous_cycle(self) -> None:
+        self._expense('1000.00', _aware(2025, 1, 10))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TransferMoneyLog.objects.create(
+                user=self.user,
+                from_account=self.debit,
+                to_account=self.card,
+                amount=Decimal('400.00'),
+                exchange_date=_aware(2025, 2, 15),
+            )
+
+        cycle = self._cycle(2025, 1)
+        self.assertEqual(cycle.payments, Decimal('400.00'))
+        self.assertEqual(cycle.remaining_debt, Decimal('600.00'))
+        self.assertEqual(self._cycle(2025, 2).repayments, Decimal('400.00'))
+
+    def test_moved_operation_refreshes_both_cycles(self) -> None:
+        expense = self._expense('1000.00', _aware(2025, 1, 10))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            expense.date = _aware(2025, 3, 5)
+            expense.save()
+
+        self.assertEqual(self._cycle(2025, 1).purchases, Decimal(0))
+        self.assertEqual(self._cycle(2025, 3).purchases, Decimal('1000.00'))
+
+    def test_debit_operation_is_neither_read_back_nor_refreshed(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            created = Transaction.objects.create(
+                user=self.user,
+                account=self.debit,
+                category=self.category,
+                type=TransactionType.EXPENSE,
+                amount=Decimal('100.00'),
+                date=_aware(2025, 1, 10),
+            )
+        expense = Transaction.objects.select_related('account').get(
+            pk=created.pk,
+        )
+
+        with (
+            patch.object(
+                CreditCardCycleService,
+                'refresh_for_operations',
+            ) as refresh,
+            CaptureQueriesContext(connection) as queries,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            expense.date = _aware(2025, 3, 5)
+            expense.save()
+
+        refresh.assert_not_called()
+        self.assertFalse(
+            [
+                query
+                for query in queries
+                if query['sql'].startswith('SELECT')
+                and 'transactions_transaction' in query['sql']
+            ],
+        )
+
+    def test_deleted_receipt_refreshes_cycle(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            receipt = Receipt.objects.create(
+                user=self.user,
+                account=self.card,
+                receipt_date=_aware(2025, 1, 7),
+                operation_type=constants.RECEIPT_OPERATION_PURCHASE,
+                total_sum=Decimal('300.00'),
+            )
+        self.assertEqual(self._cycle(2025, 1).purchases, Decimal('300.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            receipt.delete()
+
+        self.assertEqual(self._cycle(2025, 1).purchases, Decimal(0))
+
+    def test_bank_change_refreshes_cycles(self) -> None:
+        self._expense('1000.00', _aware(2025, 1, 10))
+        self.card.bank = Bank.objects.get(code=BANK_DEFAULT)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.card.save()
+
+        cycle = self._cycle(2025, 1)
+        self.assertEqual(cycle.payments, Decimal(0))
+        self.assertEqual(
+            timezone.localtime(cycle.grace_end).date(),
+            datetime(2025, 1, 31).date(),  # noqa: DTZ001
+        )
+
+    def test_non_credit_account_drops_cycles(self) -> None:
+        self._expense('1000.00', _aware(2025, 1, 10))
+        self.card.type_account = constants.ACCOUNT_TYPE_DEBIT_CARD
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.card.save()
+
+        self.assertFalse(
+            CreditCardCycle.objects.filter(account=self.card).exists(),
+        )
+
+    def test_grace_info_reads_stored_cycle(self) -> None:
+        self._expense('1000.00', _aware(2025, 1, 10))
+        purchase_month = _aware(2025, 1, 1)
+        expected = (
+            self.account_service.credit_calculation_service
+        ).calculate_grace_period_info(self.card, purchase_month)
+
+        with self.assertNumQueries(1):
+            info = self.account_service.calculate_grace_period_info(
+                self.card,
+                purchase_month,
+            )
+
+        self.assertEqual(info, expected)
+
+    def test_missing_cycles_calculated_on_read_and_stored_later(
+        self,
+    ) -> None:
+        self._expense('1000.00', _aware(2025, 1, 10))
+        CreditCardCycle.objects.all().delete()
+        months = [_aware(2025, month, 1) for month in (1, 2, 3)]
+
+        with (
+            patch(STORE_CYCLES) as queue,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            cycles = self.account_service.get_credit_card_cycles(
+                [self.card, self.debit],
+                months,
+            )
+
+        self.assertEqual(list(cycles), [self.card.pk])
+        self.assertEqual(
+            [cycle.debt for cycle in cycles[self.card.pk]],
+            [Decimal('1000.00'), Decimal(0), Decimal(0)],
+        )
+        self.assertFalse(CreditCardCycle.objects.exists())
+
+        store_credit_card_cycles(*queue.call_args.kwargs['args'])
+        self.assertEqual(
+            CreditCardCycle.objects.filter(account=self.card).count(),
+            len(months),
+        )
+
+    def test_operations_of_one_transaction_refresh_once(self) -> None:
+        with (
+            patch.object(
+                CreditCardCycleService,
+                'refresh_for_operations',
+            ) as refresh,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            for day in (3, 4, 5):
+                Transaction.objects.create(
+                    user=self.user,
+                    account=self.card,
+                    category=self.category,
+                    type=TransactionType.EXPENSE,
+                    amount=Decimal('10.00'),
+                    date=_aware(2025, 1, day),
+                )
+
+        refresh.assert_called_once()
+        self.assertEqual(len(refresh.call_args.args[0]), 3)
+
+    def test_deferred_block_refreshes_once_on_exit(self) -> None:
+        with (
+            patch.object(
+                CreditCardCycleService,
+                'refresh_for_operations',
+            ) as refresh,
+            self.captureOnCommitCallbacks(execute=True),
+            deferred_credit_cycle_refresh(),
+        ):
+            for day in (3, 4):
+                with transaction.atomic():
+                    Transaction.objects.create(
+                        user=self.user,
+                        account=self.card,
+                        category=self.category,
+                        type=TransactionType.EXPENSE,
+                        amount=Decimal('10.00'),
+                        date=_aware(2025, 1, day),
+                    )
+            refresh.assert_not_called()
+
+        refresh.assert_called_once()
+
+    def test_balance_update_does_not_refresh_cycles(self) -> None:
+        self._expense('1000.00', _aware(2025, 1, 10))
+        self.card.balance = Decimal('500.00')
+
+        with (
+            patch.object(CreditCardCycleService, 'refresh_account') as refresh,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.card.save()
+
+        refresh.assert_not_called()
+
+    def test_cycles_count_purchases_of_family_members(self) -> None:
+        self._expense('1000.00', _aware(2025, 1, 10))
+        member = cast('User', UserFactory())
+        member_account = cast('Account', AccountFactory(user=member))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Transaction.objects.create(
+                user=member,
+                account=self.card,
+                category=self.category,
+                type=TransactionType.EXPENSE,
+                amount=Decimal('250.00'),
+                date=_aware(2025, 1, 12),
+            )
+            TransferMoneyLog.objects.create(
+                user=member,
+                from_account=member_account,
+                to_account=self.card,
+                amount=Decimal('100.00'),
+                exchange_date=_aware(2025, 2, 15),
+            )
+
+        cycle = self._cycle(2025, 1)
+        self.assertEqual(cycle.purchases, Decimal('1250.00'))
+        self.assertEqual(cycle.payments, Decimal('100.00'))
+        self.assertEqual(cycle.remaining_debt, Decimal('1150.00'))
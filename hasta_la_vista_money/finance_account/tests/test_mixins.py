@@ -3,6 +3,7 @@
 from typing import TYPE_CHECKING, cast
 
 from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.test import RequestFactory, TestCase
 
 from hasta_la_vista_money.finance_account.mixins import GroupAccountMixin
@@ -21,6 +22,7 @@ class TestGroupAccountMixin(TestCase):
 
     def setUp(self) -> None:
         """Set up test data."""
+        cache.clear()
         self.user1 = User.objects.create_user(
             username='user1',
             password='testpass123',  # nosec B106: test-only password
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, cast
 from unittest import mock
 
 from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.test import TestCase
 from django.utils import timezone
@@ -37,6 +38,7 @@ class TestAccountServices(TestCase):
     """Test cases for account service functions."""
 
     def setUp(self) -> None:
+        cache.clear()
         self.user1: UserType = cast('UserType', UserFactory())
         self.user2: UserType = cast('UserType', UserFactory())
         self.container = ApplicationContainer()
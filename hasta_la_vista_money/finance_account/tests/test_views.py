@@ -28,7 +28,7 @@ from hasta_la_vista_money.finance_account.views import (
     FinancesFilter,
     TransferMoneyAccountView,
     _finances_categories,
-    _finances_transactions,
+    finances_transactions,
 )
 from hasta_la_vista_money.receipts.models import Product, Receipt, Seller
 from hasta_la_vista_money.transactions.models import (
@@ -201,7 +201,7 @@ class TestFinancesView(TestCase):
         request.user = self.user
         setup_container_for_request(request)
 
-        transactions = _finances_transactions(
+        transactions = finances_transactions(
             request=request,
             users=[self.user],
             finances_filter=FinancesFilter(),
@@ -236,7 +236,7 @@ class TestFinancesView(TestCase):
             category_keys=['receipt'],
         )
 
-        transactions = _finances_transactions(
+        transactions = finances_transactions(
             request=request,
             users=[self.user],
             finances_filter=finances_filter,
@@ -262,7 +262,7 @@ class TestFinancesView(TestCase):
         request.user = self.user
         setup_container_for_request(request)
 
-        transactions = _finances_transactions(
+        transactions = finances_transactions(
             request=request,
             users=[self.user],
             finances_filter=FinancesFilter(type='transfer'),
@@ -294,7 +294,7 @@ class TestFinancesView(TestCase):
         request.user = self.user
         setup_container_for_request(request)
 
-        transactions = _finances_transactions(
+        transactions = finances_transactions(
             request=request,
             users=[self.user],
             finances_filter=FinancesFilter(
@@ -319,7 +319,7 @@ class TestFinancesView(TestCase):
         request.user = self.user
         setup_container_for_request(request)
 
-        transactions = _finances_transactions(
+        transactions = finances_transactions(
             request=request,
             users=[self.user],
             finances_filter=FinancesFilter(q='116 000'),
@@ -342,7 +342,7 @@ class TestFinancesView(TestCase):
         request.user = self.user
         setup_container_for_request(request)
 
-        transactions = _finances_transactions(
+        transactions = finances_transactions(
             request=request,
             users=[self.user],
             finances_filter=FinancesFilter(q='116000'),
@@ -360,7 +360,7 @@ class TestFinancesView(TestCase):
         request.user = self.user
         setup_container_for_request(request)
 
-        transactions = _finances_transactions(
+        transactions = finances_transactions(
             request=request,
             users=[self.user],
             finances_filter=FinancesFilter(q='116 000,50'),
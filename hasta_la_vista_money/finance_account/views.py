@@ -426,7 +426,7 @@ class FinancesView(LoginRequiredMixin, TemplateView):
             'name_account',
         )
         categories = _finances_categories(users)
-        transactions = _finances_transactions(
+        transactions = finances_transactions(
             request=request,
             users=users,
             finances_filter=finances_filter,
@@ -777,34 +777,16 @@ class FinancesCategoryView(LoginRequiredMixin, TemplateView):
         """Build context with user income and expense category trees."""
         context = super().get_context_data(**kwargs)
         user = cast('User', self.request.user)
-        income_categories = (
-            Category.objects.filter(user=user, type=TransactionType.INCOME)
-            .select_related('user')
-            .values('id', 'name', 'parent_category', 'parent_category__name')
-            .order_by('parent_category_id')
-        )
-        expense_categories = (
-            Category.objects.filter(user=user, type=TransactionType.EXPENSE)
-            .select_related('user')
-            .values('id', 'name', 'parent_category', 'parent_category__name')
-            .order_by('parent_category_id')
-        )
         context.update(
             {
                 'income_categories': get_cached_category_tree(
                     user_id=user.pk,
                     category_type='income',
-                    categories=[
-                        dict(category) for category in income_categories
-                    ],
                     depth=self.depth,
                 ),
                 'expense_categories': get_cached_category_tree(
                     user_id=user.pk,
                     category_type='expense',
-                    categories=[
-                        dict(category) for category in expense_categories
-                    ],
                     depth=self.depth,
                 ),
             },
@@ -870,12 +852,17 @@ def _apply_date_filter[ModelType: Model](
     )
 
 
-def _finances_transactions(
+def finances_transactions(
     *,
     request: HttpRequest,
     users: list[User],
     finances_filter: FinancesFilter,
 ) -> list[FinancesTransaction]:
+    """Return the rows of the combined finances page, newest first.
+
+    Raises:
+        TypeError: If the request user is not authenticated.
+    """
     if not isinstance(request.user, User):
         raise TypeError('User must be authenticated')
     current_user = request.user
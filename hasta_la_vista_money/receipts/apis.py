@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING, Any, cast
 import structlog
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db.models import QuerySet
+from django.utils.decorators import method_decorator
 from drf_spectacular.openapi import AutoSchema
 from drf_spectacular.utils import (
     OpenApiParameter,
@@ -31,6 +32,7 @@ from rest_framework.throttling import UserRateThrottle
 from rest_framework.views import APIView
 
 from hasta_la_vista_money import constants
+from hasta_la_vista_money.api.views import AsyncAPIView
 from hasta_la_vista_money.authentication.authentication import (
     CookieJWTAuthentication,
 )
@@ -57,6 +59,9 @@ from hasta_la_vista_money.receipts.validators.receipt_api_validator import (
     ReceiptAPIValidator,
 )
 from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.conditional_get import (
+    conditional_on_user_data,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -66,6 +71,7 @@ logger = structlog.get_logger(__name__)
     summary='Список чеков',
     description='Получить список всех чеков текущего пользователя',
 )
+@method_decorator(conditional_on_user_data(), name='get')
 class ReceiptListAPIView(ListAPIView[Receipt]):
     """API view for listing and creating receipts.
 
@@ -506,6 +512,7 @@ class ReceiptCreateAPIView(ListCreateAPIView[Receipt]):
         ),
     },
 )
+@method_decorator(conditional_on_user_data(), name='get')
 class ReceiptsByGroupAPIView(APIView):
     """API view for retrieving receipts by group.
 
@@ -693,7 +700,7 @@ class ReceiptDeleteAPIView(APIView):
         ),
     },
 )
-class SellerAutocompleteAPIView(APIView):
+class SellerAutocompleteAPIView(AsyncAPIView):
     """API view for seller autocomplete.
 
     Provides an endpoint to search sellers by name for autocomplete.
@@ -704,7 +711,12 @@ class SellerAutocompleteAPIView(APIView):
     permission_classes = (IsAuthenticated,)
     throttle_classes = (UserRateThrottle,)
 
-    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+    async def get(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
         query = request.GET.get('q', '').strip()
         user = cast('User', request.user)
         sellers: QuerySet[Seller, Seller] = Seller.objects.filter(
@@ -716,7 +728,7 @@ class SellerAutocompleteAPIView(APIView):
             'name_seller',
             flat=True,
         ).distinct()[: constants.RECEIPTS_DISTINCT_LIMIT]
-        return Response({'results': list(seller_names)})
+        return Response({'results': [name async for name in seller_names]})
 
 
 @extend_schema(
@@ -747,7 +759,7 @@ class SellerAutocompleteAPIView(APIView):
         ),
     },
 )
-class ProductAutocompleteAPIView(APIView):
+class ProductAutocompleteAPIView(AsyncAPIView):
     """API view for product autocomplete.
 
     Provides an endpoint to search products by name for autocomplete.
@@ -758,7 +770,12 @@ class ProductAutocompleteAPIView(APIView):
     permission_classes = (IsAuthenticated,)
     throttle_classes = (UserRateThrottle,)
 
-    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+    async def get(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
         """Get product autocomplete suggestions.
 
         Args:
@@ -781,4 +798,4 @@ class ProductAutocompleteAPIView(APIView):
             'product_name',
             flat=True,
         ).distinct()[: constants.RECEIPTS_DISTINCT_LIMIT]
-        return Response({'results': list(product_names)})
+        return Response({'results': [name async for name in product_names]})
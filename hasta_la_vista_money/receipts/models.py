@@ -18,6 +18,7 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from hasta_la_vista_money import constants
+from hasta_la_vista_money.core.tracking import LoadedValuesMixin
 from hasta_la_vista_money.finance_account.models import Account
 from hasta_la_vista_money.users.models import User
 
@@ -404,7 +405,7 @@ class ReceiptManager(models.Manager['Receipt']):
         )
 
 
-class Receipt(models.Model):
+class Receipt(LoadedValuesMixin, models.Model):
     """Model representing a receipt from a purchase.
 
     Stores information about receipts including date, seller, products,
@@ -18,6 +18,7 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from config.containers import ApplicationContainer
+from hasta_la_vista_money.core.spans import span
 from hasta_la_vista_money.receipts.models import (
     PendingReceipt,
     PendingReceiptStatus,
@@ -169,12 +170,15 @@ def _run_fns_pipeline_from_raw(
     image first) and the browser-camera-scan pipeline (which already has
     the decoded string and skips extraction entirely).
     """
-    fns_payload = FNSClient().fetch_receipt(raw_qr)
-    receipt_data = map_fns_receipt_to_receipt_data(fns_payload)
-    receipt_data['items'] = ReceiptItemCategoryService().categorize_items(
-        user=pending.user,
-        items=receipt_data.get('items', []),
-    )
+    with span('receipt.fns_fetch'):
+        fns_payload = FNSClient().fetch_receipt(raw_qr)
+    with span('receipt.map'):
+        receipt_data = map_fns_receipt_to_receipt_data(fns_payload)
+    with span('receipt.categorize'):
+        receipt_data['items'] = ReceiptItemCategoryService().categorize_items(
+            user=pending.user,
+            items=receipt_data.get('items', []),
+        )
 
     inn = receipt_data.get('inn')
     if inn and not receipt_data.get('retail_place'):
@@ -182,14 +186,15 @@ def _run_fns_pipeline_from_raw(
         if seller and seller.retail_place not in (None, '', 'Нет данных'):
             receipt_data['retail_place'] = seller.retail_place
 
-    validated = validate_receipt_parse_payload(receipt_data).to_dict()
+    with span('receipt.validate'):
+        validated = validate_receipt_parse_payload(receipt_data).to_dict()
     validated['_fns_raw'] = fns_payload
     return validated
 
 
 def _run_fns_pipeline(pending: PendingReceipt) -> dict[str, Any]:
     """Process a pending receipt through QR -> FNS -> mapper pipeline."""
-    with pending.image_file.open('rb') as image_fp:
+    with span('receipt.qr_extract'), pending.image_file.open('rb') as image_fp:
         qr_data = QRCodeExtractor().extract(image_fp)
     return _run_fns_pipeline_from_raw(pending, qr_data.raw)
 
@@ -204,7 +209,7 @@ def _run_claimed_photo_pipeline(
     service: PendingReceiptServiceProtocol,
     task_id: str,
 ) -> dict[str, Any]:
-    with pending.image_file.open('rb') as image_fp:
+    with span('receipt.qr_extract'), pending.image_file.open('rb') as image_fp:
         qr_data = QRCodeExtractor().extract(image_fp)
     if not service.claim_fiscal_key(
         pending_receipt=pending,
@@ -259,11 +264,12 @@ def _finalize_pipeline(
             error=str(exc),
         )
         return
-    service.mark_ready(
-        pending_receipt=pending,
-        receipt_data=receipt_data,
-        task_id=task_id,
-    )
+    with span('receipt.save'):
+        service.mark_ready(
+            pending_receipt=pending,
+            receipt_data=receipt_data,
+            task_id=task_id,
+        )
 
 
 @shared_task(  # type: ignore[untyped-decorator]
@@ -21,6 +21,7 @@ from config.middleware import CoreMiddleware
 from core.protocols.services import AccountServiceProtocol
 from hasta_la_vista_money import constants
 from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.receipts.apis import SellerAutocompleteAPIView
 from hasta_la_vista_money.receipts.forms import (
     ProductForm,
     ProductFormSet,
@@ -776,6 +777,29 @@ class TestReceiptAPIs(APITestCase):
             self.seller.name_seller,
         )
 
+    def test_seller_autocomplete_api(self) -> None:
+        url = reverse_lazy('receipts:seller_autocomplete_api')
+        response = self.client.get(url, {'q': self.seller.name_seller[:3]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(self.seller.name_seller, response.json()['results'])
+        self.assertTrue(SellerAutocompleteAPIView.view_is_async)
+
+    def test_product_autocomplete_api(self) -> None:
+        product = Product.objects.filter(user=self.user).earliest('pk')
+        url = reverse_lazy('receipts:product_autocomplete_api')
+        response = self.client.get(url, {'q': product.product_name})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(product.product_name, response.json()['results'])
+
+    def test_autocomplete_api_unauthorized(self) -> None:
+        self.client.force_authenticate(user=None)
+        url = reverse_lazy('receipts:seller_autocomplete_api')
+        response = self.client.get(url)
+        self.assertIn(
+            response.status_code,
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN],
+        )
+
     def test_seller_create_api(self) -> None:
         url = reverse_lazy('receipts:seller_create_api')
         data = {
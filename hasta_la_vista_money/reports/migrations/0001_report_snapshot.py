@@ -0,0 +1,142 @@
+# Generated by Django 6.0.7 on 2026-10-19 00:35
+
+import django.core.serializers.json
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('month', models.DateField(verbose_name='Месяц')),
+                (
+                    'income_total',
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal('0'),
+                        max_digits=20,
+                        verbose_name='Доходы',
+                    ),
+                ),
+                (
+                    'income_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Количество доходов'
+                    ),
+                ),
+                (
+                    'expense_total',
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal('0'),
+                        max_digits=20,
+                        verbose_name='Расходы',
+                    ),
+                ),
+                (
+                    'expense_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Количество расходов'
+                    ),
+                ),
+                (
+                    'interest_income',
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal('0'),
+                        max_digits=20,
+                        verbose_name='Проценты по вкладам',
+                    ),
+                ),
+                (
+                    'interest_expense',
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal('0'),
+                        max_digits=20,
+                        verbose_name='Удержания по вкладам',
+                    ),
+                ),
+                (
+                    'interest_events',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Количество выплат процентов'
+                    ),
+                ),
+                (
+                    'receipt_total',
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal('0'),
+                        max_digits=20,
+                        verbose_name='Сумма чеков',
+                    ),
+                ),
+                (
+                    'receipt_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Количество чеков'
+                    ),
+                ),
+                (
+                    'categories',
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        verbose_name='Итоги по категориям',
+                    ),
+                ),
+                (
+                    'data_version',
+                    models.CharField(
+                        max_length=64, verbose_name='Версия данных'
+                    ),
+                ),
+                (
+                    'generated_at',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='Дата формирования'
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='report_snapshots',
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='Пользователь',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Снимок отчёта',
+                'verbose_name_plural': 'Снимки отчётов',
+                'ordering': ['user', 'month', '-generated_at'],
+                'indexes': [
+                    models.Index(
+                        fields=['user', 'month', '-generated_at'],
+                        name='report_snapshot_latest_idx',
+                    )
+                ],
+            },
+        ),
+    ]
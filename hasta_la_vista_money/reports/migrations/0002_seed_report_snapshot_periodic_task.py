@@ -0,0 +1,42 @@
+from django.db import migrations
+
+PERIODIC_TASK_NAME = 'Generate report snapshots'
+TASK_PATH = 'reports.generate_report_snapshots'
+INTERVAL_EVERY = 1
+INTERVAL_PERIOD = 'hours'
+
+
+def seed_snapshot_task(apps, schema_editor):
+    """Register an hourly periodic task for report snapshot generation."""
+    interval_model = apps.get_model('django_celery_beat', 'IntervalSchedule')
+    periodic_model = apps.get_model('django_celery_beat', 'PeriodicTask')
+
+    schedule, _created = interval_model.objects.get_or_create(
+        every=INTERVAL_EVERY,
+        period=INTERVAL_PERIOD,
+    )
+    periodic_model.objects.update_or_create(
+        name=PERIODIC_TASK_NAME,
+        defaults={
+            'task': TASK_PATH,
+            'interval': schedule,
+            'enabled': True,
+        },
+    )
+
+
+def remove_snapshot_task(apps, schema_editor):
+    """Remove the periodic task on rollback; leave the schedule for reuse."""
+    periodic_model = apps.get_model('django_celery_beat', 'PeriodicTask')
+    periodic_model.objects.filter(name=PERIODIC_TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('reports', '0001_report_snapshot'),
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_snapshot_task, remove_snapshot_task),
+    ]
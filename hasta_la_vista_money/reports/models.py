@@ -0,0 +1,112 @@
+"""Persisted report figures."""
+
+from decimal import Decimal
+from typing import Any, ClassVar
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.users.models import User
+
+
+def _amount_field(verbose_name: Any) -> models.DecimalField[Any, Any]:
+    return models.DecimalField(
+        max_digits=constants.TWENTY,
+        decimal_places=constants.TWO,
+        default=Decimal(0),
+        verbose_name=verbose_name,
+    )
+
+
+class ReportSnapshot(models.Model):
+    """Immutable monthly report figures of one user.
+
+    Rows are written by the batch generator and never updated: a newer
+    generation of the same month replaces older rows. ``data_version``
+    identifies the data the figures were computed from, so readers can
+    tell whether the user has changed anything in the month since.
+
+    ``categories`` maps a transaction type to the totals of its
+    categories: ``{type: {category_id: {'total': ..., 'count': ...}}}``.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='report_snapshots',
+        verbose_name=_('Пользователь'),
+    )
+    month = models.DateField(verbose_name=_('Месяц'))
+    income_total = _amount_field(_('Доходы'))
+    income_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество доходов'),
+    )
+    expense_total = _amount_field(_('Расходы'))
+    expense_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество расходов'),
+    )
+    interest_income = _amount_field(_('Проценты по вкладам'))
+    interest_expense = _amount_field(_('Удержания по вкладам'))
+    interest_events = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество выплат процентов'),
+    )
+    receipt_total = _amount_field(_('Сумма чеков'))
+    receipt_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество чеков'),
+    )
+    categories = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder,
+        verbose_name=_('Итоги по категориям'),
+    )
+    data_version = models.CharField(
+        max_length=constants.SIXTY_FOUR,
+        verbose_name=_('Версия данных'),
+    )
+    generated_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Дата формирования'),
+    )
+
+    class Meta:
+        ordering: ClassVar[list[str]] = ['user', 'month', '-generated_at']
+        verbose_name = _('Снимок отчёта')
+        verbose_name_plural = _('Снимки отчётов')
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=['user', 'month', '-generated_at'],
+                name='report_snapshot_latest_idx',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user} — {self.month:%Y-%m}'
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if not self._state.adding:
+            raise ValidationError(_('Снимок отчёта нельзя изменить.'))
+        super().save(*args, **kwargs)
+
+    def category_totals(self, type_value: str) -> dict[int, Decimal]:
+        """Return totals of the month per category of a transaction type."""
+        return {
+            int(category_id): Decimal(str(figures['total']))
+            for category_id, figures in self.categories.get(
+                type_value,
+                {},
+            ).items()
+        }
+
+    @property
+    def has_data(self) -> bool:
+        """Whether any transaction or deposit interest fell in the month."""
+        return bool(
+            self.income_count or self.expense_count or self.interest_events,
+        )
@@ -1,31 +1,32 @@
+import functools
 from calendar import monthrange
-from collections import defaultdict
 from collections.abc import Sequence
-from datetime import date, datetime, time
+from dataclasses import dataclass
+from datetime import date
 from decimal import Decimal
-from typing import Any, cast
+from typing import Any
 
-from django.core.cache import cache
-from django.db.models import CharField, F, Sum
-from django.db.models.functions import Coalesce, TruncMonth
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from typing_extensions import TypedDict
 
 from hasta_la_vista_money import constants
-from hasta_la_vista_money.deposits.models import DepositCapitalizationEvent
-from hasta_la_vista_money.deposits.reporting import (
-    signed_adjustment_expense,
-    signed_adjustment_income,
-    signed_interest,
-)
+from hasta_la_vista_money.reports.models import ReportSnapshot
+from hasta_la_vista_money.reports.services.snapshots import report_snapshots
 from hasta_la_vista_money.transactions.models import (
-    Category,
     Transaction,
     TransactionType,
 )
 from hasta_la_vista_money.users.models import User
 from hasta_la_vista_money.users.services.cache import (
+    DOMAIN_CATEGORIES,
+    DOMAIN_DEPOSITS,
+    DOMAIN_TRANSACTIONS,
+    StatisticsScope,
+    acached_statistics,
     get_reports_budget_charts_cache_key,
+    statistics_cached,
 )
 
 
@@ -149,14 +150,14 @@ class ChartDataDict(TypedDict):
 def pie_expense_category(user: User) -> list[ChartDataDict]:
     """Return pie chart data for expense categories with monthly drilldown."""
     expense_rows = (
-        Transaction.objects.filter(user=user, type=TransactionType.EXPENSE)
+        Transaction.objects.filter(
+            user=user,
+            type=TransactionType.EXPENSE,
+            category__ancestor_links__ancestor__parent_category__isnull=True,
+        )
         .annotate(
             month=TruncMonth('date'),
-            parent_category_name=Coalesce(
-                F('category__parent_category__name'),
-                F('category__name'),
-                output_field=CharField(),
-            ),
+            parent_category_name=F('category__ancestor_links__ancestor__name'),
         )
         .values(
             'month',
@@ -233,206 +234,138 @@ def pie_expense_category(user: User) -> list[ChartDataDict]:
     return charts
 
 
-def _fact_map_for_categories(
-    user: User,
-    type_value: str,
-    categories: Sequence[Category],
-    months: list[date],
-) -> dict[int, dict[date, Decimal]]:
-    """Aggregate transactions per category and month."""
-    fact_map: dict[int, dict[date, Decimal]] = defaultdict(
-        lambda: defaultdict(lambda: Decimal(0)),
-    )
-    if not months:
-        return fact_map
-
-    first_month = months[0]
-    last_month = months[-1]
+@dataclass(frozen=True)
+class _CategoryIndex:
+    """Dense positions of the user's categories of one transaction type."""
 
-    first_month_start = timezone.make_aware(
-        datetime.combine(
-            date(first_month.year, first_month.month, 1),
-            time.min,
-        ),
-    )
+    keys: list[int]
+    names: list[str]
+    position: dict[int, int]
 
-    _, last_day_last = monthrange(last_month.year, last_month.month)
-    last_month_end = timezone.make_aware(
-        datetime.combine(
-            date(last_month.year, last_month.month, last_day_last),
-            time.max,
-        ),
-    )
 
-    qs = (
-        Transaction.objects.filter(
-            user=user,
-            type=type_value,
-            category__in=categories,
-            date__gte=first_month_start,
-            date__lte=last_month_end,
+def _category_indexes(user: User) -> dict[str, _CategoryIndex]:
+    """Return the expense and income category indexes with one query."""
+    by_type: dict[str, list[tuple[int, str]]] = {
+        TransactionType.EXPENSE: [],
+        TransactionType.INCOME: [],
+    }
+    for category_id, name, type_value in (
+        user.categories.filter(type__in=by_type)
+        .order_by('name')
+        .values_list('pk', 'name', 'type')
+    ):
+        by_type[type_value].append((category_id, name))
+    return {
+        type_value: _CategoryIndex(
+            keys=[category_id for category_id, _ in categories],
+            names=[name for _, name in categories],
+            position={
+                category_id: index
+                for index, (category_id, _) in enumerate(categories)
+            },
         )
-        .annotate(month=TruncMonth('date'))
-        .values('category_id', 'month')
-        .annotate(total=Sum('amount'))
-    )
-
-    for row in qs:
-        month_datetime = row['month']
-        if isinstance(month_datetime, datetime) or hasattr(
-            month_datetime,
-            'date',
-        ):
-            month_date = month_datetime.date()
-        else:
-            month_date = month_datetime
-
-        if isinstance(month_date, date) and month_date in months:
-            total_amount = row['total'] or Decimal(0)
-            fact_map[row['category_id']][month_date] = total_amount
-    return fact_map
-
-
-def _totals_by_month(
-    categories: Sequence[Category],
-    months: list[date],
-    fact_map: dict[int, dict[date, Decimal]],
-) -> list[float]:
-    totals: list[Decimal] = [Decimal(0)] * len(months)
-    for i, m in enumerate(months):
-        for cat in categories:
-            totals[i] += fact_map[cat.pk][m]
-    return [float(x) for x in totals]
-
-
-def _pie_for_categories(
-    categories: Sequence[Category],
-    months: list[date],
-    fact_map: dict[int, dict[date, Decimal]],
-) -> tuple[list[str], list[float], list[str]]:
-    """Return labels and values for the expense pie chart."""
-    labels: list[str] = []
-    values: list[float] = []
-    category_keys: list[str] = []
-    if not months or not categories:
-        return labels, values, category_keys
-    totals: dict[int, Decimal] = defaultdict(lambda: Decimal(0))
-    for cat in categories:
-        for month in months:
-            totals[cat.pk] += fact_map[cat.pk][month]
-    for cat in categories:
-        total = totals[cat.pk]
-        if total > 0:
-            labels.append(cat.name)
-            values.append(float(total))
-            category_keys.append(f'{TransactionType.EXPENSE}-{cat.pk}')
-    return labels, values, category_keys
+        for type_value, categories in by_type.items()
+    }
 
 
-def budget_charts(user: User, period: str = 'y') -> BudgetChartsDict:
-    """Build chart data for the reports dashboard."""
-    cache_key = f'{get_reports_budget_charts_cache_key(user.pk)}:{period}'
-    cached_charts = cache.get(cache_key)
-    if cached_charts is not None:
-        return cast('BudgetChartsDict', cached_charts)
-
-    period_range = report_period_range(period)
-    transactions_qs = Transaction.objects.filter(user=user)
-    interest_events = DepositCapitalizationEvent.objects.filter(
-        deposit__account__user=user,
+def _monthly_totals(
+    snapshots: Sequence[ReportSnapshot],
+    index: _CategoryIndex,
+    type_value: str,
+) -> tuple[list[Decimal], list[Decimal]]:
+    """Sum category totals of a type per month and per category.
+
+    Returns:
+        Totals indexed like ``snapshots`` and like ``index``.
+    """
+    by_month = [Decimal(0)] * len(snapshots)
+    by_category = [Decimal(0)] * len(index.keys)
+    for month_index, snapshot in enumerate(snapshots):
+        for category_id, total in snapshot.category_totals(type_value).items():
+            position = index.position.get(category_id)
+            if position is None:
+                continue
+            by_month[month_index] += total
+            by_category[position] += total
+    return by_month, by_category
+
+
+def _budget_charts_cache(
+    user: User,
+    period: str = 'y',
+) -> tuple[str, StatisticsScope]:
+    start, end = report_period_range(period) or (None, None)
+    return (
+        f'{get_reports_budget_charts_cache_key(user.pk)}:{period}',
+        StatisticsScope(
+            user.pk,
+            (DOMAIN_TRANSACTIONS, DOMAIN_DEPOSITS, DOMAIN_CATEGORIES),
+            start,
+            end,
+        ),
     )
-    if period_range is not None:
-        start, end = period_range
-        transactions_qs = transactions_qs.filter(
-            date__date__gte=start,
-            date__date__lte=end,
-        )
-        interest_events = interest_events.filter(
-            posting_on__gte=start,
-            posting_on__lte=end,
-        )
 
-    months_qs = (
-        transactions_qs.annotate(month=TruncMonth('date'))
-        .values_list('month', flat=True)
-        .distinct()
-        .order_by('month')
-    )
 
-    all_months_set: set[date] = set()
-    for d in months_qs:
-        if d:
-            month_date = d.date() if hasattr(d, 'date') else d
-            if isinstance(month_date, date):
-                all_months_set.add(month_date)
-
-    interest_by_month = {
-        row['month']: row
-        for row in interest_events.annotate(
-            month=TruncMonth('posting_on'),
-        )
-        .values('month')
-        .annotate(
-            gross_total=Sum(signed_interest('gross')),
-            withholding_total=Sum(signed_interest('withholding')),
-            adjustment_income=Sum(signed_adjustment_income()),
-            adjustment_expense=Sum(signed_adjustment_expense()),
+@statistics_cached(
+    _budget_charts_cache,
+    timeout=constants.REPORTS_CACHE_TIMEOUT,
+    metric='reports_budget_charts',
+)
+def budget_charts(user: User, period: str = 'y') -> BudgetChartsDict:
+    """Build chart data for the reports dashboard.
+
+    Monthly figures come from report snapshots; months changed since the
+    last snapshot generation are computed live.
+    """
+    snapshots = [
+        snapshot
+        for snapshot in report_snapshots(
+            user,
+            *report_period_range(period) or (None, None),
         )
-    }
-    all_months_set.update(interest_by_month)
-
-    months = sorted(all_months_set)
-
-    expense_categories = list(
-        user.categories.filter(type=TransactionType.EXPENSE).order_by('name'),
-    )
-    income_categories = list(
-        user.categories.filter(type=TransactionType.INCOME).order_by('name'),
-    )
+        if snapshot.has_data
+    ]
+    months = [snapshot.month for snapshot in snapshots]
 
-    chart_labels = [m.strftime('%b %Y') for m in months] if months else []
+    chart_labels = [m.strftime('%b %Y') for m in months]
     chart_start_dates = [m.isoformat() for m in months]
     chart_end_dates = [_end_of_month(m).isoformat() for m in months]
 
-    expense_fact = _fact_map_for_categories(
-        user,
+    indexes = _category_indexes(user)
+    expense_index = indexes[TransactionType.EXPENSE]
+    expense_by_month, expense_by_category = _monthly_totals(
+        snapshots,
+        expense_index,
         TransactionType.EXPENSE,
-        expense_categories,
-        months,
     )
-    income_fact = _fact_map_for_categories(
-        user,
+    income_by_month, _ = _monthly_totals(
+        snapshots,
+        indexes[TransactionType.INCOME],
         TransactionType.INCOME,
-        income_categories,
-        months,
-    )
-
-    total_expense = _totals_by_month(expense_categories, months, expense_fact)
-    total_income = _totals_by_month(income_categories, months, income_fact)
-    for index, month in enumerate(months):
-        interest = interest_by_month.get(month)
-        if interest is None:
-            continue
-        total_income[index] += float(
-            Decimal(interest['gross_total'] or 0)
-            + Decimal(interest['adjustment_income'] or 0),
-        )
-        total_expense[index] += float(
-            Decimal(interest['withholding_total'] or 0)
-            + Decimal(interest['adjustment_expense'] or 0),
-        )
-
-    chart_balance = (
-        [total_income[i] - total_expense[i] for i in range(len(months))]
-        if months
-        else []
-    )
-
-    pie_labels, pie_values, pie_category_keys = _pie_for_categories(
-        expense_categories,
-        months,
-        expense_fact,
     )
+    total_income = [
+        float(income + snapshot.interest_income)
+        for income, snapshot in zip(income_by_month, snapshots, strict=True)
+    ]
+    total_expense = [
+        float(expense + snapshot.interest_expense)
+        for expense, snapshot in zip(expense_by_month, snapshots, strict=True)
+    ]
+    chart_balance = [
+        income - expense
+        for income, expense in zip(total_income, total_expense, strict=True)
+    ]
+
+    pie_labels: list[str] = []
+    pie_values: list[float] = []
+    pie_category_keys: list[str] = []
+    for position, total in enumerate(expense_by_category):
+        if total > 0:
+            pie_labels.append(expense_index.names[position])
+            pie_values.append(float(total))
+            pie_category_keys.append(
+                f'{TransactionType.EXPENSE}-{expense_index.keys[position]}',
+            )
 
     total_income_sum = sum(total_income)
     total_expense_sum = sum(total_expense)
@@ -460,5 +393,17 @@ def budget_charts(user: User, period: str = 'y') -> BudgetChartsDict:
         'chart_end_dates': chart_end_dates,
         'pie_category_keys': pie_category_keys,
     }
-    cache.set(cache_key, charts_data, constants.REPORTS_CACHE_TIMEOUT)
     return charts_data
+
+
+async def abudget_charts(user: User, period: str = 'y') -> BudgetChartsDict:
+    """Async variant of ``budget_charts`` for async views.
+
+    Fresh cached charts are read with a single cache call; missing ones
+    are built on the widget pool.
+    """
+    return await acached_statistics(
+        *_budget_charts_cache(user, period),
+        functools.partial(budget_charts, user, period),
+        metric='reports_budget_charts',
+    )
@@ -0,0 +1,324 @@
+"""Monthly report snapshots: batch generation and reading.
+
+The batch generator computes the figures of every active user with three
+grouped queries per chunk of users: transactions grouped by user, month,
+type and category, deposit interest and receipts grouped by user and
+month. Each user-month is stored as an immutable ``ReportSnapshot``
+stamped with the version of the data it was computed from.
+
+Readers take the latest snapshot of every month and keep it while its
+version still matches; months changed since the last run are computed
+live with the same grouped queries for the single user.
+"""
+
+from calendar import monthrange
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import batched
+from typing import Any, Final
+
+import structlog
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.deposits.models import DepositCapitalizationEvent
+from hasta_la_vista_money.deposits.reporting import (
+    signed_adjustment_expense,
+    signed_adjustment_income,
+    signed_interest,
+)
+from hasta_la_vista_money.receipts.models import Receipt
+from hasta_la_vista_money.reports.models import ReportSnapshot
+from hasta_la_vista_money.transactions.models import (
+    Transaction,
+    TransactionType,
+)
+from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.cache import (
+    DOMAIN_DEPOSITS,
+    DOMAIN_RECEIPTS,
+    DOMAIN_TRANSACTIONS,
+    StatisticsScope,
+    scope_versions,
+)
+
+logger = structlog.get_logger(__name__)
+
+SNAPSHOT_DOMAINS: Final = (
+    DOMAIN_TRANSACTIONS,
+    DOMAIN_DEPOSITS,
+    DOMAIN_RECEIPTS,
+)
+
+type SnapshotKey = tuple[int, date]
+type RowHandler = Callable[[ReportSnapshot, dict[str, Any]], None]
+
+
+def month_range(start: date, end: date) -> list[date]:
+    """Return the first days of the months from ``start`` to ``end``."""
+    months: list[date] = []
+    month = start.replace(day=1)
+    while month <= end:
+        months.append(month)
+        month = (
+            month.replace(year=month.year + 1, month=1)
+            if month.month == constants.NUMBER_TWELFTH_MONTH_YEAR
+            else month.replace(month=month.month + 1)
+        )
+    return months
+
+
+def _month_of(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _end_of_month(month: date) -> date:
+    return month.replace(day=monthrange(month.year, month.month)[1])
+
+
+def current_versions(keys: Sequence[SnapshotKey]) -> dict[SnapshotKey, str]:
+    """Return the current data version of every user-month."""
+    scopes = [
+        StatisticsScope(user_id, SNAPSHOT_DOMAINS, month, month)
+        for user_id, month in keys
+    ]
+    return dict(zip(keys, scope_versions(scopes), strict=True))
+
+
+def _add_transactions(snapshot: ReportSnapshot, row: dict[str, Any]) -> None:
+    total = row['total'] or Decimal(0)
+    if row['type'] == TransactionType.INCOME:
+        snapshot.income_total += total
+        snapshot.income_count += row['count']
+    elif row['type'] == TransactionType.EXPENSE:
+        snapshot.expense_total += total
+        snapshot.expense_count += row['count']
+    by_category = snapshot.categories.setdefault(row['type'], {})
+    by_category[str(row['category_id'])] = {
+        'total': total,
+        'count': row['count'],
+    }
+
+
+def _add_interest(snapshot: ReportSnapshot, row: dict[str, Any]) -> None:
+    snapshot.interest_income = Decimal(row['gross'] or 0) + Decimal(
+        row['adjustment_income'] or 0,
+    )
+    snapshot.interest_expense = Decimal(row['withholding'] or 0) + Decimal(
+        row['adjustment_expense'] or 0,
+    )
+    snapshot.interest_events = row['count']
+
+
+def _add_receipts(snapshot: ReportSnapshot, row: dict[str, Any]) -> None:
+    snapshot.receipt_total = row['total'] or Decimal(0)
+    snapshot.receipt_count = row['count']
+
+
+def _grouped_rows(
+    user_ids: Sequence[int],
+    period: tuple[date, date] | None,
+) -> list[tuple[Any, RowHandler]]:
+    """Return the grouped queries of the figures and their handlers."""
+    transactions = Transaction.objects.filter(user_id__in=user_ids)
+    interest = DepositCapitalizationEvent.objects.filter(
+        deposit__account__user_id__in=user_ids,
+    )
+    receipts = Receipt.objects.filter(user_id__in=user_ids)
+    if period is not None:
+        first, last = period
+        # Bounds on the raw timestamps let the database use its
+        # date indexes instead of converting every row's date.
+        starts = timezone.make_aware(datetime.combine(first, time.min))
+        ends = timezone.make_aware(
+            datetime.combine(last + timedelta(days=1), time.min),
+        )
+        transactions = transactions.filter(date__gte=starts, date__lt=ends)
+        interest = interest.filter(posting_on__gte=first, posting_on__lte=last)
+        receipts = receipts.filter(
+            receipt_date__gte=starts,
+            receipt_date__lt=ends,
+        )
+    return [
+        (
+            transactions.annotate(month=TruncMonth('date'))
+            .values('month', 'type', 'category_id', owner=F('user_id'))
+            .annotate(total=Sum('amount'), count=Count('pk'))
+            .order_by(),
+            _add_transactions,
+        ),
+        (
+            interest.annotate(month=TruncMonth('posting_on'))
+            .values('month', owner=F('deposit__account__user_id'))
+            .annotate(
+                gross=Sum(signed_interest('gross')),
+                withholding=Sum(signed_interest('withholding')),
+                adjustment_income=Sum(signed_adjustment_income()),
+                adjustment_expense=Sum(signed_adjustment_expense()),
+                count=Count('pk'),
+            )
+            .order_by(),
+            _add_interest,
+        ),
+        (
+            receipts.annotate(month=TruncMonth('receipt_date'))
+            .values('month', owner=F('user_id'))
+            .annotate(total=Sum('total_sum'), count=Count('pk'))
+            .order_by(),
+            _add_receipts,
+        ),
+    ]
+
+
+def build_snapshots(
+    user_ids: Sequence[int],
+    months: Sequence[date] | None = None,
+) -> dict[SnapshotKey, ReportSnapshot]:
+    """Compute unsaved snapshots of users with three grouped queries.
+
+    Args:
+        user_ids: Users to compute figures for.
+        months: First days of the months to compute. Every user gets a
+            snapshot for each of them, empty months included. Without
+            months only the months that have data are returned.
+    """
+    snapshots: dict[SnapshotKey, ReportSnapshot] = {
+        (user_id, month): ReportSnapshot(user_id=user_id, month=month)
+        for user_id in user_ids
+        for month in months or ()
+    }
+    period = (min(months), _end_of_month(max(months))) if months else None
+    for rows, handle in _grouped_rows(user_ids, period):
+        for row in rows:
+            if row['month'] is None:
+                continue
+            key = (row['owner'], _month_of(row['month']))
+            if months and key not in snapshots:
+                continue
+            if key not in snapshots:
+                snapshots[key] = ReportSnapshot(user_id=key[0], month=key[1])
+            handle(snapshots[key], row)
+    return snapshots
+
+
+def _stored_snapshots(
+    user_ids: Sequence[int],
+    months: Sequence[date],
+) -> dict[SnapshotKey, list[ReportSnapshot]]:
+    """Return stored snapshots of every user-month, latest first."""
+    stored: dict[SnapshotKey, list[ReportSnapshot]] = defaultdict(list)
+    for snapshot in ReportSnapshot.objects.filter(
+        user_id__in=user_ids,
+        month__in=months,
+    ).order_by('user_id', 'month', '-generated_at', '-pk'):
+        stored[snapshot.user_id, snapshot.month].append(snapshot)
+    return stored
+
+
+def report_snapshots(
+    user: User,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[ReportSnapshot]:
+    """Return the monthly figures of a user ordered by month.
+
+    With both bounds every month of the period is returned: from the
+    latest stored snapshot while it is current, computed live otherwise.
+    Without them every month with data is computed live.
+
+    Args:
+        user: Owner of the figures.
+        start: First day of the period.
+        end: Last day of the period.
+    """
+    if start is None or end is None:
+        built = build_snapshots([user.pk])
+        return [built[key] for key in sorted(built)]
+
+    keys = [(user.pk, month) for month in month_range(start, end)]
+    versions = current_versions(keys)
+    snapshots = {
+        key: rows[0]
+        for key, rows in _stored_snapshots(
+            [user.pk],
+            [month for _, month in keys],
+        ).items()
+        if rows[0].data_version == versions[key]
+    }
+    missing = [
+        month for user_id, month in keys if (user_id, month) not in snapshots
+    ]
+    if missing:
+        snapshots.update(build_snapshots([user.pk], missing))
+    return [snapshots[key] for key in keys]
+
+
+def _generate_chunk(user_ids: list[int], months: Sequence[date]) -> int:
+    keys = [(user_id, month) for user_id in user_ids for month in months]
+    # Versions are read before the figures are computed, so a change
+    # committed meanwhile leaves the new snapshot outdated, never wrong.
+    versions = current_versions(keys)
+    stored = _stored_snapshots(user_ids, months)
+    outdated = [
+        key
+        for key in keys
+        if not stored.get(key) or stored[key][0].data_version != versions[key]
+    ]
+    if not outdated:
+        return 0
+
+    built = build_snapshots(
+        sorted({user_id for user_id, _ in outdated}),
+        sorted({month for _, month in outdated}),
+    )
+    fresh = []
+    for key in outdated:
+        snapshot = built[key]
+        snapshot.data_version = versions[key]
+        fresh.append(snapshot)
+    superseded = [
+        snapshot.pk for key in outdated for snapshot in stored.get(key, [])
+    ]
+    with transaction.atomic():
+        ReportSnapshot.objects.bulk_create(fresh)
+        ReportSnapshot.objects.filter(pk__in=superseded).delete()
+    return len(fresh)
+
+
+def refresh_report_snapshots(
+    months: Sequence[date],
+    *,
+    chunk_size: int = constants.REPORT_SNAPSHOT_CHUNK_SIZE,
+) -> int:
+    """Store current snapshots of the months for all active users.
+
+    Users are processed in chunks of ``chunk_size``. User-months whose
+    latest snapshot still matches the data are skipped, and the snapshots
+    a new generation replaces are deleted with it.
+
+    Args:
+        months: First days of the months to generate.
+        chunk_size: Number of users aggregated by one set of queries.
+
+    Returns:
+        Number of snapshots written.
+    """
+    user_ids = (
+        User.objects.filter(is_active=True)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    written = 0
+    for chunk in batched(user_ids.iterator(chunk_size=chunk_size), chunk_size):
+        written += _generate_chunk(list(chunk), months)
+    logger.info(
+        'Report snapshots generated',
+        months=len(months),
+        snapshots=written,
+    )
+    return written
@@ -1,25 +1,29 @@
 """Reports tasks module.
 
 This module provides Celery tasks for generating monthly, yearly,
-and user statistics reports.
+and user statistics reports, and the scheduled batch generator of
+monthly report snapshots for all users.
 """
 
-from collections import defaultdict
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 from typing import Any, cast
 
 import structlog
 from celery import shared_task
 from django.db.models import Avg, Count, Max, Min, Sum
-from django.db.models.functions import TruncMonth
+from django.utils import timezone
 
 from hasta_la_vista_money import constants
 from hasta_la_vista_money.deposits.reporting import (
     actual_interest_totals,
-    actual_interest_totals_by_month,
 )
 from hasta_la_vista_money.receipts.models import Receipt
+from hasta_la_vista_money.reports.services.snapshots import (
+    month_range,
+    refresh_report_snapshots,
+    report_snapshots,
+)
 from hasta_la_vista_money.transactions.models import (
     Transaction,
     TransactionType,
@@ -251,45 +255,18 @@ def generate_yearly_report(
             end_date=end_date.isoformat(),
         )
 
-        monthly_totals: dict[int, dict[str, Decimal]] = defaultdict(
-            lambda: {
-                TransactionType.INCOME: Decimal(0),
-                TransactionType.EXPENSE: Decimal(0),
-            },
+        snapshots = report_snapshots(
+            user,
+            start_date.date(),
+            (end_date - timedelta(days=1)).date(),
         )
-        monthly_rows = (
-            Transaction.objects.filter(user=user, date__year=year)
-            .annotate(month=TruncMonth('date'))
-            .values('month', 'type')
-            .annotate(total=Sum('amount'))
-        )
-        for row in monthly_rows:
-            month_value = row['month']
-            if month_value is None:
-                continue
-            month_number = month_value.month
-            monthly_totals[month_number][row['type']] = row['total'] or Decimal(
-                0,
-            )
-
-        monthly_interest = actual_interest_totals_by_month(user, year)
         monthly_data = []
-        for month in range(
-            constants.NUMBER_FIRST_MONTH_YEAR,
-            constants.NUMBER_TWELFTH_MONTH_YEAR + 1,
-        ):
-            month_income = monthly_totals[month][TransactionType.INCOME]
-            month_expense = monthly_totals[month][TransactionType.EXPENSE]
-            interest_income, interest_expense = monthly_interest.get(
-                month,
-                (Decimal(), Decimal()),
-            )
-            month_income += interest_income
-            month_expense += interest_expense
-
+        for snapshot in snapshots:
+            month_income = snapshot.income_total + snapshot.interest_income
+            month_expense = snapshot.expense_total + snapshot.interest_expense
             monthly_data.append(
                 {
-                    'month': month,
+                    'month': snapshot.month.month,
                     'income': month_income,
                     'expense': month_expense,
                     'net': month_income - month_expense,
@@ -316,11 +293,11 @@ def generate_yearly_report(
             transaction_average=Avg('amount'),
         )
         interest_income = sum(
-            (totals[0] for totals in monthly_interest.values()),
+            (snapshot.interest_income for snapshot in snapshots),
             start=Decimal(),
         )
         interest_expense = sum(
-            (totals[1] for totals in monthly_interest.values()),
+            (snapshot.interest_expense for snapshot in snapshots),
             start=Decimal(),
         )
         yearly_income['total'] = (
@@ -572,3 +549,21 @@ def generate_user_statistics(
         return {'success': False, 'error': str(e)}
     else:
         return {'success': True, 'statistics': stats_data}
+
+
+@shared_task(  # type: ignore[untyped-decorator]
+    name='reports.generate_report_snapshots',
+    ignore_result=True,
+)
+def generate_report_snapshots(year: int | None = None) -> int:
+    """Store monthly report snapshots of a year for all active users.
+
+    Args:
+        year: Calendar year to generate; the current year by default,
+            which is the default period of the reports page.
+    """
+    if year is None:
+        year = timezone.localdate().year
+    months = month_range(date(year, 1, 1), date(year, 12, 31))
+    logger.info('Starting report snapshot generation', year=year)
+    return refresh_report_snapshots(months)
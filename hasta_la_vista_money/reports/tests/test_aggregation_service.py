@@ -291,3 +291,36 @@ class BudgetChartsTest(TestCase):
 
         self.assertIn('chart_labels', charts_data)
         self.assertEqual(len(queries), 0)
+
+    def test_budget_charts_queries_do_not_grow_with_categories(self) -> None:
+        account = Account.objects.create(user=self.user, name_account='Main')
+        for index in range(12):
+            category = Category.objects.create(
+                user=self.user,
+                name=f'Expense {index}',
+                type=TransactionType.EXPENSE,
+            )
+            Transaction.objects.create(
+                user=self.user,
+                account=account,
+                category=category,
+                type=TransactionType.EXPENSE,
+                amount=Decimal(index + 1),
+                date=datetime(
+                    2026,
+                    index + 1,
+                    5,
+                    tzinfo=timezone.get_current_timezone(),
+                ),
+            )
+
+        # Three grouped aggregates and the categories, with no query per
+        # category or month.
+        with self.assertNumQueries(4):
+            charts_data = budget_charts(self.user, period='all')
+
+        self.assertEqual(len(charts_data['chart_labels']), 12)
+        self.assertEqual(
+            sorted(charts_data['pie_values']),
+            [float(amount) for amount in range(1, 13)],
+        )
@@ -0,0 +1,175 @@
+"""Tests for batch generation and reading of report snapshots."""
+
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.utils import timezone
+
+from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.reports.models import ReportSnapshot
+from hasta_la_vista_money.reports.services.aggregation import budget_charts
+from hasta_la_vista_money.reports.services.snapshots import (
+    month_range,
+    refresh_report_snapshots,
+    report_snapshots,
+)
+from hasta_la_vista_money.reports.tasks import generate_report_snapshots
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    Transaction,
+    TransactionType,
+)
+from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.cache_invalidation import (
+    flush_statistics_invalidation,
+)
+
+JANUARY = date(2026, 1, 1)
+FEBRUARY = date(2026, 2, 1)
+
+
+class ReportSnapshotTest(TestCase):
+    def setUp(self) -> None:
+        flush_statistics_invalidation()
+        cache.clear()
+        self.categories: dict[int, tuple[Account, Category]] = {}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users = [
+                User.objects.create_user(
+                    username=f'snapshot-user-{index}',
+                    password='pass',  # nosec B106: test-only password
+                )
+                for index in range(2)
+            ]
+            for user in self.users:
+                account = Account.objects.create(
+                    user=user,
+                    name_account='Main',
+                )
+                self.categories[user.pk] = (
+                    account,
+                    Category.objects.create(
+                        user=user,
+                        name='Food',
+                        type=TransactionType.EXPENSE,
+                    ),
+                )
+                self._expense(user, Decimal('100.00'), JANUARY)
+                self._expense(user, Decimal('50.00'), JANUARY)
+
+    def _expense(
+        self,
+        user: User,
+        amount: Decimal,
+        day: date,
+    ) -> Transaction:
+        account, category = self.categories[user.pk]
+        return Transaction.objects.create(
+            user=user,
+            account=account,
+            category=category,
+            type=TransactionType.EXPENSE,
+            amount=amount,
+            date=datetime.combine(
+                day.replace(day=10),
+                datetime.min.time(),
+                tzinfo=timezone.get_current_timezone(),
+            ),
+        )
+
+    def test_batch_stores_grouped_figures_for_every_user_month(self) -> None:
+        # Active users, stored snapshots, three grouped aggregates and
+        # one insert in a savepoint, however many users there are.
+        with self.assertNumQueries(8):
+            written = refresh_report_snapshots([JANUARY, FEBRUARY])
+
+        self.assertEqual(written, 4)
+        january = ReportSnapshot.objects.get(user=self.users[0], month=JANUARY)
+        category = self.categories[self.users[0].pk][1]
+        self.assertEqual(january.expense_total, Decimal('150.00'))
+        self.assertEqual(january.expense_count, 2)
+        self.assertEqual(
+            january.category_totals(TransactionType.EXPENSE),
+            {category.pk: Decimal('150.00')},
+        )
+        february = ReportSnapshot.objects.get(
+            user=self.users[0],
+            month=FEBRUARY,
+        )
+        self.assertFalse(february.has_data)
+
+    def test_rerun_replaces_only_changed_months(self) -> None:
+        refresh_report_snapshots([JANUARY, FEBRUARY])
+        self.assertEqual(refresh_report_snapshots([JANUARY, FEBRUARY]), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._expense(self.users[0], Decimal('25.00'), FEBRUARY)
+
+        self.assertEqual(refresh_report_snapshots([JANUARY, FEBRUARY]), 1)
+        february = ReportSnapshot.objects.get(
+            user=self.users[0],
+            month=FEBRUARY,
+        )
+        self.assertEqual(february.expense_total, Decimal('25.00'))
+        self.assertEqual(ReportSnapshot.objects.count(), 4)
+
+    def test_snapshots_are_immutable(self) -> None:
+        refresh_report_snapshots([JANUARY])
+        snapshot = ReportSnapshot.objects.first()
+        assert snapshot is not None
+        snapshot.expense_total = Decimal(0)
+
+        with self.assertRaises(ValidationError):
+            snapshot.save()
+
+    def test_reader_uses_current_snapshots_and_computes_changed_months(
+        self,
+    ) -> None:
+        user = self.users[0]
+        refresh_report_snapshots([JANUARY, FEBRUARY])
+
+        stored = report_snapshots(user, JANUARY, date(2026, 2, 28))
+        self.assertTrue(all(snapshot.pk for snapshot in stored))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._expense(user, Decimal('10.00'), JANUARY)
+        january, february = report_snapshots(user, JANUARY, date(2026, 2, 28))
+
+        self.assertIsNone(january.pk)
+        self.assertEqual(january.expense_total, Decimal('160.00'))
+        self.assertIsNotNone(february.pk)
+
+    def test_budget_charts_read_current_snapshots(self) -> None:
+        user = self.users[0]
+        this_month = timezone.localdate().replace(day=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._expense(user, Decimal('40.00'), this_month)
+        refresh_report_snapshots(
+            month_range(
+                this_month.replace(month=1),
+                this_month.replace(month=12, day=31),
+            ),
+        )
+        expected = 190.0 if this_month.year == JANUARY.year else 40.0
+
+        with patch(
+            'hasta_la_vista_money.reports.services.snapshots.build_snapshots',
+        ) as build:
+            charts = budget_charts(user, period='y')
+
+        build.assert_not_called()
+        self.assertEqual(charts['total_expense'], expected)
+        self.assertEqual(charts['pie_labels'], ['Food'])
+
+    def test_task_generates_the_requested_year(self) -> None:
+        written = generate_report_snapshots.run(2026)
+
+        self.assertEqual(written, 24)
+        self.assertEqual(
+            set(ReportSnapshot.objects.values_list('month', flat=True)),
+            set(month_range(JANUARY, date(2026, 12, 31))),
+        )
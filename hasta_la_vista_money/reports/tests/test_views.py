@@ -3,16 +3,20 @@
 from typing import Any
 from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.db import connection
 from django.test import RequestFactory, TestCase
 from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
 from hasta_la_vista_money.reports.views import ReportsAnalyticMixin, ReportView
 
 User = get_user_model()
 
+ARUN_IN_WORKER = 'hasta_la_vista_money.users.services.cache.arun_in_worker'
+
 
 class ReportViewTest(TestCase):
     """Test cases for ReportView."""
@@ -28,62 +32,75 @@ class ReportViewTest(TestCase):
         self.client.force_login(self.user)
         with patch.object(ReportView, 'prepare_budget_charts') as mock_prepare:
             mock_prepare.return_value = {'test': 'data'}
-            view = ReportView()
-            view.request = self.factory.get('/')
-            view.request.user = self.user
-            response = view.get(view.request)
-            self.assertEqual(response.status_code, 200)
-
-    def test_prepare_budget_charts(self) -> None:
-        request = self.factory.get('/')
-        request.user = self.user
+            response = self.client.get(reverse('reports:list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'reports/reports.html')
+
+    def test_get_method_requires_login(self) -> None:
+        response = self.client.get(reverse('reports:list'))
+        self.assertEqual(response.status_code, 302)
+
+    async def test_prepare_budget_charts(self) -> None:
         view = ReportView()
-        view.request = request
-        charts_data = view.prepare_budget_charts(request)
+        charts_data = await view.prepare_budget_charts(
+            self.factory.get('/'),
+            self.user,
+        )
         self.assertIsInstance(charts_data, dict)
 
-    @patch('hasta_la_vista_money.reports.views.budget_charts')
+    @patch('hasta_la_vista_money.reports.views.abudget_charts')
     def test_prepare_budget_charts_avoids_extra_user_lookup(
         self,
         mock_budget_charts: Any,
     ) -> None:
-        request = self.factory.get('/')
-        request.user = self.user
         view = ReportView()
-        view.request = request
         mock_budget_charts.return_value = {}
 
         with CaptureQueriesContext(connection) as queries:
-            charts_data = view.prepare_budget_charts(request)
+            charts_data = async_to_sync(view.prepare_budget_charts)(
+                self.factory.get('/'),
+                self.user,
+            )
 
         self.assertEqual(charts_data['selected_period'], 'y')
         self.assertEqual(charts_data['finances_url'], '/finance/')
         self.assertEqual(len(queries), 0)
-        mock_budget_charts.assert_called_once_with(self.user, period='y')
+        mock_budget_charts.assert_awaited_once_with(self.user, period='y')
 
-    @patch('hasta_la_vista_money.reports.views.budget_charts')
-    def test_prepare_budget_charts_passes_selected_period(
+    @patch('hasta_la_vista_money.reports.views.abudget_charts')
+    async def test_prepare_budget_charts_passes_selected_period(
         self,
         mock_budget_charts: Any,
     ) -> None:
-        request = self.factory.get('/?period=m')
-        request.user = self.user
         view = ReportView()
-        view.request = request
         mock_budget_charts.return_value = {}
 
-        charts_data = view.prepare_budget_charts(request)
+        charts_data = await view.prepare_budget_charts(
+            self.factory.get('/?period=m'),
+            self.user,
+        )
 
         self.assertEqual(charts_data['selected_period'], 'm')
-        mock_budget_charts.assert_called_once_with(self.user, period='m')
+        mock_budget_charts.assert_awaited_once_with(self.user, period='m')
 
-    def test_prepare_budget_charts_anonymous_user(self) -> None:
-        request = self.factory.get('/')
-        request.user = AnonymousUser()
+    async def test_prepare_budget_charts_anonymous_user(self) -> None:
         view = ReportView()
-        view.request = request
         with self.assertRaises(TypeError):
-            view.prepare_budget_charts(request)
+            await view.prepare_budget_charts(
+                self.factory.get('/'),
+                AnonymousUser(),
+            )
+
+    async def test_cached_charts_are_served_without_rebuilding(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        url = reverse('reports:list')
+        await self.async_client.get(url)
+
+        with patch(ARUN_IN_WORKER) as run_in_worker:
+            response = await self.async_client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        run_in_worker.assert_not_called()
 
 
 class ReportsAnalyticMixinTest(TestCase):
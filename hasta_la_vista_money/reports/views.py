@@ -1,20 +1,30 @@
 from typing import Any, cast
 
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.messages.views import SuccessMessageMixin
 from django.http import HttpRequest, HttpResponse
-from django.shortcuts import render
 from django.urls import reverse, reverse_lazy
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, View
+from django.views.generic.base import TemplateResponseMixin
 
 from hasta_la_vista_money.reports.services.aggregation import (
-    budget_charts,
+    abudget_charts,
 )
+from hasta_la_vista_money.users.models import User
 
 
-class ReportView(LoginRequiredMixin, SuccessMessageMixin[Any], TemplateView):
+@method_decorator(login_required, name='get')
+class ReportView(SuccessMessageMixin[Any], TemplateResponseMixin, View):
+    """Reports dashboard with budget charts.
+
+    The handler is async: cached charts are read with a single cache
+    call and missing ones are built on the widget pool.
+    """
+
     template_name = 'reports/reports.html'
     no_permission_url = reverse_lazy('login')
     success_url = reverse_lazy('reports:list')
@@ -25,29 +35,24 @@ class ReportView(LoginRequiredMixin, SuccessMessageMixin[Any], TemplateView):
         ('all', _('Всё время')),
     )
 
-    def get(self, request: HttpRequest) -> HttpResponse:
-        budget_chart_data = self.prepare_budget_charts(request)
-        template_name = self.template_name
-        if template_name is None:
-            raise ValueError('template_name must be set')
-        return render(
-            request,
-            template_name,
-            budget_chart_data,
-        )
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        user = await request.auser()
+        budget_chart_data = await self.prepare_budget_charts(request, user)
+        return self.render_to_response(budget_chart_data)
 
-    def prepare_budget_charts(self, request: HttpRequest) -> dict[str, Any]:
+    async def prepare_budget_charts(
+        self,
+        request: HttpRequest,
+        user: AbstractBaseUser | AnonymousUser,
+    ) -> dict[str, Any]:
         """Prepare budget chart data."""
-        if isinstance(request.user, AnonymousUser):
+        if not isinstance(user, User):
             raise TypeError('User must be authenticated')
         selected_period = request.GET.get('period', 'y')
         allowed_periods = {choice[0] for choice in self.period_choices}
         if selected_period not in allowed_periods:
             selected_period = 'y'
-        charts_data = budget_charts(
-            request.user,
-            period=selected_period,
-        )
+        charts_data = await abudget_charts(user, period=selected_period)
         result = cast('dict[str, Any]', charts_data)
         result.update(
             {
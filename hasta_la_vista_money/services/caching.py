@@ -0,0 +1,318 @@
+"""Stampede-protected caching of expensive payloads.
+
+Payloads are stored with a soft expiry. Once it passes, every caller
+keeps getting the stale payload while one of them takes a per-key lock
+and queues the refresh on a small background pool, so no request waits
+for it. With ``CACHE_REFRESH_WORKERS`` set to zero the refresh runs in
+the calling thread after the stale payload is picked. When a payload is
+missing or no longer valid, the lock winner computes and stores it
+while callers losing the lock wait for that payload, polling with a
+growing delay. Only if the winner fails or takes longer than
+``CACHE_LOCK_WAIT`` seconds does a caller compute a copy of its own,
+which it does not store. Expiry is jittered so payloads cached together
+do not expire together.
+
+The lock is ``cache.add``, which is ``SET NX`` on Redis and an atomic
+add on the local-memory backend. It holds a token of its owner and is
+only deleted by that owner, so a refresh that outlived ``LOCK_TIMEOUT``
+cannot release a lock taken by another worker since.
+"""
+
+import contextvars
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Final, NamedTuple, cast
+
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from hasta_la_vista_money.core.metrics import CACHE_LOOKUPS
+from hasta_la_vista_money.core.spans import CACHE_SPAN, span
+
+LOCK_TIMEOUT: Final = 30
+JITTER_RATIO: Final = 0.1
+DEFAULT_REFRESH_WORKERS: Final = 2
+DEFAULT_LOCK_WAIT: Final = 10
+WAIT_FIRST_DELAY: Final = 0.05
+WAIT_MAX_DELAY: Final = 0.5
+
+HIT: Final = 'hit'
+MISS: Final = 'miss'
+STALE: Final = 'stale'
+WAIT: Final = 'wait'
+BYPASS: Final = 'bypass'
+OUTCOMES: Final = (HIT, MISS, STALE, WAIT, BYPASS)
+
+_MISSING: Final = object()
+_outcomes: Counter[tuple[str, str]] = Counter()
+_random = random.SystemRandom()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+logger = structlog.get_logger(__name__)
+
+
+class CachedPayload(NamedTuple):
+    """Payload stored together with its validity stamp and soft expiry."""
+
+    stamp: object
+    fresh_until: float
+    value: Any
+
+
+def _jittered(timeout: int) -> float:
+    return timeout * (1 + _random.uniform(0, JITTER_RATIO))
+
+
+def _count(metric: str, outcome: str) -> None:
+    _outcomes[metric, outcome] += 1
+    CACHE_LOOKUPS.labels(metric=metric, outcome=outcome).inc()
+
+
+def _lock_key(key: str) -> str:
+    return f'{key}:lock'
+
+
+def _store(
+    key: str,
+    stamp: object,
+    value: object,
+    timeout: int,
+    stale_timeout: int,
+) -> None:
+    fresh_for = _jittered(timeout)
+    with span(CACHE_SPAN):
+        cache.set(
+            key,
+            CachedPayload(stamp, time.time() + fresh_for, value),
+            int(fresh_for) + stale_timeout,
+        )
+
+
+def _acquire_lock(key: str) -> str | None:
+    """Take the lock of ``key`` and return its token, if it was free."""
+    token = uuid.uuid4().hex
+    with span(CACHE_SPAN):
+        added = cache.add(_lock_key(key), token, LOCK_TIMEOUT)
+    return token if added else None
+
+
+def _release_lock(key: str, token: str) -> None:
+    # A lock that expired and was taken again belongs to another owner.
+    lock_key = _lock_key(key)
+    with span(CACHE_SPAN):
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+class _Computation(NamedTuple):
+    """Payload to compute and how long to keep it."""
+
+    key: str
+    stamp: object
+    compute: Callable[[], Any]
+    timeout: int
+    stale_timeout: int
+
+
+def _compute_locked(job: _Computation, token: str) -> Any:
+    try:
+        value = job.compute()
+        _store(job.key, job.stamp, value, job.timeout, job.stale_timeout)
+        return value
+    finally:
+        _release_lock(job.key, token)
+
+
+def _valid_payload(entry: object, stamp: object) -> CachedPayload | None:
+    if isinstance(entry, CachedPayload) and entry.stamp == stamp:
+        return entry
+    return None
+
+
+def _lock_wait() -> float:
+    return float(getattr(settings, 'CACHE_LOCK_WAIT', DEFAULT_LOCK_WAIT))
+
+
+def _wait_for_payload(key: str, stamp: object) -> CachedPayload | None:
+    """Wait for the lock holder of ``key`` to store a payload.
+
+    Returns ``None`` once the lock is released without a valid payload,
+    or when the wait runs out.
+    """
+    deadline = time.monotonic() + _lock_wait()
+    delay = WAIT_FIRST_DELAY
+    while (remaining := deadline - time.monotonic()) > 0:
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, WAIT_MAX_DELAY)
+        with span(CACHE_SPAN):
+            found = cache.get_many([key, _lock_key(key)])
+        payload = _valid_payload(found.get(key), stamp)
+        if payload is not None:
+            return payload
+        if _lock_key(key) not in found:
+            return None
+    return None
+
+
+def _refresh_workers() -> int:
+    return int(
+        getattr(settings, 'CACHE_REFRESH_WORKERS', DEFAULT_REFRESH_WORKERS),
+    )
+
+
+def _refresh(job: _Computation, token: str) -> None:
+    try:
+        _compute_locked(job, token)
+    except Exception:
+        # The stale payload was already served; the next caller past
+        # the soft expiry tries again.
+        logger.exception('Cached payload refresh failed', key=job.key)
+
+
+def _refresh_in_worker(job: _Computation, token: str) -> None:
+    # Pool threads keep their connections between refreshes, subject to
+    # CONN_MAX_AGE as in the request cycle.
+    close_old_connections()
+    try:
+        _refresh(job, token)
+    finally:
+        close_old_connections()
+
+
+def _schedule_refresh(job: _Computation, token: str) -> None:
+    global _executor  # noqa: PLW0603
+    workers = _refresh_workers()
+    if workers <= 0:
+        _refresh(job, token)
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix='cache-refresh',
+            )
+        _executor.submit(
+            contextvars.copy_context().run,
+            _refresh_in_worker,
+            job,
+            token,
+        )
+
+
+def shutdown_refresh_pool(*, wait: bool = False) -> None:
+    """Shut the background refresh pool down; the next refresh starts one.
+
+    Args:
+        wait: Whether to wait for queued refreshes to finish.
+    """
+    global _executor
+    with _executor_lock:
+        retired, _executor = _executor, None
+    if retired is not None:
+        retired.shutdown(wait=wait)
+
+
+def fresh_entry(
+    entry: object,
+    stamp: object,
+    metric: str,
+) -> CachedPayload | None:
+    """Return a fetched payload if it can be served as a hit.
+
+    The payload must carry ``stamp`` and still be fresh; the hit is
+    counted under ``metric``. Anything else is left to
+    ``get_or_compute``, which also handles stale payloads and locking.
+    """
+    payload = _valid_payload(entry, stamp)
+    if payload is not None and time.time() < payload.fresh_until:
+        _count(metric, HIT)
+        return payload
+    return None
+
+
+def get_or_compute[T](
+    key: str,
+    compute: Callable[[], T],
+    *,
+    timeout: int,
+    metric: str,
+    stale_timeout: int | None = None,
+    stamp: object = None,
+    entry: object = _MISSING,
+) -> T:
+    """Return the cached payload under ``key`` or compute it once.
+
+    Args:
+        key: Cache key of the payload.
+        compute: Builds the payload.
+        timeout: Seconds the payload is served as fresh, before jitter.
+        metric: Name outcomes are counted under.
+        stale_timeout: Seconds a soft-expired payload may still be
+            served while it is refreshed in the background; defaults to
+            ``timeout``.
+        stamp: Validity stamp; a stored payload with another stamp is
+            treated as missing and never served, so callers wait for
+            the one being stored instead.
+        entry: Payload already fetched by the caller, if any.
+
+    Returns:
+        Cached, stale or freshly computed payload.
+    """
+    stale_for = timeout if stale_timeout is None else stale_timeout
+    if entry is _MISSING:
+        with span(CACHE_SPAN):
+            entry = cache.get(key)
+    payload = _valid_payload(entry, stamp)
+
+    if payload is not None and time.time() < payload.fresh_until:
+        _count(metric, HIT)
+        return cast('T', payload.value)
+
+    job = _Computation(key, stamp, compute, timeout, stale_for)
+    if payload is not None:
+        _count(metric, STALE)
+        token = _acquire_lock(key)
+        if token is not None:
+            _schedule_refresh(job, token)
+        return cast('T', payload.value)
+
+    token = _acquire_lock(key)
+    if token is None:
+        payload = _wait_for_payload(key, stamp)
+        if payload is not None:
+            _count(metric, WAIT)
+            return cast('T', payload.value)
+        # The holder failed or is stuck; take its place if it is gone.
+        token = _acquire_lock(key)
+    if token is not None:
+        _count(metric, MISS)
+        return cast('T', _compute_locked(job, token))
+
+    _count(metric, BYPASS)
+    return compute()
+
+
+def cache_outcomes() -> dict[str, dict[str, float]]:
+    """Return lookup counts by outcome and hit rate per metric.
+
+    Stale payloads and payloads waited for count as hits for the hit
+    rate. Counters are kept per worker process.
+    """
+    stats: dict[str, dict[str, float]] = {}
+    for metric in sorted({metric for metric, _ in _outcomes}):
+        counts: dict[str, float] = {
+            outcome: _outcomes[metric, outcome] for outcome in OUTCOMES
+        }
+        total = sum(counts.values())
+        served = counts[HIT] + counts[STALE] + counts[WAIT]
+        counts['hit_rate'] = served / total
+        stats[metric] = counts
+    return stats
@@ -14,6 +14,10 @@ from hasta_la_vista_money import constants
 from hasta_la_vista_money.budget.models import DateList, Planning
 from hasta_la_vista_money.transactions.models import Category
 from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.cache import DOMAIN_BUDGETS
+from hasta_la_vista_money.users.services.cache_invalidation import (
+    schedule_statistics_change,
+)
 
 
 class DateListGenerator:
@@ -121,6 +125,7 @@ class DateListGenerator:
         ]
         if to_create:
             DateList.objects.bulk_create(to_create)
+            schedule_statistics_change(self.user.pk, DOMAIN_BUDGETS)
 
     def _ensure_planning(self, months: Sequence[date]) -> None:
         """Create missing Planning records for specified type.
@@ -160,6 +165,7 @@ class DateListGenerator:
 
         if to_create:
             Planning.objects.bulk_create(to_create)
+            schedule_statistics_change(self.user.pk, DOMAIN_BUDGETS)
 
 
 def generate_date_list(
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections.abc import Callable
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from hasta_la_vista_money.services.caching import (
+    CachedPayload,
+    cache_outcomes,
+    get_or_compute,
+    shutdown_refresh_pool,
+)
+
+
+class GetOrComputeTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.computed = 0
+
+    def _compute(self) -> int:
+        self.computed += 1
+        return self.computed
+
+    def _get(self, metric: str, stamp: object = None) -> int:
+        return get_or_compute(
+            'payload',
+            self._compute,
+            timeout=60,
+            metric=metric,
+            stamp=stamp,
+        )
+
+    def _hold_lock(self) -> None:
+        cache.add('payload:lock', 1)
+
+    def test_hit_after_miss(self) -> None:
+        self._get('hit_after_miss')
+
+        self.assertEqual(self._get('hit_after_miss'), 1)
+        outcomes = cache_outcomes()['hit_after_miss']
+        self.assertEqual((outcomes['miss'], outcomes['hit']), (1, 1))
+        self.assertEqual(outcomes['hit_rate'], 0.5)
+        self.assertIsNone(cache.get('payload:lock'))
+
+    def test_soft_expired_payload_served_stale_while_locked(self) -> None:
+        cache.set('payload', CachedPayload(None, time.time() - 1, 7))
+        self._hold_lock()
+
+        self.assertEqual(self._get('stale_payload'), 7)
+        self.assertEqual(self.computed, 0)
+        self.assertEqual(cache_outcomes()['stale_payload']['stale'], 1)
+
+    def test_soft_expired_payload_served_stale_and_refreshed(self) -> None:
+        cache.set('payload', CachedPayload(None, time.time() - 1, 7))
+
+        self.assertEqual(self._get('expired_payload'), 7)
+        self.assertEqual(cache.get('payload').value, 1)
+        self.assertIsNone(cache.get('payload:lock'))
+
+    @override_settings(CACHE_REFRESH_WORKERS=1)
+    def test_stale_payload_refreshed_in_background(self) -> None:
+        cache.set('payload', CachedPayload(None, time.time() - 1, 7))
+        self.addCleanup(shutdown_refresh_pool, wait=True)
+        release = threading.Event()
+
+        def compute() -> int:
+            release.wait(5)
+            return 8
+
+        value = get_or_compute(
+            'payload',
+            compute,
+            timeout=60,
+            metric='background_refresh',
+        )
+
+        self.assertEqual(value, 7)
+        self.assertEqual(cache.get('payload').value, 7)
+        release.set()
+        shutdown_refresh_pool(wait=True)
+        self.assertEqual(cache.get('payload').value, 8)
+        self.assertIsNone(cache.get('payload:lock'))
+
+    def _later(self, func: Callable[[], object]) -> None:
+        timer = threading.Timer(0.1, func)
+        timer.start()
+        self.addCleanup(timer.join)
+
+    def test_invalidated_payload_waits_for_lock_holder(self) -> None:
+        cache.set('payload', CachedPayload('old', time.time() + 60, 7))
+        self._hold_lock()
+        self._later(
+            lambda: cache.set(
+                'payload',
+                CachedPayload('new', time.time() + 60, 9),
+            ),
+        )
+
+        self.assertEqual(self._get('invalidated', stamp='new'), 9)
+        self.assertEqual(self.computed, 0)
+        self.assertEqual(cache_outcomes()['invalidated']['wait'], 1)
+
+    def test_released_lock_without_payload_is_taken_over(self) -> None:
+        self._hold_lock()
+        self._later(lambda: cache.delete('payload:lock'))
+
+        self.assertEqual(self._get('holder_failed'), 1)
+        self.assertEqual(cache_outcomes()['holder_failed']['miss'], 1)
+        self.assertEqual(cache.get('payload').value, 1)
+
+    @override_settings(CACHE_LOCK_WAIT=0.1)
+    def test_stuck_lock_holder_is_bypassed(self) -> None:
+        cache.set('payload', CachedPayload('old', time.time() + 60, 7))
+        self._hold_lock()
+
+        self.assertEqual(self._get('stuck_holder', stamp='new'), 1)
+        self.assertEqual(cache_outcomes()['stuck_holder']['bypass'], 1)
+        # Only the lock holder stores the new payload.
+        self.assertEqual(cache.get('payload').stamp, 'old')
+
+    def test_lock_taken_over_by_another_owner_is_kept(self) -> None:
+        def compute() -> int:
+            # The lock expired meanwhile and another worker took it.
+            cache.set('payload:lock', 'other-owner')
+            return 3
+
+        get_or_compute('payload', compute, timeout=60, metric='taken_over')
+
+        self.assertEqual(cache.get('payload:lock'), 'other-owner')
@@ -0,0 +1,114 @@
+from typing import Any, ClassVar
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from hasta_la_vista_money.services.views import (
+    build_category_tree,
+    get_cached_category_tree,
+    invalidate_category_tree_cache,
+)
+from hasta_la_vista_money.transactions.models import Category, TransactionType
+from hasta_la_vista_money.users.models import User
+
+
+def _row(
+    category_id: int,
+    name: str,
+    parent: tuple[int, str] | None = None,
+) -> dict[str, object]:
+    return {
+        'id': category_id,
+        'name': name,
+        'parent_category': parent[0] if parent else None,
+        'parent_category__name': parent[1] if parent else None,
+    }
+
+
+class BuildCategoryTreeTest(TestCase):
+    def test_links_children_in_any_input_order(self) -> None:
+        tree = build_category_tree(
+            [
+                _row(3, 'Электричество', (2, 'ЖКХ')),
+                _row(2, 'ЖКХ', (1, 'Дом')),
+                _row(1, 'Дом'),
+                _row(4, 'Еда'),
+            ],
+        )
+
+        self.assertEqual([node['name'] for node in tree], ['Дом', 'Еда'])
+        home = tree[0]
+        self.assertEqual(home['total_children_count'], 2)
+        self.assertEqual(home['children'][0]['total_children_count'], 1)
+        self.assertEqual(
+            home['children'][0]['children'][0]['name'],
+            'Электричество',
+        )
+
+    def test_drops_orphans_and_cycles(self) -> None:
+        tree = build_category_tree(
+            [
+                _row(1, 'Дом'),
+                _row(2, 'Потерянная', (99, 'Удалённая')),
+                _row(3, 'А', (4, 'Б')),
+                _row(4, 'Б', (3, 'А')),
+            ],
+        )
+
+        self.assertEqual(tree[0]['name'], 'Дом')
+        self.assertEqual(len(tree), 1)
+        self.assertEqual(tree[0]['total_children_count'], 0)
+
+
+class CachedCategoryTreeTest(TestCase):
+    fixtures: ClassVar[list[str]] = [  # type: ignore[misc]
+        'users.yaml',
+    ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.get(pk=1)
+        self.home = self._category('Дом')
+        self.utilities = self._category('ЖКХ', parent=self.home)
+        self._category('Электричество', parent=self.utilities)
+
+    def _category(self, name: str, parent: Category | None = None) -> Category:
+        return Category.objects.create(
+            user=self.user,
+            name=name,
+            type=TransactionType.EXPENSE,
+            parent_category=parent,
+        )
+
+    def _tree(self, depth: int) -> list[dict[str, Any]]:
+        return get_cached_category_tree(
+            user_id=self.user.pk,
+            category_type=TransactionType.EXPENSE,
+            depth=depth,
+        )
+
+    def test_single_query_serves_every_depth(self) -> None:
+        with self.assertNumQueries(1):
+            shallow = self._tree(1)
+        with self.assertNumQueries(0):
+            deep = self._tree(3)
+
+        self.assertNotIn('children', shallow[0])
+        self.assertEqual(shallow[0]['total_children_count'], 2)
+        utilities = deep[0]['children'][0]
+        self.assertNotIn('children', utilities['children'][0])
+
+    def test_version_bump_invalidates_every_depth(self) -> None:
+        self._tree(2)
+        self._tree(3)
+        self._category('Еда')
+
+        invalidate_category_tree_cache(
+            self.user.pk,
+            TransactionType.EXPENSE,
+        )
+
+        with self.assertNumQueries(1):
+            names = [node['name'] for node in self._tree(2)]
+        self.assertIn('Еда', names)
+        self.assertEqual(len(self._tree(3)), 2)
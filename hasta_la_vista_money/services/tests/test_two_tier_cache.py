@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from hasta_la_vista_money.services.two_tier_cache import TwoTierCache
+
+
+@override_settings(
+    TWO_TIER_CACHE_LOCAL_TIMEOUT=60,
+    TWO_TIER_CACHE_MAX_ENTRIES=2,
+)
+class TwoTierCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.tiers = TwoTierCache()
+        self.loads = 0
+
+    def _load(self) -> int:
+        self.loads += 1
+        return self.loads
+
+    def _get(self, key: str = 'hot_key') -> int:
+        return self.tiers.get_or_set(key, self._load, 300)
+
+    def test_local_tier_serves_without_shared_cache(self) -> None:
+        self._get()
+        cache.clear()
+
+        self.assertEqual(self._get(), 1)
+        stats = self.tiers.stats()
+        self.assertEqual(stats['local']['hits'], 1)
+        self.assertEqual(stats['shared']['misses'], 1)
+
+    def test_shared_tier_fills_local_tier(self) -> None:
+        cache.set('hot_key', 7)
+
+        self.assertEqual(self._get(), 7)
+        self.assertEqual(self.loads, 0)
+        self.assertEqual(self.tiers.stats()['shared']['hits'], 1)
+
+    def test_delete_drops_both_tiers(self) -> None:
+        self._get()
+        self.tiers.delete('hot_key')
+
+        self.assertIsNone(cache.get('hot_key'))
+        self.assertEqual(self._get(), 2)
+
+    def test_evict_keeps_shared_value(self) -> None:
+        self._get()
+        cache.set('hot_key', 5)
+        self.tiers.evict('hot_key')
+
+        self.assertEqual(self._get(), 5)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        self._get('first')
+        self._get('second')
+        self._get('first')
+        self._get('third')
+        cache.clear()
+
+        self.assertEqual(self._get('first'), 1)
+        self.assertEqual(self._get('second'), 4)
+        self.assertEqual(self.tiers.stats()['local']['evictions'], 2)
+
+    @override_settings(TWO_TIER_CACHE_LOCAL_TIMEOUT=0)
+    def test_zero_timeout_disables_local_tier(self) -> None:
+        self._get()
+        cache.clear()
+
+        self.assertEqual(self._get(), 2)
+        self.assertEqual(self.tiers.stats()['local']['size'], 0)
@@ -0,0 +1,246 @@
+"""In-process cache tier in front of the Django cache.
+
+Read-mostly keys consulted on every request, such as whether a
+superuser exists or which family groups a user belongs to, are kept in
+a small per-process LRU with a TTL. Misses fall through to the shared
+Django cache and then to the loader.
+
+Invalidation deletes the shared entry and publishes the key on a Redis
+channel; every worker process listens on it and evicts its own copy.
+Without Redis (local development) only the current process is notified
+and other processes rely on the local TTL. The local tier is sized by
+``TWO_TIER_CACHE_MAX_ENTRIES`` and expires entries after
+``TWO_TIER_CACHE_LOCAL_TIMEOUT`` seconds; a timeout of zero disables it.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from typing import Any, Final, cast
+
+import structlog
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from hasta_la_vista_money.core.metrics import CACHE_TIER_LOOKUPS
+from hasta_la_vista_money.core.spans import CACHE_SPAN, span
+
+LOCAL_MAX_ENTRIES: Final = 2048
+LOCAL_TIMEOUT: Final = 60
+INVALIDATION_CHANNEL: Final = 'two_tier_cache:invalidate'
+RECONNECT_DELAY: Final = 5
+
+_MISSING: Final = object()
+
+logger = structlog.get_logger(__name__)
+
+
+def _redis_client() -> Any | None:
+    try:
+        from django_redis import get_redis_connection  # noqa: PLC0415
+    except ImportError:
+        return None
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+class TwoTierCache:
+    """Per-process LRU/TTL tier in front of the shared Django cache."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts: Counter[tuple[str, str]] = Counter()
+        self._listener_pid: int | None = None
+
+    def get_or_set[T](
+        self,
+        key: str,
+        default: Callable[[], T],
+        timeout: int | None,
+    ) -> T:
+        """Return ``key`` from the nearest tier, loading it on a miss.
+
+        Args:
+            key: Cache key shared by both tiers.
+            default: Loads the value when neither tier has it.
+            timeout: Seconds the value lives in the shared cache;
+                ``None`` keeps it until invalidated.
+        """
+        self._ensure_listener()
+        value = self._get_local(key)
+        if value is not _MISSING:
+            return cast('T', value)
+        return self._get_or_set_shared(key, default, timeout)
+
+    async def aget_or_set[T](
+        self,
+        key: str,
+        default: Callable[[], T],
+        timeout: int | None,
+    ) -> T:
+        """Async variant of ``get_or_set`` for async views and middleware.
+
+        A local hit is served on the event loop; shared cache and loader
+        calls run in a worker thread.
+        """
+        self._ensure_listener()
+        value = self._get_local(key)
+        if value is not _MISSING:
+            return cast('T', value)
+        return await sync_to_async(self._get_or_set_shared)(
+            key,
+            default,
+            timeout,
+        )
+
+    def _get_or_set_shared[T](
+        self,
+        key: str,
+        default: Callable[[], T],
+        timeout: int | None,
+    ) -> T:
+        with span(CACHE_SPAN):
+            value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            self._count('shared', 'misses')
+            value = default()
+            # ``add`` keeps a value stored concurrently by another worker.
+            with span(CACHE_SPAN):
+                cache.add(key, value, timeout)
+                value = cache.get(key, value)
+        else:
+            self._count('shared', 'hits')
+
+        local_timeout = self.local_timeout
+        if timeout is not None:
+            local_timeout = min(local_timeout, timeout)
+        if local_timeout > 0:
+            self._set_local(key, value, local_timeout)
+        return cast('T', value)
+
+    def delete(self, *keys: str) -> None:
+        """Delete keys from the shared cache and from every process."""
+        with span(CACHE_SPAN):
+            cache.delete_many(keys)
+        self.evict(*keys)
+
+    def evict(self, *keys: str) -> None:
+        """Drop local copies of keys in every process.
+
+        For keys whose shared value was already updated in place, such
+        as version counters bumped with ``cache.incr``.
+        """
+        self._evict_local(keys)
+        client = _redis_client()
+        if client is not None:
+            client.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+
+    @property
+    def local_timeout(self) -> int:
+        """Seconds a value is kept in the local tier."""
+        return cast(
+            'int',
+            getattr(settings, 'TWO_TIER_CACHE_LOCAL_TIMEOUT', LOCAL_TIMEOUT),
+        )
+
+    @property
+    def max_entries(self) -> int:
+        """Number of values the local tier holds before evicting."""
+        return cast(
+            'int',
+            getattr(settings, 'TWO_TIER_CACHE_MAX_ENTRIES', LOCAL_MAX_ENTRIES),
+        )
+
+    def clear_local(self) -> None:
+        """Drop every local copy held by this process."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return hit and miss counts per tier for this process."""
+        with self._lock:
+            size = len(self._entries)
+        return {
+            'local': {
+                'hits': self._counts['local', 'hits'],
+                'misses': self._counts['local', 'misses'],
+                'evictions': self._counts['local', 'evictions'],
+                'size': size,
+                'max_entries': self.max_entries,
+            },
+            'shared': {
+                'hits': self._counts['shared', 'hits'],
+                'misses': self._counts['shared', 'misses'],
+            },
+        }
+
+    def _count(self, tier: str, result: str) -> None:
+        self._counts[tier, result] += 1
+        CACHE_TIER_LOOKUPS.labels(tier=tier, result=result).inc()
+
+    def _get_local(self, key: str) -> object:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._count('local', 'misses')
+                return _MISSING
+            self._entries.move_to_end(key)
+            self._count('local', 'hits')
+            return entry[1]
+
+    def _set_local(self, key: str, value: object, timeout: int) -> None:
+        max_entries = self.max_entries
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                self._count('local', 'evictions')
+
+    def _evict_local(self, keys: tuple[str, ...] | list[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def _ensure_listener(self) -> None:
+        # Checked against the pid so that forked workers start their own
+        # listener instead of inheriting a dead thread.
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._entries.clear()
+        client = _redis_client()
+        if client is not None:
+            threading.Thread(
+                target=self._listen,
+                args=(client,),
+                name='two-tier-cache-invalidation',
+                daemon=True,
+            ).start()
+
+    def _listen(self, client: Any) -> None:
+        while True:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    self._evict_local(json.loads(message['data']))
+            except Exception:
+                logger.exception('Two-tier cache invalidation listener failed')
+            # Invalidations published while disconnected are lost.
+            self.clear_local()
+            time.sleep(RECONNECT_DELAY)
+
+
+local_cache = TwoTierCache()
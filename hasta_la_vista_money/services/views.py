@@ -1,166 +1,156 @@
-from collections import defaultdict
-from collections.abc import Generator, Iterable
+import time
+from collections.abc import Iterable
 from datetime import datetime
-from typing import Any, cast
+from typing import Any
 
 from django.core.cache import cache
-from django.db.models import Count, Model, QuerySet, Sum
+from django.db.models import Count, Sum
 from django.db.models.functions import TruncMonth
 
+from hasta_la_vista_money.services.two_tier_cache import local_cache
+from hasta_la_vista_money.transactions.models import Category
 from hasta_la_vista_money.users.models import User
 
+CATEGORY_TREE_CACHE_TIMEOUT = 300
+_CATEGORY_TREE_FIELDS = (
+    'id',
+    'name',
+    'parent_category',
+    'parent_category__name',
+)
 
-class CategoryTreeBuilder:
-    """Build category tree and count all descendants.
 
-    Constructs hierarchical category structure with total children count
-    for each category node.
-    """
+def _category_tree_version_key(user_id: int, category_type: str) -> str:
+    return f'category_tree_version_{category_type}_{user_id}'
 
-    def __init__(
-        self,
-        categories: list[dict[str, Any]] | QuerySet[Model, Model],
-        depth: int,
-    ) -> None:
-        """Initialize CategoryTreeBuilder.
-
-        Args:
-            categories: List or QuerySet of category dictionaries.
-            depth: Maximum depth for tree building.
-        """
-        self.depth = depth
-        self.cats = (
-            list(categories) if hasattr(categories, 'values') else categories
-        )
-        self.children_map: dict[int | None, list[dict[str, Any]]] = defaultdict(
-            list,
-        )
-        for c in self.cats:
-            if isinstance(c, dict) and 'parent_category' in c:
-                parent_id: int | None = c.get('parent_category')
-                self.children_map[parent_id].append(c)
-        self._memo: dict[int, int] = {}
-
-    def count_desc(self, cid: int) -> int:
-        """Count all descendants for category.
-
-        Args:
-            cid: Category ID.
-
-        Returns:
-            Total number of descendants including nested children.
-        """
-        cached = self._memo.get(cid)
-        if cached is not None:
-            return cached
-        total = 0
-        for ch in self.children_map.get(cid, ()):
-            total += 1 + self.count_desc(ch['id'])
-        self._memo[cid] = total
-        return total
-
-    def build(
-        self,
-        parent_id: int | None,
-        current_depth: int,
-    ) -> Generator[dict[str, Any], None, None]:
-        """Build category tree starting from parent.
-
-        Args:
-            parent_id: Parent category ID (None for root).
-            current_depth: Current depth in tree.
-
-        Yields:
-            Category dictionaries with children and total_children_count.
-        """
-        for cat in self.children_map.get(parent_id, ()):
-            node = {
-                'id': cat['id'],
-                'name': cat['name'],
-                'parent_category': cat['parent_category'],
-                'parent_category__name': cat['parent_category__name'],
-                'total_children_count': self.count_desc(cat['id']),
-            }
-            if current_depth < self.depth:
-                node['children'] = self.build(cat['id'], current_depth + 1)
-            yield node
 
+def _category_tree_version(user_id: int, category_type: str) -> int:
+    """Return the current category tree version, creating it if missing.
 
-def build_category_tree(
-    categories: list[dict[str, Any]] | QuerySet[Model, Model],
-    parent_id: int | None = None,
-    depth: int = 2,
-    current_depth: int = 1,
-) -> Generator[dict[str, Any], None, None]:
-    """Build category tree for display.
+    A missing version starts from the current time rather than from one,
+    so trees cached before the version key was evicted are never reused.
+    """
+    return local_cache.get_or_set(
+        _category_tree_version_key(user_id, category_type),
+        time.time_ns,
+        None,
+    )
 
-    Creates hierarchical category structure with total_children_count
-    field indicating number of all nested subcategories.
 
-    Args:
-        categories: List or QuerySet of category dictionaries.
-        parent_id: Parent category ID (None for root).
-        depth: Maximum tree depth.
-        current_depth: Current depth in tree.
+def invalidate_category_tree_cache(user_id: int, category_type: str) -> None:
+    """Invalidate cached category trees of a user by bumping their version.
 
-    Yields:
-        Category dictionaries with hierarchical structure.
+    Args:
+        user_id: ID of the category owner.
+        category_type: Type of categories (expense/income).
     """
-    builder = CategoryTreeBuilder(categories=categories, depth=depth)
-    yield from builder.build(parent_id=parent_id, current_depth=current_depth)
+    key = _category_tree_version_key(user_id, category_type)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    local_cache.evict(key)
 
 
-def _convert_generators_to_lists(
-    node: dict[str, Any],
-) -> dict[str, Any]:
-    """Recursively convert generators to lists for serialization.
+def build_category_tree(
+    categories: Iterable[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Build the full category tree from a flat list in O(n).
+
+    Nodes are linked to their parents through a parent-id hash map and
+    ``total_children_count`` is accumulated bottom-up, so the whole tree
+    is built in two linear passes regardless of its depth.
 
     Args:
-        node: Category tree node.
+        categories: Category dictionaries with ``id``, ``name``,
+            ``parent_category`` and ``parent_category__name`` keys.
 
     Returns:
-        Node with generators converted to lists.
+        Root category nodes; every node has ``children`` and
+        ``total_children_count``.
+    """
+    nodes = {
+        category['id']: {
+            'id': category['id'],
+            'name': category['name'],
+            'parent_category': category['parent_category'],
+            'parent_category__name': category['parent_category__name'],
+            'total_children_count': 0,
+            'children': [],
+        }
+        for category in categories
+    }
+    roots: list[dict[str, Any]] = []
+    for node in nodes.values():
+        parent = nodes.get(node['parent_category'])
+        if node['parent_category'] is None:
+            roots.append(node)
+        elif parent is not None:
+            parent['children'].append(node)
+
+    ordered = list(roots)
+    for node in ordered:
+        ordered.extend(node['children'])
+    for node in reversed(ordered):
+        parent = nodes.get(node['parent_category'])
+        if parent is not None:
+            parent['total_children_count'] += node['total_children_count'] + 1
+    return roots
+
+
+def _slice_category_tree(
+    nodes: list[dict[str, Any]],
+    depth: int,
+    current_depth: int = 1,
+) -> list[dict[str, Any]]:
+    """Copy tree nodes down to ``depth`` levels.
+
+    Nodes above the last level keep ``children``; nodes on the last
+    level have no ``children`` key, matching the template contract.
     """
-    result = dict(node)
-    if 'children' in result and hasattr(result['children'], '__iter__'):
-        if not isinstance(result['children'], list | tuple):
-            result['children'] = list(result['children'])
-        result['children'] = [
-            _convert_generators_to_lists(child) for child in result['children']
-        ]
-    return result
+    sliced = []
+    for node in nodes:
+        item = {key: value for key, value in node.items() if key != 'children'}
+        if current_depth < depth:
+            item['children'] = _slice_category_tree(
+                node['children'],
+                depth,
+                current_depth + 1,
+            )
+        sliced.append(item)
+    return sliced
 
 
 def get_cached_category_tree(
     user_id: int,
     category_type: str,
-    categories: list[dict[str, Any]] | QuerySet[Model, Model],
     depth: int = 2,
 ) -> list[dict[str, Any]]:
     """
     Получение кешированного дерева категорий.
 
+    Полное дерево строится одним запросом и хранится один раз на
+    (пользователь, тип, версия); глубина применяется при чтении.
+
     Args:
         user_id: ID пользователя
         category_type: Тип категорий (expense/income)
-        categories: Список или QuerySet категорий
         depth: Глубина дерева
 
     Returns:
         Список категорий в виде дерева с подсчитанными потомками
     """
-    cache_key = f'category_tree_{category_type}_{user_id}_{depth}'
-    cached_tree = cache.get(cache_key)
-
-    if cached_tree is not None:
-        return cast('list[dict[str, Any]]', cached_tree)
-
-    tree_generator = build_category_tree(categories, depth=depth)
-    tree = [_convert_generators_to_lists(node) for node in tree_generator]
-
-    cache.set(cache_key, tree, 300)
-
-    return tree
+    version = _category_tree_version(user_id, category_type)
+    tree = local_cache.get_or_set(
+        f'category_tree_{category_type}_{user_id}_v{version}',
+        lambda: build_category_tree(
+            Category.objects.filter(user_id=user_id, type=category_type)
+            .order_by('parent_category_id')
+            .values(*_CATEGORY_TREE_FIELDS),
+        ),
+        CATEGORY_TREE_CACHE_TIMEOUT,
+    )
+    return _slice_category_tree(tree, depth)
 
 
 def collect_info_receipt(
@@ -1,6 +1,7 @@
 from importlib import import_module
 
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class SystemConfig(AppConfig):
@@ -8,4 +9,28 @@ class SystemConfig(AppConfig):
     name = 'hasta_la_vista_money.system'
 
     def ready(self) -> None:
+        from hasta_la_vista_money.system.services.query_budget import (
+            connect_query_recorder,
+            connect_task_budgets,
+        )
+
         import_module('hasta_la_vista_money.system.signals')
+        connect_query_recorder()
+        if settings.QUERY_BUDGET_ENABLED:
+            connect_task_budgets()
+        if settings.OTEL_SPANS_ENABLED:
+            from hasta_la_vista_money.core.spans import configure_tracing
+
+            configure_tracing(
+                settings.OTEL_SERVICE_NAME,
+                settings.OTEL_EXPORTER_OTLP_ENDPOINT,
+            )
+        if settings.METRICS_ENABLED:
+            from hasta_la_vista_money.core.metrics import observe_span
+            from hasta_la_vista_money.core.spans import add_span_listener
+            from hasta_la_vista_money.system.services.metrics import (
+                connect_task_metrics,
+            )
+
+            add_span_listener(observe_span)
+            connect_task_metrics()
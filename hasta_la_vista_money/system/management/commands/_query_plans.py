@@ -0,0 +1,426 @@
+"""Snapshots of the query plans of critical code paths.
+
+Each entry of the registry runs a code path of the aggregation, budget,
+statistics or deduplication services. The SELECT statements it sends
+are captured and explained by the database, PostgreSQL with
+``EXPLAIN (FORMAT JSON)`` and SQLite with ``EXPLAIN QUERY PLAN``. Plans
+are reduced to their shape: the tree of node types with the tables and
+indexes they read, without costs or row estimates.
+
+Comparing the shapes with snapshots committed in
+``benchmarks/query_plans/<vendor>.json`` reports every plan that changed
+and every full scan of a large table. Plans depend on the data, so they
+are captured on a dataset seeded by ``generate_dataset`` and analyzed
+before explaining.
+
+On the small seeded tables PostgreSQL would prefer sequential and bitmap
+scans that a production sized table never gets, so both are disabled
+while explaining: plans show the index a query would use, and a
+remaining ``Seq Scan`` means that no index applies. PostgreSQL costs
+also count the dead rows left behind by rolled back transactions, so
+PostgreSQL snapshots are captured on a freshly migrated database.
+
+The module backs the ``snapshot_query_plans`` command; the underscore
+keeps Django from listing it as a command of its own.
+"""
+
+import json
+import re
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Final, NotRequired, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from config.containers import ApplicationContainer
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.budget.models import DateList
+from hasta_la_vista_money.budget.services.budget import get_categories
+from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.reports.services.aggregation import budget_charts
+from hasta_la_vista_money.system.services.benchmarks import isolated_cache
+from hasta_la_vista_money.system.services.dataset import (
+    DatasetSpec,
+    generate_dataset,
+)
+from hasta_la_vista_money.transactions.models import TransactionType
+from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.bank_statement import (
+    transaction_already_exists,
+)
+from hasta_la_vista_money.users.services.monthly_statistics_service import (
+    StatisticsFilters,
+    get_dashboard_summary_statistics,
+)
+from hasta_la_vista_money.users.services.summary_statistics_service import (
+    get_user_detailed_statistics,
+)
+from hasta_la_vista_money.users.tasks import (
+    find_probable_duplicates,
+    is_exact_duplicate,
+)
+
+SNAPSHOT_SPEC: Final = DatasetSpec(
+    users=2,
+    family_size=2,
+    months=12,
+    transactions=3_000,
+    receipts=100,
+    transfers=100,
+    budget_months=6,
+    prefix='plans',
+)
+LARGE_TABLES: Final = frozenset(
+    {
+        'transactions_transaction',
+        'receipts_receipt',
+        'receipts_product',
+        'receipts_receipt_product',
+        'finance_account_transfermoneylog',
+        'budget_planning',
+        'budget_budget',
+        'transactions_categoryclosure',
+    },
+)
+_SQLITE_SCAN: Final = re.compile(r'^SCAN (\w+)')
+_EXPLAINED: Final = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+
+
+class PlanNode(TypedDict):
+    node: str
+    relation: NotRequired[str]
+    children: NotRequired[list['PlanNode']]
+
+
+class QuerySnapshot(TypedDict):
+    sql: str
+    plan: list[PlanNode]
+
+
+type Snapshots = dict[str, list[QuerySnapshot]]
+
+
+@dataclass
+class PlanContext:
+    """Data the code paths of the registry run on."""
+
+    user: User
+    account: Account
+
+
+type QueryPath = Callable[[PlanContext], object]
+
+QUERY_PATHS: dict[str, QueryPath] = {}
+
+
+def query_path(name: str) -> Callable[[QueryPath], QueryPath]:
+    """Register a code path whose query plans are snapshotted."""
+
+    def register(func: QueryPath) -> QueryPath:
+        QUERY_PATHS[name] = func
+        return func
+
+    return register
+
+
+@query_path('reports.budget_charts')
+def _budget_charts(context: PlanContext) -> object:
+    return budget_charts(context.user, 'y')
+
+
+@query_path('budget.aggregate_budget_data')
+def _aggregate_budget_data(context: PlanContext) -> object:
+    months = sorted(
+        DateList.objects.filter(user=context.user).values_list(
+            'date',
+            flat=True,
+        ),
+    )
+    expense = list(get_categories(context.user, TransactionType.EXPENSE))
+    income = list(get_categories(context.user, TransactionType.INCOME))
+    service = ApplicationContainer().budget.budget_service()
+    return service.aggregate_budget_data(context.user, months, expense, income)
+
+
+@query_path('users.dashboard_summary')
+def _dashboard_summary(context: PlanContext) -> object:
+    return get_dashboard_summary_statistics(
+        context.user,
+        ApplicationContainer(),
+    )
+
+
+@query_path('users.detailed_statistics')
+def _detailed_statistics(context: PlanContext) -> object:
+    return get_user_detailed_statistics(
+        context.user,
+        container=ApplicationContainer(),
+        stats_filter=StatisticsFilters(),
+    )
+
+
+@query_path('users.exact_duplicate_by_source_ref')
+def _exact_duplicate_by_source_ref(context: PlanContext) -> object:
+    return is_exact_duplicate(
+        account=context.account,
+        source_ref='100001',
+        source_file_hash='',
+        source_row_position=0,
+    )
+
+
+@query_path('users.exact_duplicate_by_row')
+def _exact_duplicate_by_row(context: PlanContext) -> object:
+    return is_exact_duplicate(
+        account=context.account,
+        source_ref=None,
+        source_file_hash='0' * 64,
+        source_row_position=3,
+    )
+
+
+@query_path('users.probable_duplicates')
+def _probable_duplicates(context: PlanContext) -> object:
+    return find_probable_duplicates(
+        account=context.account,
+        user=context.user,
+        type_value=TransactionType.EXPENSE,
+        abs_amount=Decimal('100.00'),
+        trans_date=_moment(),
+        match_calendar_date=False,
+        description='Оплата в магазине',
+        current_file_hash='0' * 64,
+    )
+
+
+@query_path('users.probable_duplicates_by_day')
+def _probable_duplicates_by_day(context: PlanContext) -> object:
+    return find_probable_duplicates(
+        account=context.account,
+        user=context.user,
+        type_value=TransactionType.EXPENSE,
+        abs_amount=Decimal('100.00'),
+        trans_date=_moment(),
+        match_calendar_date=True,
+        description='Оплата в магазине',
+        current_file_hash='0' * 64,
+    )
+
+
+@query_path('users.transaction_already_exists')
+def _transaction_exists(context: PlanContext) -> object:
+    return transaction_already_exists(
+        account=context.account,
+        user=context.user,
+        type_value=TransactionType.EXPENSE,
+        abs_amount=Decimal('100.00'),
+        trans_date=_moment(),
+        source_ref='100001',
+    )
+
+
+def _moment() -> datetime:
+    return timezone.now() - timedelta(days=30)
+
+
+def plan_context(spec: DatasetSpec = SNAPSHOT_SPEC) -> PlanContext:
+    """Return the context of the first user of a seeded dataset."""
+    user = User.objects.get(username=f'{spec.prefix}0000')
+    account = Account.objects.filter(
+        user=user,
+        type_account=constants.ACCOUNT_TYPE_DEBIT_CARD,
+    ).earliest('pk')
+    return PlanContext(user=user, account=account)
+
+
+def analyze() -> None:
+    """Refresh the planner statistics after seeding."""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+@contextmanager
+def _captured() -> Iterator[list[tuple[str, Any]]]:
+    statements: list[tuple[str, Any]] = []
+
+    def capture(
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        if not many and _EXPLAINED.match(sql):
+            statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        yield statements
+
+
+def _postgresql_node(node: dict[str, Any]) -> PlanNode:
+    label = node['Node Type']
+    if 'Index Name' in node:
+        label = f'{label} using {node["Index Name"]}'
+    shaped: PlanNode = {'node': label}
+    if 'Relation Name' in node:
+        shaped['relation'] = node['Relation Name']
+    children = [_postgresql_node(child) for child in node.get('Plans', [])]
+    if children:
+        shaped['children'] = children
+    return shaped
+
+
+def _sqlite_plan(rows: list[tuple[Any, ...]]) -> list[PlanNode]:
+    roots: list[PlanNode] = []
+    by_id: dict[int, PlanNode] = {}
+    for node_id, parent, _unused, detail in rows:
+        shaped: PlanNode = {'node': detail}
+        match = _SQLITE_SCAN.match(detail)
+        if match:
+            shaped['relation'] = match.group(1)
+        by_id[node_id] = shaped
+        parent_node = by_id.get(parent)
+        if parent_node is None:
+            roots.append(shaped)
+        else:
+            parent_node.setdefault('children', []).append(shaped)
+    return roots
+
+
+def explain(sql: str, params: Any) -> list[PlanNode]:
+    """Return the plan shape of a statement.
+
+    Raises:
+        NotImplementedError: On databases other than PostgreSQL and SQLite.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Reset when the transaction the plans are captured in ends.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_bitmapscan = off')
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            document = cursor.fetchone()[0]
+            if isinstance(document, str):
+                document = json.loads(document)
+            return [_postgresql_node(document[0]['Plan'])]
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return _sqlite_plan(cursor.fetchall())
+    msg = f'Query plans of {connection.vendor} are not supported.'
+    raise NotImplementedError(msg)
+
+
+def capture_plans(
+    context: PlanContext,
+    names: list[str] | None = None,
+) -> Snapshots:
+    """Run the code paths and return the plans of their SELECTs.
+
+    The paths run on a private cache that is cleared before each of
+    them, so that its queries run.
+    """
+    snapshots: Snapshots = {}
+    with isolated_cache():
+        for name in names or sorted(QUERY_PATHS):
+            cache.clear()
+            with _captured() as statements:
+                QUERY_PATHS[name](context)
+            snapshots[name] = [
+                {'sql': sql, 'plan': explain(sql, params)}
+                for sql, params in statements
+            ]
+    return snapshots
+
+
+def capture_seeded_plans(names: list[str] | None = None) -> Snapshots:
+    """Seed the snapshot dataset, capture plans and roll everything back.
+
+    Args:
+        names: Code paths to capture; all of them by default.
+    """
+    end = timezone.localdate() + timedelta(days=1)
+    with transaction.atomic():
+        generate_dataset(SNAPSHOT_SPEC, end=end)
+        analyze()
+        current = capture_plans(plan_context(), names)
+        transaction.set_rollback(True)
+    return current
+
+
+def _full_scans(nodes: list[PlanNode]) -> Iterator[str]:
+    for node in nodes:
+        relation = node.get('relation')
+        if relation in LARGE_TABLES and (
+            node['node'] == 'Seq Scan' or node['node'].startswith('SCAN ')
+        ):
+            yield relation
+        yield from _full_scans(node.get('children', []))
+
+
+def find_plan_problems(current: Snapshots, snapshots: Snapshots) -> list[str]:
+    """Describe full scans of large tables and plans that changed.
+
+    Args:
+        current: Freshly captured plans.
+        snapshots: The committed plans.
+    """
+    problems: list[str] = []
+    for name, queries in current.items():
+        for number, query in enumerate(queries, start=1):
+            problems.extend(
+                f'{name} #{number}: full scan of {relation}'
+                for relation in _full_scans(query['plan'])
+            )
+        expected = snapshots.get(name)
+        if expected is None:
+            problems.append(f'{name}: no snapshot')
+            continue
+        if len(expected) != len(queries):
+            problems.append(
+                f'{name}: {len(queries)} queries, snapshot has {len(expected)}',
+            )
+            continue
+        problems.extend(
+            f'{name} #{number}: plan changed'
+            for number, (query, snapshot) in enumerate(
+                zip(queries, expected, strict=True),
+                start=1,
+            )
+            if query['plan'] != snapshot['plan']
+        )
+    return problems
+
+
+def snapshot_path(vendor: str | None = None) -> Path:
+    """Return the snapshot file of a database vendor."""
+    return (
+        Path(settings.BASE_DIR)
+        / 'benchmarks'
+        / 'query_plans'
+        / f'{vendor or connection.vendor}.json'
+    )
+
+
+def load_snapshots(path: Path) -> Snapshots | None:
+    """Return the snapshots stored at ``path`` if the file exists."""
+    if not path.exists():
+        return None
+    snapshots: Snapshots = json.loads(path.read_text(encoding='utf-8'))
+    return snapshots
+
+
+def save_snapshots(path: Path, snapshots: Snapshots) -> None:
+    """Write the snapshots to ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(snapshots, indent=2, ensure_ascii=False) + '\n',
+        encoding='utf-8',
+    )
@@ -0,0 +1,64 @@
+"""Export audit log months past the retention period and remove them.
+
+Every month is written to ``auditlog-YYYY-MM.ndjson.gz`` in the archive
+directory before its entries leave the database, for example::
+
+    python manage.py archive_audit_log --retention-months 24
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from hasta_la_vista_money.system.services.audit_archive import (
+    archive_audit_log,
+    ensure_audit_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Export audit log entries older than the retention period to '
+        'compressed NDJSON files and remove them from the database.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=settings.AUDIT_LOG_RETENTION_MONTHS,
+            help=(
+                'Whole months to keep besides the current one. Defaults to '
+                'AUDIT_LOG_RETENTION_MONTHS.'
+            ),
+        )
+        parser.add_argument(
+            '--output-dir',
+            type=Path,
+            default=settings.AUDIT_LOG_ARCHIVE_DIR,
+            help=(
+                'Directory for the archives. Defaults to AUDIT_LOG_ARCHIVE_DIR.'
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['retention_months'] < 1:
+            raise CommandError(
+                'Срок хранения должен быть не меньше одного месяца.',
+            )
+
+        ensure_audit_partitions()
+        archived = archive_audit_log(
+            options['retention_months'],
+            options['output_dir'],
+        )
+
+        for month in archived:
+            target = month.path or '—'
+            self.stdout.write(f'{month.month:%Y-%m}: {month.rows} → {target}')
+        self.stdout.write(
+            f'Архивировано записей: {sum(month.rows for month in archived)}',
+        )
@@ -0,0 +1,74 @@
+"""Measure the overhead of the Prometheus instrumentation.
+
+Times a request through ``MetricsMiddleware`` and a timed span with the
+metrics listener against the same work without them, for example::
+
+    python manage.py benchmark_metrics --iterations 20000
+"""
+
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from hasta_la_vista_money.core import spans
+from hasta_la_vista_money.core.metrics import observe_span
+from hasta_la_vista_money.system.middleware import MetricsMiddleware
+
+
+def _per_call(func: Callable[[], Any], iterations: int) -> float:
+    """Return the mean time of a call in microseconds."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+class Command(BaseCommand):
+    help = 'Measure the per-request and per-span cost of the metrics.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20000,
+            help='Calls timed per measurement.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        iterations = options['iterations']
+        request = RequestFactory().get('/healthz/')
+        request.resolver_match = resolve('/healthz/')
+
+        def view(request: HttpRequest) -> HttpResponse:
+            del request
+            return HttpResponse()
+
+        middleware = MetricsMiddleware(view)
+        bare = _per_call(lambda: view(request), iterations)
+        measured = _per_call(lambda: middleware(request), iterations)
+        self.stdout.write(
+            f'request: {bare:.2f} µs bare, {measured:.2f} µs measured, '
+            f'+{measured - bare:.2f} µs',
+        )
+
+        def timed_block() -> None:
+            with spans.span('benchmark'):
+                pass
+
+        without = _per_call(timed_block, iterations)
+        listeners = list(spans._listeners)  # noqa: SLF001
+        spans.add_span_listener(observe_span)
+        try:
+            observed = _per_call(timed_block, iterations)
+        finally:
+            spans._listeners[:] = listeners  # noqa: SLF001
+        self.stdout.write(
+            f'span: {without:.2f} µs idle, {observed:.2f} µs observed, '
+            f'+{observed - without:.2f} µs',
+        )
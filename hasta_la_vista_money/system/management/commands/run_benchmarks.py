@@ -0,0 +1,165 @@
+"""Time the core services on a seeded dataset and compare with a baseline.
+
+The dataset is seeded in a transaction that is rolled back afterwards,
+so the command runs on any migrated database, for example::
+
+    python manage.py run_benchmarks --output results.json
+    python manage.py run_benchmarks --save-baseline
+    python manage.py run_benchmarks --benchmark loan.annuity_schedule
+
+Baselines are kept per database vendor in ``benchmarks/<vendor>.json``.
+A run is compared with the baseline when it exists and fails when a
+median is slower than the baseline by more than ``--threshold``.
+Timings depend on the machine: save the baseline and compare on the
+same one.
+"""
+
+import json
+from argparse import ArgumentParser
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, cast
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from hasta_la_vista_money.system.services.benchmarks import (
+    BENCHMARKS,
+    DEFAULT_SPEC,
+    DEFAULT_THRESHOLD,
+    BenchmarkReport,
+    BenchmarkStats,
+    find_regressions,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Time budget, statistics, report, forecast, loan and bank statement '
+        'services on a seeded dataset.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--benchmark',
+            action='append',
+            dest='benchmarks',
+            choices=sorted(BENCHMARKS),
+            metavar='NAME',
+            help='Benchmark to run; may be repeated. Defaults to all.',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='Print the benchmark names and exit.',
+        )
+        parser.add_argument('--rounds', type=int, default=5)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=DEFAULT_SPEC.users,
+            help='Users in the seeded dataset.',
+        )
+        parser.add_argument(
+            '--transactions',
+            type=int,
+            default=DEFAULT_SPEC.transactions,
+            help='Transactions per seeded user.',
+        )
+        parser.add_argument(
+            '--output',
+            type=Path,
+            help='Write the results as JSON to this file.',
+        )
+        parser.add_argument(
+            '--baseline',
+            type=Path,
+            help='Baseline file. Defaults to benchmarks/<vendor>.json.',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Replace the baseline with the results of this run.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help='Allowed slowdown of a median, 0.25 for 25 %%.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['list']:
+            for name in sorted(BENCHMARKS):
+                self.stdout.write(name)
+            return
+        if options['rounds'] < 1 or options['warmup'] < 0:
+            raise CommandError(
+                'Число замеров должно быть положительным, прогрев — '
+                'неотрицательным.',
+            )
+
+        spec = replace(
+            DEFAULT_SPEC,
+            users=options['users'],
+            transactions=options['transactions'],
+        )
+        report = run_benchmarks(
+            options['benchmarks'],
+            spec=spec,
+            seed=options['seed'],
+            rounds=options['rounds'],
+            warmup=options['warmup'],
+            progress=self._print,
+        )
+
+        if options['output']:
+            self._write(options['output'], report)
+        baseline_path = options['baseline'] or (
+            Path(settings.BASE_DIR) / 'benchmarks' / f'{connection.vendor}.json'
+        )
+        if options['save_baseline']:
+            self._write(baseline_path, report)
+            self.stdout.write(f'Базовые замеры сохранены: {baseline_path}')
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f'Нет базовых замеров: {baseline_path}')
+            return
+
+        baseline = cast(
+            'BenchmarkReport',
+            json.loads(baseline_path.read_text(encoding='utf-8')),
+        )
+        regressions = find_regressions(
+            report,
+            baseline,
+            options['threshold'],
+        )
+        for regression in regressions:
+            self.stderr.write(
+                f'{regression.name}: {regression.baseline * 1000:.1f} → '
+                f'{regression.current * 1000:.1f} мс '
+                f'(×{regression.ratio:.2f})',
+            )
+        if regressions:
+            msg = f'Замедлились бенчмарки: {len(regressions)}'
+            raise CommandError(msg)
+        self.stdout.write('Замедлений относительно базовых замеров нет.')
+
+    def _print(self, name: str, stats: BenchmarkStats) -> None:
+        self.stdout.write(
+            f'{name}: median {stats["median"] * 1000:.1f} мс, '
+            f'min {stats["min"] * 1000:.1f} мс, '
+            f'stddev {stats["stddev"] * 1000:.1f} мс',
+        )
+
+    def _write(self, path: Path, report: BenchmarkReport) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(report, indent=2, ensure_ascii=False) + '\n',
+            encoding='utf-8',
+        )
@@ -0,0 +1,99 @@
+"""Fill the database with a large deterministic dataset for benchmarks.
+
+Every ``DatasetSpec`` field is an option; the same ``--seed`` and
+``--end`` always produce the same data, for example::
+
+    python manage.py seed_dataset --users 20 --transactions 50000 --seed 7
+
+The command only runs with ``DEBUG`` or ``--force``. Generated users
+cannot log in with a password unless ``--password`` is given.
+"""
+
+from argparse import ArgumentParser
+from dataclasses import fields
+from datetime import date
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from hasta_la_vista_money.system.services.dataset import (
+    DatasetSpec,
+    generate_dataset,
+)
+from hasta_la_vista_money.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Create users with accounts, categories, transactions, receipts, '
+        'deposits, loans and budgets for performance testing.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of the random generator.',
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            default=None,
+            help=(
+                'Day after the last generated date, YYYY-MM-DD. Defaults to '
+                'today; fix it to reproduce dates on another day.'
+            ),
+        )
+        parser.add_argument(
+            '--password',
+            default=None,
+            help='Password of the generated users; unusable by default.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Run even though DEBUG is off.',
+        )
+        for field in fields(DatasetSpec):
+            parser.add_argument(
+                f'--{field.name.replace("_", "-")}',
+                type=type(field.default),
+                default=field.default,
+                help=f'Defaults to {field.default}.',
+            )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not settings.DEBUG and not options['force']:
+            raise CommandError(
+                'DEBUG выключен: команда создаёт тестовых пользователей. '
+                'Для запуска укажите --force.',
+            )
+        spec = DatasetSpec(
+            **{
+                field.name: options[field.name] for field in fields(DatasetSpec)
+            },
+        )
+        if spec.users < 1 or spec.batch_size < 1:
+            raise CommandError(
+                'Количество пользователей и размер пакета должны быть '
+                'положительными.',
+            )
+        if User.objects.filter(username__startswith=spec.prefix).exists():
+            msg = f'Пользователи с префиксом «{spec.prefix}» уже существуют.'
+            raise CommandError(msg)
+
+        counts = generate_dataset(
+            spec,
+            seed=options['seed'],
+            end=options['end'],
+            password=options['password'],
+        )
+
+        for label, rows in counts.items():
+            self.stdout.write(f'{label}: {rows}')
+        if options['password'] is None:
+            self.stdout.write(
+                f'Пользователи {spec.prefix}NNNN созданы без пароля.',
+            )
@@ -0,0 +1,84 @@
+"""Check the query plans of critical code paths against their snapshots.
+
+The dataset is seeded in a transaction that is rolled back afterwards,
+so the command runs on any migrated database, for example::
+
+    python manage.py snapshot_query_plans
+    python manage.py snapshot_query_plans --update
+    python manage.py snapshot_query_plans --path users.probable_duplicates
+
+Snapshots are kept per database vendor in
+``benchmarks/query_plans/<vendor>.json``. Capture PostgreSQL snapshots
+on a freshly migrated database, as CI does: rows of earlier rolled back
+runs change the planner's costs. The check fails on every full
+scan of a large table and on every plan whose shape differs from the
+snapshot. Review the new plans and commit them with ``--update`` when
+the change is intended.
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hasta_la_vista_money.system.management.commands._query_plans import (
+    QUERY_PATHS,
+    capture_seeded_plans,
+    find_plan_problems,
+    load_snapshots,
+    save_snapshots,
+    snapshot_path,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the query plans of aggregation, budget, statistics and '
+        'deduplication paths with the committed snapshots.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            choices=sorted(QUERY_PATHS),
+            metavar='NAME',
+            help='Code path to check; may be repeated. Defaults to all.',
+        )
+        parser.add_argument(
+            '--snapshots',
+            type=Path,
+            help='Snapshot file. Defaults to benchmarks/query_plans/'
+            '<vendor>.json.',
+        )
+        parser.add_argument(
+            '--update',
+            action='store_true',
+            help='Write the captured plans to the snapshot file.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            current = capture_seeded_plans(options['paths'])
+        except NotImplementedError as error:
+            raise CommandError(str(error)) from error
+
+        path = options['snapshots'] or snapshot_path()
+        snapshots = load_snapshots(path)
+        if options['update']:
+            save_snapshots(path, {**(snapshots or {}), **current})
+            self.stdout.write(f'Планы запросов сохранены: {path}')
+            return
+        if snapshots is None:
+            msg = f'Нет снимков планов запросов: {path}'
+            raise CommandError(msg)
+
+        problems = find_plan_problems(current, snapshots)
+        for problem in problems:
+            self.stderr.write(problem)
+        if problems:
+            msg = f'Изменились планы запросов: {len(problems)}'
+            raise CommandError(msg)
+        self.stdout.write('Планы запросов совпадают со снимками.')
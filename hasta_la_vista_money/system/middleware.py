@@ -0,0 +1,243 @@
+"""Middleware of the system app."""
+
+import re
+import time
+from collections.abc import Callable
+from contextlib import ExitStack
+from typing import Any
+
+import structlog
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+
+from hasta_la_vista_money.core.metrics import (
+    REQUEST_DB_TIME,
+    REQUEST_LATENCY,
+    REQUEST_QUERIES,
+)
+from hasta_la_vista_money.core.spans import SpanTimings, collect_spans
+from hasta_la_vista_money.system.services.query_budget import (
+    QueryStats,
+    budget_for,
+    check_budget,
+    record_queries,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Characters not allowed in the metric names of Server-Timing.
+_NON_TOKEN = re.compile(r"[^!#$%&'*+\-.^_`|~0-9A-Za-z]")
+
+# Methods labelled by name in metrics; any other one counts as ``other``.
+_METHODS = frozenset(
+    {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'},
+)
+
+
+class QueryBudgetMiddleware:
+    """Hold every request to the query budget of its view.
+
+    Installed with ``QUERY_BUDGET_ENABLED``. The recorded figures are
+    kept on ``request.query_stats`` for later middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], Any],
+    ) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with record_queries() as stats:
+            request.query_stats = stats  # type: ignore[attr-defined]
+            response = self.get_response(request)
+        self._check(request, stats)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        with record_queries() as stats:
+            request.query_stats = stats  # type: ignore[attr-defined]
+            response: HttpResponse = await self.get_response(request)
+        self._check(request, stats)
+        return response
+
+    def _check(self, request: HttpRequest, stats: QueryStats) -> None:
+        match = request.resolver_match
+        if match is None:
+            return
+        logger.debug(
+            'Request queries',
+            view=match.view_name,
+            queries=stats.count,
+            db_time_ms=round(stats.duration_ms, 1),
+        )
+        check_budget(
+            budget_for(
+                match.view_name,
+                match.func,
+                getattr(match.func, 'view_class', None),
+            ),
+            stats,
+            target=match.view_name or request.path,
+        )
+
+
+def _metric(name: str, duration_ms: float, description: str = '') -> str:
+    metric = f'{_NON_TOKEN.sub("_", name)};dur={duration_ms:.1f}'
+    if description:
+        metric += f';desc="{description}"'
+    return metric
+
+
+class ServerTimingMiddleware:
+    """Report where the time of a request went.
+
+    Installed with ``SERVER_TIMING_ENABLED``. Sends a ``Server-Timing``
+    header with the database time, the shared cache time, the spans of
+    service calls and the whole time of the view, and binds the same
+    figures as ``timings`` to the structured log context, so they appear
+    on ``request_finished``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], Any],
+    ) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            stats, spans = self._start(request, stack)
+            queries_before, db_before = stats.count, stats.duration
+            response = self.get_response(request)
+        return self._report(
+            response,
+            started,
+            stats.count - queries_before,
+            stats.duration - db_before,
+            spans,
+        )
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            stats, spans = self._start(request, stack)
+            queries_before, db_before = stats.count, stats.duration
+            response = await self.get_response(request)
+        return self._report(
+            response,
+            started,
+            stats.count - queries_before,
+            stats.duration - db_before,
+            spans,
+        )
+
+    def _start(
+        self,
+        request: HttpRequest,
+        stack: ExitStack,
+    ) -> tuple[QueryStats, SpanTimings]:
+        # Reuse the recording of QueryBudgetMiddleware when it runs.
+        stats: QueryStats | None = getattr(request, 'query_stats', None)
+        if stats is None:
+            stats = stack.enter_context(record_queries())
+        return stats, stack.enter_context(collect_spans())
+
+    def _report(
+        self,
+        response: HttpResponse,
+        started: float,
+        queries: int,
+        db_time: float,
+        spans: SpanTimings,
+    ) -> HttpResponse:
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = db_time * 1000
+        metrics = [
+            _metric('db', db_ms, f'{queries} queries'),
+            *(
+                _metric(name, timing.duration_ms, f'{timing.count} calls')
+                for name, timing in spans.spans.items()
+            ),
+            _metric('total', total_ms),
+        ]
+        response.headers['Server-Timing'] = ', '.join(metrics)
+        structlog.contextvars.bind_contextvars(
+            timings={
+                'total_ms': round(total_ms, 1),
+                'db_ms': round(db_ms, 1),
+                'queries': queries,
+                'spans': spans.as_fields(),
+            },
+        )
+        return response
+
+
+class MetricsMiddleware:
+    """Record latency and database use of requests for Prometheus.
+
+    Installed first with ``METRICS_ENABLED``, so the latency covers the
+    other middleware too. Requests are labelled by URL name and by
+    method, with unknown methods as ``other``, which keeps the number of
+    series bounded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], Any],
+    ) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with record_queries(fingerprints=False) as stats:
+            response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        with record_queries(fingerprints=False) as stats:
+            response: HttpResponse = await self.get_response(request)
+        self._observe(request, response, time.perf_counter() - started, stats)
+        return response
+
+    def _observe(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        duration: float,
+        stats: QueryStats,
+    ) -> None:
+        match = request.resolver_match
+        route = (match.view_name if match else None) or 'unmatched'
+        method = request.method if request.method in _METHODS else 'other'
+        REQUEST_LATENCY.labels(
+            route=route,
+            method=method,
+            status=f'{response.status_code // 100}xx',
+        ).observe(duration)
+        REQUEST_QUERIES.labels(route=route).observe(stats.count)
+        REQUEST_DB_TIME.labels(route=route).observe(stats.duration)
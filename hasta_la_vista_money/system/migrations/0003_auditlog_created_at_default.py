@@ -0,0 +1,22 @@
+# Generated by Django 6.0.7 on 2026-10-19 00:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('system', '0002_add_object_name_to_auditlog'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='created_at',
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name='Дата создания',
+            ),
+        ),
+    ]
@@ -0,0 +1,107 @@
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.db import migrations
+
+PARTITIONS_AHEAD = 2
+
+
+def _month_start(year, month):
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=UTC)
+
+
+def partition_auditlog(apps, schema_editor):
+    """Turn the audit log into a table partitioned by month on PostgreSQL.
+
+    Existing rows are copied into monthly partitions from the oldest entry
+    up to a few months ahead; a default partition takes anything outside
+    them. The primary key includes ``created_at``, as PostgreSQL requires
+    for partitioned tables. Other databases keep the plain table.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    model = apps.get_model('system', 'AuditLog')
+    table = model._meta.db_table
+    old_table = f'{table}_unpartitioned'
+    quote = schema_editor.quote_name
+
+    schema_editor.execute(
+        f'ALTER TABLE {quote(table)} RENAME TO {quote(old_table)}',
+    )
+    schema_editor.execute(
+        f'CREATE TABLE {quote(table)} '
+        f'(LIKE {quote(old_table)} INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (created_at)',
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT min(created_at) FROM {quote(old_table)}')
+        oldest = cursor.fetchone()[0]
+    now = datetime.now(UTC)
+    first = (oldest or now).astimezone(UTC)
+    month = _month_start(first.year, first.month)
+    last = _month_start(now.year, now.month + PARTITIONS_AHEAD)
+    while month <= last:
+        following = _month_start(month.year, month.month + 1)
+        schema_editor.execute(
+            f'CREATE TABLE {quote(f"{table}_p{month:%Y_%m}")} '
+            f'PARTITION OF {quote(table)} FOR VALUES FROM (%s) TO (%s)',
+            [month, following],
+        )
+        month = following
+    schema_editor.execute(
+        f'CREATE TABLE {quote(f"{table}_default")} '
+        f'PARTITION OF {quote(table)} DEFAULT',
+    )
+
+    schema_editor.execute(
+        f'INSERT INTO {quote(table)} SELECT * FROM {quote(old_table)}',
+    )
+    schema_editor.execute(f'DROP TABLE {quote(old_table)}')
+
+    sequence = quote(f'{table}_id_seq')
+    schema_editor.execute(f'CREATE SEQUENCE {sequence}')
+    schema_editor.execute(
+        f'SELECT setval(%s, coalesce(max(id), 0) + 1, false) '
+        f'FROM {quote(table)}',
+        [f'{table}_id_seq'],
+    )
+    schema_editor.execute(
+        f'ALTER TABLE {quote(table)} '
+        f"ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')",
+    )
+    schema_editor.execute(
+        f'ALTER SEQUENCE {sequence} OWNED BY {quote(table)}.id',
+    )
+    schema_editor.execute(
+        f'ALTER TABLE {quote(table)} ADD PRIMARY KEY (id, created_at)',
+    )
+
+    user_field = model._meta.get_field('user')
+    schema_editor.execute(
+        schema_editor._create_fk_sql(
+            model,
+            user_field,
+            '_fk_%(to_table)s_%(to_column)s',
+        ),
+    )
+    schema_editor.execute(
+        schema_editor._create_index_sql(model, fields=[user_field]),
+    )
+    for index in model._meta.indexes:
+        schema_editor.add_index(model, index)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('system', '0003_auditlog_created_at_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # The partitioned table works as a plain one for Django, so the
+        # conversion is not undone on rollback.
+        migrations.RunPython(partition_auditlog, migrations.RunPython.noop),
+    ]
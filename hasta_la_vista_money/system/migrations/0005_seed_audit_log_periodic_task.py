@@ -0,0 +1,42 @@
+from django.db import migrations
+
+PERIODIC_TASK_NAME = 'Maintain audit log'
+TASK_PATH = 'system.maintain_audit_log'
+INTERVAL_EVERY = 1
+INTERVAL_PERIOD = 'days'
+
+
+def seed_audit_log_task(apps, schema_editor):
+    """Register a daily task preparing partitions and archiving the log."""
+    interval_model = apps.get_model('django_celery_beat', 'IntervalSchedule')
+    periodic_model = apps.get_model('django_celery_beat', 'PeriodicTask')
+
+    schedule, _created = interval_model.objects.get_or_create(
+        every=INTERVAL_EVERY,
+        period=INTERVAL_PERIOD,
+    )
+    periodic_model.objects.update_or_create(
+        name=PERIODIC_TASK_NAME,
+        defaults={
+            'task': TASK_PATH,
+            'interval': schedule,
+            'enabled': True,
+        },
+    )
+
+
+def remove_audit_log_task(apps, schema_editor):
+    """Remove the periodic task on rollback; leave the schedule for reuse."""
+    periodic_model = apps.get_model('django_celery_beat', 'PeriodicTask')
+    periodic_model.objects.filter(name=PERIODIC_TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('system', '0004_partition_auditlog'),
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_audit_log_task, remove_audit_log_task),
+    ]
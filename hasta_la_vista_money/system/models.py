@@ -3,6 +3,7 @@
 from typing import ClassVar
 
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from hasta_la_vista_money import constants
@@ -45,8 +46,11 @@ class AuditLog(models.Model):
         verbose_name=_('Действие'),
     )
     diff = models.JSONField(default=dict, blank=True, verbose_name=_('Diff'))
+    # Set when the entry is recorded rather than when the buffered entry
+    # is written after commit.
     created_at = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name=_('Дата создания'),
     )
 
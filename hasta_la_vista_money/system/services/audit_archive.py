@@ -0,0 +1,206 @@
+"""Monthly partitions, retention and archival of the audit log.
+
+On PostgreSQL the audit log table is partitioned by the UTC month of
+``created_at`` (migration ``0004_partition_auditlog``) and partitions are
+created ahead of time by ``ensure_audit_partitions``. Other databases
+keep a plain table.
+
+Months older than the retention period are exported to gzip-compressed
+NDJSON files, one per month, and then removed: a PostgreSQL partition is
+detached and dropped, rows of a plain table are deleted.
+"""
+
+import gzip
+import json
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+import structlog
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.system.models import AuditLog
+
+logger = structlog.get_logger(__name__)
+
+ARCHIVED_FIELDS = (
+    'id',
+    'user_id',
+    'model_name',
+    'object_pk',
+    'object_name',
+    'action',
+    'diff',
+    'created_at',
+)
+
+
+@dataclass(frozen=True)
+class ArchivedMonth:
+    """Audit entries of one month moved out of the database."""
+
+    month: date
+    rows: int
+    path: Path | None
+
+
+def _table() -> str:
+    return AuditLog._meta.db_table  # noqa: SLF001
+
+
+def add_months(month: date, count: int) -> date:
+    """Return the first day of the month ``count`` months after ``month``."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    """Return the UTC bounds of a month, the end excluded."""
+    start = datetime(month.year, month.month, 1, tzinfo=UTC)
+    end_month = add_months(month, 1)
+    return start, datetime(end_month.year, end_month.month, 1, tzinfo=UTC)
+
+
+def partition_name(month: date) -> str:
+    """Return the name of the partition holding a month of entries."""
+    return f'{_table()}_p{month:%Y_%m}'
+
+
+def is_partitioned() -> bool:
+    """Whether the audit log table is partitioned in the database."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p '
+            'JOIN pg_class c ON c.oid = p.partrelid '
+            'WHERE c.relname = %s',
+            [_table()],
+        )
+        return cursor.fetchone() is not None
+
+
+def ensure_audit_partitions(
+    months_ahead: int = constants.AUDIT_LOG_PARTITIONS_AHEAD,
+) -> None:
+    """Create partitions of the current and the next months if missing.
+
+    Args:
+        months_ahead: Number of months after the current one to prepare.
+    """
+    if not is_partitioned():
+        return
+    current = timezone.now().astimezone(UTC).date().replace(day=1)
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            start, end = month_bounds(month)
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {quote(partition_name(month))} '
+                f'PARTITION OF {quote(_table())} '
+                'FOR VALUES FROM (%s) TO (%s)',
+                [start, end],
+            )
+
+
+def _archive_path(directory: Path, month: date) -> Path:
+    # A month archived before keeps its file; rows recorded for it later
+    # go to a numbered file next to it.
+    path = directory / f'auditlog-{month:%Y-%m}.ndjson.gz'
+    number = 0
+    while path.exists():
+        number += 1
+        path = directory / f'auditlog-{month:%Y-%m}.{number}.ndjson.gz'
+    return path
+
+
+def _export_month(month: date, directory: Path) -> tuple[int, Path | None]:
+    start, end = month_bounds(month)
+    rows = (
+        AuditLog.objects.filter(created_at__gte=start, created_at__lt=end)
+        .order_by('created_at', 'pk')
+        .values(*ARCHIVED_FIELDS)
+        .iterator(chunk_size=constants.AUDIT_LOG_ARCHIVE_CHUNK_SIZE)
+    )
+    directory.mkdir(parents=True, exist_ok=True)
+    path = _archive_path(directory, month)
+    partial = path.with_name(f'{path.name}.partial')
+    count = 0
+    with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+        for row in rows:
+            archive.write(
+                json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False),
+            )
+            archive.write('\n')
+            count += 1
+    if not count:
+        partial.unlink()
+        return 0, None
+    partial.replace(path)
+    return count, path
+
+
+def _remove_month(month: date) -> None:
+    start, end = month_bounds(month)
+    quote = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        if is_partitioned():
+            cursor.execute('SELECT to_regclass(%s)', [partition_name(month)])
+            row = cursor.fetchone()
+            if row is not None and row[0] is not None:
+                partition = quote(partition_name(month))
+                cursor.execute(
+                    f'ALTER TABLE {quote(_table())} '
+                    f'DETACH PARTITION {partition}',
+                )
+                cursor.execute(f'DROP TABLE {partition}')
+        # Rows of a plain table, or of the default partition.
+        cursor.execute(
+            f'DELETE FROM {quote(_table())} '  # noqa: S608
+            'WHERE created_at >= %s AND created_at < %s',
+            [
+                connection.ops.adapt_datetimefield_value(start),
+                connection.ops.adapt_datetimefield_value(end),
+            ],
+        )
+
+
+def archive_audit_log(
+    retention_months: int,
+    directory: Path,
+) -> list[ArchivedMonth]:
+    """Export and remove months of entries older than the retention.
+
+    Args:
+        retention_months: Number of whole months to keep besides the
+            current one.
+        directory: Directory the NDJSON archives are written to.
+
+    Returns:
+        Archived months, oldest first.
+    """
+    current = timezone.now().astimezone(UTC).date().replace(day=1)
+    cutoff = add_months(current, -retention_months)
+    oldest = AuditLog.objects.aggregate(oldest=Min('created_at'))['oldest']
+    if oldest is None:
+        return []
+
+    archived: list[ArchivedMonth] = []
+    month = oldest.astimezone(UTC).date().replace(day=1)
+    while month < cutoff:
+        rows, path = _export_month(month, directory)
+        _remove_month(month)
+        archived.append(ArchivedMonth(month=month, rows=rows, path=path))
+        logger.info(
+            'Audit log month archived',
+            month=f'{month:%Y-%m}',
+            rows=rows,
+            path=str(path) if path else None,
+        )
+        month = add_months(month, 1)
+    return archived
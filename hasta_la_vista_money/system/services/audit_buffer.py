@@ -0,0 +1,131 @@
+"""Per-transaction buffer of audit log entries.
+
+Audit signals record entries here instead of inserting a row per change.
+Inside a database transaction the entries are kept in memory and written
+with one ``bulk_create`` once the transaction commits; outside of one
+they are written right away. Entries are grouped by the savepoints that
+were active when they were recorded and each group is flushed by its own
+on-commit callback, so rolling back a savepoint or the whole transaction
+discards exactly the entries recorded inside it. Foreign key names in
+the diffs of a flushed group are resolved together, see
+``audit_references``.
+
+With ``AUDIT_LOG_QUEUE`` enabled committed entries are handed to a Celery
+task instead; when the broker is unreachable they are written directly,
+so a committed change is never left without its audit entries.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+import structlog
+from django.conf import settings
+from django.db import connection
+from kombu.exceptions import OperationalError
+
+from hasta_la_vista_money.core.commit_hooks import CommitHook
+from hasta_la_vista_money.system.models import AuditLog
+from hasta_la_vista_money.system.services.audit_references import (
+    resolve_references,
+)
+
+logger = structlog.get_logger(__name__)
+
+_state = threading.local()
+
+
+@dataclass
+class _PendingEntries:
+    """Entries recorded under one stack of savepoints."""
+
+    entries: list[AuditLog] = field(default_factory=list)
+    hook: CommitHook | None = None
+
+
+def _pending() -> dict[tuple[str, ...], _PendingEntries]:
+    pending: dict[tuple[str, ...], _PendingEntries] | None = getattr(
+        _state,
+        'pending',
+        None,
+    )
+    if pending is None:
+        pending = {}
+        _state.pending = pending
+    return pending
+
+
+def serialize_entry(entry: AuditLog) -> dict[str, Any]:
+    """Return the JSON-safe fields of an unsaved audit entry."""
+    return {
+        'user_id': entry.user_id,
+        'model_name': entry.model_name,
+        'object_pk': entry.object_pk,
+        'object_name': entry.object_name,
+        'action': entry.action,
+        'diff': entry.diff,
+        'created_at': entry.created_at.isoformat(),
+    }
+
+
+def deserialize_entry(data: dict[str, Any]) -> AuditLog:
+    """Build an unsaved audit entry from ``serialize_entry`` output."""
+    return AuditLog(
+        **{**data, 'created_at': datetime.fromisoformat(data['created_at'])},
+    )
+
+
+def write_audit_entries(entries: list[AuditLog]) -> None:
+    """Insert audit entries with a single statement."""
+    if entries:
+        AuditLog.objects.bulk_create(entries)
+
+
+def _queue_or_write(entries: list[AuditLog]) -> None:
+    resolve_references(entries)
+    if not getattr(settings, 'AUDIT_LOG_QUEUE', False):
+        write_audit_entries(entries)
+        return
+    from hasta_la_vista_money.system.tasks import (  # noqa: PLC0415
+        store_audit_entries,
+    )
+
+    try:
+        store_audit_entries.apply_async(
+            args=[[serialize_entry(entry) for entry in entries]],
+            retry=False,
+        )
+    except OperationalError:
+        logger.warning('Audit entries not queued', entries=len(entries))
+        write_audit_entries(entries)
+
+
+def _flush(key: tuple[str, ...], group: _PendingEntries) -> None:
+    pending = _pending()
+    if pending.get(key) is group:
+        del pending[key]
+    _queue_or_write(group.entries)
+
+
+def record_audit_entry(entry: AuditLog) -> None:
+    """Write an unsaved audit entry once the current transaction commits.
+
+    Args:
+        entry: Audit entry to store; it must not be saved by the caller.
+    """
+    if not connection.in_atomic_block:
+        _queue_or_write([entry])
+        return
+    key = tuple(connection.savepoint_ids)
+    pending = _pending()
+    group = pending.get(key)
+    # A rolled back savepoint or transaction drops the callback together
+    # with the entries it would have written.
+    if group is None or group.hook is None or not group.hook.pending:
+        group = _PendingEntries()
+        group.hook = CommitHook(partial(_flush, key, group))
+        pending[key] = group
+        group.hook.schedule()
+    group.entries.append(entry)
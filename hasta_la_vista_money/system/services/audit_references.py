@@ -0,0 +1,85 @@
+"""Names of foreign key targets in audit diffs.
+
+Audit signals put a ``Reference`` into a diff instead of looking up the
+name of the referenced object. The buffer resolves the references of all
+entries it writes together, with one ``in_bulk`` query per kind of
+target, so entries of a transaction that mention the same accounts or
+categories do not query them one by one.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from django.db import models
+
+from hasta_la_vista_money.system.models import AuditLog
+
+MISSING_VALUE = '—'
+
+
+@dataclass(frozen=True)
+class ForeignKeyName:
+    """Field that names the target of a foreign key in audit diffs."""
+
+    manager: models.Manager[Any]
+    field: str
+
+    def load(self, pks: Iterable[Any]) -> dict[Any, str]:
+        """Return names of the objects with the given primary keys."""
+        objects = self.manager.only(self.field).in_bulk(pks)
+        return {pk: getattr(obj, self.field) for pk, obj in objects.items()}
+
+
+@dataclass(frozen=True)
+class Reference:
+    """Foreign key value whose display name is not loaded yet."""
+
+    target: ForeignKeyName
+    pk: Any
+
+
+def reference(target: ForeignKeyName, pk: Any) -> Reference | str:
+    """Return a reference to resolve later, or the placeholder of no FK."""
+    if pk is None:
+        return MISSING_VALUE
+    return Reference(target, pk)
+
+
+def _replace(value: Any, replace: Callable[[Reference], Any]) -> Any:
+    if isinstance(value, Reference):
+        return replace(value)
+    if isinstance(value, dict):
+        return {key: _replace(item, replace) for key, item in value.items()}
+    return value
+
+
+def resolve_references(entries: Iterable[AuditLog]) -> None:
+    """Replace references in the diffs of entries with display names.
+
+    Args:
+        entries: Unsaved audit entries; their diffs are updated in place.
+    """
+    entries = list(entries)
+    pending: dict[ForeignKeyName, set[Any]] = defaultdict(set)
+
+    def collect(found: Reference) -> Reference:
+        pending[found.target].add(found.pk)
+        return found
+
+    for entry in entries:
+        _replace(entry.diff, collect)
+    if not pending:
+        return
+
+    names = {target: target.load(pks) for target, pks in pending.items()}
+
+    def name_of(found: Reference) -> str:
+        return names[found.target].get(
+            found.pk,
+            f'(удалён, id={found.pk})',
+        )
+
+    for entry in entries:
+        entry.diff = _replace(entry.diff, name_of)
@@ -0,0 +1,389 @@
+"""Benchmarks of the core services on a seeded dataset.
+
+Each benchmark prepares its input once and returns the call to time.
+The runner seeds a dataset with ``generate_dataset`` in a transaction,
+times every benchmark over several rounds and rolls the transaction
+back, so it works on an empty SQLite or PostgreSQL database alike.
+The default cache is swapped for a private in-memory cache while the
+benchmarks run and cleared before every round, so the timings are those
+of a cold cache and the configured cache is never touched.
+
+Results are plain dictionaries that serialize to JSON. Comparing them
+with a baseline saved from an earlier commit reports every benchmark
+whose median got slower by more than a threshold.
+"""
+
+import platform
+import statistics
+import tempfile
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Final, TypedDict
+
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from config.containers import ApplicationContainer
+from hasta_la_vista_money.budget.models import DateList
+from hasta_la_vista_money.budget.services.budget import get_categories
+from hasta_la_vista_money.deposits.interest_forecast import (
+    PrincipalChange,
+    RateSegment,
+    WeekendOnlyCalendar,
+    build_forecast,
+)
+from hasta_la_vista_money.deposits.models import DepositTerm
+from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.finance_account.services import BalanceTrendService
+from hasta_la_vista_money.finance_account.views import (
+    FinancesFilter,
+    finances_transactions,
+)
+from hasta_la_vista_money.loan.services.loan_calculation import (
+    calculate_annuity_schedule,
+    calculate_differentiated_schedule,
+)
+from hasta_la_vista_money.reports.services.aggregation import budget_charts
+from hasta_la_vista_money.services.two_tier_cache import local_cache
+from hasta_la_vista_money.system.services.dataset import (
+    DatasetSpec,
+    generate_dataset,
+)
+from hasta_la_vista_money.system.services.synthetic_statements import (
+    synthetic_statement,
+)
+from hasta_la_vista_money.transactions.models import TransactionType
+from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.bank_statement import (
+    BankStatementParser,
+)
+from hasta_la_vista_money.users.services.monthly_statistics_service import (
+    StatisticsFilters,
+    get_dashboard_summary_statistics,
+)
+from hasta_la_vista_money.users.services.summary_statistics_service import (
+    get_user_detailed_statistics,
+)
+
+DEFAULT_SPEC: Final = DatasetSpec(
+    users=3,
+    family_size=3,
+    transactions=20_000,
+    receipts=300,
+    transfers=300,
+    prefix='benchmark',
+)
+DEFAULT_THRESHOLD: Final = 0.25
+STATEMENT_ROWS: Final = 200
+LOAN_MONTHS: Final = 360
+
+
+@dataclass
+class BenchmarkContext:
+    """Input shared by the benchmarks of a run."""
+
+    user: User
+    workdir: Path
+
+
+type Benchmark = Callable[[BenchmarkContext], Callable[[], object]]
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    """Register a benchmark under ``name``."""
+
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+class BenchmarkStats(TypedDict):
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    stddev: float
+
+
+class BenchmarkReport(TypedDict):
+    database: str
+    python: str
+    seed: int
+    spec: dict[str, Any]
+    created_at: str
+    benchmarks: dict[str, BenchmarkStats]
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A benchmark whose median exceeds the baseline beyond the threshold."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+@benchmark('reports.budget_charts')
+def _budget_charts(context: BenchmarkContext) -> Callable[[], object]:
+    return lambda: budget_charts(context.user, 'y')
+
+
+@benchmark('users.detailed_statistics')
+def _detailed_statistics(context: BenchmarkContext) -> Callable[[], object]:
+    container = ApplicationContainer()
+    return lambda: get_user_detailed_statistics(
+        context.user,
+        container=container,
+        stats_filter=StatisticsFilters(),
+    )
+
+
+@benchmark('users.dashboard_summary')
+def _dashboard_summary(context: BenchmarkContext) -> Callable[[], object]:
+    container = ApplicationContainer()
+    return lambda: get_dashboard_summary_statistics(context.user, container)
+
+
+@benchmark('budget.aggregate_budget_data')
+def _aggregate_budget_data(context: BenchmarkContext) -> Callable[[], object]:
+    service = ApplicationContainer().budget.budget_service()
+    months = sorted(
+        DateList.objects.filter(user=context.user).values_list(
+            'date',
+            flat=True,
+        ),
+    )
+    expense = list(get_categories(context.user, TransactionType.EXPENSE))
+    income = list(get_categories(context.user, TransactionType.INCOME))
+    return lambda: service.aggregate_budget_data(
+        context.user,
+        months,
+        expense,
+        income,
+    )
+
+
+@benchmark('finance_account.balance_trend')
+def _balance_trend(context: BenchmarkContext) -> Callable[[], object]:
+    accounts = Account.objects.filter(user=context.user)
+    return lambda: BalanceTrendService().get_balance_trend(accounts, '12m')
+
+
+@benchmark('finance_account.finances_transactions')
+def _finances(context: BenchmarkContext) -> Callable[[], object]:
+    request = RequestFactory().get('/finance/')
+    request.user = context.user
+    request.container = ApplicationContainer()  # type: ignore[attr-defined]
+    return lambda: finances_transactions(
+        request=request,
+        users=[context.user],
+        finances_filter=FinancesFilter(period='y'),
+    )
+
+
+@benchmark('deposits.build_forecast')
+def _build_forecast(context: BenchmarkContext) -> Callable[[], object]:
+    del context
+    opened_on = date(2026, 1, 15)
+    matures_on = opened_on + relativedelta(years=5)
+    rate_segments = [
+        RateSegment(
+            starts_on=opened_on + relativedelta(months=6 * part),
+            ends_on=opened_on + relativedelta(months=6 * (part + 1), days=-1),
+            annual_rate=Decimal(12) + Decimal(part) / 4,
+        )
+        for part in range(10)
+    ]
+    principal_changes = [
+        PrincipalChange(
+            effective_on=opened_on + relativedelta(months=month),
+            amount=Decimal(10_000),
+        )
+        for month in range(0, 60, 3)
+    ]
+    return lambda: build_forecast(
+        opened_on=opened_on,
+        matures_on=matures_on,
+        principal=Decimal(1_000_000),
+        rate_segments=rate_segments,
+        day_count_convention=DepositTerm.DayCountConvention.ACTUAL_ACTUAL,
+        accrual_start_included=False,
+        accrual_end_included=True,
+        payout_schedule_kind=DepositTerm.PayoutScheduleKind.MONTHLY,
+        custom_payout_dates=[],
+        business_day_convention=DepositTerm.BusinessDayConvention.FOLLOWING,
+        calendar=WeekendOnlyCalendar(),
+        principal_changes=principal_changes,
+    )
+
+
+@benchmark('loan.annuity_schedule')
+def _annuity_schedule(context: BenchmarkContext) -> Callable[[], object]:
+    del context
+    return lambda: calculate_annuity_schedule(5_000_000, 17.5, LOAN_MONTHS)
+
+
+@benchmark('loan.differentiated_schedule')
+def _differentiated_schedule(
+    context: BenchmarkContext,
+) -> Callable[[], object]:
+    del context
+    return lambda: calculate_differentiated_schedule(
+        5_000_000,
+        17.5,
+        LOAN_MONTHS,
+    )
+
+
+def _statement_benchmark(bank: str) -> Benchmark:
+    def prepare(context: BenchmarkContext) -> Callable[[], object]:
+        path = context.workdir / f'{bank}.pdf'
+        path.write_bytes(synthetic_statement(bank, STATEMENT_ROWS))
+        return lambda: BankStatementParser(path).parse()
+
+    return prepare
+
+
+for _bank in ('raiffeisen', 'sberbank', 'ozon'):
+    benchmark(f'users.statement_{_bank}')(_statement_benchmark(_bank))
+
+
+@contextmanager
+def isolated_cache() -> Iterator[None]:
+    """Point the default cache at a private in-memory cache.
+
+    The configured cache may be shared with running servers, so it is
+    never cleared. Local copies loaded meanwhile are dropped on exit.
+    """
+    isolated = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'benchmarks-{uuid.uuid4().hex}',
+        },
+    }
+    with override_settings(CACHES=isolated):
+        try:
+            yield
+        finally:
+            cache.clear()
+            local_cache.clear_local()
+
+
+def _time(
+    call: Callable[[], object], rounds: int, warmup: int
+) -> BenchmarkStats:
+    timings: list[float] = []
+    for number in range(warmup + rounds):
+        cache.clear()
+        started = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - started
+        if number >= warmup:
+            timings.append(elapsed)
+    return {
+        'rounds': rounds,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'stddev': statistics.pstdev(timings),
+    }
+
+
+def run_benchmarks(
+    names: Iterable[str] | None = None,
+    *,
+    spec: DatasetSpec = DEFAULT_SPEC,
+    seed: int = 0,
+    rounds: int = 5,
+    warmup: int = 1,
+    progress: Callable[[str, BenchmarkStats], None] | None = None,
+) -> BenchmarkReport:
+    """Seed a dataset, time the benchmarks on it and roll it back.
+
+    Args:
+        names: Benchmarks to run; all of them by default.
+        spec: Size of the seeded dataset. The first user is measured.
+        seed: Seed of the dataset.
+        rounds: Timed calls per benchmark.
+        warmup: Untimed calls before them.
+        progress: Called with the name and stats of each benchmark.
+
+    Raises:
+        KeyError: If a name is not a registered benchmark.
+    """
+    selected = list(names or BENCHMARKS)
+    for name in selected:
+        if name not in BENCHMARKS:
+            raise KeyError(name)
+    results: dict[str, BenchmarkStats] = {}
+    # Dates are relative to today, so that the windows of the dashboard
+    # and the reports cover the same amount of data on every run.
+    end = timezone.localdate() + timedelta(days=1)
+
+    with (
+        isolated_cache(),
+        tempfile.TemporaryDirectory() as workdir,
+        transaction.atomic(),
+    ):
+        generate_dataset(spec, seed=seed, end=end)
+        context = BenchmarkContext(
+            user=User.objects.get(username=f'{spec.prefix}0000'),
+            workdir=Path(workdir),
+        )
+        for name in selected:
+            results[name] = _time(BENCHMARKS[name](context), rounds, warmup)
+            if progress is not None:
+                progress(name, results[name])
+        transaction.set_rollback(True)
+
+    return {
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'seed': seed,
+        'spec': asdict(spec),
+        'created_at': timezone.now().isoformat(timespec='seconds'),
+        'benchmarks': results,
+    }
+
+
+def find_regressions(
+    report: BenchmarkReport,
+    baseline: BenchmarkReport,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Return the benchmarks whose median grew beyond ``threshold``.
+
+    Benchmarks missing from either report are skipped.
+
+    Args:
+        report: The current results.
+        baseline: Results to compare with.
+        threshold: Allowed relative growth, ``0.25`` for 25 %.
+    """
+    regressions: list[Regression] = []
+    for name, stats in report['benchmarks'].items():
+        previous = baseline['benchmarks'].get(name)
+        if previous is None or previous['median'] <= 0:
+            continue
+        if stats['median'] > previous['median'] * (1 + threshold):
+            regressions.append(
+                Regression(name, previous['median'], stats['median']),
+            )
+    return regressions
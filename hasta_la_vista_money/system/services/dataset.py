@@ -0,0 +1,762 @@
+"""Deterministic generator of large datasets for performance testing.
+
+Everything is created with ``bulk_create``, so model signals (audit log,
+cache invalidation, category closure, credit card cycles) do not run;
+the closure rows, account balances and card cycles are computed here
+instead. The same ``seed``, spec and
+``end`` date always produce the same rows.
+
+Users are named ``<prefix>0000``, ``<prefix>0001``, … and get an
+unusable password unless one is given. Load tests such as
+``benchmark_dashboard`` log them in without a password.
+"""
+
+import math
+import random
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import batched, pairwise
+from typing import Final
+
+from dateutil.relativedelta import relativedelta
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import models, transaction
+
+from config.containers import ApplicationContainer
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.budget.models import Budget, DateList, Planning
+from hasta_la_vista_money.deposits.models import (
+    Deposit,
+    DepositPrincipalEvent,
+    DepositRatePeriod,
+    DepositTerm,
+)
+from hasta_la_vista_money.finance_account.models import (
+    Account,
+    Bank,
+    CreditCardCycle,
+    TransferMoneyLog,
+)
+from hasta_la_vista_money.loan.models import (
+    Loan,
+    PaymentMakeLoan,
+    PaymentSchedule,
+)
+from hasta_la_vista_money.loan.services.loan_calculation import (
+    calculate_annuity_schedule,
+    calculate_differentiated_schedule,
+)
+from hasta_la_vista_money.receipts.models import Product, Receipt, Seller
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    CategoryClosure,
+    Transaction,
+    TransactionType,
+)
+from hasta_la_vista_money.users.models import FamilyGroupMembership, User
+
+CENT: Final = Decimal('0.01')
+
+EXPENSE_ROOTS: Final = (
+    'Продукты',
+    'Транспорт',
+    'Жильё',
+    'Здоровье',
+    'Развлечения',
+    'Одежда',
+    'Связь',
+    'Образование',
+    'Путешествия',
+    'Подарки',
+    'Кафе и рестораны',
+    'Дом и ремонт',
+)
+INCOME_ROOTS: Final = (
+    'Зарплата',
+    'Премия',
+    'Фриланс',
+    'Проценты',
+    'Кэшбэк',
+    'Подарки',
+)
+PRODUCT_NAMES: Final = (
+    'Молоко',
+    'Хлеб',
+    'Сыр',
+    'Яблоки',
+    'Кофе',
+    'Чай',
+    'Макароны',
+    'Рис',
+    'Курица',
+    'Яйца',
+    'Вода',
+    'Шампунь',
+    'Зубная паста',
+    'Бумага',
+    'Батарейки',
+)
+SELLER_NAMES: Final = (
+    'Пятёрочка',
+    'Перекрёсток',
+    'Магнит',
+    'Лента',
+    'ВкусВилл',
+    'Ашан',
+    'Аптека',
+    'Леруа Мерлен',
+)
+LIQUID_TYPES: Final = (
+    constants.ACCOUNT_TYPE_DEBIT_CARD,
+    constants.ACCOUNT_TYPE_DEBIT,
+    constants.ACCOUNT_TYPE_CASH,
+)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Sizes and distributions of a generated dataset.
+
+    Counts are per user unless stated otherwise. Amounts follow
+    log-normal distributions given by their median and ``amount_sigma``.
+    """
+
+    users: int = 10
+    family_size: int = 3
+    months: int = 24
+    transactions: int = 20_000
+    income_share: float = 0.08
+    expense_median: float = 900.0
+    income_median: float = 60_000.0
+    amount_sigma: float = 1.0
+    category_roots: int = 8
+    category_children: int = 4
+    category_depth: int = 2
+    accounts_per_type: int = 1
+    credit_cards: int = 2
+    deposits: int = 2
+    floating_rate_share: float = 0.5
+    loans: int = 1
+    receipts: int = 500
+    products_per_receipt: int = 5
+    transfers: int = 200
+    budget_months: int = 12
+    batch_size: int = 5_000
+    prefix: str = 'bench'
+
+
+def _numbered(names: tuple[str, ...], index: int) -> str:
+    """Return the ``index``-th name, numbering repeats once names run out."""
+    name = names[index % len(names)]
+    if index < len(names):
+        return name
+    return f'{name} {index // len(names) + 1}'
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(value)).quantize(CENT)
+
+
+class DatasetGenerator:
+    """Create users and their financial data from a ``DatasetSpec``."""
+
+    def __init__(
+        self,
+        spec: DatasetSpec,
+        *,
+        seed: int,
+        end: date,
+        password: str | None = None,
+    ) -> None:
+        self.spec = spec
+        self.random = random.Random(seed)  # noqa: S311
+        self.end = end
+        self.start = end - relativedelta(months=spec.months)
+        self.counts: Counter[str] = Counter()
+        # ``None`` makes an unusable password.
+        self._password = make_password(password)
+        self._banks = list(Bank.objects.filter(is_system=True).order_by('pk'))
+
+    def generate(self) -> dict[str, int]:
+        """Create the dataset and return the number of rows per model."""
+        users = self._create_users()
+        self._create_family_groups(users)
+        for user in users:
+            with transaction.atomic():
+                self._populate(user)
+        return dict(sorted(self.counts.items()))
+
+    def _bulk[M: models.Model](
+        self,
+        model: type[M],
+        rows: Iterable[M],
+    ) -> list[M]:
+        created: list[M] = []
+        for batch in batched(rows, self.spec.batch_size):
+            created.extend(model._default_manager.bulk_create(batch))  # noqa: SLF001
+        self.counts[model._meta.label] += len(created)  # noqa: SLF001
+        return created
+
+    def _amount(self, median: float) -> Decimal:
+        value = self.random.lognormvariate(
+            math.log(median),
+            self.spec.amount_sigma,
+        )
+        return max(_money(value), CENT)
+
+    def _moment(self, start: date | None = None) -> datetime:
+        first = datetime.combine(start or self.start, time(), tzinfo=UTC)
+        last = datetime.combine(self.end, time(), tzinfo=UTC)
+        seconds = int((last - first).total_seconds())
+        return first + timedelta(seconds=self.random.randrange(seconds))
+
+    def _bank(self) -> Bank:
+        return self.random.choice(self._banks)
+
+    def _create_users(self) -> list[User]:
+        return self._bulk(
+            User,
+            (
+                User(
+                    username=f'{self.spec.prefix}{index:04d}',
+                    email=f'{self.spec.prefix}{index:04d}@example.com',
+                    password=self._password,
+                )
+                for index in range(self.spec.users)
+            ),
+        )
+
+    def _create_family_groups(self, users: list[User]) -> None:
+        size = self.spec.family_size
+        if size < 2:  # noqa: PLR2004
+            return
+        families = [
+            users[index : index + size]
+            for index in range(0, len(users), size)
+            if len(users[index : index + size]) > 1
+        ]
+        groups = self._bulk(
+            Group,
+            (
+                Group(name=f'{self.spec.prefix}-family-{number:04d}')
+                for number in range(len(families))
+            ),
+        )
+        self._bulk(
+            FamilyGroupMembership,
+            (
+                FamilyGroupMembership(
+                    group=group,
+                    user=member,
+                    role=(
+                        FamilyGroupMembership.Role.OWNER
+                        if position == 0
+                        else FamilyGroupMembership.Role.VIEWER
+                    ),
+                )
+                for group, members in zip(groups, families, strict=True)
+                for position, member in enumerate(members)
+            ),
+        )
+
+    def _populate(self, user: User) -> None:
+        expense = self._create_categories(user, TransactionType.EXPENSE)
+        income = self._create_categories(user, TransactionType.INCOME)
+        accounts = self._create_accounts(user)
+        balances = {account.pk: account.balance for account in accounts}
+
+        self._create_transactions(user, accounts, expense, income, balances)
+        self._create_transfers(user, accounts, balances)
+        self._create_receipts(user, accounts, balances)
+        self._create_deposits(user)
+        self._create_loans(user, accounts)
+        self._create_budgets(user)
+
+        for account in accounts:
+            account.balance = balances[account.pk]
+        Account.objects.bulk_update(accounts, ['balance'])
+        self._store_credit_cycles(user)
+
+    def _create_categories(
+        self,
+        user: User,
+        type_value: str,
+    ) -> list[Category]:
+        """Create category trees and their closure rows; return leaves."""
+        names = (
+            EXPENSE_ROOTS
+            if type_value == TransactionType.EXPENSE
+            else INCOME_ROOTS
+        )
+        level = self._bulk(
+            Category,
+            (
+                Category(
+                    user=user,
+                    type=type_value,
+                    name=_numbered(names, index),
+                )
+                for index in range(self.spec.category_roots)
+            ),
+        )
+        ancestors: dict[int, list[int]] = {
+            category.pk: [category.pk] for category in level
+        }
+        for _depth in range(self.spec.category_depth - 1):
+            level = self._bulk(
+                Category,
+                (
+                    Category(
+                        user=user,
+                        type=type_value,
+                        name=f'{parent.name} / {number + 1}',
+                        parent_category=parent,
+                    )
+                    for parent in level
+                    for number in range(self.spec.category_children)
+                ),
+            )
+            for category in level:
+                ancestors[category.pk] = [
+                    *ancestors[category.parent_category_id],  # type: ignore[index]
+                    category.pk,
+                ]
+        self._bulk(
+            CategoryClosure,
+            (
+                CategoryClosure(
+                    ancestor_id=ancestor_id,
+                    descendant_id=descendant_id,
+                    depth=len(path) - 1 - position,
+                )
+                for descendant_id, path in ancestors.items()
+                for position, ancestor_id in enumerate(path)
+            ),
+        )
+        return level
+
+    def _create_accounts(self, user: User) -> list[Account]:
+        accounts = [
+            Account(
+                user=user,
+                name_account=f'{type_account} {number + 1}',
+                type_account=type_account,
+                bank=self._bank(),
+                balance=self._amount(self.spec.income_median),
+            )
+            for type_account in LIQUID_TYPES
+            for number in range(self.spec.accounts_per_type)
+        ]
+        accounts.extend(
+            Account(
+                user=user,
+                name_account=f'Кредитная карта {number + 1}',
+                type_account=constants.ACCOUNT_TYPE_CREDIT_CARD,
+                bank=self._bank(),
+                balance=Decimal(150_000),
+                limit_credit=Decimal(150_000),
+                grace_period_days=self.random.choice((55, 100, 120)),
+                payment_due_date=self.end + timedelta(days=20),
+            )
+            for number in range(self.spec.credit_cards)
+        )
+        return self._bulk(Account, accounts)
+
+    def _store_credit_cycles(self, user: User) -> None:
+        months: list[date] = []
+        month = self.start.replace(day=1)
+        while month <= self.end:
+            months.append(month)
+            month += relativedelta(months=1)
+        service = (
+            ApplicationContainer().finance_account.credit_card_cycle_service()
+        )
+        accounts = Account.objects.filter(
+            user=user,
+            type_account__in=constants.CREDIT_ACCOUNT_TYPES,
+        ).select_related('bank')
+        cycles = service.refresh_cycles(dict.fromkeys(accounts, months))
+        self.counts[CreditCardCycle._meta.label] += len(cycles)  # noqa: SLF001
+
+    def _create_transactions(
+        self,
+        user: User,
+        accounts: list[Account],
+        expense: list[Category],
+        income: list[Category],
+        balances: dict[int, Decimal],
+    ) -> None:
+        liquid = [a for a in accounts if a.type_account in LIQUID_TYPES]
+
+        def rows() -> Iterator[Transaction]:
+            for _ in range(self.spec.transactions):
+                if self.random.random() < self.spec.income_share:
+                    type_value = TransactionType.INCOME
+                    account = self.random.choice(liquid)
+                    category = self.random.choice(income)
+                    amount = self._amount(self.spec.income_median)
+                    balances[account.pk] += amount
+                else:
+                    type_value = TransactionType.EXPENSE
+                    account = self.random.choice(accounts)
+                    category = self.random.choice(expense)
+                    amount = self._amount(self.spec.expense_median)
+                    balances[account.pk] -= amount
+                yield Transaction(
+                    user=user,
+                    account=account,
+                    category=category,
+                    type=type_value,
+                    amount=amount,
+                    date=self._moment(),
+                )
+
+        self._bulk(Transaction, rows())
+
+    def _create_transfers(
+        self,
+        user: User,
+        accounts: list[Account],
+        balances: dict[int, Decimal],
+    ) -> None:
+        if len(accounts) < 2:  # noqa: PLR2004
+            return
+
+        def rows() -> Iterator[TransferMoneyLog]:
+            for _ in range(self.spec.transfers):
+                source, target = self.random.sample(accounts, 2)
+                amount = self._amount(self.spec.expense_median * 10)
+                balances[source.pk] -= amount
+                balances[target.pk] += amount
+                yield TransferMoneyLog(
+                    user=user,
+                    from_account=source,
+                    to_account=target,
+                    amount=amount,
+                    exchange_date=self._moment(),
+                )
+
+        self._bulk(TransferMoneyLog, rows())
+
+    def _create_receipts(
+        self,
+        user: User,
+        accounts: list[Account],
+        balances: dict[int, Decimal],
+    ) -> None:
+        sellers = self._bulk(
+            Seller,
+            (
+                Seller(
+                    user=user,
+                    name_seller=name,
+                    inn=f'77{self.random.randrange(10**10):010d}',
+                )
+                for name in SELLER_NAMES
+            ),
+        )
+        receipts: list[Receipt] = []
+        products: list[list[Product]] = []
+        for number in range(self.spec.receipts):
+            lines = [
+                self._product(user)
+                for _ in range(
+                    self.random.randint(
+                        1,
+                        2 * self.spec.products_per_receipt - 1,
+                    ),
+                )
+            ]
+            account = self.random.choice(accounts)
+            total = sum((line.amount for line in lines), Decimal())
+            balances[account.pk] -= total
+            receipts.append(
+                Receipt(
+                    user=user,
+                    account=account,
+                    seller=self.random.choice(sellers),
+                    receipt_date=self._moment(),
+                    number_receipt=number + 1,
+                    operation_type=1,
+                    total_sum=total,
+                    manual=False,
+                ),
+            )
+            products.append(lines)
+
+        receipts = self._bulk(Receipt, receipts)
+        created = iter(
+            self._bulk(Product, (line for lines in products for line in lines)),
+        )
+        through = Receipt.product.through
+        self._bulk(
+            through,
+            (
+                through(receipt_id=receipt.pk, product_id=next(created).pk)
+                for receipt, lines in zip(receipts, products, strict=True)
+                for _ in lines
+            ),
+        )
+
+    def _product(self, user: User) -> Product:
+        price = self._amount(150)
+        quantity = Decimal(self.random.randint(1, 4))
+        return Product(
+            user=user,
+            product_name=self.random.choice(PRODUCT_NAMES),
+            category=self.random.choice(EXPENSE_ROOTS),
+            price=price,
+            quantity=quantity,
+            amount=price * quantity,
+        )
+
+    def _create_deposits(self, user: User) -> None:
+        if not self.spec.deposits:
+            return
+        principals = [
+            self._amount(self.spec.income_median * 5)
+            for _ in range(self.spec.deposits)
+        ]
+        banks = [self._bank() for _ in principals]
+        accounts = self._bulk(
+            Account,
+            (
+                Account(
+                    user=user,
+                    name_account=f'Вклад {number + 1}',
+                    type_account=constants.ACCOUNT_TYPE_DEPOSIT,
+                    bank=bank,
+                    balance=principal,
+                )
+                for number, (principal, bank) in enumerate(
+                    zip(principals, banks, strict=True),
+                )
+            ),
+        )
+        deposits = self._bulk(
+            Deposit,
+            (
+                Deposit(
+                    account=account,
+                    name=account.name_account,
+                    bank=bank,
+                )
+                for account, bank in zip(accounts, banks, strict=True)
+            ),
+        )
+        opened = [
+            self._moment().date() - relativedelta(months=6) for _ in deposits
+        ]
+        terms = self._bulk(
+            DepositTerm,
+            (
+                DepositTerm(
+                    deposit=deposit,
+                    opened_on=opened_on,
+                    matures_on=opened_on + relativedelta(months=12),
+                    rate_kind=(
+                        DepositTerm.RateKind.FLOATING
+                        if self.random.random() < self.spec.floating_rate_share
+                        else DepositTerm.RateKind.FIXED
+                    ),
+                )
+                for deposit, opened_on in zip(deposits, opened, strict=True)
+            ),
+        )
+        self._bulk(
+            DepositRatePeriod,
+            (period for term in terms for period in self._rate_periods(term)),
+        )
+        self._bulk(
+            DepositPrincipalEvent,
+            (
+                DepositPrincipalEvent(
+                    deposit=deposit,
+                    type=DepositPrincipalEvent.Type.OPENING_POSITION,
+                    amount=principal,
+                    effective_on=term.opened_on,
+                )
+                for deposit, term, principal in zip(
+                    deposits,
+                    terms,
+                    principals,
+                    strict=True,
+                )
+            ),
+        )
+
+    def _rate_periods(self, term: DepositTerm) -> list[DepositRatePeriod]:
+        periods = 1 if term.rate_kind == DepositTerm.RateKind.FIXED else 3
+        bounds = [
+            term.opened_on + relativedelta(months=12 * part // periods)
+            for part in range(periods + 1)
+        ]
+        return [
+            DepositRatePeriod(
+                term=term,
+                starts_on=starts_on,
+                ends_on=(
+                    term.matures_on
+                    if ends_on == term.matures_on
+                    else ends_on - timedelta(days=1)
+                ),
+                annual_rate=Decimal(self.random.randint(800, 2000)) / 100,
+            )
+            for starts_on, ends_on in pairwise(bounds)
+        ]
+
+    def _create_loans(self, user: User, accounts: list[Account]) -> None:
+        if not self.spec.loans:
+            return
+        loan_accounts = self._bulk(
+            Account,
+            (
+                Account(
+                    user=user,
+                    name_account=f'Кредит {number + 1}',
+                    type_account=constants.ACCOUNT_TYPE_CREDIT,
+                    bank=self._bank(),
+                )
+                for number in range(self.spec.loans)
+            ),
+        )
+        loans = self._bulk(
+            Loan,
+            (
+                Loan(
+                    user=user,
+                    account=account,
+                    date=self._moment(),
+                    loan_amount=self._amount(self.spec.income_median * 10),
+                    annual_interest_rate=(
+                        Decimal(self.random.randint(900, 2500)) / 100
+                    ),
+                    period_loan=self.random.choice((12, 24, 36, 60)),
+                    type_loan=self.random.choice(
+                        [choice for choice, _label in Loan.TYPE_LOAN],
+                    ),
+                )
+                for account in loan_accounts
+            ),
+        )
+        schedule: list[PaymentSchedule] = []
+        payments: list[PaymentMakeLoan] = []
+        for loan in loans:
+            calculate = (
+                calculate_annuity_schedule
+                if loan.type_loan == Loan.TYPE_LOAN[0][0]
+                else calculate_differentiated_schedule
+            )
+            data = calculate(
+                float(loan.loan_amount),
+                float(loan.annual_interest_rate),
+                loan.period_loan,
+            )
+            for month, payment in enumerate(data['schedule'], start=1):
+                due = loan.date + relativedelta(months=month)
+                schedule.append(
+                    PaymentSchedule(
+                        user=user,
+                        loan=loan,
+                        date=due,
+                        balance=_money(payment['balance']),
+                        monthly_payment=_money(payment['payment']),
+                        interest=_money(payment['interest']),
+                        principal_payment=_money(payment['principal']),
+                    ),
+                )
+                if due.date() < self.end:
+                    payments.append(
+                        PaymentMakeLoan(
+                            user=user,
+                            account=self.random.choice(accounts),
+                            loan=loan,
+                            date=due,
+                            amount=_money(payment['payment']),
+                        ),
+                    )
+        self._bulk(PaymentSchedule, schedule)
+        self._bulk(PaymentMakeLoan, payments)
+
+    def _create_budgets(self, user: User) -> None:
+        months = [
+            self.end.replace(day=1) - relativedelta(months=offset)
+            for offset in range(self.spec.budget_months)
+        ]
+        roots = [
+            (category, category.type)
+            for category in Category.objects.filter(
+                user=user,
+                parent_category__isnull=True,
+            ).order_by('pk')
+        ]
+        self._bulk(DateList, (DateList(user=user, date=m) for m in months))
+        self._bulk(
+            Planning,
+            (
+                Planning(
+                    user=user,
+                    category=category,
+                    date=month,
+                    planning_type=type_value,
+                    amount=self._amount(
+                        self.spec.income_median
+                        if type_value == TransactionType.INCOME
+                        else self.spec.expense_median * 20,
+                    ),
+                )
+                for month in months
+                for category, type_value in roots
+            ),
+        )
+        expense_roots = [
+            category
+            for category, type_value in roots
+            if type_value == TransactionType.EXPENSE
+        ]
+        self._bulk(
+            Budget,
+            (
+                Budget(
+                    user=user,
+                    category=category,
+                    period=month,
+                    amount_limit=self._amount(
+                        self.spec.expense_median
+                        * 20
+                        * (len(expense_roots) if category is None else 1),
+                    ),
+                )
+                for month in months
+                for category in [None, *expense_roots]
+            ),
+        )
+
+
+def generate_dataset(
+    spec: DatasetSpec,
+    *,
+    seed: int = 0,
+    end: date | None = None,
+    password: str | None = None,
+) -> dict[str, int]:
+    """Create a dataset and return the number of rows per model.
+
+    Args:
+        spec: Sizes and distributions of the data.
+        seed: Seed of the random generator.
+        end: Day after the last generated moment; today by default. Fix
+            it to reproduce the same dates on another day.
+        password: Password of every generated user; unusable by default.
+    """
+    generator = DatasetGenerator(
+        spec,
+        seed=seed,
+        end=end or date.today(),  # noqa: DTZ011
+        password=password,
+    )
+    return generator.generate()
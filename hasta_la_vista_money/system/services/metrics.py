@@ -0,0 +1,107 @@
+"""Prometheus metrics of Celery tasks.
+
+Publishing a task stamps its message with the publish time, so a worker
+can tell how long the task waited in the queue. Run time is recorded by
+final state and retries are counted by task name.
+
+Worker processes do not serve HTTP. With ``METRICS_WORKER_PORT`` set,
+the main worker process serves the metrics of all its children on that
+port; this needs ``PROMETHEUS_MULTIPROC_DIR``, since children run in
+separate processes.
+"""
+
+import threading
+import time
+from typing import Any, Final
+
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    task_retry,
+    worker_init,
+)
+from django.conf import settings
+from prometheus_client import start_http_server
+
+from hasta_la_vista_money.core.metrics import (
+    TASK_DURATION,
+    TASK_QUEUE_WAIT,
+    TASK_RETRIES,
+    registry,
+)
+
+PUBLISHED_AT_HEADER: Final = 'published_at'
+
+_state = threading.local()
+
+
+def _started() -> dict[str, float]:
+    started: dict[str, float] | None = getattr(_state, 'started', None)
+    if started is None:
+        started = {}
+        _state.started = started
+    return started
+
+
+def _task_published(headers: dict[str, Any], **kwargs: Any) -> None:
+    del kwargs
+    headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+def _task_started(task_id: str, task: Any, **kwargs: Any) -> None:
+    del kwargs
+    _started()[task_id] = time.perf_counter()
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+    if published_at is None:
+        # Some Celery versions keep custom headers apart.
+        headers = getattr(task.request, 'headers', None) or {}
+        published_at = headers.get(PUBLISHED_AT_HEADER)
+    if isinstance(published_at, int | float):
+        TASK_QUEUE_WAIT.labels(task=task.name).observe(
+            max(time.time() - published_at, 0),
+        )
+
+
+def _task_finished(
+    task_id: str,
+    task: Any,
+    state: str | None = None,
+    **kwargs: Any,
+) -> None:
+    del kwargs
+    started = _started().pop(task_id, None)
+    if started is None:
+        return
+    TASK_DURATION.labels(task=task.name, state=state or 'UNKNOWN').observe(
+        time.perf_counter() - started,
+    )
+
+
+def _task_retried(sender: Any, **kwargs: Any) -> None:
+    del kwargs
+    TASK_RETRIES.labels(task=sender.name).inc()
+
+
+def _serve_worker_metrics(**kwargs: Any) -> None:
+    del kwargs
+    port = settings.METRICS_WORKER_PORT
+    if port:
+        start_http_server(port, registry=registry())
+
+
+def connect_task_metrics() -> None:
+    """Record metrics of Celery tasks published or run by this process."""
+    before_task_publish.connect(
+        _task_published,
+        weak=False,
+        dispatch_uid=__name__,
+    )
+    task_prerun.connect(_task_started, weak=False, dispatch_uid=__name__)
+    task_postrun.connect(_task_finished, weak=False, dispatch_uid=__name__)
+    task_retry.connect(_task_retried, weak=False, dispatch_uid=__name__)
+    worker_init.connect(
+        _serve_worker_metrics,
+        weak=False,
+        dispatch_uid=__name__,
+    )
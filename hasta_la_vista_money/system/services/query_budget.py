@@ -0,0 +1,307 @@
+"""Query budgets of views and Celery tasks.
+
+While recording, every SQL statement run on any database connection is
+counted, timed and reduced to a fingerprint with its literals removed.
+The same fingerprint repeated many times in one request is the usual
+sign of an N+1 pattern: a loop touching a related object per row.
+
+Budgets are declared with the ``query_budget`` decorator on a view or a
+task, or in ``QUERY_BUDGETS`` keyed by URL name or task name; anything
+else gets ``QUERY_BUDGET_DEFAULT``. An exceeded budget is logged as a
+warning, or raises ``QueryBudgetExceededError`` with
+``QUERY_BUDGET_RAISE`` (the default under tests).
+
+Recordings live in a context variable, so queries run for a request in
+``sync_to_async`` threads or in workers started with a copy of its
+context are counted for that request too.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+
+logger = structlog.get_logger(__name__)
+
+BUDGET_ATTR = 'query_budget'
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)')
+
+_state = threading.local()
+
+_recordings: ContextVar[tuple['QueryStats', ...]] = ContextVar(
+    'query_recordings',
+    default=(),
+)
+
+
+class QueryBudgetExceededError(Exception):
+    """Queries of a request or task went over its budget."""
+
+
+def fingerprint(sql: str) -> str:
+    """Return the SQL with literals and placeholder lists generalized."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _PLACEHOLDER_LIST.sub('(...)', sql)
+
+
+@dataclass
+class QueryStats:
+    """Queries recorded over a request or a task.
+
+    Without ``keep_fingerprints`` only the count and the time are kept,
+    which is cheaper when repeated statements are of no interest.
+    """
+
+    count: int = 0
+    duration: float = 0.0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+    keep_fingerprints: bool = True
+
+    @property
+    def duration_ms(self) -> float:
+        """Total time spent in the database, in milliseconds."""
+        return self.duration * 1000
+
+    def duplicates(self, threshold: int = 2) -> list[tuple[str, int]]:
+        """Return fingerprints run at least ``threshold`` times."""
+        return [
+            (sql, times)
+            for sql, times in self.fingerprints.most_common()
+            if times >= threshold
+        ]
+
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        repr=False,
+        compare=False,
+    )
+
+    def add(self, sql: str, duration: float) -> None:
+        """Count one statement; safe to call from several threads."""
+        generalized = fingerprint(sql) if self.keep_fingerprints else None
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            if generalized is not None:
+                self.fingerprints[generalized] += 1
+
+
+def _record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    recordings = _recordings.get()
+    if not recordings:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        for stats in recordings:
+            stats.add(sql, duration)
+
+
+def install_query_recorder(
+    connection: BaseDatabaseWrapper,
+    **kwargs: Any,
+) -> None:
+    """Put the recorder in front of the execute wrappers of a connection.
+
+    It stays installed for the life of the connection and does nothing
+    outside of ``record_queries``. Being first, it is never popped by the
+    ``execute_wrapper`` blocks stacked after it.
+    """
+    del kwargs
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+def connect_query_recorder() -> None:
+    """Install the recorder on every connection opened from now on.
+
+    Connections of other threads are only reached this way, so it is
+    connected at startup, before any of them is opened.
+    """
+    connection_created.connect(install_query_recorder, dispatch_uid=__name__)
+
+
+@contextmanager
+def record_queries(*, fingerprints: bool = True) -> Iterator[QueryStats]:
+    """Record the queries run on all connections inside the block.
+
+    Queries of any thread running in the context of the block count, as
+    do those of enclosing recordings.
+    """
+    stats = QueryStats(keep_fingerprints=fingerprints)
+    for connection in connections.all():
+        install_query_recorder(connection)
+    token = _recordings.set((*_recordings.get(), stats))
+    try:
+        yield stats
+    finally:
+        _recordings.reset(token)
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Limits on the queries of one request or task.
+
+    ``max_duplicates`` bounds how often a single fingerprint may repeat;
+    ``None`` leaves a limit out.
+    """
+
+    max_queries: int | None = None
+    max_duplicates: int | None = None
+    max_time_ms: float | None = None
+
+    def violations(self, stats: QueryStats) -> list[str]:
+        """Describe the limits the recorded queries went over."""
+        problems = []
+        if self.max_queries is not None and stats.count > self.max_queries:
+            problems.append(
+                f'{stats.count} queries, budget {self.max_queries}',
+            )
+        if self.max_duplicates is not None:
+            problems.extend(
+                f'{times}× {sql}'
+                for sql, times in stats.duplicates(self.max_duplicates + 1)
+            )
+        limit = self.max_time_ms
+        if limit is not None and stats.duration_ms > limit:
+            problems.append(
+                f'{stats.duration_ms:.1f} ms in the database, '
+                f'budget {limit} ms',
+            )
+        return problems
+
+
+def query_budget[T](
+    *,
+    max_queries: int | None = None,
+    max_duplicates: int | None = None,
+    max_time_ms: float | None = None,
+) -> Callable[[T], T]:
+    """Declare the query budget of a view function, view class or task.
+
+    Apply it under ``shared_task`` so it lands on the task function.
+    """
+    budget = QueryBudget(max_queries, max_duplicates, max_time_ms)
+
+    def decorate(target: T) -> T:
+        setattr(target, BUDGET_ATTR, budget)
+        return target
+
+    return decorate
+
+
+def budget_for(name: str | None, *targets: Any) -> QueryBudget:
+    """Return the declared budget of a view or task.
+
+    Args:
+        name: URL name or task name looked up in ``QUERY_BUDGETS``.
+        targets: Objects that may carry a ``query_budget`` declaration.
+    """
+    for target in targets:
+        budget = getattr(target, BUDGET_ATTR, None)
+        if isinstance(budget, QueryBudget):
+            return budget
+    configured = settings.QUERY_BUDGETS.get(name or '')
+    if configured is not None:
+        return QueryBudget(**configured)
+    return QueryBudget(**settings.QUERY_BUDGET_DEFAULT)
+
+
+def check_budget(budget: QueryBudget, stats: QueryStats, target: str) -> None:
+    """Warn about or raise on the limits a request or task went over."""
+    problems = budget.violations(stats)
+    if not problems:
+        return
+    if settings.QUERY_BUDGET_RAISE:
+        raise QueryBudgetExceededError(
+            f'{target}: ' + '; '.join(problems),
+        )
+    logger.warning(
+        'Query budget exceeded',
+        target=target,
+        queries=stats.count,
+        db_time_ms=round(stats.duration_ms, 1),
+        problems=problems,
+    )
+
+
+@contextmanager
+def assert_query_budget(
+    *,
+    max_queries: int | None = None,
+    max_duplicates: int | None = None,
+    max_time_ms: float | None = None,
+) -> Iterator[QueryStats]:
+    """Fail with ``QueryBudgetExceededError`` when the block goes over.
+
+    Meant for tests: unlike ``assertNumQueries`` it also catches repeated
+    statements while leaving room for unrelated queries.
+    """
+    budget = QueryBudget(max_queries, max_duplicates, max_time_ms)
+    with record_queries() as stats:
+        yield stats
+    problems = budget.violations(stats)
+    if problems:
+        raise QueryBudgetExceededError('; '.join(problems))
+
+
+def _tasks() -> dict[str, tuple[ExitStack, QueryStats]]:
+    running: dict[str, tuple[ExitStack, QueryStats]] | None = getattr(
+        _state,
+        'tasks',
+        None,
+    )
+    if running is None:
+        running = {}
+        _state.tasks = running
+    return running
+
+
+def _task_started(task_id: str, **kwargs: Any) -> None:
+    del kwargs
+    stack = ExitStack()
+    _tasks()[task_id] = (stack, stack.enter_context(record_queries()))
+
+
+def _task_finished(task_id: str, task: Any, **kwargs: Any) -> None:
+    del kwargs
+    recording = _tasks().pop(task_id, None)
+    if recording is None:
+        return
+    stack, stats = recording
+    stack.close()
+    check_budget(
+        budget_for(task.name, getattr(task, 'run', None)),
+        stats,
+        target=task.name,
+    )
+
+
+def connect_task_budgets() -> None:
+    """Record queries of every Celery task run by this process."""
+    task_prerun.connect(_task_started, weak=False, dispatch_uid=__name__)
+    task_postrun.connect(_task_finished, weak=False, dispatch_uid=__name__)
@@ -0,0 +1,328 @@
+"""Synthetic bank statement PDFs for benchmarks of the statement parsers.
+
+The statements mimic the table layouts the parsers of
+``users.services.bank_statement`` expect from Raiffeisen, Sberbank and
+Ozon Bank, so a benchmark goes through text extraction, table detection
+and row parsing like a real upload.
+
+The PDFs are written by hand, as no PDF library is a dependency. Text
+uses a simple font whose encoding maps the Cyrillic letters to their
+Unicode glyph names; viewers draw no glyphs for them, but text
+extraction recovers the characters.
+"""
+
+import random
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Final
+
+type Page = list[tuple[int, int, str]]
+type Cell = tuple[int, str]
+type Record = list[list[Cell]]
+
+PAGE_WIDTH: Final = 842
+PAGE_HEIGHT: Final = 595
+TOP: Final = 530
+BOTTOM: Final = 60
+LINE: Final = 12
+FONT_SIZE: Final = 8
+CHAR_WIDTH: Final = 500
+FIRST_CHAR: Final = 32
+FIRST_CUSTOM_CODE: Final = 128
+LAST_CHAR: Final = 255
+
+DESCRIPTIONS: Final = (
+    'Оплата в магазине Пятёрочка',
+    'Оплата услуг связи',
+    'Перевод по номеру телефона',
+    'Оплата в кафе Шоколадница',
+    'Покупка в аптеке',
+    'Оплата проезда Метро',
+)
+CATEGORIES: Final = (
+    'Супермаркеты',
+    'Рестораны и кафе',
+    'Транспорт',
+    'Здоровье и красота',
+    'Перевод на карту',
+)
+STARTED: Final = datetime(2026, 1, 5, 9, 0)  # noqa: DTZ001
+
+
+def _money(amount: Decimal) -> str:
+    whole, fraction = f'{amount:.2f}'.split('.')
+    return f'{int(whole):,}'.replace(',', ' ') + f',{fraction}'
+
+
+def _escape(text: bytes) -> bytes:
+    return (
+        text.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    )
+
+
+def render_pdf(pages: list[Page]) -> bytes:
+    """Write pages of positioned text lines as a PDF document.
+
+    Args:
+        pages: Pages of ``(x, y, text)`` lines in points from the
+            bottom left corner of a landscape A4 page.
+
+    Raises:
+        ValueError: If the text uses too many distinct non-ASCII
+            characters for a single-byte font encoding.
+    """
+    extra = sorted(
+        {char for page in pages for *_, text in page for char in text}
+        - {chr(code) for code in range(FIRST_CHAR, FIRST_CUSTOM_CODE)},
+    )
+    if len(extra) > LAST_CHAR - FIRST_CUSTOM_CODE + 1:
+        msg = 'Too many distinct characters for a single-byte font.'
+        raise ValueError(msg)
+    codes = {
+        char: FIRST_CUSTOM_CODE + index for index, char in enumerate(extra)
+    }
+
+    def encode(text: str) -> bytes:
+        return _escape(bytes(codes.get(char, ord(char)) for char in text))
+
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    descriptor = add(
+        b'<< /Type /FontDescriptor /FontName /StatementSans /Flags 32 '
+        b'/FontBBox [0 -200 600 800] /ItalicAngle 0 /Ascent 800 '
+        b'/Descent -200 /CapHeight 700 /StemV 80 >>',
+    )
+    widths = b' '.join([b'%d' % CHAR_WIDTH] * (LAST_CHAR - FIRST_CHAR + 1))
+    differences = b' '.join(b'/uni%04X' % ord(char) for char in extra)
+    font = add(
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /StatementSans '
+        b'/FirstChar %d /LastChar %d /Widths [%s] /FontDescriptor %d 0 R '
+        b'/Encoding << /Type /Encoding /BaseEncoding /WinAnsiEncoding '
+        b'/Differences [%d %s] >> >>'
+        % (
+            FIRST_CHAR,
+            LAST_CHAR,
+            widths,
+            descriptor,
+            FIRST_CUSTOM_CODE,
+            differences,
+        ),
+    )
+    pages_id = len(objects) + 2 * len(pages) + 1
+    kids: list[int] = []
+    for page in pages:
+        stream = (
+            b'BT /F1 %d Tf ' % FONT_SIZE
+            + b''.join(
+                b'1 0 0 1 %d %d Tm (%s) Tj ' % (x, y, encode(text))
+                for x, y, text in page
+            )
+            + b'ET'
+        )
+        content = add(
+            b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream),
+        )
+        kids.append(
+            add(
+                b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] '
+                b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>'
+                % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, font, content),
+            ),
+        )
+    add(
+        b'<< /Type /Pages /Kids [%s] /Count %d >>'
+        % (b' '.join(b'%d 0 R' % kid for kid in kids), len(kids)),
+    )
+    catalog = add(b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id)
+
+    document = bytearray(b'%PDF-1.4\n')
+    offsets: list[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(document))
+        document += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(document)
+    document += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    document += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    document += (
+        b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+        % (
+            len(objects) + 1,
+            catalog,
+            xref,
+        )
+    )
+    return bytes(document)
+
+
+def _paginate(
+    title: list[Cell],
+    header: list[Cell],
+    records: list[Record],
+    footer: str,
+) -> list[Page]:
+    """Lay records out under a repeated header, a title on page one.
+
+    A record is one operation: lines of ``(x, text)`` cells, kept on
+    the same page.
+    """
+    pages: list[Page] = []
+    page: Page = []
+    y = BOTTOM
+
+    def start_page() -> None:
+        nonlocal page, y
+        page = []
+        pages.append(page)
+        y = TOP + LINE * 3
+        if len(pages) == 1:
+            page.extend((x, y, text) for x, text in title)
+        y -= LINE * 2
+        page.extend((x, y, text) for x, text in header)
+        y -= LINE
+
+    start_page()
+    for record in records:
+        if y - LINE * len(record) < BOTTOM:
+            start_page()
+        for line in record:
+            page.extend((x, y, text) for x, text in line)
+            y -= LINE
+    page.append((40, BOTTOM - LINE * 2, footer))
+    return pages
+
+
+def _raiffeisen(rows: int, rng: random.Random) -> list[Page]:
+    records: list[Record] = []
+    balance = Decimal(1_000_000)
+    for number in range(1, rows + 1):
+        moment = STARTED + timedelta(minutes=97 * number)
+        amount = Decimal(rng.randint(100, 900_000)) / 100
+        income = rng.random() < 0.1  # noqa: PLR2004
+        balance += amount if income else -amount
+        records.append(
+            [
+                [
+                    (40, str(number)),
+                    (75, f'{moment:%d.%m.%Y %H:%M}'),
+                    (160, str(100_000 + number)),
+                    (
+                        260 if income else 360,
+                        ('+' if income else '-') + f'{_money(amount)} ₽',
+                    ),
+                    (460, rng.choice(DESCRIPTIONS)),
+                    (730, '*1234'),
+                ],
+            ],
+        )
+    return _paginate(
+        [(40, 'Выписка по счету АО «Райффайзенбанк»')],
+        [
+            (40, '№ П/П'),
+            (75, 'Дата'),
+            (160, 'Номер документа'),
+            (260, 'Поступления'),
+            (360, 'Расходы'),
+            (460, 'Детали операции'),
+            (730, 'Номер карты'),
+        ],
+        records,
+        f'Исходящий остаток {_money(balance)}',
+    )
+
+
+def _sberbank(rows: int, rng: random.Random) -> list[Page]:
+    records: list[Record] = []
+    balance = Decimal(1_000_000)
+    for number in range(1, rows + 1):
+        moment = STARTED + timedelta(minutes=97 * number)
+        amount = Decimal(rng.randint(100, 900_000)) / 100
+        income = rng.random() < 0.1  # noqa: PLR2004
+        balance += amount if income else -amount
+        records.append(
+            [
+                [
+                    (40, f'{moment:%d.%m.%Y %H:%M}'),
+                    (200, rng.choice(CATEGORIES)),
+                    (520, ('+' if income else '') + _money(amount)),
+                    (680, _money(balance)),
+                ],
+                [
+                    (40, f'{moment:%d.%m.%Y} / {100_000 + number}'),
+                    (200, rng.choice(DESCRIPTIONS)),
+                ],
+            ],
+        )
+    return _paginate(
+        [(40, 'Выписка по счёту кредитной карты')],
+        [
+            (40, 'ДАТА ОПЕРАЦИИ (МСК)'),
+            (200, 'КАТЕГОРИЯ'),
+            (520, 'СУММА В ВАЛЮТЕ СЧЁТА'),
+            (680, 'ОСТАТОК СРЕДСТВ'),
+        ],
+        records,
+        f'Остаток на конец периода {_money(balance)}',
+    )
+
+
+def _ozon(rows: int, rng: random.Random) -> list[Page]:
+    records: list[Record] = []
+    for number in range(1, rows + 1):
+        moment = STARTED + timedelta(minutes=97 * number)
+        amount = Decimal(rng.randint(100, 900_000)) / 100
+        refund = rng.random() < 0.1  # noqa: PLR2004
+        records.append(
+            [
+                [
+                    (40, f'{moment:%d.%m.%Y %H:%M:%S}'),
+                    (170, str(700_000_000 + number)),
+                    (
+                        300,
+                        'Возврат оплаты за товары/услуги'
+                        if refund
+                        else 'Оплата товаров/услуг на Платформе Ozon',
+                    ),
+                    (
+                        600,
+                        ('+' if refund else '-') + f'{_money(amount)} ₽',
+                    ),
+                    (730, 'RUB'),
+                ],
+            ],
+        )
+    return _paginate(
+        [(40, 'ООО «ОЗОН Банк»'), (300, 'Справка о движении средств')],
+        [
+            (40, 'Дата операции'),
+            (170, 'Документ'),
+            (300, 'Назначение платежа'),
+            (600, 'Российские рубли'),
+            (730, 'Валюта'),
+        ],
+        records,
+        'Справка сформирована автоматически',
+    )
+
+
+LAYOUTS: Final[dict[str, Callable[[int, random.Random], list[Page]]]] = {
+    'raiffeisen': _raiffeisen,
+    'sberbank': _sberbank,
+    'ozon': _ozon,
+}
+
+
+def synthetic_statement(bank: str, rows: int, *, seed: int = 0) -> bytes:
+    """Return a statement PDF of ``bank`` with ``rows`` operations.
+
+    Args:
+        bank: A key of ``LAYOUTS``.
+        rows: Number of operations.
+        seed: Seed of the random amounts and descriptions.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    return render_pdf(LAYOUTS[bank](rows, rng))
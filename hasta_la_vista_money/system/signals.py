@@ -1,4 +1,12 @@
-"""Audit logging for financial model changes."""
+"""Audit logging for financial model changes.
+
+Original values of an updated instance come from the values it was
+loaded with, see ``hasta_la_vista_money.core.tracking``; the stored row
+is read back only for instances that were not loaded from the database.
+Entries are buffered per transaction and written in bulk on commit, see
+``hasta_la_vista_money.system.services.audit_buffer``; names of the
+objects their foreign keys point to are loaded in bulk at the same time.
+"""
 
 from collections.abc import Iterable
 from datetime import date, datetime
@@ -11,13 +19,22 @@ from django.dispatch import receiver
 from django.utils.encoding import force_str
 from django.utils.functional import Promise
 
+from hasta_la_vista_money.core.tracking import LoadedValuesMixin
 from hasta_la_vista_money.finance_account.models import (
     Account,
+    Bank,
     TransferMoneyLog,
 )
-from hasta_la_vista_money.receipts.models import Receipt
+from hasta_la_vista_money.receipts.models import Receipt, Seller
 from hasta_la_vista_money.system.models import AuditLog
-from hasta_la_vista_money.transactions.models import Transaction
+from hasta_la_vista_money.system.services.audit_buffer import (
+    record_audit_entry,
+)
+from hasta_la_vista_money.system.services.audit_references import (
+    ForeignKeyName,
+    reference,
+)
+from hasta_la_vista_money.transactions.models import Category, Transaction
 from hasta_la_vista_money.users.models import User
 
 AUDITED_MODELS = (Account, Transaction, Receipt, TransferMoneyLog)
@@ -27,7 +44,7 @@ FIELD_VERBOSE_NAMES: dict[str, dict[str, str]] = {
     'finance_account.Account': {
         'name_account': 'Название счёта',
         'type_account': 'Тип счёта',
-        'bank': 'Банк',
+        'bank_id': 'Банк',
         'balance': 'Баланс',
         'currency': 'Валюта',
         'limit_credit': 'Кредитный лимит',
@@ -72,22 +89,23 @@ FIELD_VERBOSE_NAMES: dict[str, dict[str, str]] = {
 HIDDEN_FIELDS = frozenset({'id', 'user_id', 'updated_at'})
 
 
-def _resolve_account_name(pk: Any) -> str:
-    if pk is None:
-        return '—'
-    try:
-        return Account.objects.values_list('name_account', flat=True).get(pk=pk)
-    except Account.DoesNotExist:
-        return f'(удалён, id={pk})'
-
+ACCOUNT_NAME = ForeignKeyName(Account.objects, 'name_account')
 
-FK_RESOLVERS: dict[str, Any] = {
-    'account_id': _resolve_account_name,
-    'from_account_id': _resolve_account_name,
-    'to_account_id': _resolve_account_name,
+FK_RESOLVERS: dict[str, ForeignKeyName] = {
+    'account_id': ACCOUNT_NAME,
+    'from_account_id': ACCOUNT_NAME,
+    'to_account_id': ACCOUNT_NAME,
+    'bank_id': ForeignKeyName(Bank.objects, 'name'),
+    'category_id': ForeignKeyName(Category.objects, 'name'),
+    'seller_id': ForeignKeyName(Seller.objects, 'name_seller'),
 }
 
 
+def _display_value(field_name: str, value: Any) -> Any:
+    target = FK_RESOLVERS.get(field_name)
+    return reference(target, value) if target else value
+
+
 def _iter_concrete_fields(
     instance: models.Model,
 ) -> Iterable[models.Field[Any, Any]]:
@@ -117,20 +135,31 @@ def _snapshot(instance: models.Model) -> dict[str, Any]:
     }
 
 
+def _loaded_snapshot(instance: models.Model) -> dict[str, Any] | None:
+    """Snapshot of the values the instance was loaded or last saved with."""
+    if not isinstance(instance, LoadedValuesMixin):
+        return None
+    loaded = instance.loaded_values()
+    if loaded is None:
+        return None
+    return {
+        field.attname: _serialize_value(loaded[field.attname])
+        for field in _iter_concrete_fields(instance)
+    }
+
+
 def _resolve_fk_values(
     model_label: str,
     raw_data: dict[str, Any],
 ) -> dict[str, Any]:
-    """Replace FK ids with human-readable names and rename fields to verbose."""
+    """Reference FK targets by name and rename fields to verbose."""
     verbose_map = FIELD_VERBOSE_NAMES.get(model_label, {})
     result: dict[str, Any] = {}
     for field_name, value in raw_data.items():
         if field_name in HIDDEN_FIELDS:
             continue
-        resolver = FK_RESOLVERS.get(field_name)
-        display_value = resolver(value) if resolver else value
         display_name = verbose_map.get(field_name, field_name)
-        result[display_name] = display_value
+        result[display_name] = _display_value(field_name, value)
     return result
 
 
@@ -159,11 +188,11 @@ def _diff_verbose(
         old_raw = old_state.get(field_name)
         if old_raw == new_raw:
             continue
-        resolver = FK_RESOLVERS.get(field_name)
-        old_display = resolver(old_raw) if resolver else old_raw
-        new_display = resolver(new_raw) if resolver else new_raw
         display_name = verbose_map.get(field_name, field_name)
-        result[display_name] = {'old': old_display, 'new': new_display}
+        result[display_name] = {
+            'old': _display_value(field_name, old_raw),
+            'new': _display_value(field_name, new_raw),
+        }
     return result
 
 
@@ -198,13 +227,15 @@ def _create_audit_log(
     diff: dict[str, Any],
     object_name: str = '',
 ) -> None:
-    AuditLog.objects.create(
-        user=_get_user(instance),
-        model_name=instance._meta.label,
-        object_pk=str(instance.pk),
-        object_name=object_name,
-        action=action,
-        diff=diff,
+    record_audit_entry(
+        AuditLog(
+            user=_get_user(instance),
+            model_name=instance._meta.label,
+            object_pk=str(instance.pk),
+            object_name=object_name,
+            action=action,
+            diff=diff,
+        ),
     )
 
 
@@ -218,6 +249,13 @@ def store_original_state(
     if sender not in AUDITED_MODELS or instance.pk is None:
         return
 
+    original_state = _loaded_snapshot(instance)
+    if original_state is not None:
+        setattr(instance, _ORIGINAL_STATE_ATTR, original_state)
+        return
+
+    # Only instances built without loading them, or loaded with deferred
+    # fields, need their stored values read back.
     old_instance = sender._default_manager.filter(pk=instance.pk).first()
     if old_instance is None:
         return
@@ -0,0 +1,48 @@
+"""Celery tasks of the system app."""
+
+from typing import Any
+
+from celery import shared_task
+from django.conf import settings
+
+from hasta_la_vista_money.system.services.audit_archive import (
+    archive_audit_log,
+    ensure_audit_partitions,
+)
+from hasta_la_vista_money.system.services.audit_buffer import (
+    deserialize_entry,
+    write_audit_entries,
+)
+
+
+@shared_task(  # type: ignore[untyped-decorator]
+    name='system.store_audit_entries',
+    ignore_result=True,
+    autoretry_for=(ConnectionError,),
+    max_retries=5,
+    retry_backoff=True,
+    acks_late=True,
+)
+def store_audit_entries(entries: list[dict[str, Any]]) -> None:
+    """Insert audit entries committed by a web request or worker."""
+    write_audit_entries([deserialize_entry(entry) for entry in entries])
+
+
+@shared_task(  # type: ignore[untyped-decorator]
+    name='system.maintain_audit_log',
+    ignore_result=True,
+)
+def maintain_audit_log() -> int:
+    """Prepare upcoming audit log partitions and archive expired months.
+
+    Returns:
+        Number of archived entries.
+    """
+    ensure_audit_partitions()
+    if settings.AUDIT_LOG_RETENTION_MONTHS < 1:
+        return 0
+    archived = archive_audit_log(
+        settings.AUDIT_LOG_RETENTION_MONTHS,
+        settings.AUDIT_LOG_ARCHIVE_DIR,
+    )
+    return sum(month.rows for month in archived)
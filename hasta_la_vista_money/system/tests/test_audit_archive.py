@@ -0,0 +1,99 @@
+import gzip
+import json
+import tempfile
+from datetime import UTC, date, datetime
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from hasta_la_vista_money.system.models import AuditLog
+from hasta_la_vista_money.system.services.audit_archive import (
+    archive_audit_log,
+)
+from hasta_la_vista_money.system.tasks import maintain_audit_log
+
+User = get_user_model()
+
+
+class AuditArchiveTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='archive-user')
+        self.directory = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def _entry(self, created_at: datetime, object_pk: str) -> AuditLog:
+        return AuditLog.objects.create(
+            user=self.user,
+            model_name='finance_account.Account',
+            object_pk=object_pk,
+            object_name='Счёт',
+            action=AuditLog.Action.CREATE,
+            diff={'created': {'Баланс': '10.00'}},
+            created_at=created_at,
+        )
+
+    def test_months_past_retention_are_exported_and_removed(self) -> None:
+        self._entry(datetime(2020, 1, 5, tzinfo=UTC), '1')
+        self._entry(datetime(2020, 1, 20, tzinfo=UTC), '2')
+        self._entry(datetime(2020, 3, 1, tzinfo=UTC), '3')
+        recent = self._entry(datetime.now(UTC), '4')
+
+        archived = archive_audit_log(1, self.directory)
+
+        self.assertEqual(
+            [(month.month, month.rows) for month in archived[:3]],
+            [
+                (date(2020, 1, 1), 2),
+                (date(2020, 2, 1), 0),
+                (date(2020, 3, 1), 1),
+            ],
+        )
+        self.assertEqual(list(AuditLog.objects.all()), [recent])
+        path = archived[0].path
+        assert path is not None
+        self.assertEqual(path.name, 'auditlog-2020-01.ndjson.gz')
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            rows = [json.loads(line) for line in archive]
+        self.assertEqual([row['object_pk'] for row in rows], ['1', '2'])
+        self.assertEqual(rows[0]['diff'], {'created': {'Баланс': '10.00'}})
+        self.assertIsNone(archived[1].path)
+
+    def test_later_archive_of_a_month_keeps_the_earlier_file(self) -> None:
+        self._entry(datetime(2020, 1, 5, tzinfo=UTC), '1')
+        archive_audit_log(1, self.directory)
+        self._entry(datetime(2020, 1, 6, tzinfo=UTC), '2')
+
+        archived = archive_audit_log(1, self.directory)
+
+        self.assertEqual(
+            sorted(path.name for path in self.directory.iterdir()),
+            ['auditlog-2020-01.1.ndjson.gz', 'auditlog-2020-01.ndjson.gz'],
+        )
+        self.assertEqual(archived[0].rows, 1)
+
+    def test_command_requires_a_retention_period(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command('archive_audit_log', retention_months=0)
+
+    def test_command_reports_archived_entries(self) -> None:
+        self._entry(datetime(2020, 1, 5, tzinfo=UTC), '1')
+        out = StringIO()
+
+        call_command(
+            'archive_audit_log',
+            retention_months=1,
+            output_dir=self.directory,
+            stdout=out,
+        )
+
+        self.assertIn('Архивировано записей: 1', out.getvalue())
+        self.assertFalse(AuditLog.objects.exists())
+
+    @override_settings(AUDIT_LOG_RETENTION_MONTHS=0)
+    def test_task_keeps_everything_without_retention(self) -> None:
+        self._entry(datetime(2020, 1, 5, tzinfo=UTC), '1')
+
+        self.assertEqual(maintain_audit_log.run(), 0)
+        self.assertTrue(AuditLog.objects.exists())
@@ -1,10 +1,27 @@
+from datetime import UTC, datetime
 from decimal import Decimal
+from typing import Any
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from kombu.exceptions import OperationalError
 
-from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.finance_account.models import (
+    Account,
+    TransferMoneyLog,
+)
+from hasta_la_vista_money.receipts.models import Receipt
 from hasta_la_vista_money.system.models import AuditLog
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    Transaction,
+    TransactionType,
+)
 
 User = get_user_model()
 
@@ -13,7 +30,11 @@ class AuditLogTests(TestCase):
     def test_audit_log_created_for_financial_model_create(self) -> None:
         user = User.objects.create_user(username='audit-user')
 
-        account = Account.objects.create(user=user, balance=Decimal('100.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            account = Account.objects.create(
+                user=user,
+                balance=Decimal('100.00'),
+            )
 
         audit_log = AuditLog.objects.get(
             model_name='finance_account.Account',
@@ -26,10 +47,15 @@ class AuditLogTests(TestCase):
 
     def test_audit_log_created_for_financial_model_update(self) -> None:
         user = User.objects.create_user(username='audit-user')
-        account = Account.objects.create(user=user, balance=Decimal('100.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            account = Account.objects.create(
+                user=user,
+                balance=Decimal('100.00'),
+            )
 
-        account.balance = Decimal('75.50')
-        account.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            account.balance = Decimal('75.50')
+            account.save()
 
         audit_log = AuditLog.objects.get(
             model_name='finance_account.Account',
@@ -41,12 +67,152 @@ class AuditLogTests(TestCase):
             {'old': '100.00', 'new': '75.50'},
         )
 
+    def test_update_of_a_loaded_instance_does_not_read_it_back(self) -> None:
+        user = User.objects.create_user(username='audit-user')
+        with self.captureOnCommitCallbacks(execute=True):
+            account = Account.objects.create(
+                user=user,
+                balance=Decimal('100.00'),
+            )
+        loaded = Account.objects.select_related('user').get(pk=account.pk)
+
+        with (
+            self.captureOnCommitCallbacks(execute=True),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            loaded.balance = Decimal('60.00')
+            loaded.save()
+            loaded.balance = Decimal('40.00')
+            loaded.save()
+
+        self.assertFalse(
+            [query for query in queries if query['sql'].startswith('SELECT')],
+        )
+        diffs = AuditLog.objects.filter(
+            action=AuditLog.Action.UPDATE,
+        ).values_list('diff', flat=True)
+        self.assertCountEqual(
+            [diff['Баланс'] for diff in diffs],
+            [
+                {'old': '100.00', 'new': '60.00'},
+                {'old': '60.00', 'new': '40.00'},
+            ],
+        )
+
+    def test_updates_of_dated_operations_do_not_read_them_back(self) -> None:
+        user = User.objects.create_user(username='audit-user')
+        moment = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            account = Account.objects.create(user=user, name_account='Main')
+            other = Account.objects.create(user=user, name_account='Other')
+            category = Category.objects.create(
+                user=user,
+                name='Food',
+                type=TransactionType.EXPENSE,
+            )
+            created = [
+                Transaction.objects.create(
+                    user=user,
+                    account=account,
+                    category=category,
+                    type=TransactionType.EXPENSE,
+                    amount=Decimal('10.00'),
+                    date=moment,
+                ),
+                Receipt.objects.create(
+                    user=user,
+                    account=account,
+                    receipt_date=moment,
+                    total_sum=Decimal('10.00'),
+                ),
+                TransferMoneyLog.objects.create(
+                    user=user,
+                    from_account=account,
+                    to_account=other,
+                    amount=Decimal('10.00'),
+                    exchange_date=moment,
+                ),
+            ]
+        operations = [
+            Transaction.objects.select_related('user', 'account').get(
+                pk=created[0].pk,
+            ),
+            Receipt.objects.select_related('user', 'account').get(
+                pk=created[1].pk,
+            ),
+            TransferMoneyLog.objects.select_related(
+                'user',
+                'from_account',
+                'to_account',
+            ).get(pk=created[2].pk),
+        ]
+
+        for operation in operations:
+            table = operation._meta.db_table
+            with (
+                self.subTest(table=table),
+                self.captureOnCommitCallbacks(execute=True),
+                CaptureQueriesContext(connection) as queries,
+            ):
+                operation.save()
+
+                self.assertFalse(
+                    [
+                        query
+                        for query in queries
+                        if query['sql'].startswith('SELECT')
+                        and f'FROM "{table}"' in query['sql']
+                    ],
+                )
+
+    def test_instance_with_deferred_fields_is_read_back(self) -> None:
+        user = User.objects.create_user(username='audit-user')
+        with self.captureOnCommitCallbacks(execute=True):
+            account = Account.objects.create(
+                user=user,
+                name_account='Main',
+                balance=Decimal('100.00'),
+            )
+        partial = Account.objects.only('pk', 'user', 'balance').get(
+            pk=account.pk,
+        )
+        unloaded = Account(
+            pk=account.pk,
+            user=user,
+            name_account='Renamed',
+            balance=Decimal('100.00'),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            partial.balance = Decimal('80.00')
+            partial.save()
+            unloaded.save()
+
+        diffs = list(
+            AuditLog.objects.filter(action=AuditLog.Action.UPDATE)
+            .order_by('pk')
+            .values_list('diff', flat=True),
+        )
+        self.assertEqual(
+            diffs[0]['Баланс'],
+            {'old': '100.00', 'new': '80.00'},
+        )
+        self.assertEqual(
+            diffs[1]['Название счёта'],
+            {'old': 'Main', 'new': 'Renamed'},
+        )
+        self.assertEqual(
+            diffs[1]['Баланс'],
+            {'old': '80.00', 'new': '100.00'},
+        )
+
     def test_audit_log_created_for_financial_model_delete(self) -> None:
         user = User.objects.create_user(username='audit-user')
         account = Account.objects.create(user=user, balance=Decimal('100.00'))
         object_pk = str(account.pk)
 
-        account.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            account.delete()
 
         audit_log = AuditLog.objects.get(
             model_name='finance_account.Account',
@@ -55,3 +221,230 @@ class AuditLogTests(TestCase):
         )
         self.assertEqual(audit_log.user, user)
         self.assertEqual(audit_log.diff['deleted']['Баланс'], '100.00')
+
+    def test_entries_of_a_transaction_are_written_in_one_statement(
+        self,
+    ) -> None:
+        user = User.objects.create_user(username='audit-user')
+
+        with (
+            self.captureOnCommitCallbacks() as callbacks,
+            transaction.atomic(),
+        ):
+            accounts = [
+                Account.objects.create(user=user, name_account=f'Счёт {n}')
+                for n in range(3)
+            ]
+        self.assertFalse(AuditLog.objects.exists())
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+
+        # Names of the banks the accounts belong to, then one insert.
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(
+            AuditLog.objects.filter(action=AuditLog.Action.CREATE).count(),
+            len(accounts),
+        )
+
+    def test_names_of_referenced_objects_are_loaded_in_bulk(self) -> None:
+        user = User.objects.create_user(username='audit-user')
+        with self.captureOnCommitCallbacks(execute=True):
+            cash = Account.objects.create(user=user, name_account='Cash')
+            card = Account.objects.create(user=user, name_account='Card')
+        category = Category.objects.create(
+            user=user,
+            name='Food',
+            type=TransactionType.EXPENSE,
+        )
+
+        with (
+            self.captureOnCommitCallbacks() as callbacks,
+            transaction.atomic(),
+        ):
+            for from_account, to_account in ((cash, card), (card, cash)):
+                TransferMoneyLog.objects.create(
+                    user=user,
+                    from_account=from_account,
+                    to_account=to_account,
+                    amount=Decimal('10.00'),
+                    exchange_date=timezone.now(),
+                )
+            Transaction.objects.create(
+                user=user,
+                account=cash,
+                category=category,
+                type=TransactionType.EXPENSE,
+                amount=Decimal('5.00'),
+                date=timezone.now(),
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+
+        # Account balances are refreshed by their own callbacks; the audit
+        # entries look up account and category names once each.
+        sql = [query['sql'] for query in queries]
+        self.assertEqual(
+            sum('"account"."name_account" FROM' in query for query in sql),
+            1,
+        )
+        self.assertEqual(
+            sum('FROM "transactions_category"' in query for query in sql),
+            1,
+        )
+        self.assertEqual(sum('system_auditlog' in query for query in sql), 1)
+
+        transfers = AuditLog.objects.filter(
+            model_name='finance_account.TransferMoneyLog',
+        ).values_list('diff', flat=True)
+        self.assertCountEqual(
+            [
+                (
+                    diff['created']['Счёт списания'],
+                    diff['created']['Счёт зачисления'],
+                )
+                for diff in transfers
+            ],
+            [('Cash', 'Card'), ('Card', 'Cash')],
+        )
+        expense = AuditLog.objects.get(model_name='transactions.Transaction')
+        self.assertEqual(expense.diff['created']['Счёт'], 'Cash')
+        self.assertEqual(expense.diff['created']['Категория'], 'Food')
+
+    def test_rolled_back_savepoint_leaves_no_entries(self) -> None:
+        user = User.objects.create_user(username='audit-user')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            kept = Account.objects.create(user=user, name_account='Kept')
+            try:
+                with transaction.atomic():
+                    Account.objects.create(user=user, name_account='Lost')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(
+            list(AuditLog.objects.values_list('object_pk', flat=True)),
+            [str(kept.pk)],
+        )
+
+    @override_settings(AUDIT_LOG_QUEUE=True)
+    def test_queued_entries_fall_back_to_direct_write(self) -> None:
+        user = User.objects.create_user(username='audit-user')
+
+        with (
+            patch(
+                'hasta_la_vista_money.system.tasks.store_audit_entries'
+                '.apply_async',
+                side_effect=OperationalError,
+            ) as apply_async,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            Account.objects.create(user=user, name_account='Main')
+
+        apply_async.assert_called_once()
+        self.assertTrue(
+            AuditLog.objects.filter(action=AuditLog.Action.CREATE).exists(),
+        )
+
+
+class AuditLogTransactionTests(TransactionTestCase):
+    def test_rolled_back_transaction_leaves_no_entries(self) -> None:
+        user = User.objects.create_user(username='audit-user')
+
+        try:
+            with transaction.atomic():
+                Account.objects.create(user=user, name_account='Lost')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        with transaction.atomic():
+            Account.objects.create(user=user, name_account='Kept')
+
+        self.assertEqual(
+            list(AuditLog.objects.values_list('object_name', flat=True)),
+            ['Kept'],
+        )
+
+
+class AuditLogViewTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='audit-viewer')
+        self.client.force_login(self.user)
+        moments = [
+            datetime(2026, 3, day, 12, tzinfo=UTC) for day in (1, 2, 3, 3, 4)
+        ]
+        self.entries = [
+            AuditLog.objects.create(
+                user=self.user,
+                model_name='finance_account.Account',
+                object_pk=str(index),
+                action=AuditLog.Action.UPDATE,
+                created_at=moment,
+            )
+            for index, moment in enumerate(moments)
+        ]
+        self.newest_first = [
+            entry.pk
+            for entry in sorted(
+                self.entries,
+                key=lambda entry: (entry.created_at, entry.pk),
+                reverse=True,
+            )
+        ]
+
+    def _page(self, **params: str) -> Any:
+        return self.client.get(reverse('system:auditlog'), params)
+
+    @patch('hasta_la_vista_money.system.views.AUDIT_PAGE_SIZE', 2)
+    def test_pages_follow_cursors_in_both_directions(self) -> None:
+        seen: list[int] = []
+        pages = []
+        response = self._page()
+        while True:
+            pages.append(response)
+            seen += [entry.pk for entry in response.context['entries']]
+            cursor = response.context['keyset'].next_cursor
+            if cursor is None:
+                break
+            response = self._page(after=cursor)
+
+        self.assertEqual(seen, self.newest_first)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(pages[0].context['entries_count'], 5)
+        self.assertFalse(pages[0].context['entries_count_capped'])
+
+        back = self._page(before=pages[2].context['keyset'].previous_cursor)
+        self.assertEqual(
+            [entry.pk for entry in back.context['entries']],
+            self.newest_first[2:4],
+        )
+
+    @patch('hasta_la_vista_money.system.views.AUDIT_COUNT_LIMIT', 3)
+    def test_entries_are_counted_up_to_the_limit(self) -> None:
+        response = self._page()
+
+        self.assertEqual(response.context['entries_count'], 3)
+        self.assertTrue(response.context['entries_count_capped'])
+        self.assertContains(response, '3+')
+
+    def test_date_filter_bounds_the_raw_timestamp(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self._page(date_from='2026-03-02', date_to='2026-03-03')
+
+        self.assertEqual(
+            [entry.pk for entry in response.context['entries']],
+            self.newest_first[1:4],
+        )
+        sql = ' '.join(query['sql'] for query in queries).upper()
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('CAST_DATE', sql)
+
+    def test_invalid_cursor_and_dates_show_the_first_page(self) -> None:
+        response = self._page(after='not-a-cursor', date_from='03/02/2026')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['entries']), 5)
@@ -0,0 +1,148 @@
+import tempfile
+from pathlib import Path
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from hasta_la_vista_money.system.services.benchmarks import (
+    BenchmarkReport,
+    BenchmarkStats,
+    find_regressions,
+    run_benchmarks,
+)
+from hasta_la_vista_money.system.services.dataset import DatasetSpec
+from hasta_la_vista_money.system.services.synthetic_statements import (
+    LAYOUTS,
+    synthetic_statement,
+)
+from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.bank_statement import (
+    _create_parser,
+    _OzonBankParser,
+    _RaiffeisenBankParser,
+    _SberbankParser,
+)
+
+PARSERS = {
+    'raiffeisen': _RaiffeisenBankParser,
+    'sberbank': _SberbankParser,
+    'ozon': _OzonBankParser,
+}
+
+
+def _report(**medians: float) -> BenchmarkReport:
+    stats: dict[str, BenchmarkStats] = {
+        name: {
+            'rounds': 1,
+            'min': median,
+            'median': median,
+            'mean': median,
+            'stddev': 0.0,
+        }
+        for name, median in medians.items()
+    }
+    return {
+        'database': 'sqlite',
+        'python': '3.12',
+        'seed': 0,
+        'spec': {},
+        'created_at': '',
+        'benchmarks': stats,
+    }
+
+
+class FindRegressionsTests(TestCase):
+    def test_only_medians_beyond_the_threshold_regress(self) -> None:
+        baseline = _report(fast=1.0, slow=1.0, gone=1.0)
+        current = _report(fast=1.2, slow=1.3, new=5.0)
+
+        regressions = find_regressions(current, baseline, threshold=0.25)
+
+        self.assertEqual([r.name for r in regressions], ['slow'])
+        self.assertAlmostEqual(regressions[0].ratio, 1.3)
+
+
+class SyntheticStatementTests(TestCase):
+    def test_every_layout_is_detected_and_parsed_in_full(self) -> None:
+        with tempfile.TemporaryDirectory() as workdir:
+            for bank in LAYOUTS:
+                with self.subTest(bank=bank):
+                    path = Path(workdir) / f'{bank}.pdf'
+                    path.write_bytes(synthetic_statement(bank, 60, seed=3))
+
+                    parser = _create_parser(path)
+                    result = parser.parse()
+
+                    self.assertIsInstance(parser, PARSERS[bank])
+                    self.assertEqual(len(result.transactions), 60)
+                    self.assertEqual(
+                        result.transactions[0]['date'].strftime('%d.%m.%Y'),
+                        '05.01.2026',
+                    )
+
+    def test_same_seed_gives_the_same_document(self) -> None:
+        self.assertEqual(
+            synthetic_statement('sberbank', 10, seed=1),
+            synthetic_statement('sberbank', 10, seed=1),
+        )
+
+
+class RunBenchmarksTests(TestCase):
+    def test_benchmarks_run_on_a_dataset_that_is_rolled_back(self) -> None:
+        users = User.objects.count()
+        seen: list[str] = []
+
+        report = run_benchmarks(
+            ['reports.budget_charts', 'loan.annuity_schedule'],
+            spec=DatasetSpec(
+                users=1,
+                months=3,
+                transactions=50,
+                receipts=2,
+                transfers=2,
+                budget_months=2,
+                prefix='run',
+            ),
+            rounds=2,
+            warmup=0,
+            progress=lambda name, _stats: seen.append(name),
+        )
+
+        self.assertEqual(
+            sorted(report['benchmarks']),
+            ['loan.annuity_schedule', 'reports.budget_charts'],
+        )
+        self.assertEqual(
+            report['benchmarks']['loan.annuity_schedule']['rounds'],
+            2,
+        )
+        self.assertEqual(
+            seen,
+            ['reports.budget_charts', 'loan.annuity_schedule'],
+        )
+        self.assertEqual(User.objects.count(), users)
+
+    def test_configured_cache_is_left_alone(self) -> None:
+        cache.set('benchmarks-test', 'kept')
+        self.addCleanup(cache.delete, 'benchmarks-test')
+
+        run_benchmarks(
+            ['reports.budget_charts'],
+            spec=DatasetSpec(
+                users=1,
+                months=1,
+                transactions=5,
+                receipts=1,
+                transfers=1,
+                budget_months=1,
+                prefix='iso',
+            ),
+            rounds=1,
+            warmup=0,
+        )
+
+        self.assertEqual(cache.get('benchmarks-test'), 'kept')
+
+    def test_unknown_benchmark_is_rejected(self) -> None:
+        with self.assertRaises(KeyError):
+            run_benchmarks(['nope'])
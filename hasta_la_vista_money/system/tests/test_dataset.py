@@ -0,0 +1,139 @@
+from dataclasses import replace
+from datetime import date
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from hasta_la_vista_money.budget.models import Budget
+from hasta_la_vista_money.deposits.models import DepositRatePeriod
+from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.system.services.dataset import (
+    DatasetSpec,
+    generate_dataset,
+)
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    CategoryClosure,
+    Transaction,
+)
+from hasta_la_vista_money.users.models import FamilyGroupMembership, User
+
+END = date(2026, 1, 1)
+SPEC = DatasetSpec(
+    users=3,
+    family_size=2,
+    months=6,
+    transactions=200,
+    category_roots=3,
+    category_children=2,
+    category_depth=3,
+    receipts=10,
+    transfers=10,
+    budget_months=2,
+    batch_size=64,
+)
+
+
+def _transactions(prefix: str) -> list[tuple[object, ...]]:
+    return list(
+        Transaction.objects.filter(user__username__startswith=prefix)
+        .order_by('pk')
+        .values_list('type', 'amount', 'date', 'category__name'),
+    )
+
+
+class GenerateDatasetTests(TestCase):
+    def test_counts_follow_the_spec(self) -> None:
+        counts = generate_dataset(SPEC, seed=1, end=END)
+
+        self.assertEqual(counts['users.User'], 3)
+        self.assertEqual(counts['transactions.Transaction'], 600)
+        self.assertEqual(counts['users.FamilyGroupMembership'], 2)
+        self.assertEqual(
+            counts['transactions.Category'],
+            3 * 2 * (3 + 3 * 2 + 3 * 2 * 2),
+        )
+        self.assertEqual(
+            set(Account.objects.values_list('type_account', flat=True)),
+            {'Credit', 'CreditCard', 'Debit', 'DebitCard', 'CASH', 'Deposit'},
+        )
+        self.assertEqual(
+            Budget.objects.filter(category__isnull=True).count(),
+            3 * 2,
+        )
+        self.assertTrue(
+            FamilyGroupMembership.objects.filter(
+                role=FamilyGroupMembership.Role.OWNER,
+            ).exists(),
+        )
+        self.assertGreaterEqual(DepositRatePeriod.objects.count(), 3 * 2)
+
+    def test_same_seed_gives_the_same_data(self) -> None:
+        generate_dataset(SPEC, seed=5, end=END)
+        generate_dataset(replace(SPEC, prefix='again'), seed=5, end=END)
+
+        self.assertEqual(_transactions('bench'), _transactions('again'))
+
+    def test_category_closure_covers_every_ancestor(self) -> None:
+        generate_dataset(SPEC, seed=1, end=END)
+        leaf = Category.objects.filter(
+            user__username='bench0000',
+            parent_category__parent_category__isnull=False,
+        ).first()
+        assert leaf is not None
+        assert leaf.parent_category is not None
+
+        ancestors = CategoryClosure.objects.filter(descendant=leaf)
+
+        self.assertEqual(
+            sorted(ancestors.values_list('depth', flat=True)),
+            [0, 1, 2],
+        )
+        self.assertEqual(
+            ancestors.get(depth=2).ancestor,
+            leaf.parent_category.parent_category,
+        )
+
+    def test_generated_user_can_open_the_statistics(self) -> None:
+        generate_dataset(SPEC, seed=1, end=END)
+        self.client.force_login(User.objects.get(username='bench0000'))
+
+        response = self.client.get(reverse('users:statistics'))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_users_get_unusable_passwords_by_default(self) -> None:
+        generate_dataset(SPEC, seed=1, end=END)
+
+        self.assertFalse(
+            any(
+                user.has_usable_password()
+                for user in User.objects.filter(username__startswith='bench')
+            ),
+        )
+
+
+class SeedDatasetCommandTests(TestCase):
+    def test_refuses_to_run_without_debug(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command('seed_dataset', users=1)
+
+        self.assertFalse(User.objects.filter(username='bench0000').exists())
+
+    def test_password_is_opt_in(self) -> None:
+        call_command(
+            'seed_dataset',
+            '--force',
+            '--password',
+            'secret-pass',
+            users=1,
+            family_size=1,
+            months=1,
+            transactions=5,
+            stdout=StringIO(),
+        )
+
+        user = User.objects.get(username='bench0000')
+        self.assertTrue(user.check_password('secret-pass'))
@@ -0,0 +1,163 @@
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from hasta_la_vista_money.core.metrics import observe_statement_rows
+from hasta_la_vista_money.services.caching import get_or_compute
+from hasta_la_vista_money.system.services import metrics as task_metrics
+
+User = get_user_model()
+
+MIDDLEWARE = 'hasta_la_vista_money.system.middleware.MetricsMiddleware'
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN='secret')
+class MetricsViewTests(TestCase):
+    def test_token_bearer_gets_the_metrics(self) -> None:
+        response = self.client.get(
+            reverse('metrics'),
+            headers={'Authorization': 'Bearer secret'},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'hlvm_cache_lookups_total', response.content)
+
+    def test_wrong_token_and_anonymous_requests_are_hidden(self) -> None:
+        wrong = self.client.get(
+            reverse('metrics'),
+            headers={'Authorization': 'Bearer guess'},
+        )
+        anonymous = self.client.get(reverse('metrics'))
+
+        self.assertEqual(wrong.status_code, 404)
+        self.assertEqual(anonymous.status_code, 404)
+
+    def test_superuser_gets_the_metrics(self) -> None:
+        self.client.force_login(
+            User.objects.create_superuser(username='metrics-admin'),
+        )
+
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_metrics_are_off_unless_enabled(self) -> None:
+        response = self.client.get(
+            reverse('metrics'),
+            headers={'Authorization': 'Bearer secret'},
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+
+class MetricsRecordingTests(TestCase):
+    @modify_settings(MIDDLEWARE={'prepend': MIDDLEWARE})
+    def test_request_is_recorded_under_its_url_name(self) -> None:
+        labels = {'route': 'readyz', 'method': 'GET', 'status': '2xx'}
+        before = _sample('hlvm_http_request_duration_seconds_count', **labels)
+
+        self.client.get(reverse('readyz'))
+
+        self.assertEqual(
+            _sample('hlvm_http_request_duration_seconds_count', **labels),
+            before + 1,
+        )
+        self.assertEqual(
+            _sample('hlvm_http_request_queries_count', route='readyz'),
+            before + 1,
+        )
+
+    @modify_settings(MIDDLEWARE={'prepend': MIDDLEWARE})
+    def test_unknown_methods_share_one_label(self) -> None:
+        labels = {'route': 'readyz', 'method': 'other', 'status': '4xx'}
+        before = _sample('hlvm_http_request_duration_seconds_count', **labels)
+
+        self.client.generic('PROPFIND', reverse('readyz'))
+        self.client.generic('X-CUSTOM', reverse('readyz'))
+
+        self.assertEqual(
+            _sample('hlvm_http_request_duration_seconds_count', **labels),
+            before + 2,
+        )
+
+    @modify_settings(MIDDLEWARE={'prepend': MIDDLEWARE})
+    async def test_async_requests_are_recorded(self) -> None:
+        labels = {'route': 'readyz', 'method': 'GET', 'status': '2xx'}
+        before = _sample('hlvm_http_request_duration_seconds_count', **labels)
+
+        await self.async_client.get(reverse('readyz'))
+
+        self.assertEqual(
+            _sample('hlvm_http_request_duration_seconds_count', **labels),
+            before + 1,
+        )
+
+    def test_cache_lookups_are_counted_by_outcome(self) -> None:
+        before = _sample(
+            'hlvm_cache_lookups_total',
+            metric='metrics_test',
+            outcome='miss',
+        )
+
+        get_or_compute(
+            'metrics-test',
+            lambda: 1,
+            timeout=60,
+            metric='metrics_test',
+        )
+
+        self.assertEqual(
+            _sample(
+                'hlvm_cache_lookups_total',
+                metric='metrics_test',
+                outcome='miss',
+            ),
+            before + 1,
+        )
+
+    def test_task_run_and_queue_wait_are_recorded(self) -> None:
+        headers: dict[str, float] = {}
+        task_metrics._task_published(headers=headers)
+        task = SimpleNamespace(
+            name='metrics.test_task',
+            request=SimpleNamespace(
+                published_at=headers['published_at'] - 2,
+            ),
+        )
+
+        task_metrics._task_started('task-id', task=task)
+        task_metrics._task_finished('task-id', task=task, state='SUCCESS')
+
+        self.assertGreaterEqual(
+            _sample(
+                'hlvm_celery_task_queue_wait_seconds_sum',
+                task='metrics.test_task',
+            ),
+            2,
+        )
+        self.assertEqual(
+            _sample(
+                'hlvm_celery_task_duration_seconds_count',
+                task='metrics.test_task',
+                state='SUCCESS',
+            ),
+            1,
+        )
+
+    def test_statement_throughput_is_recorded(self) -> None:
+        observe_statement_rows('parse', 120, 0.5)
+
+        self.assertGreaterEqual(
+            _sample('hlvm_bank_statement_rows_total', stage='parse'),
+            120,
+        )
+        self.assertGreaterEqual(
+            _sample('hlvm_bank_statement_rows_per_second_sum', stage='parse'),
+            240,
+        )
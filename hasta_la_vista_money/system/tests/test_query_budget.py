@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+from django.views import View
+
+from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.system.services import query_budget as budgets
+from hasta_la_vista_money.system.services.query_budget import (
+    QueryBudget,
+    QueryBudgetExceededError,
+    assert_query_budget,
+    budget_for,
+    fingerprint,
+    query_budget,
+)
+from hasta_la_vista_money.system.tasks import maintain_audit_log
+
+User = get_user_model()
+
+MIDDLEWARE = 'hasta_la_vista_money.system.middleware.QueryBudgetMiddleware'
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='budget-user')
+        for number in range(3):
+            Account.objects.create(user=self.user, name_account=f'{number}')
+
+    def test_fingerprint_ignores_literals_and_list_lengths(self) -> None:
+        self.assertEqual(
+            fingerprint("SELECT * FROM a WHERE id IN (%s, %s) AND n = 'x'"),
+            fingerprint('SELECT * FROM a WHERE id IN (%s) AND n = 42'),
+        )
+
+    def test_repeated_statement_in_a_loop_exceeds_the_budget(self) -> None:
+        with (
+            self.assertRaises(QueryBudgetExceededError) as raised,
+            assert_query_budget(max_duplicates=1),
+        ):
+            for account in Account.objects.all():
+                account.user.get_username()
+
+        self.assertIn('3×', str(raised.exception))
+
+    def test_prefetched_loop_stays_within_the_budget(self) -> None:
+        with assert_query_budget(max_queries=1, max_duplicates=1) as stats:
+            for account in Account.objects.select_related('user'):
+                account.user.get_username()
+
+        self.assertEqual(stats.count, 1)
+
+    def test_decorator_wins_over_settings(self) -> None:
+        @query_budget(max_queries=3)
+        class BudgetView(View):
+            pass
+
+        self.assertEqual(
+            budget_for('system:auditlog', BudgetView.as_view(), BudgetView),
+            QueryBudget(max_queries=3),
+        )
+
+    @modify_settings(MIDDLEWARE={'append': MIDDLEWARE})
+    @override_settings(QUERY_BUDGETS={'system:auditlog': {'max_queries': 1}})
+    def test_middleware_fails_a_request_over_its_budget(self) -> None:
+        self.client.force_login(self.user)
+
+        with self.assertRaises(QueryBudgetExceededError):
+            self.client.get(reverse('system:auditlog'))
+
+    @modify_settings(MIDDLEWARE={'append': MIDDLEWARE})
+    @override_settings(QUERY_BUDGETS={'system:auditlog': {'max_queries': 1}})
+    async def test_async_middleware_counts_queries_of_sync_views(
+        self,
+    ) -> None:
+        await self.async_client.aforce_login(self.user)
+
+        with self.assertRaises(QueryBudgetExceededError):
+            await self.async_client.get(reverse('system:auditlog'))
+
+    @modify_settings(MIDDLEWARE={'append': MIDDLEWARE})
+    @override_settings(
+        QUERY_BUDGETS={'system:auditlog': {'max_queries': 1}},
+        QUERY_BUDGET_RAISE=False,
+    )
+    def test_middleware_warns_outside_of_tests(self) -> None:
+        self.client.force_login(self.user)
+
+        with patch.object(budgets.logger, 'warning') as warning:
+            response = self.client.get(reverse('system:auditlog'))
+
+        self.assertEqual(response.status_code, 200)
+        warning.assert_called_once()
+        self.assertEqual(warning.call_args.kwargs['target'], 'system:auditlog')
+
+    @override_settings(
+        QUERY_BUDGETS={'system.maintain_audit_log': {'max_queries': 0}},
+        QUERY_BUDGET_RAISE=False,
+    )
+    def test_task_queries_are_checked_after_the_run(self) -> None:
+        with patch.object(budgets.logger, 'warning') as warning:
+            budgets._task_started('task-id')
+            Account.objects.count()
+            budgets._task_finished('task-id', task=maintain_audit_log)
+
+        self.assertEqual(
+            warning.call_args.kwargs['target'],
+            'system.maintain_audit_log',
+        )
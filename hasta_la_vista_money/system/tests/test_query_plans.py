@@ -0,0 +1,95 @@
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.system.management.commands._query_plans import (
+    QUERY_PATHS,
+    PlanContext,
+    PlanNode,
+    Snapshots,
+    capture_plans,
+    capture_seeded_plans,
+    find_plan_problems,
+    load_snapshots,
+    snapshot_path,
+)
+from hasta_la_vista_money.users.models import User
+
+
+def _snapshots(*plan: PlanNode) -> Snapshots:
+    return {'budget.path': [{'sql': 'SELECT 1', 'plan': list(plan)}]}
+
+
+class FindPlanProblemsTests(TestCase):
+    def test_full_scans_of_large_tables_are_reported(self) -> None:
+        scan: PlanNode = {
+            'node': 'Seq Scan',
+            'relation': 'transactions_transaction',
+        }
+        small: PlanNode = {'node': 'Seq Scan', 'relation': 'users_user'}
+        current = _snapshots({'node': 'Hash Join', 'children': [scan, small]})
+
+        self.assertEqual(
+            find_plan_problems(current, current),
+            ['budget.path #1: full scan of transactions_transaction'],
+        )
+
+    def test_changed_and_unknown_plans_are_reported(self) -> None:
+        before = _snapshots({'node': 'Index Scan using a'})
+        after = _snapshots({'node': 'Index Scan using b'})
+
+        self.assertEqual(
+            find_plan_problems(after, before),
+            ['budget.path #1: plan changed'],
+        )
+        self.assertEqual(
+            find_plan_problems(after, {}),
+            ['budget.path: no snapshot'],
+        )
+
+
+class CapturePlansTests(TestCase):
+    fixtures = ['users.yaml', 'finance_account.yaml']
+
+    def test_configured_cache_is_left_alone(self) -> None:
+        cache.set('query-plans-test', 'kept')
+        self.addCleanup(cache.delete, 'query-plans-test')
+        context = PlanContext(
+            user=User.objects.get(pk=1),
+            account=Account.objects.get(pk=1),
+        )
+
+        plans = capture_plans(context, ['reports.budget_charts'])
+
+        self.assertTrue(plans['reports.budget_charts'])
+        self.assertEqual(cache.get('query-plans-test'), 'kept')
+
+
+class QueryPlanSnapshotTests(TransactionTestCase):
+    # Rolled back tests leave dead rows behind, which PostgreSQL counts
+    # in its costs. Flushing gives every table a fresh heap, and the
+    # serialized rollback restores the rows created by migrations.
+    serialized_rollback = True
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Before the fixture setup of super(), which restores the rows.
+        call_command(
+            'flush',
+            interactive=False,
+            verbosity=0,
+            inhibit_post_migrate=True,
+        )
+        super().setUpClass()
+
+    def test_plans_match_the_committed_snapshots(self) -> None:
+        snapshots = load_snapshots(snapshot_path())
+        if snapshots is None:
+            self.skipTest(f'No query plan snapshots for {connection.vendor}.')
+
+        current = capture_seeded_plans()
+
+        self.assertEqual(sorted(current), sorted(QUERY_PATHS))
+        self.assertEqual(find_plan_problems(current, snapshots), [])
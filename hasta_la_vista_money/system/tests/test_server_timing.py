@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import structlog
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, modify_settings
+from django.urls import reverse
+
+from hasta_la_vista_money.core.spans import collect_spans, span, timed
+
+User = get_user_model()
+
+MIDDLEWARE = 'hasta_la_vista_money.system.middleware.ServerTimingMiddleware'
+
+
+@timed()
+def _work() -> int:
+    with span('inner'):
+        return 42
+
+
+class SpanTests(SimpleTestCase):
+    def test_spans_are_summed_by_name(self) -> None:
+        with collect_spans() as timings:
+            _work()
+            _work()
+
+        self.assertEqual(list(timings.spans), ['inner', '_work'])
+        self.assertEqual(timings.spans['_work'].count, 2)
+        self.assertGreaterEqual(
+            timings.spans['_work'].duration,
+            timings.spans['inner'].duration,
+        )
+
+    def test_span_outside_a_collection_is_not_timed(self) -> None:
+        with patch('hasta_la_vista_money.core.spans.time') as clock:
+            self.assertEqual(_work(), 42)
+
+        clock.perf_counter.assert_not_called()
+
+    def test_nested_collection_keeps_its_own_spans(self) -> None:
+        with collect_spans() as outer:
+            with collect_spans() as inner:
+                _work()
+            with span('outer'):
+                pass
+
+        self.assertEqual(list(inner.spans), ['inner', '_work'])
+        self.assertEqual(list(outer.spans), ['outer'])
+
+
+@modify_settings(MIDDLEWARE={'append': MIDDLEWARE})
+class ServerTimingMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username='timing-user')
+        self.client.force_login(self.user)
+
+    def test_response_reports_database_spans_and_total_time(self) -> None:
+        response = self.client.get(reverse('users:statistics'))
+
+        self.assertEqual(response.status_code, 200)
+        metrics = [
+            metric.split(';')[0]
+            for metric in response.headers['Server-Timing'].split(', ')
+        ]
+        self.assertEqual(metrics[0], 'db')
+        self.assertIn('cache', metrics)
+        self.assertIn('get_user_detailed_statistics', metrics)
+        self.assertEqual(metrics[-1], 'total')
+
+    async def test_async_chain_reports_spans_of_sync_views(self) -> None:
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse('users:statistics'))
+
+        self.assertEqual(response.status_code, 200)
+        db, *spans = response.headers['Server-Timing'].split(', ')
+        self.assertNotIn('desc="0 queries"', db)
+        self.assertTrue(
+            any(
+                metric.startswith('get_user_detailed_statistics;')
+                for metric in spans
+            ),
+        )
+
+    def test_timings_are_bound_to_the_request_log(self) -> None:
+        with patch.object(
+            structlog.contextvars,
+            'bind_contextvars',
+        ) as bind:
+            self.client.get(reverse('users:statistics'))
+
+        timings = next(
+            call.kwargs['timings']
+            for call in bind.call_args_list
+            if 'timings' in call.kwargs
+        )
+        self.assertGreater(timings['queries'], 0)
+        self.assertIn('get_user_detailed_statistics', timings['spans'])
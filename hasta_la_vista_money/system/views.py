@@ -1,20 +1,26 @@
 """System health and readiness views."""
 
+import hmac
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.staticfiles import finders
 from django.core.cache import cache
 from django.db import connection
 from django.db.models import QuerySet
 from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.cache import never_cache
 from django.views.generic import ListView, TemplateView
 
 from hasta_la_vista_money import constants
+from hasta_la_vista_money.core import metrics
+from hasta_la_vista_money.core.pagination import keyset_page
 from hasta_la_vista_money.system.models import AuditLog
 from hasta_la_vista_money.system.services.pwa import get_pwa_precache_payload
 from hasta_la_vista_money.users.models import User
@@ -69,6 +75,33 @@ class ReadinessCheckView(View):
             return False
 
 
+@method_decorator(never_cache, name='dispatch')
+class MetricsView(View):
+    """Prometheus metrics of the web processes.
+
+    Served with ``METRICS_ENABLED`` to requests bearing ``METRICS_TOKEN``
+    and to superusers; anyone else gets a 404.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        if not settings.METRICS_ENABLED or not self._is_allowed(request):
+            raise Http404
+        body, content_type = metrics.render()
+        return HttpResponse(body, content_type=content_type)
+
+    def _is_allowed(self, request: HttpRequest) -> bool:
+        token = settings.METRICS_TOKEN
+        scheme, _, credentials = request.headers.get(
+            'Authorization',
+            '',
+        ).partition(' ')
+        if token and scheme.lower() == 'bearer':
+            return hmac.compare_digest(credentials.encode(), token.encode())
+        return bool(request.user.is_superuser)
+
+
 @method_decorator(never_cache, name='dispatch')
 class ServiceWorkerView(View):
     http_method_names = ['get', 'head', 'options']
@@ -102,6 +135,9 @@ class OfflineView(TemplateView):
 
 
 AUDIT_PAGE_SIZE = 30
+AUDIT_ORDERING = ('-created_at', '-pk')
+# Entries are counted up to this limit; larger totals show as "N+".
+AUDIT_COUNT_LIMIT = 10_000
 
 AUDITED_MODEL_CHOICES = [
     ('', 'Все модели'),
@@ -112,10 +148,18 @@ AUDITED_MODEL_CHOICES = [
 ]
 
 
+def _day_start(value: str) -> datetime | None:
+    """Start of a ``YYYY-MM-DD`` day in the current time zone."""
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        return None
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
 class AuditLogView(LoginRequiredMixin, ListView[AuditLog]):
     template_name = 'system/auditlog.html'
     context_object_name = 'entries'
-    paginate_by = AUDIT_PAGE_SIZE
 
     def get_queryset(self) -> QuerySet[AuditLog]:
         if not isinstance(self.request.user, User):
@@ -131,17 +175,33 @@ class AuditLogView(LoginRequiredMixin, ListView[AuditLog]):
             qs = qs.filter(model_name=model)
         if action:
             qs = qs.filter(action=action)
-        if date_from:
-            qs = qs.filter(created_at__date__gte=date_from)
-        if date_to:
-            qs = qs.filter(created_at__date__lte=date_to)
+        # Bounds on the raw timestamp keep the (user, -created_at) index
+        # usable, unlike a filter on the date of every row.
+        if date_from and (start := _day_start(date_from)):
+            qs = qs.filter(created_at__gte=start)
+        if date_to and (end := _day_start(date_to)):
+            qs = qs.filter(created_at__lt=end + timedelta(days=1))
         return qs
 
     def get_context_data(
         self,
         **kwargs: Any,
     ) -> dict[str, Any]:
-        ctx = super().get_context_data(**kwargs)
+        queryset = cast('QuerySet[AuditLog]', self.object_list)
+        page = keyset_page(
+            queryset,
+            AUDIT_ORDERING,
+            AUDIT_PAGE_SIZE,
+            after=self.request.GET.get('after'),
+            before=self.request.GET.get('before'),
+        )
+        ctx = super().get_context_data(object_list=page.object_list, **kwargs)
+        ctx['keyset'] = page
+        # Counting a slice stops at the limit instead of scanning every
+        # matching row of the partitioned table on each page.
+        count = queryset.order_by()[: AUDIT_COUNT_LIMIT + 1].count()
+        ctx['entries_count'] = min(count, AUDIT_COUNT_LIMIT)
+        ctx['entries_count_capped'] = count > AUDIT_COUNT_LIMIT
         ctx['model_choices'] = AUDITED_MODEL_CHOICES
         ctx['action_choices'] = AuditLog.Action.choices
         ctx['filter'] = {
@@ -8,6 +8,7 @@ transactions for the user.
 from typing import TYPE_CHECKING, Any, cast
 
 from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
 from drf_spectacular.openapi import AutoSchema
 from drf_spectacular.utils import (
     OpenApiParameter,
@@ -31,6 +32,9 @@ from hasta_la_vista_money.transactions.models import (
     Transaction,
     TransactionType,
 )
+from hasta_la_vista_money.users.services.conditional_get import (
+    conditional_on_user_data,
+)
 
 if TYPE_CHECKING:
     from hasta_la_vista_money.core.types import RequestWithContainer
@@ -100,6 +104,7 @@ def _serialize(transaction_obj: Transaction) -> dict[str, Any]:
         ),
     },
 )
+@method_decorator(conditional_on_user_data(), name='get')
 class TransactionByGroupAPIView(APIView):
     """API view for retrieving transactions by group."""
 
@@ -173,6 +178,7 @@ class TransactionByGroupAPIView(APIView):
         ),
     },
 )
+@method_decorator(conditional_on_user_data(), name='get')
 class TransactionDataAPIView(APIView):
     """API view for retrieving transaction data for table widgets."""
 
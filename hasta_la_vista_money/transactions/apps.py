@@ -9,3 +9,6 @@ class TransactionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hasta_la_vista_money.transactions'
     verbose_name = 'Transactions'
+
+    def ready(self) -> None:
+        import hasta_la_vista_money.transactions.signals  # noqa: F401
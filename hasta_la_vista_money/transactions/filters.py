@@ -33,6 +33,7 @@ class TransactionFilter(django_filters.FilterSet):
     category = django_filters.ModelChoiceFilter(
         queryset=Category.objects.all(),
         field_name='category',
+        method='filter_category',
         label='',
         widget=Select(attrs={'class': f'{FORM_CONTROL_CLASS} mb-2'}),
     )
@@ -63,6 +64,18 @@ class TransactionFilter(django_filters.FilterSet):
             user__in=users,
         )
 
+    def filter_category(
+        self,
+        queryset: Any,
+        name: str,
+        value: Category | None,
+    ) -> Any:
+        """Match the selected category together with its subcategories."""
+        del name
+        if value is None:
+            return queryset
+        return queryset.filter(category__ancestor_links__ancestor=value)
+
     @property
     def qs(self) -> Any:
         """Restrict the queryset to the configured user(s)."""
@@ -27,6 +27,7 @@ from hasta_la_vista_money.custom_mixin import (
 from hasta_la_vista_money.finance_account.models import Account
 from hasta_la_vista_money.transactions.models import (
     Category,
+    CategoryClosure,
     Transaction,
     TransactionType,
 )
@@ -198,7 +199,7 @@ class CategoryForm(
         super().__init__(*args, category_queryset=category_queryset, **kwargs)
 
     def clean(self) -> dict[str, Any]:
-        """Verify that the parent category has the same type."""
+        """Verify the parent category type and prevent nesting cycles."""
         cleaned_data = super().clean()
         if not cleaned_data:
             return {}
@@ -213,6 +214,21 @@ class CategoryForm(
                     ),
                 },
             )
+        if (
+            parent
+            and self.instance.pk
+            and CategoryClosure.objects.filter(
+                ancestor_id=self.instance.pk,
+                descendant=parent,
+            ).exists()
+        ):
+            raise ValidationError(
+                {
+                    'parent_category': _(
+                        'Категорию нельзя вложить в её подкатегорию',
+                    ),
+                },
+            )
         return cleaned_data
 
     class Meta:
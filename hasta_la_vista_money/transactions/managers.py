@@ -4,7 +4,7 @@ from datetime import datetime, time
 from typing import TYPE_CHECKING, Any
 
 from django.db import models
-from django.db.models import Q, Sum
+from django.db.models import Sum
 from django.db.models.functions import TruncMonth
 from django.utils import timezone
 
@@ -53,10 +53,8 @@ class TransactionQuerySet(models.QuerySet['Transaction']):
         return self.filter(date__gte=start_datetime, date__lte=end_datetime)
 
     def for_category(self, category: 'Category') -> 'TransactionQuerySet':
-        """Return transactions for the category or its direct descendants."""
-        return self.filter(
-            Q(category=category) | Q(category__parent_category=category),
-        )
+        """Return transactions for the category or any of its descendants."""
+        return self.filter(category__ancestor_links__ancestor=category)
 
     def total_amount(self) -> int | float:
         """Return the sum of ``amount`` for the queryset."""
@@ -0,0 +1,84 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_category_closure(apps, schema_editor):
+    Category = apps.get_model('transactions', 'Category')
+    CategoryClosure = apps.get_model('transactions', 'CategoryClosure')
+
+    parents = dict(Category.objects.values_list('id', 'parent_category_id'))
+    links = []
+    for category_id in parents:
+        ancestor_id = category_id
+        depth = 0
+        seen = set()
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            links.append(
+                CategoryClosure(
+                    ancestor_id=ancestor_id,
+                    descendant_id=category_id,
+                    depth=depth,
+                ),
+            )
+            ancestor_id = parents.get(ancestor_id)
+            depth += 1
+    CategoryClosure.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('transactions', '0004_transaction_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryClosure',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('depth', models.PositiveSmallIntegerField()),
+                (
+                    'ancestor',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='descendant_links',
+                        to='transactions.category',
+                    ),
+                ),
+                (
+                    'descendant',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='ancestor_links',
+                        to='transactions.category',
+                    ),
+                ),
+            ],
+            options={
+                'indexes': [
+                    models.Index(
+                        fields=['descendant', 'depth'],
+                        name='transaction_descend_3184ee_idx',
+                    ),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=('ancestor', 'descendant'),
+                        name='unique_category_closure_pair',
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(
+            fill_category_closure,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -14,6 +14,7 @@ from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from hasta_la_vista_money import constants
+from hasta_la_vista_money.core.tracking import LoadedValuesMixin
 from hasta_la_vista_money.finance_account.models import Account
 from hasta_la_vista_money.transactions.managers import TransactionQuerySet
 from hasta_la_vista_money.users.models import User
@@ -29,7 +30,7 @@ class TransactionType(models.TextChoices):
 TransactionManager = models.Manager.from_queryset(TransactionQuerySet)
 
 
-class Category(models.Model):
+class Category(LoadedValuesMixin, models.Model):
     """Unified category model with a type discriminator.
 
     Categories can be hierarchical via ``parent_category``. The ``(user,
@@ -74,7 +75,44 @@ class Category(models.Model):
         return str(self.name)
 
 
-class Transaction(models.Model):
+class CategoryClosure(models.Model):
+    """Closure table of the category hierarchy.
+
+    Stores one row for every (ancestor, descendant) pair, including each
+    category paired with itself at ``depth`` 0, so rollups of any depth
+    join through a single indexed table instead of walking
+    ``parent_category`` level by level.
+    """
+
+    ancestor = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='descendant_links',
+    )
+    descendant = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='ancestor_links',
+    )
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=['descendant', 'depth']),
+        ]
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=['ancestor', 'descendant'],
+                name='unique_category_closure_pair',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return the ancestor/descendant pair."""
+        return f'{self.ancestor_id} -> {self.descendant_id} ({self.depth})'
+
+
+class Transaction(LoadedValuesMixin, models.Model):
     """Unified financial transaction model.
 
     ``type`` distinguishes incomes from expenses. The pair
@@ -0,0 +1,101 @@
+"""Maintenance and lookups of the category closure table."""
+
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from hasta_la_vista_money.transactions.models import Category, CategoryClosure
+
+
+class CategoryCycleError(ValueError):
+    """Raised when a category would become its own ancestor."""
+
+
+def insert_category_links(category: Category) -> None:
+    """Link a new category to itself and to every ancestor of its parent."""
+    links = [
+        CategoryClosure(ancestor=category, descendant=category, depth=0),
+    ]
+    if category.parent_category_id is not None:
+        links.extend(
+            CategoryClosure(
+                ancestor_id=ancestor_id,
+                descendant=category,
+                depth=depth + 1,
+            )
+            for ancestor_id, depth in CategoryClosure.objects.filter(
+                descendant_id=category.parent_category_id,
+            ).values_list('ancestor_id', 'depth')
+        )
+    CategoryClosure.objects.bulk_create(links, ignore_conflicts=True)
+
+
+def check_category_parent(category: Category) -> None:
+    """Reject a parent taken from the subtree of the category itself.
+
+    Raises:
+        CategoryCycleError: If the parent is the category or one of its
+            descendants.
+    """
+    if category.parent_category_id is None or category.pk is None:
+        return
+    if CategoryClosure.objects.filter(
+        ancestor_id=category.pk,
+        descendant_id=category.parent_category_id,
+    ).exists():
+        msg = 'Category cannot be nested into its own subcategory'
+        raise CategoryCycleError(msg)
+
+
+@transaction.atomic
+def move_category_links(category: Category) -> None:
+    """Relink the subtree of a category after its parent changed.
+
+    Links from former ancestors to the subtree are removed and every
+    ancestor of the new parent is linked to every subtree member. The
+    parent must have passed ``check_category_parent`` before the save.
+    """
+    subtree = dict(
+        CategoryClosure.objects.filter(ancestor=category).values_list(
+            'descendant_id',
+            'depth',
+        ),
+    )
+    if not subtree:
+        insert_category_links(category)
+        return
+
+    CategoryClosure.objects.filter(descendant_id__in=subtree).exclude(
+        ancestor_id__in=subtree,
+    ).delete()
+    if category.parent_category_id is None:
+        return
+    ancestors = CategoryClosure.objects.filter(
+        descendant_id=category.parent_category_id,
+    ).values_list('ancestor_id', 'depth')
+    CategoryClosure.objects.bulk_create(
+        [
+            CategoryClosure(
+                ancestor_id=ancestor_id,
+                descendant_id=descendant_id,
+                depth=ancestor_depth + descendant_depth + 1,
+            )
+            for ancestor_id, ancestor_depth in ancestors
+            for descendant_id, descendant_depth in subtree.items()
+        ],
+    )
+
+
+def category_subtree_ids(
+    category_ids: Iterable[int],
+) -> QuerySet[CategoryClosure, int]:
+    """Return ids of the categories and all of their descendants.
+
+    The result is meant to be used as a subquery, e.g.
+    ``filter(category_id__in=category_subtree_ids(ids))``, which keeps
+    each row once even when both a parent and its child are selected.
+    """
+    return CategoryClosure.objects.filter(
+        ancestor_id__in=list(category_ids),
+    ).values_list('descendant_id', flat=True)
@@ -2,8 +2,7 @@
 
 from typing import TYPE_CHECKING
 
-from django.core.cache import cache
-
+from hasta_la_vista_money.services.views import invalidate_category_tree_cache
 from hasta_la_vista_money.transactions.forms import CategoryForm
 from hasta_la_vista_money.transactions.models import Category
 from hasta_la_vista_money.users.models import User
@@ -14,9 +13,6 @@ if TYPE_CHECKING:
     )
 
 
-CATEGORY_TREE_CACHE_DEPTHS = range(1, 6)
-
-
 class CategoryService:
     """Service for creating and updating user categories."""
 
@@ -28,8 +24,7 @@ class CategoryService:
 
     @staticmethod
     def _invalidate_tree_cache(user: User, type_value: str) -> None:
-        for depth in CATEGORY_TREE_CACHE_DEPTHS:
-            cache.delete(f'category_tree_{type_value}_{user.pk}_{depth}')
+        invalidate_category_tree_cache(user.pk, type_value)
 
     def create_category(self, user: User, form: CategoryForm) -> Category:
         """Create a category from a validated form."""
@@ -0,0 +1,64 @@
+"""Signals keeping the category closure table in sync.
+
+Every category write, whether it comes from ``CategoryService`` or from
+statement imports creating categories on the fly, links the category
+into the closure table; changing ``parent_category`` relinks its subtree.
+A parent taken from the category's own subtree is rejected before the
+row is written. Fixture loads link each category to the already loaded
+ancestors.
+"""
+
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from hasta_la_vista_money.transactions.models import Category
+from hasta_la_vista_money.transactions.services.category_closure import (
+    check_category_parent,
+    insert_category_links,
+    move_category_links,
+)
+
+_ORIGINAL_PARENT_ATTR = '_closure_original_parent_id'
+
+
+@receiver(pre_save, sender=Category)
+def check_parent_change(
+    sender: type[Model],
+    instance: Category,
+    **kwargs: Any,
+) -> None:
+    del sender
+    if kwargs.get('raw') or instance.pk is None:
+        return
+    loaded = instance.loaded_field_values('parent_category_id')
+    if loaded is not None:
+        original_parent_id = loaded[0]
+    else:
+        # Only instances built without loading them are read back.
+        original_parent_id = (
+            Category.objects.filter(pk=instance.pk)
+            .values_list('parent_category_id', flat=True)
+            .first()
+        )
+    if original_parent_id != instance.parent_category_id:
+        check_category_parent(instance)
+    setattr(instance, _ORIGINAL_PARENT_ATTR, original_parent_id)
+
+
+@receiver(post_save, sender=Category)
+def sync_category_closure(
+    sender: type[Model],
+    instance: Category,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    del sender
+    if created or kwargs.get('raw'):
+        insert_category_links(instance)
+        return
+    original_parent_id = getattr(instance, _ORIGINAL_PARENT_ATTR, None)
+    if original_parent_id != instance.parent_category_id:
+        move_category_links(instance)
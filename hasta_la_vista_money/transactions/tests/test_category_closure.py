@@ -0,0 +1,148 @@
+"""Tests for the category closure table."""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from django.test import TestCase
+
+from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.transactions.forms import CategoryForm
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    CategoryClosure,
+    Transaction,
+    TransactionType,
+)
+from hasta_la_vista_money.transactions.services.category_closure import (
+    CategoryCycleError,
+    category_subtree_ids,
+)
+from hasta_la_vista_money.users.models import User
+
+
+class CategoryClosureTest(TestCase):
+    """Verify closure rows follow the category hierarchy."""
+
+    fixtures = [
+        'users.yaml',
+        'finance_account.yaml',
+    ]
+
+    def setUp(self) -> None:
+        self.user = User.objects.get(pk=1)
+        self.account = Account.objects.get(pk=1)
+        self.home = self._category('Дом')
+        self.utilities = self._category('ЖКХ', parent=self.home)
+        self.power = self._category('Электричество', parent=self.utilities)
+        self.food = self._category('Еда')
+
+    def _category(self, name: str, parent: Category | None = None) -> Category:
+        return Category.objects.create(
+            user=self.user,
+            name=name,
+            type=TransactionType.EXPENSE,
+            parent_category=parent,
+        )
+
+    def _links(self, category: Category) -> dict[str, int]:
+        return {
+            link.ancestor.name: link.depth
+            for link in CategoryClosure.objects.filter(
+                descendant=category,
+            ).select_related('ancestor')
+        }
+
+    def _expense(self, category: Category, amount: str) -> Transaction:
+        return Transaction.objects.create(
+            user=self.user,
+            account=self.account,
+            category=category,
+            type=TransactionType.EXPENSE,
+            amount=Decimal(amount),
+            date=datetime(2026, 1, 10, tzinfo=UTC),
+        )
+
+    def test_new_category_linked_to_all_ancestors(self) -> None:
+        self.assertEqual(
+            self._links(self.power),
+            {'Электричество': 0, 'ЖКХ': 1, 'Дом': 2},
+        )
+
+    def test_moving_category_relinks_subtree(self) -> None:
+        self.utilities.parent_category = self.food
+        self.utilities.save()
+
+        self.assertEqual(
+            self._links(self.power),
+            {'Электричество': 0, 'ЖКХ': 1, 'Еда': 2},
+        )
+        self.assertEqual(self._links(self.home), {'Дом': 0})
+
+    def test_detaching_category_makes_it_root(self) -> None:
+        self.utilities.parent_category = None
+        self.utilities.save()
+
+        self.assertEqual(
+            self._links(self.power),
+            {'Электричество': 0, 'ЖКХ': 1},
+        )
+
+    def test_renaming_loaded_category_keeps_links_in_one_query(self) -> None:
+        utilities = Category.objects.get(pk=self.utilities.pk)
+        utilities.name = 'Коммунальные услуги'
+
+        with self.assertNumQueries(1):
+            utilities.save()
+
+        self.assertEqual(
+            self._links(self.power),
+            {'Электричество': 0, 'Коммунальные услуги': 1, 'Дом': 2},
+        )
+
+    def test_moving_into_own_subtree_is_rejected(self) -> None:
+        self.home.parent_category = self.power
+
+        with self.assertRaises(CategoryCycleError):
+            self.home.save()
+
+        self.home.refresh_from_db()
+        self.assertIsNone(self.home.parent_category_id)
+        self.assertEqual(self._links(self.power)['Дом'], 2)
+
+    def test_form_rejects_nesting_into_subcategory(self) -> None:
+        form = CategoryForm(
+            data={
+                'name': self.home.name,
+                'type': TransactionType.EXPENSE,
+                'parent_category': self.power.pk,
+            },
+            instance=self.home,
+            category_queryset=Category.objects.filter(user=self.user),
+        )
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('parent_category', form.errors)
+
+    def test_for_category_rolls_up_any_depth(self) -> None:
+        expenses = {
+            self._expense(self.home, '10.00'),
+            self._expense(self.utilities, '20.00'),
+            self._expense(self.power, '30.00'),
+        }
+        self._expense(self.food, '40.00')
+
+        result = Transaction.objects.for_category(self.home)
+
+        self.assertEqual(set(result), expenses)
+        self.assertEqual(result.total_amount(), Decimal('60.00'))
+
+    def test_subtree_ids_keep_rows_unique(self) -> None:
+        self._expense(self.power, '30.00')
+
+        result = Transaction.objects.filter(
+            category_id__in=category_subtree_ids(
+                [self.home.pk, self.utilities.pk],
+            ),
+        )
+
+        self.assertEqual(result.count(), 1)
@@ -382,11 +382,15 @@ class CategoryServiceTest(TestCase):
     def test_create_category_persists_and_invalidates_cache(self) -> None:
         form = self._build_form('Аренда', TransactionType.EXPENSE)
         with patch(
-            'hasta_la_vista_money.transactions.services.category_ops.cache.delete',
-        ) as cache_delete:
+            'hasta_la_vista_money.transactions.services.category_ops.'
+            'invalidate_category_tree_cache',
+        ) as invalidate:
             created = self.service.create_category(self.user, form)
         self.assertTrue(Category.objects.filter(pk=created.pk).exists())
-        self.assertEqual(cache_delete.call_count, 5)
+        invalidate.assert_called_once_with(
+            self.user.pk,
+            TransactionType.EXPENSE,
+        )
 
     def test_update_category_changes_name(self) -> None:
         original = Category.objects.create(
@@ -4,7 +4,6 @@ from typing import TYPE_CHECKING, Any, cast
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.cache import cache
 from django.db.models import ProtectedError
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -12,7 +11,10 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
-from hasta_la_vista_money.services.views import get_cached_category_tree
+from hasta_la_vista_money.services.views import (
+    get_cached_category_tree,
+    invalidate_category_tree_cache,
+)
 from hasta_la_vista_money.transactions.forms import CategoryForm
 from hasta_la_vista_money.transactions.models import Category, TransactionType
 
@@ -27,11 +29,6 @@ def _category_type(value: str | None) -> str:
     return TransactionType.EXPENSE
 
 
-def _clear_category_cache(user_id: int, category_type: str) -> None:
-    for depth in range(1, 6):
-        cache.delete(f'category_tree_{category_type}_{user_id}_{depth}')
-
-
 def _find_category_node(
     categories: list[dict[str, Any]],
     category_id: int,
@@ -91,7 +88,7 @@ class CategoryCreateView(
         category.user = user
         category.type = self.get_category_type()
         category.save()
-        _clear_category_cache(user.pk, category.type)
+        invalidate_category_tree_cache(user.pk, category.type)
         messages.success(self.request, _('Категория успешно добавлена.'))
         return redirect(self.success_url)
 
@@ -146,23 +143,9 @@ class CategoryUpdateView(
 
     def _inline_item_context(self, category: Category) -> dict[str, Any]:
         user = cast('User', self.request.user)
-        categories = cast(
-            'list[dict[str, Any]]',
-            list(
-                Category.objects.filter(user=user, type=category.type)
-                .values(
-                    'id',
-                    'name',
-                    'parent_category',
-                    'parent_category__name',
-                )
-                .order_by('parent_category_id'),
-            ),
-        )
         tree = get_cached_category_tree(
             user_id=user.pk,
             category_type=category.type,
-            categories=categories,
             depth=3,
         )
         found = _find_category_node(tree, category.pk)
@@ -224,7 +207,7 @@ class CategoryUpdateView(
         category.user = user
         category.type = self.get_object().type
         category.save()
-        _clear_category_cache(user.pk, category.type)
+        invalidate_category_tree_cache(user.pk, category.type)
         if self.is_inline_request():
             return self._render_inline_item(category=category)
         messages.success(self.request, _('Категория успешно обновлена.'))
@@ -262,6 +245,6 @@ class CategoryDeleteView(LoginRequiredMixin, DeleteView[Category, Any]):
                 _('Категория используется и не может быть удалена.'),
             )
             return redirect(self.success_url)
-        _clear_category_cache(user.pk, category_type)
+        invalidate_category_tree_cache(user.pk, category_type)
         messages.success(self.request, _('Категория успешно удалена.'))
         return redirect(self.success_url)
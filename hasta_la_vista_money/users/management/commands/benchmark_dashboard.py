@@ -0,0 +1,175 @@
+"""Load test of the dashboard JSON endpoints on a running server.
+
+Run it against the same data once per server configuration to compare
+throughput, for example::
+
+    granian --interface asgi config.asgi:application --port 8001
+    granian --interface wsgi config.wsgi:application --port 8002
+
+    python manage.py benchmark_dashboard --username demo \\
+        --base-url http://127.0.0.1:8001
+    python manage.py benchmark_dashboard --username demo \\
+        --base-url http://127.0.0.1:8002
+"""
+
+import asyncio
+import statistics
+import time
+from argparse import ArgumentParser
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from hasta_la_vista_money.users.models import User
+
+DEFAULT_ENDPOINTS = (
+    'users:dashboard_data',
+    'users:dashboard_comparison',
+)
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run."""
+
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    failures: int = 0
+
+    @property
+    def requests_per_second(self) -> float:
+        """Completed requests per second of wall time."""
+        if not self.elapsed:
+            return 0.0
+        return (len(self.latencies) + self.failures) / self.elapsed
+
+    def percentile(self, percent: int) -> float:
+        """Return the latency percentile of successful requests in ms."""
+        if len(self.latencies) < 2:  # noqa: PLR2004
+            return sum(self.latencies) * 1000
+        cut_points = statistics.quantiles(self.latencies, n=100)
+        return cut_points[percent - 1] * 1000
+
+
+async def run_load(
+    urls: list[str],
+    cookies: dict[str, str],
+    *,
+    total: int,
+    concurrency: int,
+) -> LoadResult:
+    """Issue ``total`` GET requests over ``urls`` with bounded concurrency.
+
+    Args:
+        urls: Endpoints requested round-robin.
+        cookies: Session cookies of the benchmark user.
+        total: Number of requests to send.
+        concurrency: Requests in flight at the same time.
+    """
+    result = LoadResult()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(client: httpx.AsyncClient, url: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+            except httpx.HTTPError:
+                result.failures += 1
+                return
+            if response.status_code != httpx.codes.OK:
+                result.failures += 1
+                return
+            result.latencies.append(time.perf_counter() - started)
+
+    async with httpx.AsyncClient(cookies=cookies, timeout=60.0) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(fetch(client, urls[index % len(urls)]) for index in range(total)),
+        )
+        result.elapsed = time.perf_counter() - started
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure requests per second and latency of the dashboard JSON '
+        'endpoints on a running server.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--username',
+            required=True,
+            help='User whose dashboard is requested.',
+        )
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8001',
+            help='Root URL of the server under test.',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Total number of requests to send.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=20,
+            help='Number of requests in flight at the same time.',
+        )
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            dest='endpoints',
+            help=(
+                'URL name to request; may be repeated. Defaults to the '
+                'dashboard data and comparison endpoints.'
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist as error:
+            raise CommandError('Пользователь не найден.') from error
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError(
+                'Число запросов и параллельность должны быть больше нуля.',
+            )
+
+        # A session created the way the test client does it lets the
+        # load generator skip the login form and its rate limits.
+        session_client = Client()
+        session_client.force_login(user)
+        cookies = {
+            name: morsel.value
+            for name, morsel in session_client.cookies.items()
+        }
+        base_url = options['base_url'].rstrip('/')
+        urls = [
+            f'{base_url}{reverse(name)}'
+            for name in options['endpoints'] or DEFAULT_ENDPOINTS
+        ]
+
+        result = asyncio.run(
+            run_load(
+                urls,
+                cookies,
+                total=options['requests'],
+                concurrency=options['concurrency'],
+            ),
+        )
+
+        self.stdout.write(f'Запросов: {options["requests"]}')
+        self.stdout.write(f'Ошибок: {result.failures}')
+        self.stdout.write(f'Время: {result.elapsed:.2f} с')
+        self.stdout.write(f'RPS: {result.requests_per_second:.1f}')
+        self.stdout.write(f'p50: {result.percentile(50):.1f} мс')
+        self.stdout.write(f'p95: {result.percentile(95):.1f} мс')
@@ -1,28 +1,63 @@
 from collections.abc import Callable
+from typing import Any
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
-from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 
+from hasta_la_vista_money.services.two_tier_cache import local_cache
 from hasta_la_vista_money.users.models import User
 
+HAS_SUPERUSER_CACHE_KEY = 'has_superuser'
+
 
 class CheckAdminMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(
         self,
-        get_response: Callable[[HttpRequest], HttpResponse],
+        get_response: Callable[[HttpRequest], Any],
     ) -> None:
         """init."""
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
-    def __call__(self, request: HttpRequest) -> HttpResponse:
-        has_superuser = cache.get('has_superuser')
-        if has_superuser is None:
-            has_superuser = User.objects.filter(is_superuser=True).exists()
-            cache.set('has_superuser', has_superuser, 300)
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        has_superuser = local_cache.get_or_set(
+            HAS_SUPERUSER_CACHE_KEY,
+            User.objects.filter(is_superuser=True).exists,
+            300,
+        )
+        response = self._registration_redirect(
+            request,
+            has_superuser=has_superuser,
+        )
+        return response or self.get_response(request)
 
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        has_superuser = await local_cache.aget_or_set(
+            HAS_SUPERUSER_CACHE_KEY,
+            User.objects.filter(is_superuser=True).exists,
+            300,
+        )
+        response = self._registration_redirect(
+            request,
+            has_superuser=has_superuser,
+        )
+        return response or await self.get_response(request)
+
+    def _registration_redirect(
+        self,
+        request: HttpRequest,
+        *,
+        has_superuser: bool,
+    ) -> HttpResponse | None:
         if not has_superuser:
             allowed_paths = {
                 str(reverse_lazy('users:registration')),
@@ -38,4 +73,4 @@ class CheckAdminMiddleware:
                 and not request.path.startswith(allowed_prefixes)
             ):
                 return redirect('users:registration')
-        return self.get_response(request)
+        return None
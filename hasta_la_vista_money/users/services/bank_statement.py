@@ -25,6 +25,7 @@ from django.utils import timezone
 from pdfminer.high_level import extract_text
 from pdfminer.pdfparser import PDFSyntaxError
 
+from hasta_la_vista_money.core.spans import timed
 from hasta_la_vista_money.finance_account.services.balance_service import (
     BalanceService,
 )
@@ -295,6 +296,7 @@ class BaseBankStatementParser(ABC):
 class _GenericBankParser(BaseBankStatementParser):
     """Generic parser for Russian bank statements."""
 
+    @timed()
     def parse(self) -> StatementParseResult:
         """Разобрать PDF-выписку неизвестного банка.
 
@@ -498,6 +500,7 @@ class _RaiffeisenBankParser(_GenericBankParser):
     [6]=Номер карты
     """
 
+    @timed()
     def parse(self) -> StatementParseResult:
         """Разобрать PDF-выписку Райффайзенбанка.
 
@@ -554,6 +557,7 @@ class _SberbankParser(BaseBankStatementParser):
     Columns: [0]=Дата | [1]=Категория | [2]=Сумма | [3]=Остаток
     """
 
+    @timed()
     def parse(self) -> StatementParseResult:
         """Разобрать PDF-выписку Сбербанка (кредитная карта).
 
@@ -935,6 +939,7 @@ class _OzonBankParser(BaseBankStatementParser):
         r'^\s*\d{2}\.\d{2}\.\d{4}\s+\d{2}:\d{2}:\d{2}\b',
     )
 
+    @timed()
     def parse(self) -> StatementParseResult:
         """Parse purchases, refunds, and tips from an Ozon statement."""
         try:
@@ -1113,6 +1118,7 @@ def _extract_pdf_text_for_detection(pdf_path: Path) -> str:
     return extract_text(str(pdf_path), page_numbers=[0], maxpages=1)
 
 
+@timed()
 def _create_parser(pdf_path: Path) -> BaseBankStatementParser:
     """Auto-detect bank from PDF content and return matching parser."""
     try:
@@ -1191,6 +1197,7 @@ class BankStatementParser:
 # ---------------------------------------------------------------------------
 
 
+@timed()
 @transaction.atomic
 def process_bank_statement(
     pdf_path: str | Path,
@@ -1240,7 +1247,7 @@ def process_bank_statement(
         else:
             type_value = TransactionType.EXPENSE
 
-        if _transaction_already_exists(
+        if transaction_already_exists(
             account=account,
             user=user,
             type_value=type_value,
@@ -1286,7 +1293,7 @@ def process_bank_statement(
     }
 
 
-def _transaction_already_exists(
+def transaction_already_exists(
     *,
     account: Account,
     user: User,
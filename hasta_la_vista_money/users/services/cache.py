@@ -1,14 +1,311 @@
+"""Tagged caching of per-user dashboard and reports payloads.
+
+Every cached payload declares a ``StatisticsScope``: the data domains it
+reads and the months it covers. The scope maps to tag keys whose
+versions are stored with the payload; a payload is served only while
+all of its tags keep those versions. Changing a row bumps just the tags
+of its domain and month, so a back-dated edit leaves payloads for other
+months cached.
+
+Async views serve fresh payloads through ``acached_statistics``, which
+reads them with a single ``get_many`` call off the event loop and only
+hands building a missing one to the widget pool.
+"""
+
+import functools
 import hashlib
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Final, cast
 
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
+from django.utils import timezone
+
+from hasta_la_vista_money.core.spans import CACHE_SPAN, span
+from hasta_la_vista_money.services.caching import fresh_entry, get_or_compute
+from hasta_la_vista_money.users.services.dashboard_widgets import (
+    arun_in_worker,
+)
+
+DOMAIN_TRANSACTIONS: Final = 'transactions'
+DOMAIN_RECEIPTS: Final = 'receipts'
+DOMAIN_TRANSFERS: Final = 'transfers'
+DOMAIN_DEPOSITS: Final = 'deposits'
+DOMAIN_ACCOUNTS: Final = 'accounts'
+DOMAIN_CATEGORIES: Final = 'categories'
+DOMAIN_BUDGETS: Final = 'budgets'
+DOMAIN_DASHBOARD: Final = 'dashboard'
+STATISTICS_DOMAINS: Final = (
+    DOMAIN_TRANSACTIONS,
+    DOMAIN_RECEIPTS,
+    DOMAIN_TRANSFERS,
+    DOMAIN_DEPOSITS,
+    DOMAIN_ACCOUNTS,
+    DOMAIN_CATEGORIES,
+)
+DATA_DOMAINS: Final = (*STATISTICS_DOMAINS, DOMAIN_BUDGETS, DOMAIN_DASHBOARD)
+UNDATED_DOMAINS: Final = frozenset(
+    {DOMAIN_ACCOUNTS, DOMAIN_CATEGORIES, DOMAIN_BUDGETS, DOMAIN_DASHBOARD},
+)
+
+_EPOCH_TAG: Final = 'epoch'
+
+
+def _tag_key(user_id: int, name: str) -> str:
+    return f'user_stats_tag_{user_id}_{name}'
+
+
+def _month_start(value: date | datetime) -> date:
+    if isinstance(value, datetime):
+        value = (
+            timezone.localtime(value).date()
+            if timezone.is_aware(value)
+            else value.date()
+        )
+    return value.replace(day=1)
+
+
+def _months(start: date, end: date) -> Iterator[date]:
+    month = _month_start(start)
+    last = _month_start(end)
+    while month <= last:
+        yield month
+        month = (
+            month.replace(year=month.year + 1, month=1)
+            if month.month == 12  # noqa: PLR2004
+            else month.replace(month=month.month + 1)
+        )
+
+
+@dataclass(frozen=True)
+class StatisticsScope:
+    """Data a cached statistics payload of one user depends on.
+
+    ``start`` and ``end`` bound the months of dated rows the payload
+    reads; leaving either open makes it depend on changes in any month.
+    """
+
+    user_id: int
+    domains: tuple[str, ...] = STATISTICS_DOMAINS
+    start: date | None = None
+    end: date | None = None
+
+    def tags(self) -> list[str]:
+        """Return the tag keys the payload must be validated against."""
+        names = [_EPOCH_TAG]
+        for domain in self.domains:
+            names.append(f'{domain}:all')
+            if domain in UNDATED_DOMAINS:
+                continue
+            if self.start is None or self.end is None:
+                names.append(f'{domain}:any')
+            else:
+                names.extend(
+                    f'{domain}:{month:%Y-%m}'
+                    for month in _months(self.start, self.end)
+                )
+        return [_tag_key(self.user_id, name) for name in names]
+
+
+def statistics_change_tags(
+    user_id: int,
+    domain: str,
+    moments: Iterable[date | datetime | None] = (),
+) -> set[str]:
+    """Return the tag keys affected by a change of rows in a domain.
+
+    Args:
+        user_id: Owner of the changed rows.
+        domain: Data domain of the rows, one of ``STATISTICS_DOMAINS``.
+        moments: Dates of the rows before and after the change. Without
+            usable dates the change affects every month of the domain.
+    """
+    values = list(moments)
+    if (
+        domain in UNDATED_DOMAINS
+        or not values
+        or not all(isinstance(value, date) for value in values)
+    ):
+        return {_tag_key(user_id, f'{domain}:all')}
+    return {
+        _tag_key(user_id, f'{domain}:any'),
+        *(
+            _tag_key(user_id, f'{domain}:{_month_start(value):%Y-%m}')
+            for value in cast('list[date | datetime]', values)
+        ),
+    }
+
+
+def statistics_user_tag(user_id: int) -> str:
+    """Return the tag every payload of a user is validated against."""
+    return _tag_key(user_id, _EPOCH_TAG)
+
+
+def _current_tag_versions(
+    tags: list[str],
+    found: dict[str, object],
+) -> dict[str, object]:
+    missing = [tag for tag in tags if tag not in found]
+    if not missing:
+        return {tag: found[tag] for tag in tags}
+    # Fresh tags start from the clock rather than from one, so payloads
+    # stored before a tag was evicted can never match it again.
+    version = time.time_ns()
+    with span(CACHE_SPAN):
+        for tag in missing:
+            cache.add(tag, version, None)
+        return cache.get_many(tags)
+
+
+def cached_statistics[T](
+    cache_key: str,
+    scope: StatisticsScope,
+    compute: Callable[[], T],
+    *,
+    timeout: int,
+    metric: str,
+) -> T:
+    """Return a cached payload or compute and cache it for ``scope``.
+
+    Tag versions are read before ``compute`` runs, so a change committed
+    while the payload is being built invalidates it right away. Payloads
+    invalidated by a change are never served stale.
+
+    Args:
+        cache_key: Key of the payload.
+        scope: Data the payload depends on.
+        compute: Builds the payload on a miss.
+        timeout: Seconds the payload is served as fresh.
+        metric: Name the lookup is counted under in cache metrics.
+    """
+    tags = scope.tags()
+    with span(CACHE_SPAN):
+        found = cache.get_many([cache_key, *tags])
+    entry = found.pop(cache_key, None)
+    return get_or_compute(
+        cache_key,
+        compute,
+        timeout=timeout,
+        metric=metric,
+        stamp=_current_tag_versions(tags, found),
+        entry=entry,
+    )
+
+
+async def acached_statistics[T](
+    cache_key: str,
+    scope: StatisticsScope,
+    load: Callable[[], T],
+    *,
+    metric: str,
+) -> T:
+    """Serve a payload cached by ``cached_statistics`` to an async view.
+
+    The payload and its tags are read with one ``get_many`` call, the
+    same single round trip the sync path makes. It runs outside the
+    thread-sensitive thread, since cache backends without native async
+    support would otherwise issue one queued ``get`` per key there. A
+    fresh payload whose tags all kept their versions is returned right
+    away; anything else is left to ``load`` on the widget pool.
+
+    Args:
+        cache_key: Key of the payload.
+        scope: Data the payload depends on.
+        load: Blocking call returning the payload through
+            ``cached_statistics`` under the same key and scope.
+        metric: Name the lookup is counted under in cache metrics.
+    """
+    tags = scope.tags()
+    with span(CACHE_SPAN):
+        found = await sync_to_async(cache.get_many, thread_sensitive=False)(
+            [cache_key, *tags],
+        )
+    entry = found.pop(cache_key, None)
+    if len(found) == len(tags):
+        payload = fresh_entry(entry, found, metric)
+        if payload is not None:
+            return cast('T', payload.value)
+    return await arun_in_worker(load)
+
+
+def statistics_cached[**P, T](
+    spec: Callable[P, tuple[str, StatisticsScope]],
+    *,
+    timeout: int,
+    metric: str,
+) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Cache a statistics builder through ``cached_statistics``.
+
+    Args:
+        spec: Returns the cache key and scope for the call arguments.
+        timeout: Seconds the payload is served as fresh.
+        metric: Name the lookup is counted under in cache metrics.
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            cache_key, scope = spec(*args, **kwargs)
+            return cached_statistics(
+                cache_key,
+                scope,
+                functools.partial(func, *args, **kwargs),
+                timeout=timeout,
+                metric=metric,
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def user_data_version(user_ids: Iterable[int]) -> str:
+    """Return a token that changes whenever data of the users changes.
+
+    The token digests the current versions of every tag of the users'
+    data domains, so it is computed with a single cache call and no
+    database queries.
+
+    Args:
+        user_ids: IDs of users whose data a response reads.
+    """
+    tags = [
+        tag
+        for user_id in sorted(set(user_ids))
+        for tag in StatisticsScope(user_id, DATA_DOMAINS).tags()
+    ]
+    versions = _current_tag_versions(tags, cache.get_many(tags))
+    return _version_digest(tags, versions)
 
-from hasta_la_vista_money import constants
 
-PERIOD_TYPES = ('month', 'quarter', 'year')
+def scope_versions(scopes: Sequence[StatisticsScope]) -> list[str]:
+    """Return a token per scope that changes whenever its data changes.
 
+    Tags shared by the scopes are read once, in a single cache call.
 
-def _user_statistics_version_key(user_id: int) -> str:
-    return f'user_stats_version_{user_id}'
+    Args:
+        scopes: Data of stored results to be validated.
+    """
+    scope_tags = [scope.tags() for scope in scopes]
+    tags = list(dict.fromkeys(tag for group in scope_tags for tag in group))
+    versions = _current_tag_versions(tags, cache.get_many(tags))
+    return [_version_digest(group, versions) for group in scope_tags]
+
+
+def _version_digest(tags: list[str], versions: dict[str, object]) -> str:
+    digest = hashlib.sha256()
+    for tag in tags:
+        digest.update(f'{tag}={versions.get(tag)};'.encode())
+    return digest.hexdigest()
+
+
+def invalidate_statistics_tags(tags: Iterable[str]) -> None:
+    """Bump the versions of the given tags in a single cache call."""
+    version = time.time_ns()
+    cache.set_many(dict.fromkeys(tags, version), None)
 
 
 def get_user_detailed_statistics_cache_key(
@@ -16,9 +313,8 @@ def get_user_detailed_statistics_cache_key(
     suffix: str = 'default',
 ) -> str:
     """Return cache key for detailed dashboard statistics."""
-    version = cache.get(_user_statistics_version_key(user_id), 1)
     suffix_hash = hashlib.sha256(suffix.encode()).hexdigest()[:16]
-    return f'user_stats_{user_id}_{version}_{suffix_hash}'
+    return f'user_stats_{user_id}_{suffix_hash}'
 
 
 def get_dashboard_summary_cache_key(user_id: int) -> str:
@@ -36,24 +332,24 @@ def get_reports_budget_charts_cache_key(user_id: int) -> str:
     return f'user_reports_budget_charts_{user_id}'
 
 
-def invalidate_user_detailed_statistics_cache(user_id: int) -> None:
-    """Invalidate cached dashboard and reports data for a user."""
-    version_key = _user_statistics_version_key(user_id)
-    cache.set(version_key, int(cache.get(version_key, 1)) + 1)
-    cache.delete(get_dashboard_summary_cache_key(user_id))
-    reports_key = get_reports_budget_charts_cache_key(user_id)
-    cache.delete_many(
-        [
-            reports_key,
-            *(
-                f'{reports_key}:{period}'
-                for period in constants.REPORTS_BUDGET_CHART_PERIODS
-            ),
-        ],
-    )
-    cache.delete_many(
-        [
-            get_period_comparison_cache_key(user_id, period_type)
-            for period_type in PERIOD_TYPES
-        ],
+def get_dashboard_widget_cache_key(
+    user_id: int,
+    widget: str,
+    suffix: str = 'default',
+) -> str:
+    """Return cache key for a separately cached dashboard widget."""
+    return f'user_dashboard_widget_{user_id}_{widget}_{suffix}'
+
+
+def invalidate_users_detailed_statistics_cache(
+    user_ids: Iterable[int],
+) -> None:
+    """Invalidate every cached dashboard and reports payload of users."""
+    invalidate_statistics_tags(
+        statistics_user_tag(user_id) for user_id in set(user_ids)
     )
+
+
+def invalidate_user_detailed_statistics_cache(user_id: int) -> None:
+    """Invalidate every cached dashboard and reports payload of a user."""
+    invalidate_users_detailed_statistics_cache([user_id])
@@ -0,0 +1,137 @@
+"""Coalesced invalidation of per-user statistics caches.
+
+Writers schedule invalidation of the cache tags their change affects.
+Inside a database transaction the tags are collected and flushed once
+on commit, so a receipt touching dozens of rows costs a single cache
+call. Bulk importers committing row by row can wrap the whole import in
+``deferred_statistics_invalidation`` to get one flush for the entire
+run. Each flush also queues a debounced pre-warm of the affected users'
+caches.
+"""
+
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from django.db import connection
+
+from hasta_la_vista_money.core.commit_hooks import CommitHook
+from hasta_la_vista_money.users.services.cache import (
+    invalidate_statistics_tags,
+    statistics_change_tags,
+    statistics_user_tag,
+)
+from hasta_la_vista_money.users.services.cache_prewarm import (
+    schedule_statistics_prewarm,
+)
+
+_state = threading.local()
+
+
+def _pending_tags() -> set[str]:
+    pending: set[str] | None = getattr(_state, 'pending', None)
+    if pending is None:
+        pending = set()
+        _state.pending = pending
+    return pending
+
+
+def _pending_users() -> set[int]:
+    users: set[int] | None = getattr(_state, 'pending_users', None)
+    if users is None:
+        users = set()
+        _state.pending_users = users
+    return users
+
+
+def _reset_pending() -> None:
+    _state.pending = set()
+    _state.pending_users = set()
+
+
+def flush_statistics_invalidation() -> None:
+    """Invalidate every collected tag in one batch."""
+    _flush_hook.discard()
+    pending = _pending_tags()
+    if not pending:
+        return
+    users = _pending_users()
+    _reset_pending()
+    invalidate_statistics_tags(pending)
+    schedule_statistics_prewarm(*users)
+
+
+_flush_hook = CommitHook(flush_statistics_invalidation)
+
+
+def _drop_rolled_back_tags() -> None:
+    # Without a pending flush any collected tags belong to work that was
+    # rolled back together with its on-commit callback.
+    if not connection.in_atomic_block or not _flush_hook.pending:
+        _reset_pending()
+
+
+def _schedule_flush() -> None:
+    if not connection.in_atomic_block:
+        flush_statistics_invalidation()
+    else:
+        _flush_hook.schedule()
+
+
+def _collect(tags: Iterable[str], user_ids: Iterable[int]) -> None:
+    if not getattr(_state, 'deferred', 0):
+        _drop_rolled_back_tags()
+    _pending_tags().update(tags)
+    _pending_users().update(user_ids)
+    if not getattr(_state, 'deferred', 0):
+        _schedule_flush()
+
+
+def schedule_statistics_change(
+    user_id: int,
+    domain: str,
+    moments: Iterable[date | datetime | None] = (),
+) -> None:
+    """Invalidate payloads reading the changed rows once committed.
+
+    Repeated calls within one transaction register a single on-commit
+    flush. The flush is registered again when a rolled back savepoint
+    discarded it, so tags collected outside that savepoint are kept.
+
+    Args:
+        user_id: Owner of the changed rows.
+        domain: Data domain of the rows.
+        moments: Dates of the rows before and after the change.
+    """
+    _collect(statistics_change_tags(user_id, domain, moments), [user_id])
+
+
+def schedule_statistics_invalidation(*user_ids: int) -> None:
+    """Invalidate every statistics payload of users once committed.
+
+    Args:
+        user_ids: IDs of users whose financial data changed.
+    """
+    _collect(
+        [statistics_user_tag(user_id) for user_id in user_ids],
+        user_ids,
+    )
+
+
+@contextmanager
+def deferred_statistics_invalidation() -> Iterator[None]:
+    """Collect invalidations and flush them once when the block exits.
+
+    Meant for bulk writers that commit many small transactions, such as
+    bank statement imports. Nested blocks flush with the outermost one.
+    """
+    if not getattr(_state, 'deferred', 0):
+        _drop_rolled_back_tags()
+    _state.deferred = getattr(_state, 'deferred', 0) + 1
+    try:
+        yield
+    finally:
+        _state.deferred -= 1
+        if not _state.deferred and _pending_tags():
+            _schedule_flush()
@@ -0,0 +1,59 @@
+"""Debounced background pre-warming of per-user statistics caches.
+
+After a change invalidates a user's statistics, or when the user logs
+in, a Celery task recomputes the dashboard summary, the current month
+comparison and the default reports period so the next page load is
+served from cache. Triggers for the same user within
+``PREWARM_DEBOUNCE`` seconds share one task, so a bulk import warms the
+cache once after it finishes rather than after every row.
+"""
+
+from typing import Final
+
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from kombu.exceptions import OperationalError
+
+PREWARM_DEBOUNCE: Final = 30
+# The marker outlives the countdown so a task delayed in the queue still
+# absorbs triggers; if the task is lost, the marker expires on its own.
+_MARKER_TIMEOUT: Final = PREWARM_DEBOUNCE * 4
+
+logger = structlog.get_logger(__name__)
+
+
+def _prewarm_marker_key(user_id: int) -> str:
+    return f'user_stats_prewarm_{user_id}'
+
+
+def schedule_statistics_prewarm(*user_ids: int) -> None:
+    """Queue one cache warm-up per user unless one is already pending.
+
+    Args:
+        user_ids: IDs of users whose statistics should be recomputed.
+    """
+    if not getattr(settings, 'STATISTICS_PREWARM_ENABLED', True):
+        return
+    from hasta_la_vista_money.users.tasks import (  # noqa: PLC0415
+        warm_statistics_cache,
+    )
+
+    for user_id in set(user_ids):
+        marker_key = _prewarm_marker_key(user_id)
+        if not cache.add(marker_key, 1, _MARKER_TIMEOUT):
+            continue
+        try:
+            warm_statistics_cache.apply_async(
+                args=[user_id],
+                countdown=PREWARM_DEBOUNCE,
+                retry=False,
+            )
+        except OperationalError:
+            cache.delete(marker_key)
+            logger.warning('Statistics pre-warm not queued', user_id=user_id)
+
+
+def release_statistics_prewarm(user_id: int) -> None:
+    """Let later triggers queue a new warm-up for the user."""
+    cache.delete(_prewarm_marker_key(user_id))
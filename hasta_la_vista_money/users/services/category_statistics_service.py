@@ -3,7 +3,7 @@ from collections.abc import Iterable
 from datetime import date, timedelta
 from typing import Any
 
-from django.db.models import Avg, Count, Q, QuerySet, Sum
+from django.db.models import Avg, Count, F, Q, QuerySet, Sum
 from django.db.models.functions import TruncMonth
 
 from hasta_la_vista_money import constants
@@ -16,6 +16,9 @@ from hasta_la_vista_money.transactions.models import (
     Category,
     Transaction,
 )
+from hasta_la_vista_money.transactions.services.category_closure import (
+    category_subtree_ids,
+)
 from hasta_la_vista_money.users.models import User
 from hasta_la_vista_money.users.services.monthly_statistics_service import (
     StatisticsChoiceDict,
@@ -53,7 +56,9 @@ def _filter_transaction_queryset(
 
     category_ids = _category_ids(stats_filter.category_keys, f'{type_value}-')
     if category_ids:
-        queryset = queryset.filter(category_id__in=category_ids)
+        queryset = queryset.filter(
+            category_id__in=category_subtree_ids(category_ids),
+        )
     elif stats_filter.category_keys:
         queryset = queryset.none()
     return queryset
@@ -76,6 +81,17 @@ def _filtered_transactions(
     )
 
 
+def _receipt_search_lookup(search: str) -> Q:
+    lookup = (
+        Q(seller__name_seller__icontains=search)
+        | Q(account__name_account__icontains=search)
+        | Q(user__username__icontains=search)
+    )
+    if search.isdigit():
+        lookup |= Q(number_receipt=int(search))
+    return lookup
+
+
 def _filtered_receipts(
     users: Iterable[User],
     stats_filter: StatisticsFilters,
@@ -95,15 +111,9 @@ def _filtered_receipts(
     if stats_filter.currency:
         queryset = queryset.filter(account__currency=stats_filter.currency)
     if stats_filter.receipts_search:
-        search = stats_filter.receipts_search
-        lookup = (
-            Q(seller__name_seller__icontains=search)
-            | Q(account__name_account__icontains=search)
-            | Q(user__username__icontains=search)
+        queryset = queryset.filter(
+            _receipt_search_lookup(stats_filter.receipts_search),
         )
-        if search.isdigit():
-            lookup |= Q(number_receipt=int(search))
-        queryset = queryset.filter(lookup)
     if (
         stats_filter.category_keys
         and 'receipt' not in stats_filter.category_keys
@@ -251,19 +261,29 @@ def _category_children_totals(
             end,
         )
         .filter(
-            category__parent_category_id__in=category_ids,
+            category__ancestor_links__ancestor__parent_category_id__in=(
+                category_ids
+            ),
         )
         .values(
-            'category__parent_category_id',
-            'category__id',
-            'category__name',
+            parent_id=F(
+                'category__ancestor_links__ancestor__parent_category_id',
+            ),
+            child_id=F('category__ancestor_links__ancestor_id'),
+            child_name=F('category__ancestor_links__ancestor__name'),
         )
         .annotate(total=Sum('amount'))
-        .order_by('category__parent_category_id', '-total')
+        .order_by('parent_id', '-total')
     )
     result: dict[int, list[dict[str, Any]]] = defaultdict(list)
     for row in rows:
-        result[row['category__parent_category_id']].append(row)
+        result[row['parent_id']].append(
+            {
+                'category__id': row['child_id'],
+                'category__name': row['child_name'],
+                'total': row['total'],
+            },
+        )
     return result
 
 
@@ -288,8 +308,7 @@ def _category_drilldown_transactions(
     for category_id in category_ids:
         rows = (
             queryset.filter(
-                Q(category_id=category_id)
-                | Q(category__parent_category_id=category_id),
+                category__ancestor_links__ancestor_id=category_id,
             )
             .values(
                 'date',
@@ -399,6 +418,7 @@ __all__ = [
     '_filtered_transactions',
     '_match_income_expense_search',
     '_receipt_details',
+    '_receipt_search_lookup',
     '_sum_amount_for_period',
     '_top_categories_qs',
     '_top_categories_with_comparison',
@@ -0,0 +1,160 @@
+"""Conditional GET for pages and APIs built from a user's financial data.
+
+The ETag of a response digests the request and the data version of every
+user whose rows the response may read: the requesting user and the
+members of their family groups. Invalidation signals bump those versions
+on every change, so a matching ``If-None-Match`` is answered with 304
+before the view touches a service or the database.
+"""
+
+import functools
+import hashlib
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from typing import Any, Concatenate, Final
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http.response import HttpResponseBase
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+
+from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.cache import user_data_version
+from hasta_la_vista_money.users.services.groups import (
+    get_family_member_ids,
+    get_family_roles,
+)
+
+_CONDITIONAL_METHODS: Final = frozenset({'GET', 'HEAD'})
+_VARY_HEADERS: Final = ('Accept', 'HX-Request')
+
+
+def user_data_etag(request: Any, user: User) -> str:
+    """Return a strong ETag of the request and the user's data version.
+
+    Family roles and members are part of the digest, so joining or
+    leaving a group changes the ETag of group-scoped responses too.
+    """
+    roles = sorted(get_family_roles(user).items())
+    user_ids = {user.pk}
+    for group_id, _role in roles:
+        user_ids.update(get_family_member_ids(group_id))
+    digest = hashlib.sha256()
+    for part in (
+        request.get_full_path(),
+        request.headers.get('HX-Request', ''),
+        request.headers.get('Accept', ''),
+        get_language() or '',
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        repr(roles),
+        user_data_version(user_ids),
+    ):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return quote_etag(digest.hexdigest())
+
+
+def _finalize(response: HttpResponseBase, etag: str) -> HttpResponseBase:
+    if response.status_code not in {
+        HTTPStatus.OK,
+        HTTPStatus.NOT_MODIFIED,
+    } or 'no-store' in response.get('Cache-Control', ''):
+        return response
+    response.headers.setdefault('ETag', etag)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, _VARY_HEADERS)
+    return response
+
+
+def _wrap_async[**P](
+    view: Callable[Concatenate[Any, P], Awaitable[HttpResponseBase]],
+    applies: Callable[[Any], bool],
+) -> Callable[Concatenate[Any, P], Any]:
+    @functools.wraps(view)
+    async def wrapper(
+        request: Any,
+        /,
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> HttpResponseBase:
+        if not applies(request):
+            return await view(request, *args, **kwargs)
+        user = await request.auser()
+        if not user.is_authenticated:
+            return await view(request, *args, **kwargs)
+        etag = await sync_to_async(user_data_etag)(request, user)
+        response: HttpResponseBase | None = get_conditional_response(
+            request,
+            etag=etag,
+        )
+        if response is None:
+            response = await view(request, *args, **kwargs)
+        return _finalize(response, etag)
+
+    return wrapper
+
+
+def _wrap_sync[**P](
+    view: Callable[Concatenate[Any, P], HttpResponseBase],
+    applies: Callable[[Any], bool],
+) -> Callable[Concatenate[Any, P], Any]:
+    @functools.wraps(view)
+    def wrapper(
+        request: Any,
+        /,
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> HttpResponseBase:
+        if not applies(request) or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        etag = user_data_etag(request, request.user)
+        response: HttpResponseBase | None = get_conditional_response(
+            request,
+            etag=etag,
+        )
+        if response is None:
+            response = view(request, *args, **kwargs)
+        return _finalize(response, etag)
+
+    return wrapper
+
+
+def conditional_on_user_data[**P](
+    *,
+    htmx_only: bool = False,
+) -> Callable[
+    [Callable[Concatenate[Any, P], Any]],
+    Callable[Concatenate[Any, P], Any],
+]:
+    """Answer unchanged GET requests of a view with 304 Not Modified.
+
+    Successful responses get the ETag and a private ``no-cache`` policy,
+    so browsers keep them but revalidate before every reuse. Views mark
+    incomplete responses with ``no-store`` to keep them out of caches.
+    Apply it to ``get`` of class-based views, sync or async, after
+    authentication has run.
+
+    Args:
+        htmx_only: Only handle HTMX requests. Full pages also depend on
+            profile settings that have no data version.
+    """
+
+    def applies(request: Any) -> bool:
+        return request.method in _CONDITIONAL_METHODS and (
+            not htmx_only or bool(request.headers.get('HX-Request'))
+        )
+
+    def decorator(
+        view: Callable[Concatenate[Any, P], Any],
+    ) -> Callable[Concatenate[Any, P], Any]:
+        if iscoroutinefunction(view):
+            return _wrap_async(view, applies)
+        return _wrap_sync(view, applies)
+
+    return decorator
@@ -9,8 +9,7 @@ from decimal import Decimal
 from typing import Any
 
 import numpy as np
-from django.core.cache import cache
-from django.db.models import Q, Sum
+from django.db.models import F, Q, Sum
 from django.utils import timezone
 
 from hasta_la_vista_money import constants
@@ -24,7 +23,11 @@ from hasta_la_vista_money.transactions.models import (
 )
 from hasta_la_vista_money.users.models import User
 from hasta_la_vista_money.users.services.cache import (
+    DOMAIN_DEPOSITS,
+    DOMAIN_TRANSACTIONS,
+    StatisticsScope,
     get_period_comparison_cache_key,
+    statistics_cached,
 )
 from hasta_la_vista_money.users.utils.date_utils import (
     get_month_start_end,
@@ -108,6 +111,27 @@ def calculate_linear_trend(
     }
 
 
+def _period_comparison_cache(
+    user: User,
+    period_type: str,
+) -> tuple[str, StatisticsScope]:
+    period_dates = get_period_dates(period_type=period_type)
+    return (
+        get_period_comparison_cache_key(user.pk, period_type),
+        StatisticsScope(
+            user.pk,
+            (DOMAIN_TRANSACTIONS, DOMAIN_DEPOSITS),
+            period_dates['previous_start'].date(),
+            period_dates['current_end'].date(),
+        ),
+    )
+
+
+@statistics_cached(
+    _period_comparison_cache,
+    timeout=constants.DASHBOARD_COMPARISON_CACHE_TIMEOUT,
+    metric='period_comparison',
+)
 def get_period_comparison(
     user: User,
     period_type: str,
@@ -123,11 +147,6 @@ def get_period_comparison(
         Keys: 'current', 'previous', 'change_percent'. Each period
         contains: 'start', 'end', 'expenses', 'income', 'savings'.
     """
-    cache_key = get_period_comparison_cache_key(user.pk, period_type)
-    cached_data = cache.get(cache_key)
-    if cached_data is not None:
-        return cached_data  # type: ignore[no-any-return]
-
     period_dates = get_period_dates(period_type=period_type)
     current_start_dt = period_dates['current_start']
     today_dt = period_dates['current_end']
@@ -231,7 +250,7 @@ def get_period_comparison(
 
     today = timezone.now().date()
 
-    result = {
+    return {
         'current': {
             'start': period_dates['current_start'].date().isoformat(),
             'end': today.isoformat(),
@@ -252,8 +271,6 @@ def get_period_comparison(
             'savings': savings_change_percent,
         },
     }
-    cache.set(cache_key, result, constants.DASHBOARD_COMPARISON_CACHE_TIMEOUT)
-    return result
 
 
 def get_drill_down_data(
@@ -303,18 +320,21 @@ def get_drill_down_data(
                 type=type_value,
                 date__gte=month_start_dt,
                 date__lte=month_end_dt,
-                category__parent_category__isnull=True,
+                category__ancestor_links__ancestor__parent_category__isnull=True,
+            )
+            .values(
+                root_id=F('category__ancestor_links__ancestor_id'),
+                root_name=F('category__ancestor_links__ancestor__name'),
             )
-            .values('category__id', 'category__name')
             .annotate(total=Sum('amount'))
             .order_by('-total')[: constants.TOP_CATEGORIES_LIMIT]
         )
 
         data = [
             {
-                'name': cat['category__name'],
+                'name': cat['root_name'],
                 'value': float(cat['total']),
-                'category_id': cat['category__id'],
+                'category_id': cat['root_id'],
             }
             for cat in top_categories
         ]
@@ -344,18 +364,21 @@ def get_drill_down_data(
             type=type_value,
             date__gte=month_start_dt,
             date__lte=month_end_dt,
-            category__parent_category_id=category_pk,
+            category__ancestor_links__ancestor__parent_category_id=category_pk,
+        )
+        .values(
+            child_id=F('category__ancestor_links__ancestor_id'),
+            child_name=F('category__ancestor_links__ancestor__name'),
         )
-        .values('category__id', 'category__name')
         .annotate(total=Sum('amount'))
         .order_by('-total')
     )
 
     data = [
         {
-            'name': subcat['category__name'],
+            'name': subcat['child_name'],
             'value': float(subcat['total']),
-            'category_id': subcat['category__id'],
+            'category_id': subcat['child_id'],
         }
         for subcat in subcategories
     ]
@@ -0,0 +1,268 @@
+"""Concurrent computation of independent dashboard widgets.
+
+Each widget is computed by its own provider. Providers run on a shared
+thread pool, each bounded by its own timeout, and a failing or slow
+provider only drops its widget from the payload. With
+``DASHBOARD_WIDGET_WORKERS`` set to zero providers run one after another
+in the calling thread. Async views await ``arun_widgets``, which runs
+providers on the same pool without blocking the event loop, and
+``arun_in_worker`` for any other blocking call.
+
+Every provider runs in a copy of the caller's context, so its spans,
+queries and log fields are collected for the request that asked. Pool
+threads keep their database connections between calls, subject to
+``CONN_MAX_AGE`` as in the request cycle.
+
+A provider that times out while still queued is cancelled. One that is
+already running cannot be stopped, so the pool it occupies is retired:
+later requests get a fresh pool instead of queuing behind it, and the
+retired threads exit once their providers return. At most
+``DASHBOARD_WIDGET_MAX_RETIRED_POOLS`` retired pools drain at a time;
+past that the pool is kept and requests queue behind its slow providers
+rather than piling up threads.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+import structlog
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+DEFAULT_WIDGET_TIMEOUT: Final = 10.0
+DEFAULT_MAX_RETIRED_POOLS: Final = 4
+WIDGET_TIMEOUT_ERROR: Final = 'timeout'
+WIDGET_FAILURE_ERROR: Final = 'error'
+
+logger = structlog.get_logger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_pool_futures: weakref.WeakSet[Future[Any]] = weakref.WeakSet()
+_retired_pools = 0
+
+
+@dataclass(frozen=True)
+class WidgetProvider:
+    """Computes the payload of one dashboard widget.
+
+    Attributes:
+        compute: Builds the widget payload.
+        timeout: Seconds the request waits for the payload.
+        lazy: Whether the frontend loads the widget separately.
+    """
+
+    compute: Callable[[], Any]
+    timeout: float = DEFAULT_WIDGET_TIMEOUT
+    lazy: bool = False
+
+
+@dataclass
+class WidgetResults:
+    """Payloads of computed widgets and errors of the failed ones."""
+
+    data: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def _widget_workers() -> int:
+    return int(getattr(settings, 'DASHBOARD_WIDGET_WORKERS', 4))
+
+
+def _max_retired_pools() -> int:
+    return int(
+        getattr(
+            settings,
+            'DASHBOARD_WIDGET_MAX_RETIRED_POOLS',
+            DEFAULT_MAX_RETIRED_POOLS,
+        ),
+    )
+
+
+def _submit(compute: Callable[[], Any]) -> Future[Any]:
+    global _executor  # noqa: PLW0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_widget_workers(),
+                thread_name_prefix='dashboard-widget',
+            )
+        future = _executor.submit(
+            contextvars.copy_context().run,
+            _run_in_worker,
+            compute,
+        )
+        _pool_futures.add(future)
+        return future
+
+
+def _abandon(future: Future[Any]) -> None:
+    """Drop a provider that ran past its timeout."""
+    global _executor, _retired_pools  # noqa: PLW0603
+    if future.done() or future.cancel():
+        return
+    with _executor_lock:
+        # Only a future of the current pool holds one of its threads;
+        # a pool that was already retired is left to drain.
+        if _executor is None or future not in _pool_futures:
+            return
+        if _retired_pools >= _max_retired_pools():
+            logger.warning(
+                'Dashboard widget pool kept: too many retired pools draining',
+                retired_pools=_retired_pools,
+            )
+            return
+        retired, _executor = _executor, None
+        _pool_futures.clear()
+        _retired_pools += 1
+        retired.shutdown(wait=False)
+    # The pool counts as draining until the provider that retired it
+    # returns; outside the lock, as the callback may run right away.
+    future.add_done_callback(_pool_drained)
+    logger.warning('Dashboard widget pool retired behind a slow widget')
+
+
+def _pool_drained(_future: Future[Any]) -> None:
+    global _retired_pools  # noqa: PLW0603
+    with _executor_lock:
+        _retired_pools -= 1
+
+
+def shutdown_widget_pool(*, wait: bool = False) -> None:
+    """Shut the shared widget pool down; the next call starts a new one.
+
+    Args:
+        wait: Whether to wait for running providers to return.
+    """
+    global _executor
+    with _executor_lock:
+        retired, _executor = _executor, None
+        _pool_futures.clear()
+    if retired is not None:
+        retired.shutdown(wait=wait)
+
+
+def _run_in_worker(compute: Callable[[], Any]) -> Any:
+    # Pool threads are reused across requests; like the request cycle,
+    # drop only connections that are broken or older than CONN_MAX_AGE.
+    close_old_connections()
+    try:
+        return compute()
+    finally:
+        close_old_connections()
+
+
+def _run_inline(
+    providers: Mapping[str, WidgetProvider],
+    results: WidgetResults,
+) -> None:
+    for name, provider in providers.items():
+        try:
+            results.data[name] = provider.compute()
+        except Exception:
+            logger.exception('Dashboard widget failed', widget=name)
+            results.errors[name] = WIDGET_FAILURE_ERROR
+
+
+def run_widgets(providers: Mapping[str, WidgetProvider]) -> WidgetResults:
+    """Compute widget payloads concurrently.
+
+    Args:
+        providers: Widget providers keyed by widget name.
+
+    Returns:
+        Payloads of widgets that finished within their timeout and the
+        error kind of the others.
+    """
+    results = WidgetResults()
+    if _widget_workers() <= 0:
+        _run_inline(providers, results)
+        return results
+
+    started = time.monotonic()
+    futures = {
+        name: _submit(provider.compute) for name, provider in providers.items()
+    }
+    for name, future in futures.items():
+        remaining = providers[name].timeout - (time.monotonic() - started)
+        try:
+            results.data[name] = future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            # A running provider keeps going and still fills its cache,
+            # so a later lazy request for the widget is likely served.
+            logger.warning('Dashboard widget timed out', widget=name)
+            results.errors[name] = WIDGET_TIMEOUT_ERROR
+            _abandon(future)
+        except Exception:
+            logger.exception('Dashboard widget failed', widget=name)
+            results.errors[name] = WIDGET_FAILURE_ERROR
+    return results
+
+
+async def arun_widgets(
+    providers: Mapping[str, WidgetProvider],
+) -> WidgetResults:
+    """Async variant of ``run_widgets`` for async views.
+
+    Args:
+        providers: Widget providers keyed by widget name.
+
+    Returns:
+        Payloads of widgets that finished within their timeout and the
+        error kind of the others.
+    """
+    results = WidgetResults()
+    if _widget_workers() <= 0:
+        await sync_to_async(_run_inline)(providers, results)
+        return results
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    futures = {
+        name: _submit(provider.compute) for name, provider in providers.items()
+    }
+    for name, future in futures.items():
+        remaining = providers[name].timeout - (loop.time() - started)
+        try:
+            # Shielded so that only ``_abandon`` decides whether the
+            # provider is cancelled or left to fill its cache.
+            results.data[name] = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=max(remaining, 0),
+            )
+        except TimeoutError:
+            logger.warning('Dashboard widget timed out', widget=name)
+            results.errors[name] = WIDGET_TIMEOUT_ERROR
+            _abandon(future)
+        except Exception:
+            logger.exception('Dashboard widget failed', widget=name)
+            results.errors[name] = WIDGET_FAILURE_ERROR
+    return results
+
+
+async def arun_in_worker[T](compute: Callable[[], T]) -> T:
+    """Run a blocking call of an async view on the widget pool.
+
+    Unlike ``sync_to_async`` the call does not queue behind the other
+    requests of the process on its single thread-sensitive thread. With
+    the pool disabled it runs through ``sync_to_async``.
+
+    Args:
+        compute: Blocking call, for example a service building a payload.
+
+    Returns:
+        Result of the call.
+    """
+    if _widget_workers() <= 0:
+        return await sync_to_async(compute)()
+    result: T = await asyncio.wrap_future(_submit(compute))
+    return result
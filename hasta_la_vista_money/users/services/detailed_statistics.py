@@ -15,6 +15,7 @@ from hasta_la_vista_money.users.services.category_statistics_service import (
     _filtered_transactions,
     _match_income_expense_search,
     _receipt_details,
+    _receipt_search_lookup,
     _sum_amount_for_period,
     _top_categories_qs,
     _top_categories_with_comparison,
@@ -57,12 +58,14 @@ from hasta_la_vista_money.users.services.summary_statistics_service import (
     _apply_payments_to_months,
     _balances_and_delta,
     _build_chart,
-    _build_expenses_receipts_dicts,
     _build_payment_schedule,
     _build_single_card_month,
     _calculate_grace_period_end,
     _card_months_block,
+    _card_operation_filters,
+    _cards_months_blocks,
     _collect_card_payments,
+    _collect_cards_payments,
     _credit_card_utilization_chart,
     _credit_cards_block,
     _credit_cards_summary,
@@ -98,16 +101,18 @@ __all__ = [
     '_balances_and_delta',
     '_budgets_data',
     '_build_chart',
-    '_build_expenses_receipts_dicts',
     '_build_payment_schedule',
     '_build_single_card_month',
     '_calculate_grace_period_end',
     '_card_months_block',
+    '_card_operation_filters',
+    '_cards_months_blocks',
     '_category_children_totals',
     '_category_choices',
     '_category_drilldown_transactions',
     '_category_ids',
     '_collect_card_payments',
+    '_collect_cards_payments',
     '_credit_card_utilization_chart',
     '_credit_cards_block',
     '_credit_cards_summary',
@@ -132,6 +137,7 @@ __all__ = [
     '_positive_int',
     '_pre_period_debt_for_card',
     '_receipt_details',
+    '_receipt_search_lookup',
     '_resolve_statistics_members',
     '_six_months_data',
     '_statistics_alerts',
@@ -9,6 +9,7 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from typing_extensions import TypedDict
 
+from hasta_la_vista_money.services.two_tier_cache import local_cache
 from hasta_la_vista_money.users.models import (
     FamilyGroupMembership,
     FamilyInvite,
@@ -16,6 +17,7 @@ from hasta_la_vista_money.users.models import (
 )
 
 DEFAULT_FAMILY_GROUP_NAME = 'Семья'
+FAMILY_MEMBERSHIP_CACHE_TIMEOUT = 600
 
 
 class GroupDict(TypedDict):
@@ -194,6 +196,52 @@ def user_can_manage_group(user: User, group: Group) -> bool:
     ).exists()
 
 
+def _family_roles_cache_key(user_id: int) -> str:
+    return f'family_roles_{user_id}'
+
+
+def _family_members_cache_key(group_id: int) -> str:
+    return f'family_group_members_{group_id}'
+
+
+def get_family_roles(user: User) -> dict[int, str]:
+    """Return the user's roles keyed by family group ID."""
+
+    return local_cache.get_or_set(
+        _family_roles_cache_key(user.pk),
+        lambda: dict(
+            FamilyGroupMembership.objects.filter(user=user).values_list(
+                'group_id',
+                'role',
+            ),
+        ),
+        FAMILY_MEMBERSHIP_CACHE_TIMEOUT,
+    )
+
+
+def get_family_member_ids(group_id: int) -> list[int]:
+    """Return IDs of users that are members of a family group."""
+
+    return local_cache.get_or_set(
+        _family_members_cache_key(group_id),
+        lambda: list(
+            FamilyGroupMembership.objects.filter(
+                group_id=group_id,
+            ).values_list('user_id', flat=True),
+        ),
+        FAMILY_MEMBERSHIP_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_family_membership_cache(user_id: int, group_id: int) -> None:
+    """Drop cached roles of a user and cached members of a group."""
+
+    local_cache.delete(
+        _family_roles_cache_key(user_id),
+        _family_members_cache_key(group_id),
+    )
+
+
 def user_has_group_access(user: User, group_id: str | None) -> bool:
     """Return whether user may read data for selected group."""
 
@@ -201,10 +249,7 @@ def user_has_group_access(user: User, group_id: str | None) -> bool:
         return True
     if not group_id.isdigit():
         return False
-    return FamilyGroupMembership.objects.filter(
-        user=user,
-        group_id=int(group_id),
-    ).exists()
+    return int(group_id) in get_family_roles(user)
 
 
 def get_family_groups(
@@ -254,13 +299,11 @@ def get_family_groups(
 def get_family_group_ids(user: User) -> list[int]:
     """Return group IDs that participate in family finance sharing."""
 
-    get_or_create_default_family_group(user)
-    return list(
-        FamilyGroupMembership.objects.filter(user=user).values_list(
-            'group_id',
-            flat=True,
-        ),
-    )
+    roles = get_family_roles(user)
+    if FamilyGroupMembership.Role.OWNER not in roles.values():
+        get_or_create_default_family_group(user)
+        roles = get_family_roles(user)
+    return list(roles)
 
 
 def get_or_create_family_invite(
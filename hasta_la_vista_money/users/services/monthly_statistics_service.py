@@ -6,7 +6,6 @@ from typing import TYPE_CHECKING, Any
 from urllib.parse import urlencode
 
 from dateutil.relativedelta import relativedelta
-from django.core.cache import cache
 from django.db.models import Sum
 from django.db.models.functions import TruncMonth
 from django.utils import timezone
@@ -17,12 +16,18 @@ if TYPE_CHECKING:
 
 from hasta_la_vista_money import constants
 from hasta_la_vista_money.budget.models import Budget, Planning
+from hasta_la_vista_money.core.spans import timed
 from hasta_la_vista_money.transactions.models import (
     Transaction,
     TransactionType,
 )
 from hasta_la_vista_money.users.models import FamilyGroupMembership, User
 from hasta_la_vista_money.users.services.cache import (
+    DOMAIN_BUDGETS,
+    DOMAIN_CATEGORIES,
+    DOMAIN_TRANSACTIONS,
+    StatisticsScope,
+    cached_statistics,
     get_dashboard_summary_cache_key,
 )
 from hasta_la_vista_money.users.services.groups import get_family_groups
@@ -437,7 +442,8 @@ def _planning_amounts_by_month(
     income_by_month: dict[date, float] = {}
     expense_by_month: dict[date, float] = {}
     for row in qs:
-        month_date = row['month'].date().replace(day=1)
+        # Planning.date is a DateField, so the month is already a date.
+        month_date = row['month']
         value = float(row['total'] or 0)
         if row['planning_type'] == TransactionType.INCOME:
             income_by_month[month_date] = value
@@ -500,11 +506,62 @@ def _sum_amount_for_period(
     return float(queryset.aggregate(total=Sum('amount'))['total'] or 0)
 
 
+def _balance_before_months(
+    users: Iterable[User],
+    months_data: list[MonthDataDict],
+    stats_filter: StatisticsFilters,
+) -> float:
+    """Return the balance accumulated before the first listed month."""
+    if not months_data:
+        return 0.0
+    first_month_start = date.fromisoformat(str(months_data[0]['month_start']))
+    period_end_date = first_month_start - timedelta(days=1)
+    total_income_before = _sum_amount_for_period(
+        TransactionType.INCOME,
+        users,
+        date(2000, 1, 1),
+        period_end_date,
+        stats_filter,
+    )
+    total_expense_before = _sum_amount_for_period(
+        TransactionType.EXPENSE,
+        users,
+        date(2000, 1, 1),
+        period_end_date,
+        stats_filter,
+    )
+    return total_income_before - total_expense_before
+
+
+def _apply_running_balance(
+    months_data: list[MonthDataDict],
+    opening_balance: float,
+) -> list[MonthDataDict]:
+    """Return copies of month rows with ``balance`` counted from opening."""
+    running_balance = opening_balance
+    out: list[MonthDataDict] = []
+    for month in months_data:
+        running_balance = (
+            running_balance
+            + float(month.get('income', 0.0) or 0.0)
+            - float(month.get('expenses', 0.0) or 0.0)
+        )
+        out.append({**month, 'balance': round(running_balance, 2)})
+    return out
+
+
 def _six_months_data(
     users: Iterable[User],
     today: date,
     stats_filter: StatisticsFilters,
+    *,
+    with_balance: bool = True,
 ) -> list[MonthDataDict]:
+    """Build month rows for the statistics window.
+
+    With ``with_balance=False`` rows carry no running balance, which lets
+    callers cache the window apart from the history preceding it.
+    """
     out = []
 
     month_ranges = _month_ranges_for_filter(today, stats_filter)
@@ -557,44 +614,14 @@ def _six_months_data(
             },
         )
 
-    if out:
-        first_month_start = str(out[0]['month_start'])
-        first_month_start_date = date.fromisoformat(first_month_start)
-        period_end_date: date = first_month_start_date - timedelta(days=1)
-
-        total_income_before = _sum_amount_for_period(
-            TransactionType.INCOME,
-            users,
-            date(2000, 1, 1),
-            period_end_date,
-            stats_filter,
-        )
-        total_expense_before = _sum_amount_for_period(
-            TransactionType.EXPENSE,
-            users,
-            date(2000, 1, 1),
-            period_end_date,
-            stats_filter,
-        )
-
-        running_balance = total_income_before - total_expense_before
-    else:
-        running_balance = 0.0
-
     for m in out:
         income_raw = m.get('income', 0.0) or 0.0
-        expenses_raw = m.get('expenses', 0.0) or 0.0
         savings_raw = m.get('savings', 0.0) or 0.0
         income_val = (
             float(income_raw)
             if isinstance(income_raw, int | float | str)
             else 0.0
         )
-        expenses_val = (
-            float(expenses_raw)
-            if isinstance(expenses_raw, int | float | str)
-            else 0.0
-        )
         savings_val = (
             float(savings_raw)
             if isinstance(savings_raw, int | float | str)
@@ -606,9 +633,16 @@ def _six_months_data(
             else float(constants.ZERO)
         )
 
-        running_balance = running_balance + income_val - expenses_val
-        m['balance'] = round(running_balance, 2)
-    return out  # type: ignore[return-value]
+    if not with_balance:
+        return out  # type: ignore[return-value]
+    return _apply_running_balance(
+        out,  # type: ignore[arg-type]
+        _balance_before_months(
+            users,
+            out,  # type: ignore[arg-type]
+            stats_filter,
+        ),
+    )
 
 
 def _budgets_data(
@@ -679,22 +713,11 @@ class DashboardSummaryStatisticsDict(TypedDict):
     top_expense_categories: list[dict[str, Any]]
 
 
-def get_dashboard_summary_statistics(
+def _dashboard_summary_window(
     user: User,
-    container: 'ApplicationContainer',
+    today: date,
+    stats_filter: StatisticsFilters,
 ) -> DashboardSummaryStatisticsDict:
-    """Return the dashboard widget payload without heavyweight sections."""
-    del container
-
-    cache_key = get_dashboard_summary_cache_key(user.pk)
-    cached_stats = cache.get(cache_key)
-
-    if cached_stats is not None:
-        return cached_stats  # type: ignore[no-any-return]
-
-    now = timezone.now()
-    today = now.date()
-    stats_filter = StatisticsFilters()
     start, end = stats_filter.date_range(today)
     users = [user]
 
@@ -702,11 +725,12 @@ def get_dashboard_summary_statistics(
         _top_categories_qs,
     )
 
-    stats: DashboardSummaryStatisticsDict = {
+    return {
         'months_data': _six_months_data(
             users,
             today,
             stats_filter,
+            with_balance=False,
         ),
         'top_expense_categories': list(
             _top_categories_qs(
@@ -719,8 +743,55 @@ def get_dashboard_summary_statistics(
         ),
     }
 
-    cache.set(cache_key, stats, constants.DASHBOARD_CACHE_TIMEOUT)
-    return stats
+
+@timed()
+def get_dashboard_summary_statistics(
+    user: User,
+    container: 'ApplicationContainer',
+) -> DashboardSummaryStatisticsDict:
+    """Return the dashboard widget payload without heavyweight sections.
+
+    The statistics window and the balance accumulated before it are
+    cached apart, so an edit of an older transaction only recomputes
+    the opening balance.
+    """
+    del container
+
+    today = timezone.now().date()
+    stats_filter = StatisticsFilters()
+    start, end = stats_filter.date_range(today)
+    cache_key = get_dashboard_summary_cache_key(user.pk)
+
+    window = cached_statistics(
+        cache_key,
+        StatisticsScope(
+            user.pk,
+            (DOMAIN_TRANSACTIONS, DOMAIN_CATEGORIES, DOMAIN_BUDGETS),
+            start,
+            end,
+        ),
+        lambda: _dashboard_summary_window(user, today, stats_filter),
+        timeout=constants.DASHBOARD_CACHE_TIMEOUT,
+        metric='dashboard_summary',
+    )
+    opening_balance = cached_statistics(
+        f'{cache_key}:opening_balance:{start.isoformat()}',
+        StatisticsScope(user.pk, (DOMAIN_TRANSACTIONS,)),
+        lambda: _balance_before_months(
+            [user],
+            window['months_data'],
+            stats_filter,
+        ),
+        timeout=constants.DASHBOARD_CACHE_TIMEOUT,
+        metric='dashboard_opening_balance',
+    )
+    return {
+        **window,
+        'months_data': _apply_running_balance(
+            window['months_data'],
+            opening_balance,
+        ),
+    }
 
 
 # ---------------------------------------------------------------------------
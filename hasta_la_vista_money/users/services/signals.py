@@ -1,81 +1,197 @@
-"""Cache-invalidation signals for statistics.
+"""Cache-invalidation signals for statistics and family groups.
 
-Automatically invalidates per-user statistics cache whenever a
-Transaction, Receipt, or TransferMoneyLog is saved or deleted.
+Invalidates cached statistics whenever a Transaction, Receipt,
+TransferMoneyLog, Category or Account is saved or deleted, and bumps the
+data version of budget, receipt detail and dashboard layout rows. Dated
+rows invalidate only the months they were moved from and to; writes
+within one database transaction are coalesced into a single flush.
+Changes of family group memberships drop the cached roles and members
+once they are committed, and logging in queues a pre-warm of the user's
+statistics caches.
 """
 
+from functools import partial
+from typing import TYPE_CHECKING, Any, Final
+
+from django.contrib.auth.signals import user_logged_in
 from django.db import transaction
 from django.db.models import Model
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from hasta_la_vista_money.budget.models import Budget, DateList, Planning
+from hasta_la_vista_money.core.tracking import LoadedValuesMixin
 from hasta_la_vista_money.finance_account.models import (
     Account,
     TransferMoneyLog,
 )
-from hasta_la_vista_money.receipts.models import Receipt
+from hasta_la_vista_money.receipts.models import Product, Receipt, Seller
 from hasta_la_vista_money.transactions.models import Category, Transaction
+from hasta_la_vista_money.users.models import (
+    DashboardWidget,
+    FamilyGroupMembership,
+)
 from hasta_la_vista_money.users.services.cache import (
-    invalidate_user_detailed_statistics_cache,
+    DOMAIN_ACCOUNTS,
+    DOMAIN_BUDGETS,
+    DOMAIN_CATEGORIES,
+    DOMAIN_DASHBOARD,
+    DOMAIN_RECEIPTS,
+    DOMAIN_TRANSACTIONS,
+    DOMAIN_TRANSFERS,
+)
+from hasta_la_vista_money.users.services.cache_invalidation import (
+    schedule_statistics_change,
+)
+from hasta_la_vista_money.users.services.cache_prewarm import (
+    schedule_statistics_prewarm,
+)
+from hasta_la_vista_money.users.services.groups import (
+    invalidate_family_membership_cache,
 )
 
+if TYPE_CHECKING:
+    from datetime import date, datetime
 
-def _invalidate_on_commit(user_id: int) -> None:
-    transaction.on_commit(
-        lambda: invalidate_user_detailed_statistics_cache(user_id),
+DATED_MODELS: Final[dict[type[Model], tuple[str, str]]] = {
+    Transaction: (DOMAIN_TRANSACTIONS, 'date'),
+    Receipt: (DOMAIN_RECEIPTS, 'receipt_date'),
+    TransferMoneyLog: (DOMAIN_TRANSFERS, 'exchange_date'),
+}
+_ORIGINAL_DATE_ATTR = '_statistics_original_date'
+
+
+@receiver(pre_save, sender=Transaction)
+@receiver(pre_save, sender=Receipt)
+@receiver(pre_save, sender=TransferMoneyLog)
+def store_original_date(
+    sender: type[Model],
+    instance: Model,
+    **kwargs: Any,
+) -> None:
+    if kwargs.get('raw') or instance.pk is None:
+        return
+    _, date_field = DATED_MODELS[sender]
+    loaded = None
+    if isinstance(instance, LoadedValuesMixin):
+        loaded = instance.loaded_field_values(date_field)
+    if loaded is not None:
+        setattr(instance, _ORIGINAL_DATE_ATTR, loaded[0])
+        return
+    # Only instances built without loading them are read back.
+    setattr(
+        instance,
+        _ORIGINAL_DATE_ATTR,
+        sender._default_manager.filter(pk=instance.pk)
+        .values_list(date_field, flat=True)
+        .first(),
     )
 
 
-@receiver(post_save, sender='transactions.Transaction')
-@receiver(post_delete, sender='transactions.Transaction')
-def invalidate_cache_on_transaction_change(
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Receipt)
+@receiver(post_save, sender=TransferMoneyLog)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Receipt)
+@receiver(post_delete, sender=TransferMoneyLog)
+def invalidate_cache_on_dated_change(
+    sender: type[Model],
+    instance: Transaction | Receipt | TransferMoneyLog,
+    **kwargs: Any,
+) -> None:
+    domain, date_field = DATED_MODELS[sender]
+    moments: list[date | datetime | None] = [getattr(instance, date_field)]
+    if not kwargs.get('created', True):
+        moments.append(getattr(instance, _ORIGINAL_DATE_ATTR, None))
+    schedule_statistics_change(instance.user_id, domain, moments)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cache_on_category_change(
+    sender: type[Model],
+    instance: Category,
+    **kwargs: object,
+) -> None:
+    del sender, kwargs
+    schedule_statistics_change(instance.user_id, DOMAIN_CATEGORIES)
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_cache_on_account_change(
     sender: type[Model],
-    instance: Transaction,
+    instance: Account,
     **kwargs: object,
 ) -> None:
     del sender, kwargs
-    _invalidate_on_commit(instance.user_id)
+    schedule_statistics_change(instance.user_id, DOMAIN_ACCOUNTS)
 
 
-@receiver(post_save, sender='receipts.Receipt')
-@receiver(post_delete, sender='receipts.Receipt')
-def invalidate_cache_on_receipt_change(
+@receiver(post_save, sender=DateList)
+@receiver(post_save, sender=Planning)
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=DateList)
+@receiver(post_delete, sender=Planning)
+@receiver(post_delete, sender=Budget)
+def invalidate_cache_on_budget_change(
     sender: type[Model],
-    instance: Receipt,
+    instance: DateList | Planning | Budget,
     **kwargs: object,
 ) -> None:
     del sender, kwargs
-    _invalidate_on_commit(instance.user_id)
+    schedule_statistics_change(instance.user_id, DOMAIN_BUDGETS)
 
 
-@receiver(post_save, sender='finance_account.TransferMoneyLog')
-@receiver(post_delete, sender='finance_account.TransferMoneyLog')
-def invalidate_cache_on_transfer_change(
+@receiver(post_save, sender=Seller)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Seller)
+@receiver(post_delete, sender=Product)
+def invalidate_cache_on_receipt_detail_change(
     sender: type[Model],
-    instance: TransferMoneyLog,
+    instance: Seller | Product,
     **kwargs: object,
 ) -> None:
     del sender, kwargs
-    _invalidate_on_commit(instance.user_id)
+    # Sellers and products are shared by receipts of any month.
+    schedule_statistics_change(instance.user_id, DOMAIN_RECEIPTS)
 
 
-@receiver(post_save, sender='transactions.Category')
-@receiver(post_delete, sender='transactions.Category')
-def invalidate_cache_on_category_change(
+@receiver(post_save, sender=DashboardWidget)
+@receiver(post_delete, sender=DashboardWidget)
+def invalidate_cache_on_dashboard_widget_change(
     sender: type[Model],
-    instance: Category,
+    instance: DashboardWidget,
     **kwargs: object,
 ) -> None:
     del sender, kwargs
-    _invalidate_on_commit(instance.user_id)
+    schedule_statistics_change(instance.user_id, DOMAIN_DASHBOARD)
 
 
-@receiver(post_save, sender='finance_account.Account')
-@receiver(post_delete, sender='finance_account.Account')
-def invalidate_cache_on_account_change(
+@receiver(post_save, sender=FamilyGroupMembership)
+@receiver(post_delete, sender=FamilyGroupMembership)
+def invalidate_cache_on_membership_change(
     sender: type[Model],
-    instance: Account,
+    instance: FamilyGroupMembership,
+    **kwargs: object,
+) -> None:
+    del sender, kwargs
+    # Dropped after commit: a request reading the memberships before
+    # that would cache the old rows in every tier again.
+    transaction.on_commit(
+        partial(
+            invalidate_family_membership_cache,
+            instance.user_id,
+            instance.group_id,
+        ),
+    )
+
+
+@receiver(user_logged_in)
+def prewarm_cache_on_login(
+    sender: type[Model],
+    user: Model,
     **kwargs: object,
 ) -> None:
     del sender, kwargs
-    _invalidate_on_commit(instance.user_id)
+    schedule_statistics_prewarm(user.pk)
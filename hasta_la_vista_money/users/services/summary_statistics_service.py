@@ -1,16 +1,17 @@
+import functools
 import json
 from calendar import monthrange
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
+from functools import reduce
+from operator import or_
 from typing import TYPE_CHECKING, Any, cast
 
 from dateutil.relativedelta import relativedelta
-from django.core.cache import cache
 from django.core.paginator import Page, Paginator
-from django.db.models import QuerySet, Sum
-from django.db.models.functions import TruncMonth
+from django.db.models import Q, QuerySet, Sum
 from django.utils import timezone
 from typing_extensions import TypedDict
 
@@ -20,10 +21,7 @@ if TYPE_CHECKING:
     from config.containers import ApplicationContainer
 
 from hasta_la_vista_money import constants
-from hasta_la_vista_money.constants import (
-    RECEIPT_OPERATION_PURCHASE,
-    RECEIPT_OPERATION_RETURN,
-)
+from hasta_la_vista_money.core.spans import timed
 from hasta_la_vista_money.finance_account.models import (
     Account,
     TransferMoneyLog,
@@ -33,25 +31,37 @@ from hasta_la_vista_money.finance_account.prepare import (
     collect_info_income,
     sort_expense_income,
 )
+from hasta_la_vista_money.finance_account.services.types import (
+    CreditPeriod,
+    CreditPeriodTotals,
+)
 from hasta_la_vista_money.receipts.models import Receipt
 from hasta_la_vista_money.services.views import collect_info_receipt
 from hasta_la_vista_money.transactions.models import (
     Transaction,
     TransactionType,
 )
+from hasta_la_vista_money.transactions.services.category_closure import (
+    category_subtree_ids,
+)
 from hasta_la_vista_money.users.models import User
 from hasta_la_vista_money.users.services.cache import (
+    DOMAIN_BUDGETS,
+    STATISTICS_DOMAINS,
+    StatisticsScope,
+    acached_statistics,
+    cached_statistics,
     get_user_detailed_statistics_cache_key,
 )
 from hasta_la_vista_money.users.services.category_statistics_service import (
     _category_choices,
     _category_ids,
-    _filter_transaction_queryset,
     _filtered_accounts,
     _filtered_receipts,
     _filtered_transactions,
     _match_income_expense_search,
     _receipt_details,
+    _receipt_search_lookup,
     _top_categories_with_comparison,
     _transfer_logs,
 )
@@ -493,32 +503,51 @@ def _calculate_grace_period_end(
     return purchase_end
 
 
-def _build_expenses_receipts_dicts(
-    expenses_by_month: Any,
-    receipts_by_month: Any,
-) -> tuple[dict[date, Decimal], dict[date, dict[int, Decimal]]]:
-    """Build expenses and receipts dictionaries by month."""
-    expenses_dict: dict[date, Decimal] = {}
-    for item in expenses_by_month:
-        month_date = item['month'].date().replace(day=1)
-        expenses_dict[month_date] = Decimal(str(item['total'] or 0))
+def _card_operation_filters(
+    cards: Sequence[Account],
+    stats_filter: StatisticsFilters,
+) -> tuple[Q, Q]:
+    """Build transaction and receipt filters for card months.
+
+    Applies the category and receipt search restrictions of
+    ``_filter_transaction_queryset`` and ``_filtered_receipts``. Like the
+    stored credit cycles, every operation on the cards is counted,
+    including those of family members.
+
+    Args:
+        cards: Credit card accounts.
+        stats_filter: Statistics filter parameters.
 
-    receipts_dict: dict[date, dict[int, Decimal]] = defaultdict(
-        lambda: defaultdict(lambda: Decimal(0)),
+    Returns:
+        Tuple of (transaction_filter, receipt_filter).
+    """
+    on_cards = Q(account_id__in=[card.pk for card in cards])
+    transaction_filter = on_cards
+    category_ids = _category_ids(
+        stats_filter.category_keys,
+        f'{TransactionType.EXPENSE}-',
     )
-    for item in receipts_by_month:
-        month_date = item['month'].date().replace(day=1)
-        operation_type = item['operation_type']
-        receipts_dict[month_date][operation_type] = Decimal(
-            str(item['total'] or 0),
+    if category_ids:
+        transaction_filter &= Q(
+            category_id__in=category_subtree_ids(category_ids),
         )
-    return expenses_dict, receipts_dict
+    elif stats_filter.category_keys:
+        transaction_filter &= Q(pk__in=[])
+
+    receipt_filter = on_cards
+    if stats_filter.receipts_search:
+        receipt_filter &= _receipt_search_lookup(stats_filter.receipts_search)
+    if (
+        stats_filter.category_keys
+        and 'receipt' not in stats_filter.category_keys
+    ):
+        receipt_filter &= Q(pk__in=[])
+    return transaction_filter, receipt_filter
 
 
 def _build_single_card_month(
     month_date: date,
-    expenses_dict: dict[date, Decimal],
-    receipts_dict: dict[date, dict[int, Decimal]],
+    totals: CreditPeriodTotals,
     card: Account,
     account_service: AccountServiceProtocol,
     now: datetime,
@@ -527,9 +556,7 @@ def _build_single_card_month(
 
     Args:
         month_date: Month date to build data for.
-        expenses_dict: Dictionary mapping month date to expense amount.
-        receipts_dict: Dictionary mapping month date to receipts by
-            operation type.
+        totals: Card totals for the month.
         card: Account (credit card) instance.
         account_service: Account service for payment schedule calculations.
         now: Current datetime.
@@ -553,17 +580,7 @@ def _build_single_card_month(
         ),
     )
 
-    exp_sum = expenses_dict.get(purchase_start_date, Decimal(0))
-    rcpt_expense = receipts_dict[purchase_start_date].get(
-        RECEIPT_OPERATION_PURCHASE,
-        Decimal(0),
-    )
-    rcpt_return = receipts_dict[purchase_start_date].get(
-        RECEIPT_OPERATION_RETURN,
-        Decimal(0),
-    )
-
-    debt = float(exp_sum) + float(rcpt_expense) - float(rcpt_return)
+    debt = float(totals.purchases - totals.refunds)
     grace_end = _calculate_grace_period_end(
         card,
         purchase_start_date,
@@ -606,121 +623,208 @@ def _build_single_card_month(
     return month_data, final_debt
 
 
-def _card_months_block(
-    card: Account,
-    today: date,
-    stats_filter: StatisticsFilters,
+def _reads_credit_cycles(stats_filter: StatisticsFilters) -> bool:
+    """Whether card months of the filter match stored credit cycles."""
+    return (
+        stats_filter.period != 'range'
+        and not stats_filter.category_keys
+        and not stats_filter.receipts_search
+    )
+
+
+def _cards_cycle_totals(
+    cards: Sequence[Account],
+    month_ranges: Sequence[tuple[date, date, date]],
     account_service: AccountServiceProtocol,
-) -> tuple[list[CardMonthDict], list[CardHistoryDict]]:
-    """Build months data block for card."""
-    now = timezone.now()
-    month_ranges = _month_ranges_for_filter(today, stats_filter)
-    if not month_ranges:
-        return [], []
-    period_start = month_ranges[0][1]
-    period_end = month_ranges[-1][2]
-
-    expenses_by_month = (
-        _filter_transaction_queryset(
-            Transaction.objects.filter(
-                user=card.user,
-                account=card,
-                type=TransactionType.EXPENSE,
-            ),
-            stats_filter=stats_filter,
-            type_value=TransactionType.EXPENSE,
-            start=period_start,
-            end=period_end,
-        )
-        .annotate(month=TruncMonth('date'))
-        .values('month')
-        .annotate(total=Sum('amount'))
+) -> dict[int, list[CreditPeriodTotals]]:
+    """Read card month totals from stored credit card cycles."""
+    cycles = account_service.get_credit_card_cycles(
+        cards,
+        [month_date for month_date, _start, _end in month_ranges],
     )
+    return {
+        card_id: [
+            CreditPeriodTotals(
+                purchases=cycle.purchases,
+                refunds=cycle.refunds,
+                repayments=cycle.repayments,
+                payments=cycle.payments,
+            )
+            for cycle in card_cycles
+        ]
+        for card_id, card_cycles in cycles.items()
+    }
 
-    receipts_by_month = (
-        _filtered_receipts(
-            [card.user],
-            stats_filter,
-            period_start,
-            period_end,
-            account=card,
+
+def _cards_filtered_totals(
+    cards: Sequence[Account],
+    month_ranges: Sequence[tuple[date, date, date]],
+    stats_filter: StatisticsFilters,
+    account_service: AccountServiceProtocol,
+) -> dict[int, list[CreditPeriodTotals]]:
+    """Calculate card month totals honouring the statistics filter."""
+    periods = [
+        CreditPeriod(
+            start=_date_to_aware(range_start),
+            end=_date_to_aware(range_end, end_of_day=True),
         )
-        .annotate(month=TruncMonth('receipt_date'))
-        .values('month', 'operation_type')
-        .annotate(total=Sum('total_sum'))
+        for _month_date, range_start, range_end in month_ranges
+    ]
+    transaction_filter, receipt_filter = _card_operation_filters(
+        cards,
+        stats_filter,
     )
-
-    expenses_dict, receipts_dict = _build_expenses_receipts_dicts(
-        expenses_by_month,
-        receipts_by_month,
+    return account_service.get_credit_cards_period_totals(
+        {card.pk: periods for card in cards},
+        transaction_filter=transaction_filter,
+        receipt_filter=receipt_filter,
     )
 
-    months: list[CardMonthDict] = []
-    history: list[CardHistoryDict] = []
 
-    for month_date, _range_start, _range_end in month_ranges:
-        month_data, final_debt = _build_single_card_month(
-            month_date,
-            expenses_dict,
-            receipts_dict,
-            card,
+def _cards_months_blocks(
+    cards: Sequence[Account],
+    today: date,
+    stats_filter: StatisticsFilters,
+    account_service: AccountServiceProtocol,
+) -> dict[int, tuple[list[CardMonthDict], list[CardHistoryDict]]]:
+    """Build months data blocks for several cards.
+
+    Unfiltered months are read from stored credit card cycles; filtered
+    ones are calculated for every card and month with one batched query.
+
+    Args:
+        cards: Credit card accounts.
+        today: Current date.
+        stats_filter: Statistics filter parameters.
+        account_service: Account service for credit card calculations.
+
+    Returns:
+        Dictionary mapping card id to (months, history).
+    """
+    now = timezone.now()
+    month_ranges = _month_ranges_for_filter(today, stats_filter)
+    if not cards or not month_ranges:
+        return {card.pk: ([], []) for card in cards}
+
+    totals = (
+        _cards_cycle_totals(cards, month_ranges, account_service)
+        if _reads_credit_cycles(stats_filter)
+        else _cards_filtered_totals(
+            cards,
+            month_ranges,
+            stats_filter,
             account_service,
-            now,
         )
-        months.append(month_data)
+    )
 
-        history.append(
-            {
-                'month': str(month_data['month']),
-                'debt': month_data['debt_for_month'],
-                'final_debt': final_debt,
-                'grace_end': month_data['grace_end'].strftime('%d.%m.%Y'),
-                'is_overdue': month_data['is_overdue'],
-            },
-        )
+    blocks: dict[int, tuple[list[CardMonthDict], list[CardHistoryDict]]] = {}
+    for card in cards:
+        months: list[CardMonthDict] = []
+        history: list[CardHistoryDict] = []
+
+        for (month_date, _range_start, _range_end), month_totals in zip(
+            month_ranges,
+            totals[card.pk],
+            strict=True,
+        ):
+            month_data, final_debt = _build_single_card_month(
+                month_date,
+                month_totals,
+                card,
+                account_service,
+                now,
+            )
+            months.append(month_data)
+
+            history.append(
+                {
+                    'month': str(month_data['month']),
+                    'debt': month_data['debt_for_month'],
+                    'final_debt': final_debt,
+                    'grace_end': month_data['grace_end'].strftime('%d.%m.%Y'),
+                    'is_overdue': month_data['is_overdue'],
+                },
+            )
 
-    return months, history
+        blocks[card.pk] = (months, history)
+    return blocks
 
 
-def _collect_card_payments(
+def _card_months_block(
     card: Account,
+    today: date,
+    stats_filter: StatisticsFilters,
+    account_service: AccountServiceProtocol,
+) -> tuple[list[CardMonthDict], list[CardHistoryDict]]:
+    """Build months data block for card."""
+    return _cards_months_blocks(
+        [card],
+        today,
+        stats_filter,
+        account_service,
+    )[card.pk]
+
+
+def _collect_cards_payments(
+    cards: Sequence[Account],
     period_start: date,
     period_end: date,
-) -> list[PaymentItemDict]:
-    """Collect all credit-card repayments in the period.
+) -> dict[int, list[PaymentItemDict]]:
+    """Collect all credit-card repayments in the period for several cards.
 
     Includes both TransferMoneyLog entries (canonical repayments) and
     income transactions, since users sometimes record repayments as
     income rather than inter-account transfers.
     """
-    transfers = list(
-        TransferMoneyLog.objects.filter(
-            user=card.user,
-            to_account=card,
-            exchange_date__date__gte=period_start,
-            exchange_date__date__lte=period_end,
-        ).values('amount', 'exchange_date'),
-    )
-    income_txns = list(
-        Transaction.objects.filter(
-            user=card.user,
-            account=card,
-            type=TransactionType.INCOME,
-            date__date__gte=period_start,
-            date__date__lte=period_end,
-        ).values('amount', 'date'),
+    payments: dict[int, list[PaymentItemDict]] = {card.pk: [] for card in cards}
+    if not cards:
+        return payments
+
+    owners = reduce(
+        or_,
+        (Q(account_id=card.pk, user_id=card.user_id) for card in cards),
     )
-    payments: list[PaymentItemDict] = [
-        {'amount': Decimal(str(item['amount'])), 'date': item['exchange_date']}
-        for item in transfers
-    ]
-    payments.extend(
-        {'amount': Decimal(str(item['amount'])), 'date': item['date']}
-        for item in income_txns
+    transfer_owners = reduce(
+        or_,
+        (Q(to_account_id=card.pk, user_id=card.user_id) for card in cards),
     )
+    # Aware bounds instead of ``__date`` lookups keep the date indexes
+    # usable; casting the column scans the whole table.
+    starts = timezone.make_aware(datetime.combine(period_start, time.min))
+    ends = timezone.make_aware(datetime.combine(period_end, time.max))
+    transfers = TransferMoneyLog.objects.filter(
+        transfer_owners,
+        exchange_date__range=(starts, ends),
+    ).values('to_account_id', 'amount', 'exchange_date')
+    income_txns = Transaction.objects.filter(
+        owners,
+        type=TransactionType.INCOME,
+        date__range=(starts, ends),
+    ).values('account_id', 'amount', 'date')
+
+    for item in transfers:
+        payments[item['to_account_id']].append(
+            {
+                'amount': Decimal(str(item['amount'])),
+                'date': item['exchange_date'],
+            },
+        )
+    for txn in income_txns:
+        payments[txn['account_id']].append(
+            {'amount': Decimal(str(txn['amount'])), 'date': txn['date']},
+        )
     return payments
 
 
+def _collect_card_payments(
+    card: Account,
+    period_start: date,
+    period_end: date,
+) -> list[PaymentItemDict]:
+    """Collect all credit-card repayments in the period."""
+    return _collect_cards_payments([card], period_start, period_end)[card.pk]
+
+
 def _pre_period_debt_for_card(
     card: Account,
     payments: list[PaymentItemDict],
@@ -751,21 +855,44 @@ def _apply_payments_to_months(
     payments: list[PaymentItemDict],
     pre_period_debt: float = 0.0,
 ) -> None:
-    for m in months:
+    """Distribute repayments over credit-card months.
+
+    Payments made up to a month's grace end first cover the pre-period
+    debt and the debt of months with an earlier grace end; the rest goes
+    to the month itself. Months and payments are swept once in grace-end
+    order with running (prefix) sums, so the cost is O((M + P) log).
+
+    Args:
+        months: Card months, updated in place.
+        payments: Repayments in the tracked period.
+        pre_period_debt: Debt that existed before the tracked period.
+    """
+    ordered_payments = sorted(payments, key=lambda p: p['date'])
+    ordered_months = sorted(months, key=lambda m: m['grace_end'])
+
+    paid_before_due = 0.0
+    payment_index = 0
+    prior_debt = pre_period_debt
+    prior_index = 0
+
+    for m in ordered_months:
+        grace_end = m['grace_end']
+        while (
+            payment_index < len(ordered_payments)
+            and ordered_payments[payment_index]['date'] <= grace_end
+        ):
+            paid_before_due += float(ordered_payments[payment_index]['amount'])
+            payment_index += 1
+        while ordered_months[prior_index]['grace_end'] < grace_end:
+            prior_debt += float(ordered_months[prior_index]['debt_for_month'])
+            prior_index += 1
+
         debt = float(m['debt_for_month'])
         if debt <= constants.ZERO:
             m['payments_made'] = constants.ZERO
             m['remaining_debt'] = constants.ZERO
             m['is_paid'] = True
             continue
-        paid_before_due = sum(
-            float(p['amount']) for p in payments if p['date'] <= m['grace_end']
-        )
-        prior_debt = pre_period_debt + sum(
-            float(prev['debt_for_month'])
-            for prev in months
-            if prev['grace_end'] < m['grace_end']
-        )
         available_for_month = max(paid_before_due - prior_debt, constants.ZERO)
         paid = min(available_for_month, debt)
         m['payments_made'] = paid
@@ -887,6 +1014,7 @@ def _payment_schedule_remaining_debt(
     )
 
 
+@timed()
 def compute_total_payment_schedule_debt(
     accounts: QuerySet[Account],
     account_service: AccountServiceProtocol,
@@ -912,20 +1040,27 @@ def compute_total_payment_schedule_debt(
     stats_filter = StatisticsFilters()
     period_start, period_end = stats_filter.date_range(today)
 
-    credit_cards = accounts.filter(
-        type_account__in=constants.CREDIT_ACCOUNT_TYPES,
+    credit_cards = list(
+        accounts.filter(
+            type_account__in=constants.CREDIT_ACCOUNT_TYPES,
+        ).select_related('bank'),
+    )
+    blocks = _cards_months_blocks(
+        credit_cards,
+        today,
+        stats_filter,
+        account_service=account_service,
+    )
+    payments_by_card = _collect_cards_payments(
+        credit_cards,
+        period_start,
+        period_end,
     )
 
     total = Decimal(str(constants.ZERO))
     for card in credit_cards:
-        months, history = _card_months_block(
-            card,
-            today,
-            stats_filter,
-            account_service=account_service,
-        )
-
-        payments = _collect_card_payments(card, period_start, period_end)
+        months, history = blocks[card.pk]
+        payments = payments_by_card[card.pk]
         pre_period_debt = _pre_period_debt_for_card(card, payments, months)
         _apply_payments_to_months(months, payments, pre_period_debt)
         schedule = _build_payment_schedule(months, history, card)
@@ -944,28 +1079,40 @@ def _credit_cards_block(
     today_month = today.replace(day=1)
     period_start, period_end = stats_filter.date_range(today)
 
-    credit_cards = accounts.filter(
-        type_account__in=constants.CREDIT_ACCOUNT_TYPES,
+    credit_cards = list(
+        accounts.filter(
+            type_account__in=constants.CREDIT_ACCOUNT_TYPES,
+        ).select_related('bank'),
+    )
+    blocks = _cards_months_blocks(
+        credit_cards,
+        today,
+        stats_filter,
+        account_service=account_service,
+    )
+    payments_by_card = _collect_cards_payments(
+        credit_cards,
+        period_start,
+        period_end,
+    )
+    debts_now = account_service.get_credit_cards_period_totals(
+        {card.pk: [CreditPeriod()] for card in credit_cards},
+    )
+    grace_infos = account_service.calculate_grace_periods_info(
+        credit_cards,
+        today_month,
     )
 
     for card in credit_cards:
-        debt_now = account_service.get_credit_card_debt(card)
-        months, history = _card_months_block(
-            card,
-            today,
-            stats_filter,
-            account_service=account_service,
-        )
+        debt_now = debts_now[card.pk][0].debt
+        months, history = blocks[card.pk]
 
-        payments = _collect_card_payments(card, period_start, period_end)
+        payments = payments_by_card[card.pk]
         pre_period_debt = _pre_period_debt_for_card(card, payments, months)
         _apply_payments_to_months(months, payments, pre_period_debt)
         schedule = _build_payment_schedule(months, history, card)
 
-        current_info = account_service.calculate_grace_period_info(
-            card,
-            today_month,
-        )
+        current_info = grace_infos.get(card.pk, {})
         current_info['debt_for_month'] = Decimal(
             str(
                 max(
@@ -1014,6 +1161,7 @@ def _credit_cards_block(
 # ---------------------------------------------------------------------------
 
 
+@timed()
 def get_user_detailed_statistics(
     user: User,
     container: 'ApplicationContainer',
@@ -1033,15 +1181,66 @@ def get_user_detailed_statistics(
     Returns:
         Словарь с детальной статистикой пользователя
     """
-    cache_key = get_user_detailed_statistics_cache_key(
-        user.pk,
-        stats_filter.cache_suffix,
+    return cached_statistics(
+        *_detailed_statistics_cache(user, stats_filter),
+        lambda: _build_user_detailed_statistics(
+            user,
+            container,
+            stats_filter,
+            request,
+            members,
+        ),
+        timeout=600,
+        metric='detailed_statistics',
     )
-    cached_stats = cache.get(cache_key)
 
-    if cached_stats is not None:
-        return cached_stats  # type: ignore[no-any-return]
 
+async def aget_user_detailed_statistics(
+    user: User,
+    container: 'ApplicationContainer',
+    stats_filter: StatisticsFilters,
+    request: Any | None = None,
+    members: list[User] | None = None,
+) -> UserDetailedStatisticsDict:
+    """Асинхронный вариант ``get_user_detailed_statistics``.
+
+    Свежая статистика читается из кеша одним запросом, недостающая
+    собирается в пуле виджетов.
+    """
+    return await acached_statistics(
+        *_detailed_statistics_cache(user, stats_filter),
+        functools.partial(
+            get_user_detailed_statistics,
+            user,
+            container,
+            stats_filter,
+            request,
+            members,
+        ),
+        metric='detailed_statistics',
+    )
+
+
+def _detailed_statistics_cache(
+    user: User,
+    stats_filter: StatisticsFilters,
+) -> tuple[str, StatisticsScope]:
+    return (
+        get_user_detailed_statistics_cache_key(
+            user.pk,
+            stats_filter.cache_suffix,
+        ),
+        StatisticsScope(user.pk, (*STATISTICS_DOMAINS, DOMAIN_BUDGETS)),
+    )
+
+
+def _build_user_detailed_statistics(
+    user: User,
+    container: 'ApplicationContainer',
+    stats_filter: StatisticsFilters,
+    request: Any | None,
+    members: list[User] | None,
+) -> UserDetailedStatisticsDict:
     now = timezone.now()
     today = now.date()
     period_start, period_end = stats_filter.date_range(today)
@@ -1204,7 +1403,7 @@ def get_user_detailed_statistics(
         set(account_choices.values_list('currency', flat=True)),
     )
 
-    stats = {
+    return {
         'months_data': months_data,
         'budgets_data': budgets_data,
         'top_expense_categories': top_expense_categories,
@@ -1214,7 +1413,7 @@ def get_user_detailed_statistics(
         'top_receipt_products': top_receipt_products,
         'top_receipt_sellers': top_receipt_sellers,
         'average_receipts_by_month': average_receipts_by_month,
-        'income_expense': income_expense,
+        'income_expense': income_expense,  # type: ignore[typeddict-item]
         'income_expense_page': income_expense_page,
         'transfer_money_log': transfer_money_log,
         'transfer_money_log_page': _paginate(
@@ -1240,10 +1439,6 @@ def get_user_detailed_statistics(
         'payment_calendar': payment_calendar,
     }
 
-    cache.set(cache_key, stats, 600)
-
-    return stats  # type: ignore[return-value]
-
 
 __all__ = [
     'CardHistoryDict',
@@ -1259,12 +1454,14 @@ __all__ = [
     '_apply_payments_to_months',
     '_balances_and_delta',
     '_build_chart',
-    '_build_expenses_receipts_dicts',
     '_build_payment_schedule',
     '_build_single_card_month',
     '_calculate_grace_period_end',
     '_card_months_block',
+    '_card_operation_filters',
+    '_cards_months_blocks',
     '_collect_card_payments',
+    '_collect_cards_payments',
     '_credit_card_utilization_chart',
     '_credit_cards_block',
     '_credit_cards_summary',
@@ -1,6 +1,7 @@
 """Celery tasks for user-related async operations."""
 
 import logging
+import time
 from datetime import datetime
 from decimal import Decimal
 from difflib import SequenceMatcher
@@ -13,7 +14,12 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from config.containers import ApplicationContainer
+from hasta_la_vista_money.core.metrics import observe_statement_rows
 from hasta_la_vista_money.finance_account.models import Account
+from hasta_la_vista_money.finance_account.signals import (
+    deferred_credit_cycle_refresh,
+)
+from hasta_la_vista_money.reports.services.aggregation import budget_charts
 from hasta_la_vista_money.transactions.models import (
     Category,
     Transaction,
@@ -23,6 +29,7 @@ from hasta_la_vista_money.users.models import (
     BankStatementCandidate,
     BankStatementRow,
     BankStatementUpload,
+    User,
 )
 from hasta_la_vista_money.users.services.bank_statement import (
     BankStatementParseError,
@@ -31,9 +38,21 @@ from hasta_la_vista_money.users.services.bank_statement import (
 from hasta_la_vista_money.users.services.bank_statement_reconciliation import (
     BankStatementReconciliationService,
 )
+from hasta_la_vista_money.users.services.cache_invalidation import (
+    deferred_statistics_invalidation,
+)
+from hasta_la_vista_money.users.services.cache_prewarm import (
+    release_statistics_prewarm,
+)
 from hasta_la_vista_money.users.services.category_classifier import (
     CategoryClassifier,
 )
+from hasta_la_vista_money.users.services.dashboard_analytics import (
+    get_period_comparison,
+)
+from hasta_la_vista_money.users.services.monthly_statistics_service import (
+    get_dashboard_summary_statistics,
+)
 from hasta_la_vista_money.users.services.pii_stripper import strip_pii
 
 logger = logging.getLogger(__name__)
@@ -51,6 +70,29 @@ cleanup_expired_bank_statements = shared_task(
 )(_cleanup_expired_bank_statements)
 
 
+@shared_task(  # type: ignore[untyped-decorator]
+    name='users.warm_statistics_cache',
+    ignore_result=True,
+)
+def warm_statistics_cache(user_id: int) -> None:
+    """Recompute the user's dashboard and default report payloads.
+
+    Payloads still valid in cache are left as they are, so warming a
+    user whose data did not change costs only cache reads.
+
+    Args:
+        user_id: ID of the user whose caches are warmed.
+    """
+    # Released first so that changes made while warming queue another run.
+    release_statistics_prewarm(user_id)
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    get_dashboard_summary_statistics(user, ApplicationContainer())
+    get_period_comparison(user, 'month')
+    budget_charts(user, 'y')
+
+
 @shared_task(bind=True, max_retries=3)  # type: ignore[untyped-decorator]
 def process_bank_statement_task(
     self: Any,
@@ -88,9 +130,15 @@ def process_bank_statement_task(
         classifier = ApplicationContainer().users.category_classifier()
 
         logger.info('Processing upload: %s', upload.pdf_file.path)
+        started = time.perf_counter()
         parser = BankStatementParser(upload.pdf_file.path)
         parse_result = parser.parse()
         transactions = parse_result.transactions
+        observe_statement_rows(
+            'parse',
+            len(transactions),
+            time.perf_counter() - started,
+        )
 
         upload.total_transactions = len(transactions)
         upload.save(update_fields=['total_transactions'])
@@ -103,11 +151,21 @@ def process_bank_statement_task(
             .distinct(),
         )
 
-        income_count, expense_count, skipped_count = _process_transactions(
-            upload=upload,
-            transactions=transactions,
-            classifier=classifier,
-            existing_categories=existing_categories,
+        started = time.perf_counter()
+        with (
+            deferred_statistics_invalidation(),
+            deferred_credit_cycle_refresh(),
+        ):
+            income_count, expense_count, skipped_count = _process_transactions(
+                upload=upload,
+                transactions=transactions,
+                classifier=classifier,
+                existing_categories=existing_categories,
+            )
+        observe_statement_rows(
+            'import',
+            len(transactions),
+            time.perf_counter() - started,
         )
 
         upload.account.refresh_from_db(fields=['balance'])
@@ -249,7 +307,7 @@ def _process_transactions(
                 type_value = TransactionType.EXPENSE
                 balance_change = -abs_amount
 
-            if _is_exact_duplicate(
+            if is_exact_duplicate(
                 account=upload.account,
                 source_ref=source_ref,
                 source_file_hash=upload.file_hash,
@@ -259,7 +317,7 @@ def _process_transactions(
                 created = False
                 candidate = None
             else:
-                candidates = _find_probable_duplicates(
+                candidates = find_probable_duplicates(
                     account=upload.account,
                     user=upload.user,
                     type_value=type_value,
@@ -368,13 +426,18 @@ def _process_transactions(
     return income_count, expense_count, skipped_count
 
 
-def _is_exact_duplicate(
+def is_exact_duplicate(
     *,
     account: Account,
     source_ref: str | None,
     source_file_hash: str,
     source_row_position: int,
 ) -> bool:
+    """Проверить, импортирована ли уже эта строка выписки.
+
+    Строка совпадает по ``source_ref`` банка, а без него по хэшу файла
+    и номеру строки.
+    """
     if source_ref:
         return bool(
             Transaction.objects.filter(
@@ -460,7 +523,7 @@ def _classify_category(
         return FALLBACK_CATEGORY
 
 
-def _find_probable_duplicates(
+def find_probable_duplicates(
     *,
     account: Account,
     user: Any,
@@ -471,6 +534,10 @@ def _find_probable_duplicates(
     description: str,
     current_file_hash: str,
 ) -> list[Transaction]:
+    """Найти операции из других файлов с той же суммой и датой.
+
+    Кандидаты упорядочены по сходству описания, самые похожие первыми.
+    """
     queryset = Transaction.objects.filter(
         account=account,
         user=user,
@@ -11,6 +11,7 @@ from unittest.mock import MagicMock, patch
 import pandas as pd
 from django.contrib.auth.models import Group
 from django.contrib.messages import get_messages
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase
 from django.urls import reverse
@@ -474,6 +475,7 @@ class TestBankStatementReconciliationView(TestCase):
     fixtures: list[str] = ['users.yaml']
 
     def setUp(self) -> None:
+        cache.clear()
         self.user: User = User.objects.get(pk=1)
         self.other_user: User = User.objects.get(pk=2)
         self.client = Client()
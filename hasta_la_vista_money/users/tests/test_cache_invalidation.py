@@ -0,0 +1,320 @@
+"""Tests for coalesced, scoped statistics cache invalidation and pre-warm."""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, cast
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from config.containers import ApplicationContainer
+from hasta_la_vista_money.budget.models import Planning
+from hasta_la_vista_money.finance_account.factories import AccountFactory
+from hasta_la_vista_money.services.caching import cache_outcomes
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    Transaction,
+    TransactionType,
+)
+from hasta_la_vista_money.users.factories import UserFactory
+from hasta_la_vista_money.users.services.cache import (
+    DOMAIN_RECEIPTS,
+    DOMAIN_TRANSACTIONS,
+    StatisticsScope,
+    acached_statistics,
+    cached_statistics,
+    invalidate_statistics_tags,
+    invalidate_users_detailed_statistics_cache,
+    statistics_change_tags,
+    statistics_user_tag,
+)
+from hasta_la_vista_money.users.services.cache_invalidation import (
+    deferred_statistics_invalidation,
+    schedule_statistics_invalidation,
+)
+from hasta_la_vista_money.users.services.dashboard_analytics import (
+    get_period_comparison,
+)
+from hasta_la_vista_money.users.services.monthly_statistics_service import (
+    _dashboard_summary_window,
+    get_dashboard_summary_statistics,
+)
+from hasta_la_vista_money.users.tasks import warm_statistics_cache
+
+if TYPE_CHECKING:
+    from hasta_la_vista_money.finance_account.models import Account
+    from hasta_la_vista_money.users.models import User
+
+TAG_INVALIDATION = (
+    'hasta_la_vista_money.users.services.cache_invalidation.'
+    'invalidate_statistics_tags'
+)
+SUMMARY_WINDOW = (
+    'hasta_la_vista_money.users.services.monthly_statistics_service.'
+    '_dashboard_summary_window'
+)
+PREWARM_QUEUE = (
+    'hasta_la_vista_money.users.tasks.warm_statistics_cache.apply_async'
+)
+JANUARY = datetime(2026, 1, 10, tzinfo=timezone.get_current_timezone())
+
+
+class StatisticsCacheInvalidationTest(TestCase):
+    """Invalidation is deduplicated and flushed once per commit."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = cast('User', UserFactory())
+            self.other_user = cast('User', UserFactory())
+            self.account = cast('Account', AccountFactory(user=self.user))
+            self.category = Category.objects.create(
+                user=self.user,
+                name='Еда',
+                type=TransactionType.EXPENSE,
+            )
+
+    def _expense(self) -> Transaction:
+        return Transaction.objects.create(
+            user=self.user,
+            account=self.account,
+            category=self.category,
+            type=TransactionType.EXPENSE,
+            amount=Decimal('10.00'),
+            date=JANUARY,
+        )
+
+    def _expense_tags(self, *moments: datetime) -> set[str]:
+        return statistics_change_tags(
+            self.user.pk,
+            DOMAIN_TRANSACTIONS,
+            moments,
+        )
+
+    def test_writes_in_one_transaction_flush_once(self) -> None:
+        with (
+            patch(TAG_INVALIDATION) as invalidate,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            for _ in range(5):
+                self._expense()
+            schedule_statistics_invalidation(self.other_user.pk)
+
+        invalidate.assert_called_once_with(
+            {
+                *self._expense_tags(JANUARY),
+                statistics_user_tag(self.other_user.pk),
+            },
+        )
+
+    def test_rolled_back_savepoint_keeps_outer_flush(self) -> None:
+        with (
+            patch(TAG_INVALIDATION) as invalidate,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            try:
+                with transaction.atomic():
+                    self._expense()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            schedule_statistics_invalidation(self.other_user.pk)
+
+        invalidate.assert_called_once()
+        self.assertIn(
+            statistics_user_tag(self.other_user.pk),
+            invalidate.call_args.args[0],
+        )
+
+    def test_deferred_block_flushes_on_exit(self) -> None:
+        with patch(TAG_INVALIDATION) as invalidate:
+            with (
+                self.captureOnCommitCallbacks(execute=True),
+                deferred_statistics_invalidation(),
+            ):
+                for _ in range(3):
+                    with transaction.atomic():
+                        self._expense()
+                invalidate.assert_not_called()
+
+            invalidate.assert_called_once_with(self._expense_tags(JANUARY))
+
+    def test_moved_transaction_invalidates_both_months(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            expense = self._expense()
+        march = JANUARY.replace(month=3)
+
+        with (
+            patch(TAG_INVALIDATION) as invalidate,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            expense.date = march
+            expense.save()
+
+        invalidate.assert_called_once_with(
+            self._expense_tags(JANUARY, march),
+        )
+
+    def test_plan_change_drops_dashboard_summary(self) -> None:
+        container = ApplicationContainer()
+        get_dashboard_summary_statistics(self.user, container)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Planning.objects.create(
+                user=self.user,
+                category=self.category,
+                date=timezone.localdate().replace(day=1),
+                amount=Decimal('500.00'),
+            )
+        with patch(SUMMARY_WINDOW, wraps=_dashboard_summary_window) as build:
+            get_dashboard_summary_statistics(self.user, container)
+
+        build.assert_called_once()
+
+
+class StatisticsCacheInvalidationTransactionTest(TransactionTestCase):
+    """A rolled back transaction does not swallow later flushes."""
+
+    def test_commit_after_rolled_back_transaction_flushes(self) -> None:
+        user = cast('User', UserFactory())
+
+        with patch(TAG_INVALIDATION) as invalidate:
+            try:
+                with transaction.atomic():
+                    schedule_statistics_invalidation(user.pk)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            with transaction.atomic():
+                schedule_statistics_invalidation(user.pk)
+
+        invalidate.assert_called_once_with({statistics_user_tag(user.pk)})
+
+
+class ScopedStatisticsCacheTest(TestCase):
+    """Cached payloads survive changes outside their scope."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = cast('User', UserFactory())
+        self.scope = StatisticsScope(
+            self.user.pk,
+            (DOMAIN_TRANSACTIONS,),
+            date(2026, 3, 1),
+            date(2026, 3, 31),
+        )
+        self.computed = 0
+
+    def _compute(self) -> int:
+        self.computed += 1
+        return self.computed
+
+    def _read(self) -> int:
+        return cached_statistics(
+            'test_scoped_payload',
+            self.scope,
+            self._compute,
+            timeout=60,
+            metric='test_scoped_payload',
+        )
+
+    def _change(self, domain: str, moment: date) -> None:
+        invalidate_statistics_tags(
+            statistics_change_tags(self.user.pk, domain, [moment]),
+        )
+
+    def test_change_outside_scope_keeps_payload(self) -> None:
+        self._read()
+        self._change(DOMAIN_TRANSACTIONS, date(2023, 3, 15))
+        self._change(DOMAIN_RECEIPTS, date(2026, 3, 15))
+
+        self.assertEqual(self._read(), 1)
+        self.assertEqual(cache_outcomes()['test_scoped_payload']['hit'], 1)
+
+    def test_change_inside_scope_recomputes(self) -> None:
+        self._read()
+        self._change(DOMAIN_TRANSACTIONS, date(2026, 3, 15))
+
+        self.assertEqual(self._read(), 2)
+
+    def test_user_invalidation_drops_every_payload(self) -> None:
+        self._read()
+        invalidate_users_detailed_statistics_cache([self.user.pk])
+
+        self.assertEqual(self._read(), 2)
+
+    def test_async_hit_reads_cache_once(self) -> None:
+        self._read()
+
+        with patch.object(cache, 'get_many', wraps=cache.get_many) as read:
+            value = async_to_sync(acached_statistics)(
+                'test_scoped_payload',
+                self.scope,
+                self._read,
+                metric='test_async_payload',
+            )
+
+        self.assertEqual(value, 1)
+        read.assert_called_once()
+
+    def test_back_dated_edit_keeps_period_comparison(self) -> None:
+        account = cast('Account', AccountFactory(user=self.user))
+        category = Category.objects.create(
+            user=self.user,
+            name='Еда',
+            type=TransactionType.EXPENSE,
+        )
+        get_period_comparison(self.user, 'month')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Transaction.objects.create(
+                user=self.user,
+                account=account,
+                category=category,
+                type=TransactionType.EXPENSE,
+                amount=Decimal('10.00'),
+                date=timezone.now() - timedelta(days=3 * 365),
+            )
+
+        with self.assertNumQueries(0):
+            get_period_comparison(self.user, 'month')
+
+
+@override_settings(STATISTICS_PREWARM_ENABLED=True)
+class StatisticsPrewarmTest(TestCase):
+    """Invalidation queues one debounced cache warm-up per user."""
+
+    def setUp(self) -> None:
+        with patch(PREWARM_QUEUE), self.captureOnCommitCallbacks(execute=True):
+            self.user = cast('User', UserFactory())
+            self.account = cast('Account', AccountFactory(user=self.user))
+        cache.clear()
+
+    def _deposit(self) -> None:
+        self.account.balance += Decimal('1.00')
+        self.account.save()
+
+    def test_repeated_flushes_queue_one_warm_up(self) -> None:
+        with patch(PREWARM_QUEUE) as queue:
+            for _ in range(3):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self._deposit()
+
+        queue.assert_called_once()
+        self.assertEqual(queue.call_args.kwargs['args'], [self.user.pk])
+
+    def test_warm_up_fills_cache_and_releases_debounce(self) -> None:
+        warm_statistics_cache(self.user.pk)
+
+        with self.assertNumQueries(0):
+            get_period_comparison(self.user, 'month')
+        with (
+            patch(PREWARM_QUEUE) as queue,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            schedule_statistics_invalidation(self.user.pk)
+        queue.assert_called_once()
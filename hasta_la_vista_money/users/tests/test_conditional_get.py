@@ -0,0 +1,114 @@
+"""Tests for conditional GET of data-backed pages and APIs."""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hasta_la_vista_money.budget.models import DateList
+from hasta_la_vista_money.transactions.models import Transaction
+from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.cache_invalidation import (
+    flush_statistics_invalidation,
+)
+from hasta_la_vista_money.users.services.dashboard_widgets import (
+    WidgetResults,
+)
+
+
+class ConditionalGetTest(TestCase):
+    fixtures = [
+        'users.yaml',
+        'finance_account.yaml',
+        'categories.yaml',
+        'transactions.yaml',
+    ]
+
+    def setUp(self) -> None:
+        # Fixtures are loaded in a transaction that is never committed;
+        # drop the flush they scheduled so test writes schedule their own.
+        flush_statistics_invalidation()
+        cache.clear()
+        self.user = User.objects.get(pk=1)
+        self.client.force_login(self.user)
+        self.url = reverse('users:dashboard_data')
+
+    def _revalidate(self, url: str, etag: str, *, htmx: bool = False) -> int:
+        return self.client.get(
+            url,
+            HTTP_IF_NONE_MATCH=etag,
+            headers={'HX-Request': 'true'} if htmx else None,
+        ).status_code
+
+    def test_unchanged_data_is_not_recomputed(self) -> None:
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+        with patch(
+            'hasta_la_vista_money.users.views.dashboard.arun_widgets',
+        ) as run_widgets:
+            revalidated = self.client.get(
+                self.url,
+                HTTP_IF_NONE_MATCH=response['ETag'],
+            )
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated['ETag'], response['ETag'])
+        run_widgets.assert_not_called()
+
+    def test_data_change_issues_new_etag(self) -> None:
+        etag = self.client.get(self.url)['ETag']
+        transaction = Transaction.objects.filter(user=self.user).first()
+        assert transaction is not None
+        with self.captureOnCommitCallbacks(execute=True):
+            transaction.amount += Decimal(1)
+            transaction.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_incomplete_dashboard_is_not_cached(self) -> None:
+        with patch(
+            'hasta_la_vista_money.users.views.dashboard.arun_widgets',
+            return_value=WidgetResults(errors={'stats': 'timeout'}),
+        ):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertIn('no-store', response['Cache-Control'])
+
+    def test_budget_matrix_revalidates_only_htmx_requests(self) -> None:
+        url = reverse('budget:expense_table')
+        page = self.client.get(url)
+        partial = self.client.get(url, HTTP_HX_REQUEST='true')
+
+        self.assertFalse(page.has_header('ETag'))
+        self.assertEqual(
+            self._revalidate(url, partial['ETag'], htmx=True),
+            304,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            DateList.objects.create(user=self.user, date=date(2024, 1, 1))
+        self.assertEqual(
+            self._revalidate(url, partial['ETag'], htmx=True),
+            200,
+        )
+
+    def test_transactions_api_revalidates(self) -> None:
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.user)
+        url = reverse('api:transactions:data')
+
+        etag = api_client.get(url)['ETag']
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
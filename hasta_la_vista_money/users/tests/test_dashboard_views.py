@@ -9,20 +9,13 @@ from typing import TYPE_CHECKING, Any, cast
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
 from django.db import connection
 from django.test import RequestFactory, TestCase
 from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from core.test_helpers import setup_container_for_request
 from hasta_la_vista_money.users.models import DashboardWidget
-from hasta_la_vista_money.users.views import (
-    DashboardComparisonView,
-    DashboardDataView,
-    DashboardDrillDownView,
-)
 
 User = get_user_model()
 
@@ -173,28 +166,66 @@ class DashboardDataViewTest(TestCase):
         self.assertIn('comparison', data)
 
     def test_dashboard_data_view_requires_authentication(self) -> None:
-        request = RequestFactory().get(reverse('users:dashboard_data'))
-        request.user = AnonymousUser()
-        setup_container_for_request(request)
-        response = DashboardDataView().get(request)
-        payload = json.loads(response.content.decode())
-        self.assertEqual(response.status_code, 401)
-        self.assertEqual(payload, {'error': 'User not authenticated'})
+        self.client.logout()
+        response = self.client.get(reverse('users:dashboard_data'))
+        self.assertEqual(response.status_code, 302)
 
     @patch('hasta_la_vista_money.users.views.get_dashboard_summary_statistics')
-    def test_dashboard_data_view_handles_error(
+    def test_dashboard_data_view_isolates_widget_error(
         self,
         mock_stats: Any,
     ) -> None:
         mock_stats.side_effect = ValueError('boom')
-        request = RequestFactory().get(reverse('users:dashboard_data'))
-        request.user = self.user
-        setup_container_for_request(request)
-        response = DashboardDataView().get(request)
-        self.assertEqual(response.status_code, 500)
+        response = self.client.get(reverse('users:dashboard_data'))
+        self.assertEqual(response.status_code, 200)
         payload = json.loads(response.content.decode())
-        self.assertIn('error', payload)
-        self.assertIn('traceback', payload)
+        self.assertEqual(payload['errors'], {'stats': 'error'})
+        self.assertEqual(payload['analytics']['stats'], {})
+        self.assertIn('current', payload['comparison'])
+
+    async def test_dashboard_data_view_serves_async_client(self) -> None:
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(
+            reverse('users:dashboard_data'),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('comparison', response.json())
+
+    def test_dashboard_data_view_defers_lazy_widgets(self) -> None:
+        response = self.client.get(
+            reverse('users:dashboard_data'),
+            {'lazy': '1'},
+        )
+        data = response.json()
+        self.assertEqual(
+            data['lazy_widgets'],
+            ['expense_heatmap', 'hot_budget_categories'],
+        )
+        self.assertEqual(data['analytics']['hot_budget_categories'], [])
+
+    def test_dashboard_widget_data_view_returns_one_widget(self) -> None:
+        response = self.client.get(
+            reverse(
+                'users:dashboard_widget_data',
+                kwargs={'widget': 'expense_heatmap'},
+            ),
+            {'period': 'month'},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['widget'], 'expense_heatmap')
+        self.assertIsInstance(data['data'], list)
+
+    def test_dashboard_widget_data_view_rejects_unknown_widget(self) -> None:
+        response = self.client.get(
+            reverse(
+                'users:dashboard_widget_data',
+                kwargs={'widget': 'unknown'},
+            ),
+        )
+        self.assertEqual(response.status_code, 404)
 
     @patch('hasta_la_vista_money.users.views.get_dashboard_summary_statistics')
     def test_dashboard_data_view_does_not_clear_cached_stats(
@@ -215,14 +246,10 @@ class DashboardDataViewTest(TestCase):
             'user': self.user,
             'credit_cards_data': [],
         }
-        request = RequestFactory().get(reverse('users:dashboard_data'))
-        request.user = self.user
-        setup_container_for_request(request)
-
         with patch(
             'hasta_la_vista_money.users.views.cache.delete',
         ) as mock_delete:
-            response = DashboardDataView().get(request)
+            response = self.client.get(reverse('users:dashboard_data'))
 
         self.assertEqual(response.status_code, 200)
         mock_delete.assert_not_called()
@@ -377,13 +404,9 @@ class DashboardAnalyticsEndpointsTest(TestCase):
         )
 
     def test_dashboard_drilldown_requires_authentication(self) -> None:
-        request = self.factory.get(reverse('users:dashboard_drilldown'))
-        request.user = AnonymousUser()
-        setup_container_for_request(request)
-        response = DashboardDrillDownView().get(request)
-        payload = json.loads(response.content.decode())
-        self.assertEqual(response.status_code, 401)
-        self.assertEqual(payload, {'error': 'User not authenticated'})
+        self.client.logout()
+        response = self.client.get(reverse('users:dashboard_drilldown'))
+        self.assertEqual(response.status_code, 302)
 
     @patch('hasta_la_vista_money.users.views.get_period_comparison')
     def test_dashboard_comparison_returns_data(
@@ -403,10 +426,6 @@ class DashboardAnalyticsEndpointsTest(TestCase):
         )
 
     def test_dashboard_comparison_requires_authentication(self) -> None:
-        request = self.factory.get(reverse('users:dashboard_comparison'))
-        request.user = AnonymousUser()
-        setup_container_for_request(request)
-        response = DashboardComparisonView().get(request)
-        payload = json.loads(response.content.decode())
-        self.assertEqual(response.status_code, 401)
-        self.assertEqual(payload, {'error': 'User not authenticated'})
+        self.client.logout()
+        response = self.client.get(reverse('users:dashboard_comparison'))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,289 @@
+"""Tests for concurrent dashboard widget computation."""
+
+import threading
+from decimal import Decimal
+from typing import TYPE_CHECKING, cast
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from hasta_la_vista_money.core.spans import collect_spans, span
+from hasta_la_vista_money.finance_account.factories import AccountFactory
+from hasta_la_vista_money.system.services.query_budget import record_queries
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    Transaction,
+    TransactionType,
+)
+from hasta_la_vista_money.users.factories import UserFactory
+from hasta_la_vista_money.users.models import User
+from hasta_la_vista_money.users.services.dashboard_widgets import (
+    WIDGET_FAILURE_ERROR,
+    WIDGET_TIMEOUT_ERROR,
+    WidgetProvider,
+    arun_widgets,
+    run_widgets,
+    shutdown_widget_pool,
+)
+from hasta_la_vista_money.users.views import DashboardDataView
+
+if TYPE_CHECKING:
+    from hasta_la_vista_money.finance_account.models import Account
+
+CLOSE_OLD_CONNECTIONS = (
+    'hasta_la_vista_money.users.services.dashboard_widgets.'
+    'close_old_connections'
+)
+PERIOD_COMPARISON = 'hasta_la_vista_money.users.views.get_period_comparison'
+
+
+def _fail() -> None:
+    raise ValueError('boom')
+
+
+@override_settings(DASHBOARD_WIDGET_WORKERS=4)
+class RunWidgetsTest(SimpleTestCase):
+    """Widgets run concurrently and fail independently."""
+
+    def test_widgets_run_concurrently(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        results = run_widgets(
+            {
+                'first': WidgetProvider(lambda: barrier.wait() + 1),
+                'second': WidgetProvider(lambda: barrier.wait() + 1),
+            },
+        )
+
+        self.assertEqual(results.errors, {})
+        self.assertEqual(sorted(results.data.values()), [1, 2])
+
+    def test_failure_and_timeout_drop_only_their_widget(self) -> None:
+        release = threading.Event()
+
+        results = run_widgets(
+            {
+                'ok': WidgetProvider(lambda: 'done'),
+                'broken': WidgetProvider(_fail),
+                'slow': WidgetProvider(lambda: release.wait(5), timeout=0.05),
+            },
+        )
+        release.set()
+
+        self.assertEqual(results.data, {'ok': 'done'})
+        self.assertEqual(
+            results.errors,
+            {'broken': WIDGET_FAILURE_ERROR, 'slow': WIDGET_TIMEOUT_ERROR},
+        )
+
+    @override_settings(DASHBOARD_WIDGET_WORKERS=1)
+    def test_timed_out_queued_widget_is_cancelled(self) -> None:
+        release = threading.Event()
+        started: list[str] = []
+
+        def slow() -> None:
+            started.append('slow')
+            release.wait(5)
+
+        # A retired pool from another test may still have a live
+        # worker; start from a fresh single-thread pool.
+        shutdown_widget_pool()
+        results = run_widgets(
+            {
+                'slow': WidgetProvider(slow, timeout=0.05),
+                'queued': WidgetProvider(
+                    lambda: started.append('queued'),
+                    timeout=0.05,
+                ),
+            },
+        )
+        release.set()
+        shutdown_widget_pool(wait=True)
+
+        self.assertEqual(started, ['slow'])
+        self.assertEqual(
+            results.errors,
+            {'slow': WIDGET_TIMEOUT_ERROR, 'queued': WIDGET_TIMEOUT_ERROR},
+        )
+
+    @override_settings(DASHBOARD_WIDGET_WORKERS=1)
+    def test_stuck_widget_does_not_block_later_requests(self) -> None:
+        release = threading.Event()
+        shutdown_widget_pool()
+
+        first = run_widgets(
+            {'stuck': WidgetProvider(lambda: release.wait(5), timeout=0.05)},
+        )
+        second = run_widgets(
+            {'ok': WidgetProvider(lambda: 'done', timeout=1)},
+        )
+        release.set()
+
+        self.assertEqual(first.errors, {'stuck': WIDGET_TIMEOUT_ERROR})
+        self.assertEqual(second.data, {'ok': 'done'})
+
+    @override_settings(
+        DASHBOARD_WIDGET_WORKERS=1,
+        DASHBOARD_WIDGET_MAX_RETIRED_POOLS=0,
+    )
+    def test_pool_is_kept_once_retired_pools_reach_the_cap(self) -> None:
+        release = threading.Event()
+        shutdown_widget_pool()
+
+        first = run_widgets(
+            {'stuck': WidgetProvider(lambda: release.wait(5), timeout=0.05)},
+        )
+        second = run_widgets(
+            {'queued': WidgetProvider(lambda: 'done', timeout=0.05)},
+        )
+        release.set()
+        shutdown_widget_pool(wait=True)
+
+        self.assertEqual(first.errors, {'stuck': WIDGET_TIMEOUT_ERROR})
+        self.assertEqual(second.errors, {'queued': WIDGET_TIMEOUT_ERROR})
+
+    @override_settings(DASHBOARD_WIDGET_WORKERS=0)
+    def test_without_workers_widgets_run_inline(self) -> None:
+        caller = threading.get_ident()
+
+        results = run_widgets(
+            {'inline': WidgetProvider(threading.get_ident)},
+        )
+
+        self.assertEqual(results.data, {'inline': caller})
+
+    async def test_async_runner_isolates_failures_and_timeouts(self) -> None:
+        release = threading.Event()
+
+        results = await arun_widgets(
+            {
+                'ok': WidgetProvider(lambda: 'done'),
+                'broken': WidgetProvider(_fail),
+                'slow': WidgetProvider(lambda: release.wait(5), timeout=0.05),
+            },
+        )
+        release.set()
+
+        self.assertEqual(results.data, {'ok': 'done'})
+        self.assertEqual(
+            results.errors,
+            {'broken': WIDGET_FAILURE_ERROR, 'slow': WIDGET_TIMEOUT_ERROR},
+        )
+
+    async def test_async_runner_does_not_block_event_loop(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        results = await arun_widgets(
+            {
+                'first': WidgetProvider(lambda: barrier.wait() + 1),
+                'second': WidgetProvider(lambda: barrier.wait() + 1),
+            },
+        )
+
+        self.assertEqual(sorted(results.data.values()), [1, 2])
+
+
+@override_settings(DASHBOARD_WIDGET_WORKERS=2)
+class DashboardWidgetWorkersTest(TransactionTestCase):
+    """Widgets computed on pool threads with their own connections."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = cast('User', UserFactory())
+        account = cast('Account', AccountFactory(user=self.user))
+        self.expense = Transaction.objects.create(
+            user=self.user,
+            account=account,
+            category=Category.objects.create(
+                user=self.user,
+                name='Еда',
+                type=TransactionType.EXPENSE,
+            ),
+            type=TransactionType.EXPENSE,
+            amount=Decimal('42.00'),
+            date=timezone.now(),
+        )
+
+    def test_worker_sees_committed_data_and_recycles_connections(
+        self,
+    ) -> None:
+        caller = threading.get_ident()
+        readers: list[int] = []
+        closers: list[int] = []
+
+        def read() -> bool:
+            readers.append(threading.get_ident())
+            return Transaction.objects.filter(pk=self.expense.pk).exists()
+
+        with patch(CLOSE_OLD_CONNECTIONS) as close_old_connections:
+            close_old_connections.side_effect = lambda: closers.append(
+                threading.get_ident(),
+            )
+            results = run_widgets({'exists': WidgetProvider(read)})
+
+        self.assertEqual(results.data, {'exists': True})
+        self.assertNotEqual(readers, [caller])
+        self.assertEqual(closers, readers * 2)
+
+    def test_worker_spans_and_queries_count_for_the_caller(self) -> None:
+        def read() -> bool:
+            with span('widget.read'):
+                return Transaction.objects.filter(
+                    pk=self.expense.pk,
+                ).exists()
+
+        with record_queries() as stats, collect_spans() as spans:
+            results = run_widgets(
+                {'first': WidgetProvider(read), 'second': WidgetProvider(read)},
+            )
+
+        self.assertEqual(results.data, {'first': True, 'second': True})
+        self.assertEqual(spans.spans['widget.read'].count, 2)
+        self.assertEqual(
+            sum(
+                times
+                for sql, times in stats.fingerprints.items()
+                if 'transactions_transaction' in sql
+            ),
+            2,
+        )
+
+    def test_dashboard_isolates_slow_and_failing_widgets(self) -> None:
+        release = threading.Event()
+        build_providers = DashboardDataView.get_widget_providers
+
+        def providers(
+            view: DashboardDataView,
+            request: HttpRequest,
+            user: User,
+            period: str,
+        ) -> dict[str, WidgetProvider]:
+            built = build_providers(view, request, user, period)
+            built['stats'] = WidgetProvider(
+                lambda: release.wait(5),
+                timeout=0.05,
+            )
+            return built
+
+        self.client.force_login(self.user)
+        with (
+            patch.object(DashboardDataView, 'get_widget_providers', providers),
+            patch(PERIOD_COMPARISON, side_effect=ValueError('boom')),
+        ):
+            response = self.client.get(reverse('users:dashboard_data'))
+        release.set()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            data['errors'],
+            {'stats': WIDGET_TIMEOUT_ERROR, 'comparison': WIDGET_FAILURE_ERROR},
+        )
+        self.assertEqual(
+            [item['id'] for item in data['recent_transactions']],
+            [self.expense.pk],
+        )
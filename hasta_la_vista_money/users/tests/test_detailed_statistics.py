@@ -1,23 +1,37 @@
+import copy
+import random
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING, cast
 
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import connection
 from django.http import QueryDict
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from config.containers import ApplicationContainer
-from hasta_la_vista_money.users.services.cache import (
-    get_user_detailed_statistics_cache_key,
+from hasta_la_vista_money import constants
+from hasta_la_vista_money.budget.models import Planning
+from hasta_la_vista_money.finance_account.bank_constants import BANK_SBERBANK
+from hasta_la_vista_money.finance_account.factories import AccountFactory
+from hasta_la_vista_money.finance_account.models import Account, Bank
+from hasta_la_vista_money.transactions.models import (
+    Category,
+    Transaction,
+    TransactionType,
 )
+from hasta_la_vista_money.users.factories import UserFactory
 from hasta_la_vista_money.users.services.detailed_statistics import (
     CardMonthDict,
     PaymentItemDict,
     StatisticsFilters,
     UserDetailedStatisticsDict,
     _apply_payments_to_months,
+    _card_months_block,
+    _credit_cards_block,
     get_user_detailed_statistics,
 )
 
@@ -81,43 +95,44 @@ class GetUserDetailedStatisticsServiceTest(TestCase):
     def test_get_user_detailed_statistics_uses_cached_value(self) -> None:
         container = ApplicationContainer()
         stats_filter = StatisticsFilters()
-        cache_key = get_user_detailed_statistics_cache_key(
-            self.user.pk,
-            stats_filter.cache_suffix,
+        cache.clear()
+        first = get_user_detailed_statistics(
+            self.user,
+            container=container,
+            stats_filter=stats_filter,
         )
-        cached_stats = cast(
-            'UserDetailedStatisticsDict',
-            {
-                'months_data': [],
-                'top_expense_categories': [],
-                'top_income_categories': [],
-                'receipt_info_by_month': [],
-                'income_expense': [],
-                'transfer_money_log': [],
-                'accounts': [],
-                'balances_by_currency': {},
-                'delta_by_currency': {},
-                'chart_combined': {},
-                'user': self.user,
-                'credit_cards_data': [],
-                'statistics_filter': stats_filter,
-                'statistics_period_choices': [],
-                'statistics_account_choices': [],
-                'statistics_currency_choices': [],
-                'statistics_category_choices': [],
-                'statistics_member_choices': [],
-                'statistics_members': [self.user],
-            },
+
+        with self.assertNumQueries(0):
+            stats = get_user_detailed_statistics(
+                self.user,
+                container=container,
+                stats_filter=stats_filter,
+            )
+
+        self.assertEqual(stats['months_data'], first['months_data'])
+
+    def test_months_data_include_planned_amounts(self) -> None:
+        category = Category.objects.create(
+            user=self.user,
+            name='Planned expense',
+            type=TransactionType.EXPENSE,
         )
-        cache.set(cache_key, cached_stats, 600)
+        Planning.objects.create(
+            user=self.user,
+            category=category,
+            date=timezone.localdate().replace(day=1),
+            amount=Decimal('1500.00'),
+            planning_type=TransactionType.EXPENSE,
+        )
+        cache.clear()
 
         stats = get_user_detailed_statistics(
             self.user,
-            container=container,
-            stats_filter=stats_filter,
+            container=ApplicationContainer(),
+            stats_filter=StatisticsFilters(),
         )
 
-        self.assertEqual(stats, cached_stats)
+        self.assertEqual(stats['months_data'][-1]['planned_expenses'], 1500.0)
 
     def test_statistics_filters_include_server_side_search_fields(self) -> None:
         query = QueryDict(
@@ -227,6 +242,70 @@ class GetUserDetailedStatisticsServiceTest(TestCase):
         self.assertContains(response, 'hx-target="#statistics-results"')
 
 
+def _reference_apply_payments_to_months(
+    months: list[CardMonthDict],
+    payments: list[PaymentItemDict],
+    pre_period_debt: float = 0.0,
+) -> None:
+    """Straightforward O(M * (M + P)) allocation used as an oracle."""
+    for m in months:
+        debt = float(m['debt_for_month'])
+        if debt <= 0:
+            m['payments_made'] = 0
+            m['remaining_debt'] = 0
+            m['is_paid'] = True
+            continue
+        paid_before_due = sum(
+            float(p['amount']) for p in payments if p['date'] <= m['grace_end']
+        )
+        prior_debt = pre_period_debt + sum(
+            float(prev['debt_for_month'])
+            for prev in months
+            if prev['grace_end'] < m['grace_end']
+        )
+        available_for_month = max(paid_before_due - prior_debt, 0)
+        paid = min(available_for_month, debt)
+        m['payments_made'] = paid
+        m['remaining_debt'] = max(debt - paid, 0)
+        m['is_paid'] = m['remaining_debt'] <= 0
+
+
+def _random_card_months(
+    rng: random.Random,
+) -> tuple[list[CardMonthDict], list[PaymentItemDict], float]:
+    """Random months and payments with amounts in 0.25 steps.
+
+    Quarter steps keep float sums exact in any summation order.
+    """
+    base = timezone.make_aware(datetime.combine(date(2025, 1, 1), time.max))
+    months: list[CardMonthDict] = []
+    for _ in range(rng.randint(0, 18)):
+        grace_end = base + timedelta(days=rng.randint(0, 540))
+        months.append(
+            {
+                'month': grace_end.strftime('%m.%Y'),
+                'purchase_start': grace_end,
+                'purchase_end': grace_end,
+                'grace_end': grace_end,
+                'debt_for_month': rng.randint(-400, 4000) / 4,
+                'is_overdue': False,
+                'days_until_due': 0,
+                'payments_made': 0.0,
+                'remaining_debt': 0.0,
+                'is_paid': False,
+            },
+        )
+    payments: list[PaymentItemDict] = [
+        {
+            'amount': Decimal(rng.randint(1, 4000)) / 4,
+            'date': base + timedelta(days=rng.randint(-30, 600)),
+        }
+        for _ in range(rng.randint(0, 60))
+    ]
+    pre_period_debt = rng.choice([0.0, rng.randint(0, 2000) / 4])
+    return months, payments, pre_period_debt
+
+
 class CreditCardPaymentScheduleTest(TestCase):
     """Tests for credit card payment distribution."""
 
@@ -260,3 +339,114 @@ class CreditCardPaymentScheduleTest(TestCase):
         self.assertEqual(months[0]['payments_made'], 0.0)
         self.assertEqual(months[0]['remaining_debt'], 10000.0)
         self.assertFalse(months[0]['is_paid'])
+
+    def test_allocation_matches_reference_on_random_data(self) -> None:
+        for seed in range(300):
+            rng = random.Random(seed)  # noqa: S311
+            months, payments, pre_period_debt = _random_card_months(rng)
+            expected = copy.deepcopy(months)
+
+            _reference_apply_payments_to_months(
+                expected,
+                payments,
+                pre_period_debt,
+            )
+            _apply_payments_to_months(months, payments, pre_period_debt)
+
+            with self.subTest(seed=seed):
+                self.assertEqual(months, expected)
+
+    def test_allocation_with_shared_grace_end(self) -> None:
+        rng = random.Random(42)  # noqa: S311
+        months, payments, _pre_period_debt = _random_card_months(rng)
+        for m in months:
+            m['grace_end'] = months[0]['grace_end']
+        expected = copy.deepcopy(months)
+
+        _reference_apply_payments_to_months(expected, payments)
+        _apply_payments_to_months(months, payments)
+
+        self.assertEqual(months, expected)
+
+
+class CreditCardsBlockQueriesTest(TestCase):
+    """Tests for batched credit card statistics queries."""
+
+    def setUp(self) -> None:
+        self.user = cast('UserType', UserFactory())
+        self.bank = Bank.objects.get(code=BANK_SBERBANK)
+        self.account_service = ApplicationContainer().core.account_service()
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Покупки',
+            type=TransactionType.EXPENSE,
+        )
+
+    def _create_card(self) -> Account:
+        card = cast(
+            'Account',
+            AccountFactory(
+                user=self.user,
+                bank=self.bank,
+                type_account=constants.ACCOUNT_TYPE_CREDIT_CARD,
+                limit_credit=Decimal('50000.00'),
+                balance=Decimal('50000.00'),
+            ),
+        )
+        Transaction.objects.create(
+            user=self.user,
+            account=card,
+            category=self.category,
+            type=TransactionType.EXPENSE,
+            amount=Decimal('1500.00'),
+            date=timezone.make_aware(
+                datetime.combine(timezone.now().date(), time(hour=12)),
+            ),
+        )
+        return card
+
+    def _count_queries(self) -> int:
+        accounts = Account.objects.filter(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            _credit_cards_block(
+                accounts,
+                StatisticsFilters(),
+                self.account_service,
+            )
+        return len(queries.captured_queries)
+
+    def test_query_count_does_not_grow_with_cards(self) -> None:
+        self._create_card()
+        single_card_queries = self._count_queries()
+
+        for _ in range(3):
+            self._create_card()
+
+        self.assertEqual(self._count_queries(), single_card_queries)
+
+    def test_months_block_uses_card_totals(self) -> None:
+        card = self._create_card()
+        stats_filter = StatisticsFilters(period='month')
+
+        months, history = _card_months_block(
+            card,
+            timezone.now().date(),
+            stats_filter,
+            self.account_service,
+        )
+
+        self.assertEqual(len(months), 1)
+        self.assertEqual(months[0]['debt_for_month'], 1500.0)
+        self.assertEqual(history[0]['debt'], 1500.0)
+
+        other_category = StatisticsFilters(
+            period='month',
+            category_keys=['expense-0'],
+        )
+        months, _history = _card_months_block(
+            card,
+            timezone.now().date(),
+            other_category,
+            self.account_service,
+        )
+        self.assertEqual(months[0]['debt_for_month'], 0.0)
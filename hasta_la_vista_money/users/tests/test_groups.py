@@ -6,9 +6,10 @@ from django.contrib.auth.models import Group
 from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.http import HttpRequest, HttpResponse
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
 
+from hasta_la_vista_money.services.two_tier_cache import local_cache
 from hasta_la_vista_money.users.forms import (
     AddUserToGroupForm,
     DeleteUserFromGroupForm,
@@ -23,6 +24,8 @@ from hasta_la_vista_money.users.services.groups import (
     create_group,
     delete_group,
     get_family_groups,
+    get_family_member_ids,
+    get_family_roles,
     get_groups_not_for_user,
     get_or_create_family_invite,
     get_user_groups,
@@ -162,6 +165,59 @@ class InviteExpiryTest(TestCase):
             role=FamilyGroupMembership.Role.OWNER,
         )
 
+    def test_membership_change_refreshes_cached_roles(self) -> None:
+        get_family_roles(self.user)
+        other_group = Group.objects.create(name='OtherGroup')
+        with self.captureOnCommitCallbacks(execute=True):
+            FamilyGroupMembership.objects.create(
+                group=other_group,
+                user=self.user,
+                role=FamilyGroupMembership.Role.VIEWER,
+            )
+
+        with self.assertNumQueries(1):
+            roles = get_family_roles(self.user)
+        with self.assertNumQueries(0):
+            get_family_roles(self.user)
+        self.assertEqual(
+            roles[other_group.pk], FamilyGroupMembership.Role.VIEWER
+        )
+        self.assertEqual(get_family_member_ids(other_group.pk), [self.user.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FamilyGroupMembership.objects.filter(group=other_group).delete()
+
+        self.assertNotIn(other_group.pk, get_family_roles(self.user))
+        self.assertEqual(get_family_member_ids(other_group.pk), [])
+
+    @override_settings(TWO_TIER_CACHE_LOCAL_TIMEOUT=60)
+    def test_local_tier_keeps_roles_until_membership_commits(self) -> None:
+        local_cache.clear_local()
+        self.addCleanup(local_cache.clear_local)
+        roles = get_family_roles(self.user)
+        other_group = Group.objects.create(name='OtherGroup')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            FamilyGroupMembership.objects.create(
+                group=other_group,
+                user=self.user,
+                role=FamilyGroupMembership.Role.VIEWER,
+            )
+            # Reading before commit must not cache the new row.
+            with self.assertNumQueries(0):
+                self.assertEqual(get_family_roles(self.user), roles)
+
+        for callback in callbacks:
+            callback()
+
+        with self.assertNumQueries(1):
+            roles = get_family_roles(self.user)
+        with self.assertNumQueries(0):
+            get_family_roles(self.user)
+        self.assertEqual(
+            roles[other_group.pk], FamilyGroupMembership.Role.VIEWER
+        )
+
     def test_expired_invite_is_rejected(self) -> None:
         invite = get_or_create_family_invite(self.group, self.user)
         invite.expires_at = timezone.now() - timedelta(hours=1)
@@ -1,8 +1,10 @@
+from io import StringIO
 from typing import TYPE_CHECKING
 
 import httpx
 from django.contrib.auth import get_user_model
 from django.contrib.staticfiles.testing import StaticLiveServerTestCase
+from django.core.management import call_command
 from django.urls import reverse
 
 if TYPE_CHECKING:
@@ -51,3 +53,18 @@ class CoreLoadSmokeTest(StaticLiveServerTestCase):
                 for url in urls:
                     response = client.get(url, timeout=10.0)
                     self.assertEqual(response.status_code, 200, msg=url)
+
+    def test_dashboard_benchmark_reports_throughput(self) -> None:
+        out = StringIO()
+
+        call_command(
+            'benchmark_dashboard',
+            username=self.user.username,
+            base_url=self.live_server_url,
+            requests=6,
+            concurrency=3,
+            stdout=out,
+        )
+
+        self.assertIn('Ошибок: 0', out.getvalue())
+        self.assertIn('RPS:', out.getvalue())
@@ -74,6 +74,21 @@ class CheckAdminMiddlewareTest(TestCase):
         self.assertNotIsInstance(response, HttpResponseRedirect)
         self.assertIsInstance(response, HttpResponse)
 
+    async def test_async_chain_redirects_without_superuser(self) -> None:
+        await User.objects.all().adelete()
+
+        async def get_response(_: HttpRequest) -> HttpResponse:
+            return HttpResponse()
+
+        middleware = CheckAdminMiddleware(get_response=get_response)
+        response = await middleware(self.factory.get('/budget/'))
+
+        self.assertEqual(response.status_code, constants.REDIRECTS)
+        self.assertEqual(
+            cast('HttpResponseRedirect', response).url,
+            reverse('users:registration'),
+        )
+
     def test_no_superuser_allows_static_and_media_files(self) -> None:
         User.objects.all().delete()
 
@@ -1,7 +1,10 @@
 from typing import TYPE_CHECKING, ClassVar
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
 from hasta_la_vista_money.users.services.statistics import (
     UserStatistics,
@@ -15,6 +18,8 @@ else:
 
 User = get_user_model()
 
+ARUN_IN_WORKER = 'hasta_la_vista_money.users.services.cache.arun_in_worker'
+
 
 class GetUserStatisticsServiceTest(TestCase):
     """Tests for get_user_statistics service function."""
@@ -51,3 +56,73 @@ class GetUserStatisticsServiceTest(TestCase):
         self.assertIn('top_expense_categories', stats)
         self.assertIn('monthly_savings', stats)
         self.assertIn('last_month_savings', stats)
+
+
+class UserStatisticsViewsTest(TestCase):
+    """The statistics page and its export are served asynchronously."""
+
+    fixtures: ClassVar[list[str]] = [  # type: ignore[misc]
+        'users.yaml',
+        'finance_account.yaml',
+        'categories.yaml',
+        'transactions.yaml',
+    ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        user = User.objects.first()
+        if user is None:
+            msg: str = 'No user found in fixtures'
+            raise ValueError(msg)
+        self.user: UserType = user
+
+    def test_statistics_require_login(self) -> None:
+        for name in ('users:statistics', 'users:statistics_export'):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 302)
+
+    async def test_cached_statistics_are_served_without_rebuilding(
+        self,
+    ) -> None:
+        await self.async_client.aforce_login(self.user)
+        url = reverse('users:statistics')
+        first = await self.async_client.get(url)
+
+        with patch(ARUN_IN_WORKER) as run_in_worker:
+            second = await self.async_client.get(url)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertTemplateUsed(second, 'users/statistics.html')
+        self.assertIn('months_data', second.context)
+        run_in_worker.assert_not_called()
+
+    async def test_refresh_drops_the_cache_and_redirects(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        url = reverse('users:statistics')
+
+        with patch(
+            'hasta_la_vista_money.users.views.profile.'
+            'invalidate_user_detailed_statistics_cache',
+        ) as invalidate:
+            response = await self.async_client.get(
+                url,
+                {'refresh': '1', 'period': 'month'},
+            )
+
+        invalidate.assert_called_once_with(self.user.pk)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], f'{url}?period=month')
+
+    async def test_export_returns_csv(self) -> None:
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(
+            reverse('users:statistics_export'),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertTrue(
+            response.content.decode().startswith('Раздел,Дата/период'),
+        )
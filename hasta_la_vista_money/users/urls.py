@@ -15,6 +15,7 @@ from hasta_la_vista_money.users.views import (
     DashboardDrillDownView,
     DashboardView,
     DashboardWidgetConfigView,
+    DashboardWidgetDataView,
     ExportUserDataView,
     ListUsers,
     LoginUser,
@@ -56,6 +57,11 @@ urlpatterns = [
         DashboardDataView.as_view(),
         name='dashboard_data',
     ),
+    path(
+        'dashboard/data/<str:widget>/',
+        DashboardWidgetDataView.as_view(),
+        name='dashboard_widget_data',
+    ),
     path(
         'dashboard/widget/',
         DashboardWidgetConfigView.as_view(),
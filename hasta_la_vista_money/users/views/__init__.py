@@ -31,6 +31,7 @@ from hasta_la_vista_money.users.views.dashboard import (
     DashboardDrillDownView,
     DashboardView,
     DashboardWidgetConfigView,
+    DashboardWidgetDataView,
 )
 from hasta_la_vista_money.users.views.groups import (
     AddUserToGroupView,
@@ -64,6 +65,7 @@ __all__ = [
     'DashboardDrillDownView',
     'DashboardView',
     'DashboardWidgetConfigView',
+    'DashboardWidgetDataView',
     'DeleteUserFromGroupView',
     'ExportUserDataView',
     'GroupCreateView',
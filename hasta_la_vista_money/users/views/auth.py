@@ -5,7 +5,6 @@ from django.contrib.auth.forms import SetPasswordForm
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView, LogoutView, PasswordChangeView
 from django.contrib.messages.views import SuccessMessageMixin
-from django.core.cache import cache
 from django.forms import BaseForm
 from django.http import (
     HttpRequest,
@@ -23,11 +22,13 @@ from hasta_la_vista_money.authentication.authentication import (
     clear_auth_cookies,
     set_auth_cookies,
 )
+from hasta_la_vista_money.services.two_tier_cache import local_cache
 from hasta_la_vista_money.users.forms import (
     RegisterByInviteForm,
     RegisterUserForm,
     UserLoginForm,
 )
+from hasta_la_vista_money.users.middleware import HAS_SUPERUSER_CACHE_KEY
 from hasta_la_vista_money.users.models import (
     FamilyInvite,
     User,
@@ -200,7 +201,7 @@ class CreateUser(
     def form_valid(self, form: RegisterUserForm) -> HttpResponse:
         response = super().form_valid(form)
         register_user(form)
-        cache.delete('has_superuser')
+        local_cache.delete(HAS_SUPERUSER_CACHE_KEY)
         return response
 
 
@@ -1,23 +1,28 @@
+import asyncio
 import json
-import logging
-import traceback
 from collections.abc import Mapping
+from datetime import datetime
 from decimal import Decimal
 from operator import itemgetter
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 from urllib.parse import urlencode
 
+from asgiref.sync import sync_to_async
 from dateutil.parser import parse as parse_date
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import QuerySet, Sum
 from django.db.models.functions import TruncDate
 from django.http import (
+    Http404,
     HttpRequest,
     JsonResponse,
 )
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import add_never_cache_headers
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from django.views import View
 from django.views.generic import TemplateView
@@ -36,6 +41,17 @@ from hasta_la_vista_money.users.models import (
     DashboardWidget,
     User,
 )
+from hasta_la_vista_money.users.services.cache import (
+    DOMAIN_ACCOUNTS,
+    DOMAIN_CATEGORIES,
+    DOMAIN_TRANSACTIONS,
+    StatisticsScope,
+    cached_statistics,
+    get_dashboard_widget_cache_key,
+)
+from hasta_la_vista_money.users.services.conditional_get import (
+    conditional_on_user_data,
+)
 from hasta_la_vista_money.users.services.dashboard_analytics import (
     calculate_linear_trend,
 )
@@ -43,6 +59,11 @@ from hasta_la_vista_money.users.services.dashboard_kpis import (
     DashboardKpiDict,
     get_dashboard_month_kpis,
 )
+from hasta_la_vista_money.users.services.dashboard_widgets import (
+    WIDGET_TIMEOUT_ERROR,
+    WidgetProvider,
+    arun_widgets,
+)
 from hasta_la_vista_money.users.services.detailed_statistics import (
     DashboardSummaryStatisticsDict,
     MonthDataDict,
@@ -170,11 +191,16 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         return context
 
 
-class DashboardDataView(LoginRequiredMixin, View):
+@method_decorator(login_required, name='get')
+@method_decorator(conditional_on_user_data(), name='get')
+class DashboardDataView(View):
     """View for getting all dashboard data in JSON format.
 
     Provides JSON endpoint for dashboard widgets to fetch financial
-    data including accounts, expenses, income, and analytics.
+    data including accounts, expenses, income, and analytics. The
+    handler is async so that under ASGI widgets are computed on the
+    widget pool without holding the event loop or the single
+    thread-sensitive executor.
     """
 
     def _serialize_account(self, account: Account) -> dict[str, Any]:
@@ -349,6 +375,18 @@ class DashboardDataView(LoginRequiredMixin, View):
         Returns:
             List of Transaction dictionaries sorted by date descending.
         """
+        return cached_statistics(
+            get_dashboard_widget_cache_key(user.pk, 'recent_transactions'),
+            StatisticsScope(
+                user.pk,
+                (DOMAIN_TRANSACTIONS, DOMAIN_CATEGORIES, DOMAIN_ACCOUNTS),
+            ),
+            lambda: self._build_recent_transactions(user),
+            timeout=constants.DASHBOARD_CACHE_TIMEOUT,
+            metric='dashboard_recent_transactions',
+        )
+
+    def _build_recent_transactions(self, user: User) -> list[TransactionDict]:
         recent_expenses = (
             Transaction.objects.filter(user=user, type=TransactionType.EXPENSE)
             .select_related('category', 'account')
@@ -397,7 +435,29 @@ class DashboardDataView(LoginRequiredMixin, View):
         period_dates = get_period_dates(period_type=period)
         current_start = period_dates['current_start']
         current_end = period_dates['current_end']
+        return cached_statistics(
+            get_dashboard_widget_cache_key(user.pk, 'expense_heatmap', period),
+            StatisticsScope(
+                user.pk,
+                (DOMAIN_TRANSACTIONS,),
+                current_start.date(),
+                current_end.date(),
+            ),
+            lambda: self._build_expense_heatmap_data(
+                user,
+                current_start,
+                current_end,
+            ),
+            timeout=constants.DASHBOARD_CACHE_TIMEOUT,
+            metric='dashboard_expense_heatmap',
+        )
 
+    def _build_expense_heatmap_data(
+        self,
+        user: User,
+        current_start: datetime,
+        current_end: datetime,
+    ) -> list[list[Any]]:
         grouped_expenses = (
             Transaction.objects.filter(
                 user=user,
@@ -414,7 +474,6 @@ class DashboardDataView(LoginRequiredMixin, View):
         return [
             [item['day'].isoformat(), float(item['total'] or 0)]
             for item in grouped_expenses
-            if item['day'] is not None
         ]
 
     def _get_hot_budget_categories(
@@ -464,89 +523,171 @@ class DashboardDataView(LoginRequiredMixin, View):
             for item in hot_categories[: constants.TOP_CATEGORIES_LIMIT]
         ]
 
-    def get(
+    def _get_stats(
         self,
         request: HttpRequest,
-        *args: Any,
-        **kwargs: Any,
-    ) -> JsonResponse:
-        try:
-            request_with_container = cast('RequestWithContainer', request)
-            user = request.user
-            if not isinstance(user, User):
-                return JsonResponse(
-                    {'error': 'User not authenticated'},
-                    status=401,
-                )
-
-            period = request.GET.get('period', 'month')
-
-            widgets = DashboardWidget.objects.filter(
+        user: User,
+    ) -> dict[str, Any]:
+        request_with_container = cast('RequestWithContainer', request)
+        stats: DashboardSummaryStatisticsDict = (
+            _views_module().get_dashboard_summary_statistics(
+                user,
+                container=request_with_container.container,
+            )
+        )
+        return self._prepare_serializable_stats(stats)
+
+    def get_widget_providers(
+        self,
+        request: HttpRequest,
+        user: User,
+        period: str,
+    ) -> dict[str, WidgetProvider]:
+        """Return providers of the dashboard widgets keyed by name.
+
+        Args:
+            request: Current HTTP request.
+            user: User the dashboard is built for.
+            period: Selected comparison period.
+
+        Returns:
+            Providers of every widget; lazy ones are loaded separately
+            by the frontend.
+        """
+        return {
+            'stats': WidgetProvider(lambda: self._get_stats(request, user)),
+            'comparison': WidgetProvider(
+                lambda: _views_module().get_period_comparison(user, period),
+            ),
+            'recent_transactions': WidgetProvider(
+                lambda: self._get_recent_transactions(user),
+            ),
+            'expense_heatmap': WidgetProvider(
+                lambda: self._get_expense_heatmap_data(user, period),
+                lazy=True,
+            ),
+            'hot_budget_categories': WidgetProvider(
+                lambda: self._get_hot_budget_categories(request, user),
+                lazy=True,
+            ),
+        }
+
+    async def _visible_widgets(
+        self,
+        user: User,
+    ) -> list[Mapping[str, Any]]:
+        return [
+            widget
+            async for widget in DashboardWidget.objects.filter(
                 user=user,
                 is_visible=True,
-            ).order_by('position')
-
-            stats: DashboardSummaryStatisticsDict = (
-                _views_module().get_dashboard_summary_statistics(
-                    user,
-                    container=request_with_container.container,
-                )
             )
+            .order_by('position')
+            .values()
+        ]
 
-            serializable_stats = self._prepare_serializable_stats(
-                stats,
+    async def get(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> JsonResponse:
+        user = await request.auser()
+        if not isinstance(user, User):
+            return JsonResponse(
+                {'error': 'User not authenticated'},
+                status=401,
             )
 
-            months_data = serializable_stats.get('months_data', [])
-            trends = self._calculate_trends(months_data)
+        period = request.GET.get('period', 'month')
+        providers = self.get_widget_providers(request, user, period)
+        lazy_widgets = (
+            [name for name, provider in providers.items() if provider.lazy]
+            if request.GET.get('lazy')
+            else []
+        )
+        # The widget layout is read while the widgets are computed.
+        results, widgets = await asyncio.gather(
+            arun_widgets(
+                {
+                    name: provider
+                    for name, provider in providers.items()
+                    if name not in lazy_widgets
+                },
+            ),
+            self._visible_widgets(user),
+        )
 
-            comparison_data = _views_module().get_period_comparison(
-                user,
-                period,
+        stats = results.data.get('stats', {})
+        data = {
+            'widgets': widgets,
+            'analytics': {
+                'stats': stats,
+                'trends': self._calculate_trends(
+                    stats.get('months_data', []),
+                ),
+                'expense_heatmap': results.data.get('expense_heatmap', []),
+                'hot_budget_categories': results.data.get(
+                    'hot_budget_categories',
+                    [],
+                ),
+            },
+            'comparison': results.data.get('comparison', {}),
+            'recent_transactions': results.data.get('recent_transactions', []),
+            'lazy_widgets': lazy_widgets,
+            'errors': results.errors,
+            'click_through': {
+                'expense_list_url': _finances_url('expense'),
+                'income_list_url': _finances_url('income'),
+            },
+        }
+        response = JsonResponse(data, safe=False)
+        if results.errors:
+            add_never_cache_headers(response)
+        return response
+
+
+@method_decorator(login_required, name='get')
+@method_decorator(conditional_on_user_data(), name='get')
+class DashboardWidgetDataView(DashboardDataView):
+    """View for loading one dashboard widget on its own.
+
+    Lets the frontend fetch slow widgets after the rest of the
+    dashboard has rendered.
+    """
+
+    async def get(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> JsonResponse:
+        user = await request.auser()
+        if not isinstance(user, User):
+            return JsonResponse(
+                {'error': 'User not authenticated'},
+                status=401,
             )
-            recent_transactions = self._get_recent_transactions(user)
-
-            data = {
-                'widgets': list(widgets.values()),
-                'analytics': {
-                    'stats': serializable_stats,
-                    'trends': trends,
-                    'expense_heatmap': self._get_expense_heatmap_data(
-                        user,
-                        period,
-                    ),
-                    'hot_budget_categories': self._get_hot_budget_categories(
-                        request,
-                        user,
-                    ),
-                },
-                'comparison': comparison_data,
-                'recent_transactions': recent_transactions,
-                'click_through': {
-                    'expense_list_url': _finances_url('expense'),
-                    'income_list_url': _finances_url('income'),
-                },
-            }
 
-            return JsonResponse(data, safe=False)
-        except (
-            ValueError,
-            TypeError,
-            AttributeError,
-            KeyError,
-            RuntimeError,
-        ) as e:
-            error_msg = str(e)
-            traceback_str = traceback.format_exc()
-            logger = logging.getLogger(__name__)
-            logger.exception('Dashboard data loading error')
+        widget = kwargs['widget']
+        providers = self.get_widget_providers(
+            request,
+            user,
+            request.GET.get('period', 'month'),
+        )
+        if widget not in providers:
+            raise Http404
+        results = await arun_widgets({widget: providers[widget]})
+        if widget in results.errors:
+            timed_out = results.errors[widget] == WIDGET_TIMEOUT_ERROR
             return JsonResponse(
-                {
-                    'error': f'Internal server error: {error_msg}',
-                    'traceback': traceback_str,
-                },
-                status=500,
+                {'widget': widget, 'error': results.errors[widget]},
+                status=504 if timed_out else 500,
             )
+        return JsonResponse(
+            {'widget': widget, 'data': results.data[widget]},
+            safe=False,
+        )
 
 
 class DashboardWidgetConfigView(LoginRequiredMixin, View):
@@ -645,20 +786,22 @@ class DashboardWidgetConfigView(LoginRequiredMixin, View):
         return JsonResponse({'status': 'ok'})
 
 
-class DashboardDrillDownView(LoginRequiredMixin, View):
+@method_decorator(login_required, name='get')
+@method_decorator(conditional_on_user_data(), name='get')
+class DashboardDrillDownView(View):
     """View for getting category drill-down data.
 
     Provides JSON endpoint for drill-down charts showing category
     details and subcategories.
     """
 
-    def get(
+    async def get(
         self,
         request: HttpRequest,
         *args: Any,
         **kwargs: Any,
     ) -> JsonResponse:
-        user = request.user
+        user = await request.auser()
         if not isinstance(user, User):
             return JsonResponse({'error': 'User not authenticated'}, status=401)
 
@@ -666,7 +809,7 @@ class DashboardDrillDownView(LoginRequiredMixin, View):
         date_str = request.GET.get('date')
         data_type = request.GET.get('type', 'expense')
 
-        drill_data = _views_module().get_drill_down_data(
+        drill_data = await sync_to_async(_views_module().get_drill_down_data)(
             user=user,
             category_id=category_id,
             date_str=date_str,
@@ -676,26 +819,30 @@ class DashboardDrillDownView(LoginRequiredMixin, View):
         return JsonResponse(drill_data)
 
 
-class DashboardComparisonView(LoginRequiredMixin, View):
+@method_decorator(login_required, name='get')
+@method_decorator(conditional_on_user_data(), name='get')
+class DashboardComparisonView(View):
     """View for period comparison data.
 
     Provides JSON endpoint for comparing current and previous
     periods (month, quarter, year).
     """
 
-    def get(
+    async def get(
         self,
         request: HttpRequest,
         *args: Any,
         **kwargs: Any,
     ) -> JsonResponse:
-        user = request.user
+        user = await request.auser()
         if not isinstance(user, User):
             return JsonResponse({'error': 'User not authenticated'}, status=401)
 
         period_type = request.GET.get('period', 'month')
 
-        comparison_data = _views_module().get_period_comparison(
+        comparison_data = await sync_to_async(
+            _views_module().get_period_comparison,
+        )(
             user=user,
             period_type=period_type,
         )
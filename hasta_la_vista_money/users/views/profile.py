@@ -1,9 +1,12 @@
+import functools
 import json
 from csv import writer
 from io import StringIO
 from typing import TYPE_CHECKING, Any, cast
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
@@ -16,8 +19,10 @@ from django.http import (
 )
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.generic import TemplateView, UpdateView
+from django.views.generic.base import ContextMixin, TemplateResponseMixin
 
 from hasta_la_vista_money import constants
 from hasta_la_vista_money.custom_mixin import CustomSuccessURLUserMixin
@@ -30,6 +35,9 @@ from hasta_la_vista_money.users.models import (
 from hasta_la_vista_money.users.services.cache import (
     invalidate_user_detailed_statistics_cache,
 )
+from hasta_la_vista_money.users.services.dashboard_widgets import (
+    arun_in_worker,
+)
 from hasta_la_vista_money.users.services.detailed_statistics import (
     StatisticsFilters,
     get_user_detailed_statistics,
@@ -40,6 +48,9 @@ from hasta_la_vista_money.users.services.notifications import (
     get_user_notifications,
 )
 from hasta_la_vista_money.users.services.profile import update_user_profile
+from hasta_la_vista_money.users.services.summary_statistics_service import (
+    aget_user_detailed_statistics,
+)
 from hasta_la_vista_money.users.services.theme import (
     VALID_THEMES,
     set_user_theme,
@@ -142,59 +153,64 @@ class ExportUserDataView(LoginRequiredMixin, View):
         return response
 
 
-class UserStatisticsView(LoginRequiredMixin, TemplateView):
+@method_decorator(login_required, name='get')
+class UserStatisticsView(ContextMixin, TemplateResponseMixin, View):
     """View for user detailed statistics.
 
     Displays comprehensive user statistics including monthly data,
-    top categories, and financial overview.
+    top categories, and financial overview. The handler is async:
+    cached statistics are read with a single cache call and missing
+    ones are built on the widget pool.
     """
 
     template_name = 'users/statistics.html'
 
-    def get(
+    async def get(
         self,
         request: HttpRequest,
         *args: Any,
         **kwargs: Any,
     ) -> HttpResponse:
-        if request.GET.get('refresh') == '1' and isinstance(
-            request.user,
-            User,
-        ):
-            invalidate_user_detailed_statistics_cache(request.user.pk)
+        user = await request.auser()
+        if request.GET.get('refresh') == '1' and isinstance(user, User):
+            await sync_to_async(invalidate_user_detailed_statistics_cache)(
+                user.pk,
+            )
             query = request.GET.copy()
             query.pop('refresh', None)
             redirect_url = request.path
             if query:
                 redirect_url = f'{redirect_url}?{query.urlencode()}'
             return HttpResponseRedirect(redirect_url)
-        return super().get(request, *args, **kwargs)
 
-    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
-        context = super().get_context_data(**kwargs)
-        user = self.request.user
-        request_with_container = cast('RequestWithContainer', self.request)
+        context = self.get_context_data(**kwargs)
         if isinstance(user, User):
-            statistics_filter = StatisticsFilters.from_query(self.request.GET)
-            context.update(
-                get_user_detailed_statistics(
-                    user,
-                    container=request_with_container.container,
-                    stats_filter=statistics_filter,
-                    request=self.request,
-                ).items(),
+            request_with_container = cast('RequestWithContainer', request)
+            statistics = await aget_user_detailed_statistics(
+                user,
+                container=request_with_container.container,
+                stats_filter=StatisticsFilters.from_query(request.GET),
+                request=request,
             )
-        return context
+            context.update(statistics.items())
+        return self.render_to_response(context)
 
 
-class UserStatisticsExportView(LoginRequiredMixin, View):
+@method_decorator(login_required, name='get')
+class UserStatisticsExportView(View):
     """Export the currently filtered statistics slice as CSV."""
 
-    def get(self, request: HttpRequest) -> HttpResponse:
-        user = request.user
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        user = await request.auser()
         if not isinstance(user, User):
             return HttpResponse('Unauthorized', status=401)
+        # The export walks lazy querysets of the statistics, so it is
+        # built off the event loop as a whole.
+        return await arun_in_worker(
+            functools.partial(self._export, request, user),
+        )
 
+    def _export(self, request: HttpRequest, user: User) -> HttpResponse:
         request_with_container = cast('RequestWithContainer', request)
         statistics_filter = StatisticsFilters.from_query(request.GET)
         stats = get_user_detailed_statistics(
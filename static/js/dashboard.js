@@ -241,7 +241,7 @@ class DashboardManager {
 
     async loadDashboard() {
         try {
-            const response = await this._safeFetch('data/', { period: this.period }, {
+            const response = await this._safeFetch('data/', { period: this.period, lazy: 1 }, {
                 method: 'GET',
                 headers: {
                     'Accept': 'application/json',
@@ -269,12 +269,39 @@ class DashboardManager {
             this.clickThrough = data.click_through || {};
 
             this.renderWidgets();
+            this.loadLazyWidgets(data.lazy_widgets || []);
         } catch (error) {
             console.error('Error loading dashboard:', error);
             this.showError(error.message || 'Ошибка загрузки данных дашборда');
         }
     }
 
+    async loadLazyWidgets(widgetNames) {
+        const loaded = await Promise.all(widgetNames.map(async (name) => {
+            try {
+                const response = await this._safeFetch(`data/${encodeURIComponent(name)}/`, { period: this.period }, {
+                    method: 'GET',
+                    headers: {
+                        'Accept': 'application/json',
+                        'X-Requested-With': 'XMLHttpRequest',
+                    },
+                    credentials: 'same-origin',
+                });
+                if (!response.ok) return null;
+                const payload = await response.json();
+                this.analyticsData[name] = payload.data;
+                return name;
+            } catch (error) {
+                console.error(`Error loading dashboard widget ${name}:`, error);
+                return null;
+            }
+        }));
+
+        if (loaded.some(Boolean)) {
+            this.renderWidgets();
+        }
+    }
+
     renderWidgets() {
         const grid = document.getElementById('widgets-grid');
         if (!grid) return;